@@ -3,9 +3,7 @@ Read-a-Thon Web Application
 Flask-based browser interface for managing and reporting on read-a-thon data
 """
 
-from flask import Flask, render_template, request, jsonify, send_file, Response, session, redirect, url_for
-from database import ReadathonDB, ReportGenerator, DatabaseRegistry
-from queries import get_grade_level_classes_query, get_grade_aggregations_query, get_school_wide_leaders_query
+from flask import Flask, render_template, request, jsonify, send_file, Response, session, redirect, url_for, stream_with_context, g, make_response, has_request_context
 import csv
 import io
 import zipfile
@@ -14,6 +12,15 @@ import os
 import argparse
 import json
 import sys
+import time
+import hashlib
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import wraps
+from collections import OrderedDict
+from itertools import product
+import perf_monitor
 
 app = Flask(__name__)
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
@@ -47,91 +54,210 @@ def write_config(db_id, db_filename):
 # Temporary compatibility - will be removed when all routes are updated
 DEFAULT_DATABASE = "sample"  # Fallback for legacy session.get('environment', DEFAULT_DATABASE)
 
-# Parse command line arguments - HYBRID APPROACH
-parser = argparse.ArgumentParser(description='Read-a-Thon Management System')
-parser.add_argument('--db',
-                   help='Database to use: display name ("2025 Read-a-Thon"), '
-                        'filename (readathon_2025.db), or alias ("sample"). '
-                        'Case-insensitive.')
-args, unknown = parser.parse_known_args()
-
-# Initialize registry
-registry = DatabaseRegistry()
-
-# Determine startup database
-if args.db:
-    # Command-line argument provided - match against display_name, filename, or alias
-    db_match = registry.get_database_by_name(args.db)
-
-    if not db_match:
-        print(f"\n❌ Database not found: {args.db}")
-        print("\nAvailable databases:")
-        for db in registry.list_databases():
-            active_marker = " (ACTIVE)" if db['is_active'] else ""
-            print(f"  - {db['display_name']}{active_marker}")
-            print(f"    Filename: {db['db_filename']}")
-        sys.exit(1)
+# Startup database (hybrid): READATHON_DATABASE (the --db option), else the
+# preference remembered in CONFIG_FILE, else the registry's active database.
+# Nothing is opened at import time: the registry and the default database are
+# resolved on first use, so importing the app (tests, WSGI workers) stays cheap.
+app.config.setdefault('READATHON_DATABASE', None)  # display name, filename or alias ("sample")
 
-    DEFAULT_DATABASE_ID = db_match['db_id']
-    print(f"🗄️  Starting with database: {db_match['display_name']}")
-    print(f"   (Specified via command line: --db {args.db})")
-else:
-    # No CLI arg - check config file or use active database from registry
-    config_db_id = read_config()
+_startup_lock = threading.RLock()  # re-entered: the default database resolves through get_registry()
+_registry = None
+_default_database_id = None
+
+
+def get_registry():
+    """Shared registry handle, acquired on first use and held for the life of the process"""
+    from database import database_handles
+    global _registry
+    if _registry is None:
+        with _startup_lock:
+            if _registry is None:
+                _registry = database_handles.acquire_registry()
+    return _registry
+
+
+def resolve_default_database():
+    """
+    Pick the startup database from READATHON_DATABASE, the config file or the registry.
+
+    Returns:
+        (registry entry, reason it was chosen)
 
+    Raises:
+        LookupError: If READATHON_DATABASE matches no database, or there is no active database
+    """
+    registry = get_registry()
+    name = app.config.get('READATHON_DATABASE')
+    if name:
+        # Match against display_name, filename, or alias
+        db_match = registry.get_database_by_name(name)
+        if not db_match:
+            raise LookupError(f"Database not found: {name}")
+        return db_match, f"Specified via command line: --db {name}"
+
+    config_db_id = read_config()
     if config_db_id:
-        # Use database from config file
         db_info = registry.get_database(config_db_id)
         if db_info:
-            DEFAULT_DATABASE_ID = config_db_id
-            print(f"🗄️  Starting with database: {db_info['display_name']}")
-            print(f"   (Using remembered preference from {CONFIG_FILE})")
-        else:
-            # Config references non-existent database - fall back to active
-            active_db = registry.get_active_database()
-            DEFAULT_DATABASE_ID = active_db['db_id']
-            print(f"🗄️  Starting with database: {active_db['display_name']}")
-            print(f"   (Config database not found, using active database)")
-    else:
-        # No config - use active database from registry
-        active_db = registry.get_active_database()
-        if not active_db:
-            print("\n❌ No active database found in registry!")
-            sys.exit(1)
+            return db_info, f"Using remembered preference from {CONFIG_FILE}"
 
-        DEFAULT_DATABASE_ID = active_db['db_id']
-        print(f"🗄️  Starting with database: {active_db['display_name']}")
-        print(f"   (No config file found, using active database from registry)")
+    active_db = registry.get_active_database()
+    if not active_db:
+        raise LookupError("No active database found in registry!")
+    if config_db_id:
+        return active_db, "Config database not found, using active database"
+    return active_db, "No config file found, using active database from registry"
+
+
+def get_default_database_id():
+    """Database ID for sessions that have not picked one (resolved once, on first use)"""
+    global _default_database_id
+    if _default_database_id is None:
+        with _startup_lock:
+            if _default_database_id is None:
+                _default_database_id = resolve_default_database()[0]['db_id']
+    return _default_database_id
+
+
+def create_app(config=None):
+    """
+    Configure the app and return it (WSGI entry point: app:create_app()).
+
+    Opens nothing; the registry and the default database are resolved by the
+    first request that needs them, so workers fork quickly and tests pass
+    settings here instead of through argv.
+
+    Args:
+        config: Optional settings applied to app.config (e.g. TESTING,
+                READATHON_DATABASE)
+    """
+    global _default_database_id
+    if config:
+        app.config.update(config)
+        _default_database_id = None
+    return app
+
+
+def create_app_from_argv(argv=None):
+    """Command-line startup: parse --db, then resolve and report the startup database (exits if invalid)"""
+    parser = argparse.ArgumentParser(description='Read-a-Thon Management System')
+    parser.add_argument('--db',
+                       help='Database to use: display name ("2025 Read-a-Thon"), '
+                            'filename (readathon_2025.db), or alias ("sample"). '
+                            'Case-insensitive.')
+    args, unknown = parser.parse_known_args(argv)
+    create_app({'READATHON_DATABASE': args.db})
+
+    try:
+        db_info, reason = resolve_default_database()
+    except LookupError as e:
+        print(f"\n❌ {e}")
+        if args.db:
+            print("\nAvailable databases:")
+            for db in get_registry().list_databases():
+                active_marker = " (ACTIVE)" if db['is_active'] else ""
+                print(f"  - {db['display_name']}{active_marker}")
+                print(f"    Filename: {db['db_filename']}")
+        sys.exit(1)
+
+    print(f"🗄️  Starting with database: {db_info['display_name']}")
+    print(f"   ({reason})")
+    return app
 
 # Cache for loaded databases
 database_cache = {}
 
+# Largest page the table API will return for one ?limit= request
+TABLE_PAGE_MAX_ROWS = 5000
+
+# Students table rows rendered per window (the page fetches other windows from /api/students)
+STUDENTS_PAGE_SIZE = 100
+
+# Max reports run concurrently by one workflow request (each worker gets its own read connection)
+WORKFLOW_MAX_WORKERS = 4
+
+# Pre-rendered QD slide bundles (one folder per database, newest versions kept)
+SLIDE_BUNDLE_DIR = 'slide_bundles'
+SLIDE_BUNDLE_KEEP = 5
+
+# Dashboard template contexts kept in memory (least recently used dropped first)
+TAB_CONTEXT_CACHE_MAX_ENTRIES = 2000
+
 def get_database(db_id: int):
-    """Load database by ID (with caching)"""
+    """Load database by ID (with caching; the cache holds a shared handle from database_handles)"""
+    from database import database_handles
     if db_id not in database_cache:
-        db_info = registry.get_database(db_id)
+        db_info = get_registry().get_database(db_id)
         if not db_info:
             raise ValueError(f"Database ID {db_id} not found in registry")
 
         db_path = f"db/{db_info['db_filename']}"
-        database_cache[db_id] = ReadathonDB(db_path)
+        database_cache[db_id] = database_handles.acquire(db_path)
 
     return database_cache[db_id]
 
 def get_current_db():
     """Get currently active database"""
-    db_id = session.get('active_database_id', DEFAULT_DATABASE_ID)
+    db_id = session.get('active_database_id', get_default_database_id())
     return get_database(db_id)
 
 def get_current_reports():
     """Get report generator for current environment"""
+    from database import ReportGenerator
     return ReportGenerator(get_current_db())
 
+def get_contest(db):
+    """
+    Contest context (dates, day numbers, roster, teams, grade rules, uploads) for db.
+
+    ReadathonDB caches it per data version; inside a request the instance is also
+    kept on flask.g, so every helper in the request sees the same snapshot.
+    """
+    if not has_request_context():
+        return db.get_contest_context()
+    contexts = g.setdefault('contest_contexts', {})
+    if db.db_path not in contexts:
+        contexts[db.db_path] = db.get_contest_context()
+    return contexts[db.db_path]
+
+@app.before_request
+def start_request_profiling():
+    """Time every route for /api/perf; ?profile=1 also runs cProfile for this request"""
+    if request.endpoint and request.endpoint != 'static':
+        g.perf_span = perf_monitor.span('route', request.endpoint)
+        g.perf_span.__enter__()
+
+    if request.args.get('profile') == '1':
+        import cProfile
+        g.profiler = cProfile.Profile()
+        g.profiler.enable()
+
+@app.after_request
+def return_request_profile(response):
+    """Replace the response with the cProfile dump when ?profile=1 was requested"""
+    profiler = g.pop('profiler', None)
+    if profiler is None:
+        return response
+
+    import pstats
+    profiler.disable()
+    output = io.StringIO()
+    stats = pstats.Stats(profiler, stream=output)
+    stats.sort_stats(request.args.get('profile_sort', 'cumulative')).print_stats(60)
+    return Response(output.getvalue(), mimetype='text/plain')
+
+@app.teardown_request
+def finish_request_profiling(exc):
+    """Close the route span opened in start_request_profiling"""
+    perf_span = g.pop('perf_span', None)
+    if perf_span is not None:
+        perf_span.__exit__(None, None, None)
+
 @app.context_processor
 def inject_database_info():
     """Inject database information into all templates"""
-    db_id = session.get('active_database_id', DEFAULT_DATABASE_ID)
-    db_info = registry.get_database(db_id)
+    db_id = session.get('active_database_id', get_default_database_id())
+    db_info = get_registry().get_database(db_id)
 
     if db_info:
         # Check if this is the sample database (either by display name or filename)
@@ -148,6 +274,180 @@ def inject_database_info():
     }
 
 
+@app.context_processor
+def inject_report_metadata_version():
+    """Inject the report metadata version so pages request the cacheable /api/report_metadata URL"""
+    from report_metadata import REPORT_METADATA_VERSION
+    return {'report_metadata_version': REPORT_METADATA_VERSION}
+
+
+# ========== Background Jobs ==========
+
+_background_jobs_lock = threading.Lock()
+_background_jobs_rerun = {}  # (job name, db_path) -> True when the job was requested again while running
+
+
+def _run_background_job(name, db, job):
+    """Worker loop: run the job until no new request arrived during the last run"""
+    key = (name, db.db_path)
+    while True:
+        try:
+            job(db)
+        except Exception as e:
+            print(f"⚠️  Background {name} failed for {db.db_path}: {e}")
+        with _background_jobs_lock:
+            if not _background_jobs_rerun.get(key):
+                del _background_jobs_rerun[key]
+                return
+            _background_jobs_rerun[key] = False
+
+
+def schedule_background_job(name, db, job):
+    """
+    Run job(db) in a daemon thread, one at a time per (name, database).
+
+    Requests arriving while the job runs are coalesced into one more run, so a
+    burst of uploads costs at most two runs.
+
+    Returns:
+        The started thread, or None when an in-flight run will pick up the change
+    """
+    key = (name, db.db_path)
+    with _background_jobs_lock:
+        if key in _background_jobs_rerun:
+            _background_jobs_rerun[key] = True
+            return None
+        _background_jobs_rerun[key] = False
+    thread = threading.Thread(target=_run_background_job, args=(name, db, job), daemon=True)
+    thread.start()
+    return thread
+
+
+# ========== Conditional GET (ETags) ==========
+
+# Changes on every restart, so a deploy with new templates or code never matches an old ETag
+APP_INSTANCE_ID = f'{os.getpid()}-{time.time_ns()}'
+
+_data_versions = {}  # db_path -> counter bumped by every write made through the app
+_data_versions_lock = threading.Lock()
+
+
+def notify_data_changed(db):
+    """
+    Bookkeeping after an upload, delete or clear on a database.
+
+    Bumps the data version that ETags include (so dashboards refresh even when
+    the file's modification time has coarse resolution), then refreshes the
+    database's comparison snapshot, re-renders the daily slide deck and warms
+    the dashboard contexts in the background.
+    """
+    with _data_versions_lock:
+        _data_versions[db.db_path] = _data_versions.get(db.db_path, 0) + 1
+    schedule_background_job('data refresh', db, _refresh_after_data_change)
+
+
+def _refresh_after_data_change(db):
+    """
+    Background job: refresh the comparison snapshot, then schedule the slide deck and warmup.
+
+    The bundle and the warmed contexts are keyed on the file identity, which the
+    snapshot write changes, so they start only after that write has committed.
+    """
+    try:
+        db.refresh_comparison_snapshot()
+    finally:
+        schedule_slide_bundle(db)
+        schedule_tab_warmup(db)
+
+
+def schedule_comparison_snapshot(db):
+    """
+    Rebuild the stored comparison snapshot in a background thread.
+
+    Returns:
+        The started thread, or None when an in-flight refresh will pick up the change
+    """
+    from database import ReadathonDB
+    return schedule_background_job('comparison snapshot', db, ReadathonDB.refresh_comparison_snapshot)
+
+
+def get_data_stamp(db):
+    """
+    Token that changes whenever a database's contents may have changed (no SQL).
+
+    Combines the database file identity with the in-process data version.
+    """
+    return [db.get_file_identity(), _data_versions.get(db.db_path, 0)]
+
+
+def compute_request_etag(db):
+    """
+    ETag for the current GET request, computed without running any SQL.
+
+    Combines the app instance, the data stamp, the registry file identity, the
+    session environment and the request's path and filter parameters.
+    """
+    registry_stat = os.stat(get_registry().registry_path)
+    params = sorted((key, value) for key, value in request.args.items(multi=True)
+                    if key not in ('profile', 'profile_sort'))
+    key = json.dumps([
+        APP_INSTANCE_ID,
+        get_data_stamp(db),
+        [registry_stat.st_mtime_ns, registry_stat.st_size],
+        session.get('environment', DEFAULT_DATABASE),
+        request.path,
+        params
+    ])
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+
+def conditional_get(when=None):
+    """
+    Decorator answering If-None-Match with 304 before the view runs.
+
+    Successful responses carry the ETag plus Cache-Control: no-cache, so
+    browsers revalidate on every refresh and only re-download after the data
+    changes. ?profile=1 requests always run the view.
+
+    Args:
+        when: Optional predicate on the view's keyword arguments; routes whose
+              output is not a pure function of the data (random drawings,
+              file sizes) return False to skip ETags.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.args.get('profile') == '1' or (when is not None and not when(**kwargs)):
+                return view(*args, **kwargs)
+
+            etag = compute_request_etag(get_current_db())
+            if request.if_none_match.contains(etag):
+                response = Response(status=304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag)
+            response.headers['Cache-Control'] = 'no-cache'
+            return response
+        return wrapper
+    return decorator
+
+
+def is_cacheable_report(report_id):
+    """Reports whose output depends only on the data and parameters"""
+    from database import REPORT_REGISTRY
+    spec = REPORT_REGISTRY.get(report_id)
+    return bool(spec and spec['cacheable'])
+
+
+def is_cacheable_workflow(workflow_id):
+    """Workflows made up only of cacheable reports (QD includes the random Q4 drawing)"""
+    from database import REPORT_REGISTRY
+    items = get_workflow_reports(workflow_id)
+    return bool(items) and all(is_cacheable_report(item['id']) for item in items if item['id'] in REPORT_REGISTRY)
+
+
 def get_unified_items():
     """
     Get unified list of all items (reports, tables, workflows).
@@ -277,98 +577,59 @@ def get_workflow_reports(workflow_id):
     return [item for item in items if is_report(item)]
 
 
-@app.route('/')
-@app.route('/school')
-def school_tab():
-    """School overview dashboard (landing page)"""
-    env = session.get('environment', DEFAULT_DATABASE)
-    db = get_current_db()
-    reports = get_current_reports()
-
-    # Get filter parameter (optional)
-    date_filter = request.args.get('date', 'all')
+def build_school_context(db, date_filter):
+    """Build the School tab template context for one date filter (cached by get_tab_context)"""
+    from database import ReportGenerator
+    from queries import compose_metrics_query
+    reports = ReportGenerator(db)
+    contest = get_contest(db)
 
     # Get all available dates
-    dates = db.get_all_dates()
+    dates = contest.dates
 
     # Build WHERE clause based on filter (cumulative through selected date)
     date_where = ""
     date_where_no_alias = ""  # For subqueries without table alias
-    if date_filter != 'all' and date_filter in dates:
+    if contest.is_log_date(date_filter):
         date_where = f"AND dl.log_date <= '{date_filter}'"
         date_where_no_alias = f"AND log_date <= '{date_filter}'"
 
-    # Get total roster count
-    roster_query = "SELECT COUNT(*) as total FROM Roster"
-    roster_result = db.execute_query(roster_query)
-    total_roster = roster_result[0]['total'] if roster_result else 411
+    # Banner scalars in one statement (one scan per source table)
+    banner_query = compose_metrics_query(
+        ['total_roster', 'total_fundraising', 'fundraising_students',
+         'total_minutes_base', 'participating_students', 'total_days',
+         'goals_met_students', 'bonus_minutes', 'bonus_points'],
+        date_where=date_where)
+    banner_result = db.execute_query(banner_query)
+    banner = banner_result[0] if banner_result else {}
+
+    total_roster = banner.get('total_roster', 411)
 
     # === METRICS BANNER ===
     metrics = {}
 
-    # Calculate full contest date range (always shown in dropdown, regardless of filter)
-    sorted_dates = sorted(dates)  # Oldest to newest
-    total_days = len(sorted_dates)  # Total number of days in contest
-
-    if sorted_dates:
-        start_date = datetime.strptime(sorted_dates[0], '%Y-%m-%d').strftime('%b %d')
-        end_date = datetime.strptime(sorted_dates[-1], '%Y-%m-%d').strftime('%b %d, %Y')
-        full_contest_range = f"{start_date}-{end_date}"
-    else:
-        full_contest_range = "Oct 10-15, 2025"  # Fallback if no dates
+    # Full contest date range (always shown in dropdown, regardless of filter)
+    total_days = contest.total_days  # Total number of days in contest
+    full_contest_range = contest.full_contest_range
 
-    # Current day calculation - date-aware
-    if date_filter != 'all' and date_filter in dates:
-        # Find position of selected date (1-based)
-        metrics['current_day'] = sorted_dates.index(date_filter) + 1
-        metrics['campaign_date'] = date_filter  # Store for subtitle display
-    else:
-        # Full contest - show total days
-        metrics['current_day'] = total_days
-        metrics['campaign_date'] = full_contest_range
+    # Current day calculation - date-aware (selected date, or total days for the full contest)
+    metrics['current_day'] = contest.current_day(date_filter)
+    metrics['campaign_date'] = contest.campaign_date(date_filter)  # Subtitle display
 
     metrics['total_days'] = total_days
     metrics['total_roster'] = total_roster
 
     # Fundraising metrics
-    fundraising_query = f"""
-        SELECT
-            COALESCE(SUM(rc.donation_amount), 0) as total_fundraising,
-            COUNT(DISTINCT CASE WHEN rc.donation_amount > 0 THEN rc.student_name END) as fundraising_students
-        FROM Reader_Cumulative rc
-    """
-    fundraising_result = db.execute_query(fundraising_query)
-    if fundraising_result and fundraising_result[0]:
-        metrics['total_fundraising'] = fundraising_result[0]['total_fundraising'] or 0
-        metrics['fundraising_students'] = fundraising_result[0]['fundraising_students'] or 0
-    else:
-        metrics['total_fundraising'] = 0
-        metrics['fundraising_students'] = 0
+    metrics['total_fundraising'] = banner.get('total_fundraising') or 0
+    metrics['fundraising_students'] = banner.get('fundraising_students') or 0
 
     metrics['fundraising_pct'] = (metrics['fundraising_students'] / total_roster * 100) if total_roster > 0 else 0
 
     # Reading minutes (capped at 120 per day) + Team Color Bonus
-    reading_query = f"""
-        WITH TeamColorBonus AS (
-            SELECT COALESCE(SUM(bonus_minutes), 0) as total_bonus
-            FROM Team_Color_Bonus
-        )
-        SELECT
-            SUM(MIN(dl.minutes_read, 120)) as total_minutes_base,
-            (SELECT total_bonus FROM TeamColorBonus) as bonus_minutes,
-            COUNT(DISTINCT CASE WHEN dl.minutes_read > 0 THEN dl.student_name END) as participating_students
-        FROM Daily_Logs dl
-        WHERE 1=1 {date_where}
-    """
-    reading_result = db.execute_query(reading_query)
-    if reading_result and reading_result[0]:
-        base_minutes = int(reading_result[0]['total_minutes_base'] or 0)
-        bonus_minutes = int(reading_result[0]['bonus_minutes'] or 0)
-        metrics['total_minutes'] = base_minutes + bonus_minutes
-        metrics['participating_students'] = reading_result[0]['participating_students'] or 0
-    else:
-        metrics['total_minutes'] = 0
-        metrics['participating_students'] = 0
+    base_minutes = int(banner.get('total_minutes_base') or 0)
+    bonus_minutes = int(banner.get('bonus_minutes') or 0)
+    metrics['total_minutes'] = base_minutes + bonus_minutes
+    metrics['participating_students'] = banner.get('participating_students') or 0
 
     metrics['total_hours'] = metrics['total_minutes'] // 60
     metrics['participation_pct'] = (metrics['participating_students'] / total_roster * 100) if total_roster > 0 else 0
@@ -391,47 +652,22 @@ def school_tab():
     base_school_participation = school_participation_result[0]['avg_participation'] or 0 if school_participation_result and school_participation_result[0] else 0
 
     # Get total color bonus points across all classes
-    school_color_bonus_query = """
-        SELECT COALESCE(SUM(bonus_participation_points), 0) as total_bonus
-        FROM Team_Color_Bonus
-    """
-    school_color_bonus_result = db.execute_query(school_color_bonus_query)
-    school_color_bonus = school_color_bonus_result[0]['total_bonus'] if school_color_bonus_result and school_color_bonus_result[0] else 0
+    school_color_bonus = banner.get('bonus_points') or 0
 
-    # Calculate total days in date range for color bonus calculation
-    total_days_query = f"""
-        SELECT COUNT(DISTINCT dl.log_date) as total_days
-        FROM Daily_Logs dl
-        WHERE 1=1 {date_where}
-    """
-    total_days_result = db.execute_query(total_days_query)
-    total_days = total_days_result[0]['total_days'] if total_days_result and total_days_result[0] else 1
+    # Total days in date range for color bonus calculation
+    total_days = banner.get('total_days', 1)
 
     # Apply color bonus: color points act as "free" participation days
     metrics['avg_participation_with_color'] = base_school_participation + (school_color_bonus * 100.0 / (total_roster * total_days)) if total_roster > 0 and total_days > 0 else base_school_participation
 
     # Goals met calculation
-    goals_met_query = f"""
-        SELECT
-            COUNT(DISTINCT dl.student_name) as goals_met_students
-        FROM Daily_Logs dl
-        JOIN Roster r ON dl.student_name = r.student_name
-        JOIN Grade_Rules gr ON r.grade_level = gr.grade_level
-        WHERE dl.minutes_read >= gr.min_daily_minutes {date_where}
-    """
-    goals_met_result = db.execute_query(goals_met_query)
-    if goals_met_result and goals_met_result[0]:
-        metrics['goals_met_students'] = goals_met_result[0]['goals_met_students'] or 0
-    else:
-        metrics['goals_met_students'] = 0
+    metrics['goals_met_students'] = banner.get('goals_met_students') or 0
 
     metrics['goals_met_pct'] = (metrics['goals_met_students'] / total_roster * 100) if total_roster > 0 else 0
 
     # === TEAM COMPETITION ===
     # Get actual team names from database (sorted alphabetically for consistency)
-    team_names_query = "SELECT DISTINCT team_name FROM Roster ORDER BY team_name"
-    team_names_result = db.execute_query(team_names_query)
-    team_names = [row['team_name'] for row in team_names_result] if team_names_result else []
+    team_names = contest.team_names
 
     # Ensure we have exactly 2 teams
     if len(team_names) != 2:
@@ -443,7 +679,7 @@ def school_tab():
     teams = {}
 
     # Team 1 (cumulative through selected date)
-    team1_where = f"AND dl.log_date <= '{date_filter}'" if date_filter != 'all' and date_filter in dates else ""
+    team1_where = f"AND dl.log_date <= '{date_filter}'" if contest.is_log_date(date_filter) else ""
 
     # Separate query for fundraising to avoid row multiplication from Daily_Logs join
     team1_fundraising_query = f"""
@@ -826,7 +1062,7 @@ def school_tab():
         performers['class_fundraising'] = {'teacher': 'N/A', 'grade': '', 'amount': 0}
 
     # Top class by reading (cumulative through selected date, with color bonus)
-    class_reading_where = f"WHERE dl.log_date <= '{date_filter}'" if date_filter != 'all' and date_filter in dates else ""
+    class_reading_where = f"WHERE dl.log_date <= '{date_filter}'" if contest.is_log_date(date_filter) else ""
     class_reading_query = f"""
         WITH ClassBonus AS (
             SELECT
@@ -864,7 +1100,7 @@ def school_tab():
     participation['total_roster'] = total_roster
 
     # Determine dates to include (cumulative through selected date)
-    if date_filter != 'all' and date_filter in dates:
+    if contest.is_log_date(date_filter):
         # Get all dates up through and including selected date
         dates_through_selected = [d for d in dates if d <= date_filter]
         participation_day_count = len(dates_through_selected)
@@ -876,7 +1112,7 @@ def school_tab():
         participation_date_label = "Full Contest"
 
     # Build WHERE clause for participation queries
-    if date_filter != 'all' and date_filter in dates:
+    if contest.is_log_date(date_filter):
         participation_where = f"AND dl.log_date <= '{date_filter}'"
     else:
         participation_where = ""
@@ -947,29 +1183,9 @@ def school_tab():
     # === METADATA (Last Updated) ===
     metadata = {}
 
-    # Daily_Logs timestamp
-    daily_logs_ts_query = """
-        SELECT MAX(upload_timestamp) as last_updated
-        FROM Upload_History
-        WHERE file_type = 'daily'
-    """
-    daily_logs_ts = db.execute_query(daily_logs_ts_query)
-    if daily_logs_ts and daily_logs_ts[0] and daily_logs_ts[0]['last_updated']:
-        metadata['daily_logs_updated'] = daily_logs_ts[0]['last_updated']
-    else:
-        metadata['daily_logs_updated'] = 'Never'
-
-    # Reader_Cumulative timestamp
-    reader_cumulative_ts_query = """
-        SELECT MAX(upload_timestamp) as last_updated
-        FROM Upload_History
-        WHERE file_type = 'cumulative'
-    """
-    reader_cumulative_ts = db.execute_query(reader_cumulative_ts_query)
-    if reader_cumulative_ts and reader_cumulative_ts[0] and reader_cumulative_ts[0]['last_updated']:
-        metadata['reader_cumulative_updated'] = reader_cumulative_ts[0]['last_updated']
-    else:
-        metadata['reader_cumulative_updated'] = 'Never'
+    # Daily_Logs and Reader_Cumulative timestamps
+    metadata['daily_logs_updated'] = contest.last_uploads['daily'] or 'Never'
+    metadata['reader_cumulative_updated'] = contest.last_uploads['cumulative'] or 'Never'
 
     # Roster timestamp (static - set during init)
     metadata['roster_updated'] = '09/15/2025 8:00 AM'
@@ -990,43 +1206,50 @@ def school_tab():
     else:
         metadata['team_color_bonus_updated'] = 'No data'
 
-    return render_template('school.html',
-                         environment=env,
-                         dates=dates,
-                         full_contest_range=full_contest_range,
-                         metrics=metrics,
-                         teams=teams,
-                         team1_name=team1_name,
-                         team2_name=team2_name,
-                         performers=performers,
-                         participation=participation,
-                         integrity=integrity,
-                         metadata=metadata)
+    return dict(
+        dates=dates,
+        full_contest_range=full_contest_range,
+        metrics=metrics,
+        teams=teams,
+        team1_name=team1_name,
+        team2_name=team2_name,
+        performers=performers,
+        participation=participation,
+        integrity=integrity,
+        metadata=metadata)
 
 
-@app.route('/teams')
-def teams_tab():
-    """Teams head-to-head competition dashboard"""
+@app.route('/')
+@app.route('/school')
+@conditional_get()
+def school_tab():
+    """School overview dashboard (landing page)"""
     env = session.get('environment', DEFAULT_DATABASE)
     db = get_current_db()
 
     # Get filter parameter (optional)
     date_filter = request.args.get('date', 'all')
 
+    return render_template('school.html', environment=env,
+                           **get_tab_context(db, 'school', date_filter))
+
+
+def build_teams_context(db, date_filter):
+    """Build the Teams tab template context for one date filter (cached by get_tab_context)"""
+    contest = get_contest(db)
+
     # Get all available dates
-    dates = db.get_all_dates()
+    dates = contest.dates
 
     # Build WHERE clause based on filter (cumulative through selected date)
     date_where = ""
     date_where_no_alias = ""
-    if date_filter != 'all' and date_filter in dates:
+    if contest.is_log_date(date_filter):
         date_where = f"AND dl.log_date <= '{date_filter}'"
         date_where_no_alias = f"AND log_date <= '{date_filter}'"
 
     # Get team names (sorted alphabetically for consistency)
-    team_names_query = "SELECT DISTINCT team_name FROM Roster ORDER BY team_name"
-    team_names_result = db.execute_query(team_names_query)
-    team_names = [row['team_name'] for row in team_names_result] if team_names_result else []
+    team_names = contest.team_names
 
     # Ensure we have exactly 2 teams
     if len(team_names) != 2:
@@ -1035,25 +1258,13 @@ def teams_tab():
     team1_name = team_names[0]  # Kitsko (alphabetically first)
     team2_name = team_names[1]  # Staub (alphabetically second)
 
-    # Calculate full contest date range
-    sorted_dates = sorted(dates)
-    total_days = len(sorted_dates)
-    if sorted_dates:
-        start_date = datetime.strptime(sorted_dates[0], '%Y-%m-%d').strftime('%b %d')
-        end_date = datetime.strptime(sorted_dates[-1], '%Y-%m-%d').strftime('%b %d, %Y')
-        full_contest_range = f"{start_date}-{end_date}"
-    else:
-        full_contest_range = "Oct 10-15, 2025"  # Fallback if no dates
+    # Full contest date range
+    total_days = contest.total_days
+    full_contest_range = contest.full_contest_range
 
-    # Campaign Day calculation - date-aware (for banner metric)
-    if date_filter != 'all' and date_filter in dates:
-        # Find position of selected date (1-based)
-        current_day = sorted_dates.index(date_filter) + 1
-        campaign_date = date_filter  # Store for subtitle display
-    else:
-        # Full contest - show total days
-        current_day = total_days
-        campaign_date = full_contest_range
+    # Campaign Day calculation - date-aware (selected date, or total days for the full contest)
+    current_day = contest.current_day(date_filter)
+    campaign_date = contest.campaign_date(date_filter)  # Subtitle display
 
     # === BANNER METRICS (6 metrics showing team winners + Campaign Day) ===
     banner = {}
@@ -1666,41 +1877,12 @@ def teams_tab():
     # 2. Students (Team Size)
     add_comparison_row('Students (Team Size)', 'Team Stats', team1_metrics['participation_students'], team2_metrics['participation_students'], 'number')
 
-    # === FULL CONTEST RANGE ===
-    sorted_dates = sorted(dates)
-    if sorted_dates:
-        start_date = datetime.strptime(sorted_dates[0], '%Y-%m-%d').strftime('%b %d')
-        end_date = datetime.strptime(sorted_dates[-1], '%Y-%m-%d').strftime('%b %d, %Y')
-        full_contest_range = f"{start_date}-{end_date}"
-    else:
-        full_contest_range = "Oct 10-15, 2025"  # Fallback if no dates
-
     # === METADATA (Last Updated) ===
     metadata = {}
 
-    # Daily_Logs timestamp
-    daily_logs_ts_query = """
-        SELECT MAX(upload_timestamp) as last_updated
-        FROM Upload_History
-        WHERE file_type = 'daily'
-    """
-    daily_logs_ts = db.execute_query(daily_logs_ts_query)
-    if daily_logs_ts and daily_logs_ts[0] and daily_logs_ts[0]['last_updated']:
-        metadata['daily_logs_updated'] = daily_logs_ts[0]['last_updated']
-    else:
-        metadata['daily_logs_updated'] = 'Never'
-
-    # Reader_Cumulative timestamp
-    reader_cumulative_ts_query = """
-        SELECT MAX(upload_timestamp) as last_updated
-        FROM Upload_History
-        WHERE file_type = 'cumulative'
-    """
-    reader_cumulative_ts = db.execute_query(reader_cumulative_ts_query)
-    if reader_cumulative_ts and reader_cumulative_ts[0] and reader_cumulative_ts[0]['last_updated']:
-        metadata['reader_cumulative_updated'] = reader_cumulative_ts[0]['last_updated']
-    else:
-        metadata['reader_cumulative_updated'] = 'Never'
+    # Daily_Logs and Reader_Cumulative timestamps
+    metadata['daily_logs_updated'] = contest.last_uploads['daily'] or 'Never'
+    metadata['reader_cumulative_updated'] = contest.last_uploads['cumulative'] or 'Never'
 
     # Roster timestamp (static - set during init)
     metadata['roster_updated'] = '09/15/2025 8:00 AM'
@@ -1721,181 +1903,169 @@ def teams_tab():
     else:
         metadata['team_color_bonus_updated'] = 'No data'
 
-    return render_template('teams.html',
-                         environment=env,
-                         dates=dates,
-                         date_filter=date_filter,
-                         current_day=current_day,
-                         campaign_date=campaign_date,
-                         total_days=total_days,
-                         full_contest_range=full_contest_range,
-                         team1_name=team1_name,
-                         team2_name=team2_name,
-                         banner=banner,
-                         top_performers=top_performers,
-                         comparison_table=comparison_table,
-                         metadata=metadata)
+    return dict(
+        dates=dates,
+        date_filter=date_filter,
+        current_day=current_day,
+        campaign_date=campaign_date,
+        total_days=total_days,
+        full_contest_range=full_contest_range,
+        team1_name=team1_name,
+        team2_name=team2_name,
+        banner=banner,
+        top_performers=top_performers,
+        comparison_table=comparison_table,
+        metadata=metadata)
 
 
-@app.route('/classes')
-def grade_level_tab():
-    """Grade Level dashboard - class and grade-level competition view"""
+@app.route('/teams')
+@conditional_get()
+def teams_tab():
+    """Teams head-to-head competition dashboard"""
     env = session.get('environment', DEFAULT_DATABASE)
     db = get_current_db()
 
-    # Get filter parameters (optional)
+    # Get filter parameter (optional)
     date_filter = request.args.get('date', 'all')
-    grade_filter = request.args.get('grade', 'all')
-    team_filter = request.args.get('team', 'all')
 
-    # Get all available dates
-    dates = db.get_all_dates()
+    return render_template('teams.html', environment=env,
+                           **get_tab_context(db, 'teams', date_filter))
 
-    # Build WHERE clause based on filter (cumulative through selected date)
-    date_where = ""
-    if date_filter != 'all' and date_filter in dates:
-        date_where = f" AND dl.log_date <= '{date_filter}'"
 
-    # Build grade WHERE clause
-    grade_where = ""
-    if grade_filter != 'all':
-        grade_where = f" AND ci.grade_level = '{grade_filter}'"
-
-    # Build team WHERE clause
-    team_where = ""
-    if team_filter != 'all':
-        team_where = f" AND ci.team_name = '{team_filter}'"
-
-    # DEBUG: Log filter state
-    print(f"\n=== GRADE LEVEL ROUTE DEBUG ===")
-    print(f"  date_filter: {date_filter}")
-    print(f"  grade_filter: {grade_filter}")
-    print(f"  team_filter: {team_filter}")
-    print(f"  date_where: {repr(date_where)}")
-    print(f"  grade_where: {repr(grade_where)}")
-    print(f"  team_where: {repr(team_where)}")
-
-    # Calculate full contest date range
-    sorted_dates = sorted(dates)
-    total_days = len(sorted_dates)
-    if sorted_dates:
-        start_date = datetime.strptime(sorted_dates[0], '%Y-%m-%d').strftime('%b %d')
-        end_date = datetime.strptime(sorted_dates[-1], '%Y-%m-%d').strftime('%b %d, %Y')
-        full_contest_range = f"{start_date}-{end_date}"
-    else:
-        full_contest_range = "Oct 10-15, 2025"  # Fallback if no dates
+# Grade Level winner highlights: metric key -> class row column
+GRADE_LEVEL_WINNER_METRICS = (
+    ('fundraising', 'total_fundraising'),
+    ('minutes', 'total_minutes'),
+    ('participation', 'participation_pct'),
+    ('avg_participation_with_color', 'avg_participation_with_color_pct'),
+    ('all_days_active', 'all_days_active_pct'),
+    ('goal_met_once', 'goal_met_once_pct'),
+    ('goal_met_all_days', 'goal_met_all_days_pct'),
+    ('color_war_points', 'color_war_points'),
+    ('sponsors', 'total_sponsors'),
+)
 
-    # Campaign Day calculation - date-aware (for banner metric)
-    if date_filter != 'all' and date_filter in dates:
-        # Find position of selected date (1-based)
-        current_day = sorted_dates.index(date_filter) + 1
-        campaign_date = date_filter  # Store for subtitle display
-    else:
-        # Full contest - show total days
-        current_day = total_days
-        campaign_date = full_contest_range
-
-    # === GET ALL CLASSES (unfiltered) TO CALCULATE TRUE SCHOOL-WIDE WINNERS ===
-    # IMPORTANT: School-wide winners must be calculated across ALL grades/teams, not just filtered
-    all_classes_query = get_grade_level_classes_query(date_where, "", "")  # No grade/team filter
-    all_classes_result = db.execute_query(all_classes_query)
-    all_classes = [dict(row) for row in all_classes_result] if all_classes_result else []
-
-    # Find TRUE school-wide winners (gold highlights) across ALL grades
-    # Matches metrics from Teams page for consistency
-    if all_classes:
-        school_winners = {
-            'fundraising': max(all_classes, key=lambda x: x['total_fundraising'])['total_fundraising'],
-            'minutes': max(all_classes, key=lambda x: x['total_minutes'])['total_minutes'],
-            'participation': max(all_classes, key=lambda x: x['participation_pct'])['participation_pct'],
-            'avg_participation_with_color': max(all_classes, key=lambda x: x['avg_participation_with_color_pct'])['avg_participation_with_color_pct'],
-            'all_days_active': max(all_classes, key=lambda x: x['all_days_active_pct'])['all_days_active_pct'],
-            'goal_met_once': max(all_classes, key=lambda x: x['goal_met_once_pct'])['goal_met_once_pct'],
-            'goal_met_all_days': max(all_classes, key=lambda x: x['goal_met_all_days_pct'])['goal_met_all_days_pct'],
-            'color_war_points': max(all_classes, key=lambda x: x['color_war_points'])['color_war_points'],
-            'sponsors': max(all_classes, key=lambda x: x['total_sponsors'])['total_sponsors']
-        }
-    else:
-        school_winners = {
-            'fundraising': 0,
-            'minutes': 0,
-            'participation': 0,
-            'avg_participation_with_color': 0,
-            'all_days_active': 0,
-            'goal_met_once': 0,
-            'goal_met_all_days': 0,
-            'color_war_points': 0,
-            'sponsors': 0
+# Grades that get silver (grade-level) winners and banner leaders
+GRADE_LEVEL_GRADES = ('K', '1', '2', '3', '4', '5')
+
+# Grade card order (other grade labels sort after these, alphabetically)
+GRADE_CARD_ORDER = {'K': 0, '1st': 1, '2nd': 2, '3rd': 3, '4th': 4, '5th': 5}
+
+
+def find_grade_level_winners(all_classes):
+    """
+    School-wide (gold) and per-grade (silver) maxima of every winner metric, in one pass.
+
+    Returns:
+        (school_winners, grade_winners): metric -> max value, and grade -> {metric -> max value}
+        for the grades in GRADE_LEVEL_GRADES that have classes
+    """
+    school_winners = dict.fromkeys((metric for metric, _ in GRADE_LEVEL_WINNER_METRICS), 0)
+    grade_maxes = {}
+    for index, cls in enumerate(all_classes):
+        grade_max = grade_maxes.setdefault(cls['grade_level'], {})
+        for metric, column in GRADE_LEVEL_WINNER_METRICS:
+            value = cls[column]
+            if index == 0 or value > school_winners[metric]:
+                school_winners[metric] = value
+            if metric not in grade_max or value > grade_max[metric]:
+                grade_max[metric] = value
+
+    grade_winners = {grade: grade_maxes[grade] for grade in GRADE_LEVEL_GRADES if grade in grade_maxes}
+    return school_winners, grade_winners
+
+
+def summarize_grade_level_classes(contest, classes):
+    """
+    Roll Grade Level class rows up into one grade card row per grade.
+
+    Class and student counts (and the team split) come from the roster students
+    of the given classes. The top class/student fields start empty and are
+    filled in by the caller's tie detection.
+    """
+    class_grades = {cls['class_name']: cls['grade_level'] for cls in classes}
+    team_names = contest.team_names
+    stats = {}
+    for student in contest.roster:
+        grade_level = class_grades.get(student['class_name'])
+        if grade_level is None:
+            continue
+        grade = stats.setdefault(grade_level, {'class_names': set(), 'num_students': 0,
+                                               'team1_students': 0, 'team2_students': 0})
+        grade['class_names'].add(student['class_name'])
+        grade['num_students'] += 1
+        if len(team_names) > 0 and student['team_name'] == team_names[0]:
+            grade['team1_students'] += 1
+        if len(team_names) > 1 and student['team_name'] == team_names[1]:
+            grade['team2_students'] += 1
+
+    summaries = []
+    for grade_level in sorted(stats, key=lambda g: (GRADE_CARD_ORDER.get(g, 99), g)):
+        grade = stats[grade_level]
+        summary = {
+            'grade_level': grade_level,
+            'num_classes': len(grade['class_names']),
+            'num_students': grade['num_students'],
+            'team1_students': grade['team1_students'],
+            'team2_students': grade['team2_students'],
         }
+        for field in ('top_fundraising_teacher', 'top_fundraising_team', 'top_fundraising_amount',
+                      'top_reading_teacher', 'top_reading_team', 'top_reading_minutes',
+                      'top_participation_teacher', 'top_participation_team', 'top_participation_pct',
+                      'top_student_fundraiser', 'top_student_fundraiser_team', 'top_student_fundraising_amount',
+                      'top_student_reader', 'top_student_reader_team', 'top_student_reading_minutes'):
+            summary[field] = None
+        summaries.append(summary)
+    return summaries
 
-    # === GET FILTERED CLASSES FOR DISPLAY ===
-    classes_query = get_grade_level_classes_query(date_where, grade_where, team_where)
-    classes_result = db.execute_query(classes_query)
-
-    # DEBUG: Log result count
-    row_count = len(classes_result) if classes_result else 0
-    print(f"  Query returned {row_count} classes")
-    if row_count > 0 and classes_result:
-        grades_in_results = set(row['grade_level'] for row in classes_result)
-        print(f"  Grades in results: {grades_in_results}")
-    print(f"=================================\n")
-
-    # Find grade-level winners (silver highlights) for each metric - use ALL classes
-    # Matches metrics from Teams page for consistency
-    grade_winners = {}
-    for grade in ['K', '1', '2', '3', '4', '5']:
-        grade_classes = [c for c in all_classes if c['grade_level'] == grade]
-        if grade_classes:
-            grade_winners[grade] = {
-                'fundraising': max(grade_classes, key=lambda x: x['total_fundraising'])['total_fundraising'],
-                'minutes': max(grade_classes, key=lambda x: x['total_minutes'])['total_minutes'],
-                'participation': max(grade_classes, key=lambda x: x['participation_pct'])['participation_pct'],
-                'avg_participation_with_color': max(grade_classes, key=lambda x: x['avg_participation_with_color_pct'])['avg_participation_with_color_pct'],
-                'all_days_active': max(grade_classes, key=lambda x: x['all_days_active_pct'])['all_days_active_pct'],
-                'goal_met_once': max(grade_classes, key=lambda x: x['goal_met_once_pct'])['goal_met_once_pct'],
-                'goal_met_all_days': max(grade_classes, key=lambda x: x['goal_met_all_days_pct'])['goal_met_all_days_pct'],
-                'color_war_points': max(grade_classes, key=lambda x: x['color_war_points'])['color_war_points'],
-                'sponsors': max(grade_classes, key=lambda x: x['total_sponsors'])['total_sponsors']
-            }
 
-    # Convert filtered results to list of dicts
-    classes = []
-    if classes_result:
-        classes = [dict(row) for row in classes_result]
-
-        # Add winner flags to each class
-        for cls in classes:
-            cls['is_school_winner'] = {}
-            cls['is_grade_winner'] = {}
-
-            # Check if this class is a school-wide winner (matches Teams metrics)
-            cls['is_school_winner']['fundraising'] = (cls['total_fundraising'] == school_winners['fundraising'] and cls['total_fundraising'] > 0)
-            cls['is_school_winner']['minutes'] = (cls['total_minutes'] == school_winners['minutes'] and cls['total_minutes'] > 0)
-            cls['is_school_winner']['participation'] = (cls['participation_pct'] == school_winners['participation'] and cls['participation_pct'] > 0)
-            cls['is_school_winner']['avg_participation_with_color'] = (cls['avg_participation_with_color_pct'] == school_winners['avg_participation_with_color'] and cls['avg_participation_with_color_pct'] > 0)
-            cls['is_school_winner']['all_days_active'] = (cls['all_days_active_pct'] == school_winners['all_days_active'] and cls['all_days_active_pct'] > 0)
-            cls['is_school_winner']['goal_met_once'] = (cls['goal_met_once_pct'] == school_winners['goal_met_once'] and cls['goal_met_once_pct'] > 0)
-            cls['is_school_winner']['goal_met_all_days'] = (cls['goal_met_all_days_pct'] == school_winners['goal_met_all_days'] and cls['goal_met_all_days_pct'] > 0)
-            cls['is_school_winner']['color_war_points'] = (cls['color_war_points'] == school_winners['color_war_points'] and cls['color_war_points'] > 0)
-            cls['is_school_winner']['sponsors'] = (cls['total_sponsors'] == school_winners['sponsors'] and cls['total_sponsors'] > 0)
-
-            # Check if this class is a grade-level winner (matches Teams metrics)
-            if cls['grade_level'] in grade_winners:
-                gw = grade_winners[cls['grade_level']]
-                cls['is_grade_winner']['fundraising'] = (cls['total_fundraising'] == gw['fundraising'] and cls['total_fundraising'] > 0)
-                cls['is_grade_winner']['minutes'] = (cls['total_minutes'] == gw['minutes'] and cls['total_minutes'] > 0)
-                cls['is_grade_winner']['participation'] = (cls['participation_pct'] == gw['participation'] and cls['participation_pct'] > 0)
-                cls['is_grade_winner']['avg_participation_with_color'] = (cls['avg_participation_with_color_pct'] == gw['avg_participation_with_color'] and cls['avg_participation_with_color_pct'] > 0)
-                cls['is_grade_winner']['all_days_active'] = (cls['all_days_active_pct'] == gw['all_days_active'] and cls['all_days_active_pct'] > 0)
-                cls['is_grade_winner']['goal_met_once'] = (cls['goal_met_once_pct'] == gw['goal_met_once'] and cls['goal_met_once_pct'] > 0)
-                cls['is_grade_winner']['goal_met_all_days'] = (cls['goal_met_all_days_pct'] == gw['goal_met_all_days'] and cls['goal_met_all_days_pct'] > 0)
-                cls['is_grade_winner']['color_war_points'] = (cls['color_war_points'] == gw['color_war_points'] and cls['color_war_points'] > 0)
-                cls['is_grade_winner']['sponsors'] = (cls['total_sponsors'] == gw['sponsors'] and cls['total_sponsors'] > 0)
-
-    # === GET GRADE AGGREGATIONS FOR CARDS ===
-    grade_agg_query = get_grade_aggregations_query(date_where, grade_where, team_where)
-    grade_summaries_result = db.execute_query(grade_agg_query)
-    grade_summaries = [dict(row) for row in grade_summaries_result] if grade_summaries_result else []
+def build_grade_level_context(db, date_filter, grade_filter, team_filter):
+    """Build the Grade Level tab template context for one filter combination (cached by get_tab_context)"""
+    from queries import get_school_wide_leaders_query
+    contest = get_contest(db)
+
+    # Get all available dates
+    dates = contest.dates
+
+    # Build WHERE clause based on filter (cumulative through selected date)
+    date_where = ""
+    if contest.is_log_date(date_filter):
+        date_where = f" AND dl.log_date <= '{date_filter}'"
+
+    # Full contest date range
+    total_days = contest.total_days
+    full_contest_range = contest.full_contest_range
+
+    # Campaign Day calculation - date-aware (selected date, or total days for the full contest)
+    current_day = contest.current_day(date_filter)
+    campaign_date = contest.campaign_date(date_filter)  # Subtitle display
+
+    # === GET ALL CLASSES (unfiltered, cached per date) ===
+    # IMPORTANT: School-wide winners must be calculated across ALL grades/teams, not just filtered.
+    # Each class row only depends on its own students, so filtered views are subsets of these rows
+    all_classes = db.get_grade_level_classes(date_filter)
+
+    # Find TRUE school-wide winners (gold) and grade-level winners (silver) in one pass
+    school_winners, grade_winners = find_grade_level_winners(all_classes)
+
+    # === FILTER CLASSES FOR DISPLAY (in memory; rows are copied so the cache stays clean) ===
+    classes = [dict(cls) for cls in all_classes
+               if (grade_filter == 'all' or cls['grade_level'] == grade_filter)
+               and (team_filter == 'all' or cls['team_name'] == team_filter)]
+
+    # Add winner flags to each class (matches Teams metrics)
+    for cls in classes:
+        cls['is_school_winner'] = {}
+        cls['is_grade_winner'] = {}
+        gw = grade_winners.get(cls['grade_level'])
+        for metric, column in GRADE_LEVEL_WINNER_METRICS:
+            value = cls[column]
+            cls['is_school_winner'][metric] = (value == school_winners[metric] and value > 0)
+            if gw:
+                cls['is_grade_winner'][metric] = (value == gw[metric] and value > 0)
+
+    # === GRADE AGGREGATIONS FOR CARDS (rolled up from the filtered classes) ===
+    grade_summaries = summarize_grade_level_classes(contest, classes)
 
     # Enhance grade summaries with tie detection for "TOP CLASS" within each grade
     for grade in grade_summaries:
@@ -1920,6 +2090,7 @@ def grade_level_tab():
             else:
                 grade['top_fundraising_teacher'] = ", ".join([c['class_name'] for c in tied_fundraising[:3]]) + f" and {len(tied_fundraising) - 3} others"
             grade['top_fundraising_amount'] = max_fundraising
+            grade['top_fundraising_team'] = tied_fundraising[0]['team_name']
 
         # Find all classes tied for top reading
         if max_reading > 0:
@@ -1929,6 +2100,7 @@ def grade_level_tab():
             else:
                 grade['top_reading_teacher'] = ", ".join([c['class_name'] for c in tied_reading[:3]]) + f" and {len(tied_reading) - 3} others"
             grade['top_reading_minutes'] = max_reading
+            grade['top_reading_team'] = tied_reading[0]['team_name']
 
         # Find all classes tied for top participation
         if max_participation > 0:
@@ -1938,37 +2110,24 @@ def grade_level_tab():
             else:
                 grade['top_participation_teacher'] = ", ".join([c['class_name'] for c in tied_participation[:3]]) + f" and {len(tied_participation) - 3} others"
             grade['top_participation_pct'] = max_participation
+            grade['top_participation_team'] = tied_participation[0]['team_name']
 
     # Enhance grade summaries with tie detection for "TOP STUDENT" within each grade
+    # Students come from the per-date aggregate shared with the Students tab (no per-grade query)
+    students = db.get_students_master(date_filter if contest.is_log_date(date_filter) else 'all')['students']
     for grade in grade_summaries:
         grade_level = grade['grade_level']
 
-        # Get all students in this grade (need to query)
-        student_query = f"""
-            SELECT
-                r.student_name,
-                r.grade_level,
-                r.team_name,
-                r.class_name,
-                COALESCE(rc.donation_amount, 0) as fundraising,
-                SUM(MIN(dl.minutes_read, 120)) as total_minutes
-            FROM Roster r
-            LEFT JOIN Reader_Cumulative rc ON r.student_name = rc.student_name
-            LEFT JOIN Daily_Logs dl ON r.student_name = dl.student_name {date_where}
-            WHERE r.grade_level = '{grade_level}' {team_where}
-            GROUP BY r.student_name, r.grade_level, r.team_name, r.class_name, rc.donation_amount
-        """
-        grade_students = db.execute_query(student_query)
+        # Get all students in this grade (and team, when filtered)
+        grade_students = [s for s in students if s['grade_level'] == grade_level
+                          and (team_filter == 'all' or s['team_name'] == team_filter)]
 
         if not grade_students:
             continue
 
-        # Convert to list of dicts
-        grade_students = [dict(row) for row in grade_students]
-
         # Find max values for fundraising and reading (handle None values)
         max_fundraising = max([s.get('fundraising') or 0 for s in grade_students], default=0)
-        max_reading = max([s.get('total_minutes') or 0 for s in grade_students], default=0)
+        max_reading = max([s.get('minutes_capped') or 0 for s in grade_students], default=0)
 
         # Find all students tied for top fundraising
         if max_fundraising > 0:
@@ -1983,7 +2142,7 @@ def grade_level_tab():
 
         # Find all students tied for top reading
         if max_reading > 0:
-            tied_readers = [s for s in grade_students if (s.get('total_minutes') or 0) == max_reading]
+            tied_readers = [s for s in grade_students if (s.get('minutes_capped') or 0) == max_reading]
             if len(tied_readers) <= 3:
                 grade['top_student_reader'] = ", ".join([s['student_name'] for s in tied_readers])
             else:
@@ -1993,9 +2152,7 @@ def grade_level_tab():
             grade['top_student_reader_team'] = tied_readers[0]['team_name']
 
     # Get team names dynamically from database
-    team_names_query = "SELECT DISTINCT team_name FROM Roster ORDER BY team_name"
-    team_names_result = db.execute_query(team_names_query)
-    team_names = [row['team_name'] for row in team_names_result] if team_names_result else []
+    team_names = contest.team_names
 
     # Enrich grade_summaries with properly named team attributes
     for grade in grade_summaries:
@@ -2087,9 +2244,8 @@ def grade_level_tab():
 
     # Get grade-specific leaders (now using consistent format) with tie detection
     banner_leaders_by_grade = {}
-    grades = ['K', '1', '2', '3', '4', '5']
 
-    for grade in grades:
+    for grade in GRADE_LEVEL_GRADES:
         leaders_query_grade = get_school_wide_leaders_query(date_where, grade=grade, team=team_for_banner)
         leaders_result_grade = db.execute_query(leaders_query_grade)
         banner_leaders_by_grade[grade] = parse_banner_leaders(leaders_result_grade, classes, filter_grade=grade, filter_team=team_for_banner)
@@ -2105,23 +2261,9 @@ def grade_level_tab():
     # === METADATA (Last Updated) ===
     metadata = {}
 
-    # Daily_Logs timestamp
-    daily_logs_ts_query = """
-        SELECT MAX(upload_timestamp) as last_updated
-        FROM Upload_History
-        WHERE file_type = 'daily'
-    """
-    daily_logs_ts = db.execute_query(daily_logs_ts_query)
-    metadata['daily_logs_updated'] = daily_logs_ts[0]['last_updated'] if daily_logs_ts and daily_logs_ts[0] and daily_logs_ts[0]['last_updated'] else 'Never'
-
-    # Reader_Cumulative timestamp
-    reader_cumulative_ts_query = """
-        SELECT MAX(upload_timestamp) as last_updated
-        FROM Upload_History
-        WHERE file_type = 'cumulative'
-    """
-    reader_cumulative_ts = db.execute_query(reader_cumulative_ts_query)
-    metadata['reader_cumulative_updated'] = reader_cumulative_ts[0]['last_updated'] if reader_cumulative_ts and reader_cumulative_ts[0] and reader_cumulative_ts[0]['last_updated'] else 'Never'
+    # Daily_Logs and Reader_Cumulative timestamps
+    metadata['daily_logs_updated'] = contest.last_uploads['daily'] or 'Never'
+    metadata['reader_cumulative_updated'] = contest.last_uploads['cumulative'] or 'Never'
 
     # Roster timestamp
     roster_ts_query = "SELECT datetime('now', 'localtime') as last_updated"
@@ -2131,87 +2273,70 @@ def grade_level_tab():
     # Team Color Bonus
     metadata['team_color_bonus_updated'] = '2025-10-13 (Spirit Day)'
 
-    return render_template('grade_level.html',
-                         environment=env,
-                         date_filter=date_filter,
-                         grade_filter=grade_filter,
-                         team_filter=team_filter,
-                         dates=dates,
-                         current_day=current_day,
-                         campaign_date=campaign_date,
-                         total_days=total_days,
-                         full_contest_range=full_contest_range,
-                         classes=classes,
-                         grade_summaries=grade_summaries,
-                         banner_leaders=banner_leaders,
-                         banner_leaders_by_grade=banner_leaders_by_grade,
-                         school_winners=school_winners if classes else {},
-                         grade_winners=grade_winners if classes else {},
-                         metadata=metadata,
-                         team_names=team_names)
+    return dict(
+        date_filter=date_filter,
+        grade_filter=grade_filter,
+        team_filter=team_filter,
+        dates=dates,
+        current_day=current_day,
+        campaign_date=campaign_date,
+        total_days=total_days,
+        full_contest_range=full_contest_range,
+        classes=classes,
+        grade_summaries=grade_summaries,
+        banner_leaders=banner_leaders,
+        banner_leaders_by_grade=banner_leaders_by_grade,
+        school_winners=school_winners if classes else {},
+        grade_winners=grade_winners if classes else {},
+        metadata=metadata,
+        team_names=team_names)
 
 
-@app.route('/students')
-def students_tab():
-    """Students master-detail dashboard"""
+@app.route('/classes')
+@conditional_get()
+def grade_level_tab():
+    """Grade Level dashboard - class and grade-level competition view"""
     env = session.get('environment', DEFAULT_DATABASE)
     db = get_current_db()
 
-    # Get filter parameters
+    # Get filter parameters (optional)
     date_filter = request.args.get('date', 'all')
     grade_filter = request.args.get('grade', 'all')
     team_filter = request.args.get('team', 'all')
 
+    return render_template('grade_level.html', environment=env,
+                           **get_tab_context(db, 'classes', date_filter, grade_filter, team_filter))
+
+
+def build_students_context(db, date_filter, grade_filter, team_filter):
+    """Build the Students tab template context for one filter combination (cached by get_tab_context)"""
+    contest = get_contest(db)
+
     # Get all available dates for filter dropdown
-    dates = db.get_all_dates()
+    dates = contest.dates
 
     # Get team names (sorted alphabetically for consistency)
-    team_names_query = "SELECT DISTINCT team_name FROM Roster ORDER BY team_name"
-    team_names_result = db.execute_query(team_names_query)
-    team_names = [row['team_name'] for row in team_names_result] if team_names_result else []
-
-    # Calculate full contest date range
-    sorted_dates = sorted(dates)
-    total_days = len(sorted_dates)
-    if sorted_dates:
-        start_date = datetime.strptime(sorted_dates[0], '%Y-%m-%d').strftime('%b %d')
-        end_date = datetime.strptime(sorted_dates[-1], '%Y-%m-%d').strftime('%b %d, %Y')
-        full_contest_range = f"{start_date}-{end_date}"
-    else:
-        full_contest_range = "Oct 10-15, 2025"  # Fallback if no dates
+    team_names = contest.team_names
+
+    # Full contest date range
+    total_days = contest.total_days
+    full_contest_range = contest.full_contest_range
 
     # === GET DATA FROM DATABASE ===
+    # Rows, banner and winners below are all derived from one cached per-date
+    # aggregate (db.get_students_master), so grade/team changes re-run no SQL
 
-    # Get all students data with filters
-    students = db.get_students_data(date_filter, grade_filter, team_filter)
+    # First window of the table (with highlight flags); later windows come from /api/students
+    students_page = db.get_students_page(date_filter, grade_filter, team_filter, limit=STUDENTS_PAGE_SIZE)
 
     # Get banner metrics (6 metrics)
     banner_metrics = db.get_students_banner(date_filter, grade_filter, team_filter)
 
-    # Get school-wide winners (gold highlights)
-    school_winners = db.get_students_school_winners(date_filter)
-
-    # Get filtered winners (silver highlights)
-    filtered_winners = {}
-    grade_winners = {}
-    if grade_filter != 'all' or team_filter != 'all':
-        # Specific filter applied - use filtered winners
-        filtered_winners = db.get_students_filtered_winners(date_filter, grade_filter, team_filter)
-    else:
-        # All grades shown - get grade-level winners for silver highlighting
-        grade_winners = db.get_students_grade_winners(date_filter)
-
     # === BANNER SETUP ===
 
-    # Campaign Day calculation - date-aware
-    if date_filter != 'all' and date_filter in dates:
-        # Find position of selected date (1-based)
-        current_day = sorted_dates.index(date_filter) + 1
-        campaign_date = date_filter  # Store for subtitle display
-    else:
-        # Full contest - show total days
-        current_day = total_days
-        campaign_date = full_contest_range
+    # Campaign Day calculation - date-aware (selected date, or total days for the full contest)
+    current_day = contest.current_day(date_filter)
+    campaign_date = contest.campaign_date(date_filter)  # Subtitle display
 
     # Build banner dictionary with all 6 metrics
     banner = {
@@ -2228,16 +2353,6 @@ def students_tab():
         'total_students': banner_metrics.get('total_students', 0)
     }
 
-    # === HIGHLIGHTING SETUP ===
-
-    # Determine which highlighting mode to use
-    # - Gold: School-wide winners (all students)
-    # - Silver: Filtered winners (grade/team subset)
-    highlight_mode = 'gold' if (grade_filter == 'all' and team_filter == 'all') else 'silver'
-
-    # Choose appropriate winners dict
-    winners = school_winners if highlight_mode == 'gold' else filtered_winners
-
     # === BUILD TEAM INDEX MAPPING (alphabetical order determines color) ===
     # Team 1 (alphabetically first) = index 0 (blue)
     # Team 2 (alphabetically second) = index 1 (yellow)
@@ -2248,29 +2363,9 @@ def students_tab():
     # === METADATA (Last Updated) ===
     metadata = {}
 
-    # Daily_Logs timestamp
-    daily_logs_ts_query = """
-        SELECT MAX(upload_timestamp) as last_updated
-        FROM Upload_History
-        WHERE file_type = 'daily'
-    """
-    daily_logs_ts = db.execute_query(daily_logs_ts_query)
-    if daily_logs_ts and daily_logs_ts[0] and daily_logs_ts[0]['last_updated']:
-        metadata['daily_logs_updated'] = daily_logs_ts[0]['last_updated']
-    else:
-        metadata['daily_logs_updated'] = 'Never'
-
-    # Reader_Cumulative timestamp
-    reader_cumulative_ts_query = """
-        SELECT MAX(upload_timestamp) as last_updated
-        FROM Upload_History
-        WHERE file_type = 'cumulative'
-    """
-    reader_cumulative_ts = db.execute_query(reader_cumulative_ts_query)
-    if reader_cumulative_ts and reader_cumulative_ts[0] and reader_cumulative_ts[0]['last_updated']:
-        metadata['reader_cumulative_updated'] = reader_cumulative_ts[0]['last_updated']
-    else:
-        metadata['reader_cumulative_updated'] = 'Never'
+    # Daily_Logs and Reader_Cumulative timestamps
+    metadata['daily_logs_updated'] = contest.last_uploads['daily'] or 'Never'
+    metadata['reader_cumulative_updated'] = contest.last_uploads['cumulative'] or 'Never'
 
     # Roster timestamp (static - set during init)
     metadata['roster_updated'] = '09/15/2025 8:00 AM'
@@ -2278,27 +2373,67 @@ def students_tab():
     # Grade_Rules timestamp (static)
     metadata['grade_rules_updated'] = '09/15/2025 8:00 AM'
 
-    # === RENDER TEMPLATE ===
+    return dict(
+        students_page=students_page,
+        banner=banner,
+        highlight_mode=students_page['highlight_mode'],
+        date_filter=date_filter,
+        grade_filter=grade_filter,
+        team_filter=team_filter,
+        dates=dates,
+        team_names=team_names,
+        team_index_map=team_index_map,
+        student_columns=list(db.STUDENT_TABLE_COLUMNS),
+        full_contest_range=full_contest_range,
+        metadata=metadata)
 
-    return render_template('students.html',
-                         environment=env,
-                         students=students,
-                         banner=banner,
-                         school_winners=school_winners,
-                         filtered_winners=filtered_winners,
-                         grade_winners=grade_winners,
-                         highlight_mode=highlight_mode,
-                         date_filter=date_filter,
-                         grade_filter=grade_filter,
-                         team_filter=team_filter,
-                         dates=dates,
-                         team_names=team_names,
-                         team_index_map=team_index_map,
-                         full_contest_range=full_contest_range,
-                         metadata=metadata)
+
+@app.route('/students')
+@conditional_get()
+def students_tab():
+    """Students master-detail dashboard"""
+    env = session.get('environment', DEFAULT_DATABASE)
+    db = get_current_db()
+
+    # Get filter parameters
+    date_filter = request.args.get('date', 'all')
+    grade_filter = request.args.get('grade', 'all')
+    team_filter = request.args.get('team', 'all')
+
+    return render_template('students.html', environment=env,
+                           **get_tab_context(db, 'students', date_filter, grade_filter, team_filter))
+
+
+@app.route('/api/students')
+@conditional_get()
+def students_api():
+    """
+    One sorted, filtered, searched window of the Students table as JSON.
+
+    Query params: date, grade, team (as on /students), search, sort (column name),
+    dir (asc/desc), offset, limit (default STUDENTS_PAGE_SIZE, max TABLE_PAGE_MAX_ROWS)
+    """
+    try:
+        offset = int(request.args.get('offset', 0))
+        limit = min(int(request.args.get('limit', STUDENTS_PAGE_SIZE)), TABLE_PAGE_MAX_ROWS)
+    except ValueError:
+        return jsonify({'error': 'offset and limit must be integers'}), 400
+
+    db = get_current_db()
+    return jsonify(db.get_students_page(
+        request.args.get('date', 'all'),
+        request.args.get('grade', 'all'),
+        request.args.get('team', 'all'),
+        search=request.args.get('search', ''),
+        sort_by=request.args.get('sort', 'student_name'),
+        descending=request.args.get('dir') == 'desc',
+        offset=offset,
+        limit=limit
+    ))
 
 
 @app.route('/student/<student_name>')
+@conditional_get()
 def student_detail(student_name):
     """Student detail API endpoint (returns JSON for modal)"""
     env = session.get('environment', DEFAULT_DATABASE)
@@ -2307,26 +2442,175 @@ def student_detail(student_name):
     # Get filter parameter (should match main page filter)
     date_filter = request.args.get('date', 'all')
 
-    # Get all dates for calculating days_in_filter
-    dates = db.get_all_dates()
-    sorted_dates = sorted(dates)
-
-    # Calculate days in filter (for "X/Y" display)
-    if date_filter != 'all' and date_filter in dates:
-        days_in_filter = sorted_dates.index(date_filter) + 1
-    else:
-        days_in_filter = len(sorted_dates)
-
     # Get student detail from database
     detail = db.get_student_detail(student_name, date_filter)
 
     # Add days_in_filter to response
-    detail['days_in_filter'] = days_in_filter
+    detail['days_in_filter'] = get_days_in_filter(db, date_filter)
 
     # Return JSON
     return jsonify(detail)
 
 
+@app.route('/api/students/detail')
+@conditional_get()
+def student_detail_batch():
+    """
+    Student detail for a whole class or a list of names in one request (columnar JSON).
+
+    Query params: class (class name) or name (repeat for each student), date.
+    Used by the Students tab to prefetch the modal data for the rows on screen.
+    """
+    class_name = request.args.get('class')
+    student_names = request.args.getlist('name')
+    if not class_name and not student_names:
+        return jsonify({'error': 'class or name is required'}), 400
+
+    db = get_current_db()
+    date_filter = request.args.get('date', 'all')
+    detail = db.get_student_details_batch(student_names, class_name=class_name, date_filter=date_filter)
+    detail['days_in_filter'] = get_days_in_filter(db, date_filter)
+    return jsonify(detail)
+
+
+def get_days_in_filter(db, date_filter):
+    """Days with logs up to and including date_filter (all days for 'all'), for "X/Y" displays."""
+    return get_contest(db).current_day(date_filter)
+
+
+# ========== Dashboard Context Cache & Warmup ==========
+
+TAB_CONTEXT_BUILDERS = {
+    'school': build_school_context,
+    'teams': build_teams_context,
+    'classes': build_grade_level_context,
+    'students': build_students_context,
+}
+
+_tab_context_cache = OrderedDict()  # (db_path, tab, filters) -> (data stamp, context), least recently used first
+_tab_context_lock = threading.Lock()
+_tab_warmup_status = {}  # db_path -> status of the latest warmup (shown on the Admin page)
+
+
+def get_tab_context(db, tab, *filters):
+    """
+    Template context for a dashboard tab, built once per filter combination and data stamp.
+
+    Contexts are shared between requests, so templates must treat them as read-only.
+
+    Args:
+        db: ReadathonDB instance
+        tab: Key of TAB_CONTEXT_BUILDERS
+        *filters: The builder's filter arguments (date, and grade/team where used)
+    """
+    key = (db.db_path, tab, filters)
+    stamp = get_data_stamp(db)
+    with _tab_context_lock:
+        cached = _tab_context_cache.get(key)
+        if cached and cached[0] == stamp:
+            _tab_context_cache.move_to_end(key)
+            return cached[1]
+
+    context = TAB_CONTEXT_BUILDERS[tab](db, *filters)
+
+    with _tab_context_lock:
+        _tab_context_cache[key] = (stamp, context)
+        _tab_context_cache.move_to_end(key)
+        while len(_tab_context_cache) > TAB_CONTEXT_CACHE_MAX_ENTRIES:
+            _tab_context_cache.popitem(last=False)
+    return context
+
+
+def get_tab_filter_combinations(db):
+    """
+    Every (tab, filters) the dashboard dropdowns can request, most used first.
+
+    Unfiltered views come first, then each single filter, then grade+team pairs,
+    newest dates before older ones.
+    """
+    contest = get_contest(db)
+    dates = ['all'] + contest.dates
+    grades = ['all'] + contest.grade_levels
+    teams = ['all'] + contest.team_names
+
+    combinations = [(tab, (date,)) for date in dates for tab in ('school', 'teams')]
+    combinations += [(tab, (date, grade, team)) for date, grade, team in product(dates, grades, teams)
+                     for tab in ('classes', 'students')]
+    combinations.sort(key=lambda c: sum(1 for value in c[1][1:] if value != 'all'))  # stable: keeps date order
+    return combinations
+
+
+def warm_tab_contexts(db):
+    """
+    Build every dashboard context for the current data into the cache.
+
+    Runs on its own read connection. Entries from older data stamps are dropped
+    first; a failing combination is recorded and the warmup continues.
+    """
+    status = {
+        'state': 'running',
+        'started_at': datetime.now().isoformat(timespec='seconds'),
+        'finished_at': None,
+        'total': 0,
+        'built': 0,
+        'failed': 0,
+        'errors': [],
+        'elapsed_ms': None
+    }
+    _tab_warmup_status[db.db_path] = status
+    start = time.perf_counter()
+
+    stamp = get_data_stamp(db)
+    with _tab_context_lock:
+        for key in [k for k, (entry_stamp, _) in _tab_context_cache.items()
+                    if k[0] == db.db_path and entry_stamp != stamp]:
+            del _tab_context_cache[key]
+
+    with db.thread_read_connection():
+        combinations = get_tab_filter_combinations(db)[:TAB_CONTEXT_CACHE_MAX_ENTRIES]
+        status['total'] = len(combinations)
+        for tab, filters in combinations:
+            try:
+                get_tab_context(db, tab, *filters)
+                status['built'] += 1
+            except Exception as e:
+                status['failed'] += 1
+                if len(status['errors']) < 10:
+                    status['errors'].append(f"{tab} {'/'.join(filters)}: {e}")
+
+    status['state'] = 'done' if not status['failed'] else 'done_with_errors'
+    status['finished_at'] = datetime.now().isoformat(timespec='seconds')
+    status['elapsed_ms'] = round((time.perf_counter() - start) * 1000, 1)
+
+
+def schedule_tab_warmup(db):
+    """
+    Warm every dashboard filter combination in a background thread after an upload.
+
+    Returns:
+        The started thread, or None when an in-flight warmup will pick up the change
+    """
+    return schedule_background_job('dashboard warmup', db, warm_tab_contexts)
+
+
+def get_tab_warmup_status(db):
+    """Latest warmup status for a database plus the number of its cached contexts"""
+    with _tab_context_lock:
+        cached = sum(1 for key in _tab_context_cache if key[0] == db.db_path)
+    status = dict(_tab_warmup_status.get(db.db_path) or {'state': 'never'})
+    status['cached_contexts'] = cached
+    return status
+
+
+@app.route('/api/warmup', methods=['GET', 'POST'])
+def tab_warmup():
+    """Dashboard warmup status for the current database; POST starts a warmup"""
+    db = get_current_db()
+    if request.method == 'POST':
+        schedule_tab_warmup(db)
+    return jsonify(get_tab_warmup_status(db))
+
+
 # Keep old index route for backward compatibility during transition
 @app.route('/index_old')
 def index():
@@ -2336,7 +2620,7 @@ def index():
     reports = get_current_reports()
 
     counts = db.get_table_counts()
-    dates = db.get_all_dates()
+    dates = get_contest(db).dates
 
     # Get overall totals
     totals_query = """
@@ -2518,29 +2802,11 @@ def index():
 
     # 5. Integrity Checks - Run all integrity reports
     # 5a. Minutes Integrity Check - Compare Daily_Logs total vs Reader_Cumulative total
-    integrity_check_query = """
-        SELECT
-            COALESCE(SUM(dl.minutes_read), 0) as daily_total,
-            COALESCE(SUM(rc.cumulative_minutes), 0) as cumulative_total,
-            COALESCE(SUM(rc.cumulative_minutes), 0) - COALESCE(SUM(dl.minutes_read), 0) as difference
-        FROM (SELECT SUM(minutes_read) as minutes_read FROM Daily_Logs) dl,
-             (SELECT SUM(cumulative_minutes) as cumulative_minutes FROM Reader_Cumulative) rc
-    """
-    integrity_result = db.execute_query(integrity_check_query)
-    if integrity_result and integrity_result[0]:
-        daily_total = int(integrity_result[0]['daily_total'] or 0)
-        cumulative_total = int(integrity_result[0]['cumulative_total'] or 0)
-        difference = int(integrity_result[0]['difference'] or 0)
-
-        verification_stats['integrity_daily_total'] = daily_total
-        verification_stats['integrity_cumulative_total'] = cumulative_total
-        verification_stats['integrity_difference'] = difference
-        verification_stats['integrity_match'] = (difference == 0)
-    else:
-        verification_stats['integrity_daily_total'] = 0
-        verification_stats['integrity_cumulative_total'] = 0
-        verification_stats['integrity_difference'] = 0
-        verification_stats['integrity_match'] = True
+    integrity_totals = db.get_integrity_totals()
+    verification_stats['integrity_daily_total'] = integrity_totals['daily_total']
+    verification_stats['integrity_cumulative_total'] = integrity_totals['cumulative_total']
+    verification_stats['integrity_difference'] = integrity_totals['difference']
+    verification_stats['integrity_match'] = (integrity_totals['difference'] == 0)
 
     # 5b. Student Name Sync Check (Q22)
     q22_result = reports.q22_student_name_sync_check()
@@ -2619,7 +2885,7 @@ def set_active_database():
         return jsonify({'success': False, 'error': 'database_id required'}), 400
 
     # Update registry (sets is_active flag)
-    result = registry.set_active_database(db_id)
+    result = get_registry().set_active_database(db_id)
 
     if not result['success']:
         return jsonify(result), 400
@@ -2628,7 +2894,7 @@ def set_active_database():
     session['active_database_id'] = db_id
 
     # Save to config file for next startup
-    db_info = registry.get_database(db_id)
+    db_info = get_registry().get_database(db_id)
     write_config(db_id, db_info['db_filename'])
 
     return jsonify({
@@ -2661,6 +2927,7 @@ def delete_day(log_date):
         # Delete from Daily_Logs
         result = db.delete_day_data(log_date)
         result['environment'] = env
+        notify_data_changed(db)
 
         return jsonify(result)
     except Exception as e:
@@ -2677,6 +2944,7 @@ def delete_cumulative():
         # Delete from Reader_Cumulative
         result = db.delete_cumulative_data()
         result['environment'] = env
+        notify_data_changed(db)
 
         return jsonify(result)
     except Exception as e:
@@ -2726,6 +2994,9 @@ def upload_daily():
             error_msg = result.get('error') or (result['errors'][0] if result.get('errors') else 'Unknown error occurred')
             return jsonify({'success': False, 'error': error_msg, 'errors': result.get('errors', [])}), 400
 
+        # Invalidate dashboard ETags and re-render the daily slide deck
+        notify_data_changed(db)
+
         return jsonify(result)
 
     except Exception as e:
@@ -2771,6 +3042,9 @@ def upload_cumulative():
             error_msg = result.get('error') or (result['errors'][0] if result.get('errors') else 'Unknown error occurred')
             return jsonify({'success': False, 'error': error_msg, 'errors': result.get('errors', [])}), 400
 
+        # Invalidate dashboard ETags and re-render the daily slide deck
+        notify_data_changed(db)
+
         return jsonify(result)
 
     except Exception as e:
@@ -2823,6 +3097,9 @@ def upload_team_color_bonus():
             error_msg = result.get('error') or (result['errors'][0] if result.get('errors') else 'Unknown error occurred')
             return jsonify({'success': False, 'error': error_msg, 'errors': result.get('errors', [])}), 400
 
+        # Invalidate dashboard ETags and re-render the daily slide deck
+        notify_data_changed(db)
+
         return jsonify(result)
 
     except Exception as e:
@@ -2847,6 +3124,7 @@ def delete_upload_history_batch():
 
         db = get_current_db()
         result = db.delete_upload_history_batch(upload_ids)
+        notify_data_changed(db)
 
         # Add environment info to result
         result['environment'] = env
@@ -2903,7 +3181,7 @@ def reports_page():
     ]
 
     db = get_current_db()
-    dates = db.get_all_dates()
+    dates = get_contest(db).dates
 
     return render_template('reports.html',
                          items=filtered_items,
@@ -2918,12 +3196,13 @@ def reports_page():
 @app.route('/admin')
 def admin_page():
     """Administration page - administrative operations only (no reports tab)"""
+    from database import database_handles
     env = session.get('environment', DEFAULT_DATABASE)
 
     # Get database registry for database comparison tab
-    registry = DatabaseRegistry()
-    databases = registry.list_databases()
-    active_db = registry.get_active_database()
+    with database_handles.registry() as registry:
+        databases = registry.list_databases()
+        active_db = registry.get_active_database()
 
     # Check if database comparison parameters are present
     db1_filename = request.args.get('db1')
@@ -2950,18 +3229,20 @@ def admin_page():
                          comparison_data=comparison_data,
                          db1_filename=db1_filename,
                          db2_filename=db2_filename,
-                         filter_period=filter_period)
+                         filter_period=filter_period,
+                         warmup_status=get_tab_warmup_status(get_current_db()))
 
 
 @app.route('/database-comparison')
 def database_comparison():
     """Database comparison page - year-over-year analysis"""
+    from database import database_handles
     env = session.get('environment', DEFAULT_DATABASE)
 
     # Get database registry to populate dropdowns
-    registry = DatabaseRegistry()
-    databases = registry.list_databases()
-    active_db = registry.get_active_database()
+    with database_handles.registry() as registry:
+        databases = registry.list_databases()
+        active_db = registry.get_active_database()
 
     # Get comparison parameters from request
     db1_filename = request.args.get('db1')
@@ -2993,74 +3274,39 @@ def database_comparison():
                            filter_period=filter_period)
 
 
+@app.route('/api/database_trend')
+def database_trend():
+    """Multi-year trend - comparison metrics per database, e.g. ?db=readathon_2024.db&db=readathon_2025.db"""
+    db_filenames = request.args.getlist('db')
+    filter_period = request.args.get('filter', 'all')
+
+    try:
+        trend = get_current_reports().get_database_trend(db_filenames, filter_period)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+    return jsonify({'success': True, **trend})
+
+
 @app.route('/api/report/<report_id>')
+@conditional_get(when=is_cacheable_report)
 def run_report(report_id):
     """Run a specific report"""
+    from database import REPORT_REGISTRY
     try:
-        # Get optional parameters
-        log_date = request.args.get('date')
-        group_by = request.args.get('group_by', 'class')
-        sort_by = request.args.get('sort_by', 'minutes')
-        limit = request.args.get('limit', type=int)
+        if report_id not in REPORT_REGISTRY:
+            return jsonify({'error': 'Unknown report'}), 404
 
         # Get current environment's report generator
         reports = get_current_reports()
-        db = get_current_db()
 
-        # Route to appropriate report
-        if report_id == 'q1':
-            result = reports.q1_table_counts()
-        elif report_id == 'q2':
-            result = reports.q2_daily_summary(log_date, group_by)
-        elif report_id == 'q3':
-            result = reports.q3_reader_cumulative_enhanced()
-        elif report_id == 'q4':
-            if not log_date:
-                dates = db.get_all_dates()
-                log_date = dates[0] if dates else None
-            if not log_date:
-                return jsonify({'error': 'No data available'}), 400
-            result = reports.q4_prize_drawing(log_date)
-        elif report_id == 'q5':
-            result = reports.q5_student_cumulative(sort_by, limit)
-        elif report_id == 'q6':
-            result = reports.q6_class_participation()
-        elif report_id == 'q7':
-            result = reports.q7_complete_log(log_date)
-        elif report_id == 'q14':
-            result = reports.q14_team_participation()
-        elif report_id == 'q18':
-            result = reports.q18_lead_class_by_grade()
-        elif report_id == 'q19':
-            result = reports.q19_team_minutes()
-        elif report_id == 'q20':
-            result = reports.q20_team_donations()
-        elif report_id == 'q21':
-            result = reports.q21_minutes_integrity_check()
-        elif report_id == 'q8':
-            result = reports.q8_student_reading_details()
-        elif report_id == 'q22':
-            result = reports.q22_student_name_sync_check()
-        elif report_id == 'q23':
-            result = reports.q23_roster_integrity_check()
-        elif report_id == 'q9':
-            result = reports.q9_most_donations_by_grade()
-        elif report_id == 'q10':
-            result = reports.q10_most_minutes_by_grade()
-        elif report_id == 'q11':
-            result = reports.q11_most_sponsors_by_grade()
-        elif report_id == 'q12':
-            result = reports.q12_best_class_by_grade_simplified()
-        elif report_id == 'q13':
-            result = reports.q13_overall_best_class_simplified()
-        elif report_id == 'q15':
-            result = reports.q15_goal_getters()
-        elif report_id == 'q16':
-            result = reports.q16_top_earner_per_team()
-        elif report_id == 'q24':
-            result = reports.q24_database_metadata()
-        else:
-            return jsonify({'error': 'Unknown report'}), 404
+        # Optional parameters (date, group_by, sort_by, limit) are read per REPORT_REGISTRY
+        try:
+            result = reports.run_report(report_id, request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
 
         return jsonify(result)
 
@@ -3068,71 +3314,66 @@ def run_report(report_id):
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/prize_draws', methods=['POST'])
+def save_prize_draws():
+    """Draw and save seeded batch prize winners (GET /api/report/q4_batch only reads saved draws)"""
+    try:
+        seed = int(request.form['seed'])
+        winners_per_grade = int(request.form.get('k', 1))
+    except (KeyError, ValueError):
+        return jsonify({'error': 'An integer seed (and k) is required to save prize draws'}), 400
+
+    try:
+        db = get_current_db()
+        result = get_current_reports().q4_prize_drawing_batch(seed, winners_per_grade,
+                                                             request.form.get('weighted', False), save=True)
+        if result['draw_stats']['saved']:
+            notify_data_changed(db)
+        return jsonify(result)
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/report_metadata')
+def get_report_metadata_api():
+    """
+    Column descriptions and terms for every report, keyed by metadata key
+
+    Report results carry only metadata['key']; pages load this once. The
+    content is static, so ?v=<REPORT_METADATA_VERSION> responses may be cached
+    for a year (a new version changes the URL); other requests revalidate
+    against the version ETag.
+    """
+    from report_metadata import REPORT_METADATA_VERSION, get_all_report_metadata
+    if request.if_none_match.contains(REPORT_METADATA_VERSION):
+        response = Response(status=304)
+    else:
+        response = jsonify({'version': REPORT_METADATA_VERSION, 'reports': get_all_report_metadata()})
+    response.set_etag(REPORT_METADATA_VERSION)
+    if request.args.get('v') == REPORT_METADATA_VERSION:
+        response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    else:
+        response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
 @app.route('/api/export/<report_id>')
 def export_report(report_id):
     """Export report as CSV"""
+    from database import REPORT_REGISTRY
     try:
-        # Get the report data
-        log_date = request.args.get('date')
-        group_by = request.args.get('group_by', 'class')
-        sort_by = request.args.get('sort_by', 'minutes')
+        if report_id not in REPORT_REGISTRY:
+            return jsonify({'error': 'Unknown report'}), 404
 
         # Get current environment's report generator
         reports = get_current_reports()
-        db = get_current_db()
 
-        # Get report data (same logic as run_report)
-        if report_id == 'q1':
-            result = reports.q1_table_counts()
-        elif report_id == 'q2':
-            result = reports.q2_daily_summary(log_date, group_by)
-        elif report_id == 'q3':
-            result = reports.q3_reader_cumulative_enhanced()
-        elif report_id == 'q4':
-            if not log_date:
-                dates = db.get_all_dates()
-                log_date = dates[0] if dates else None
-            result = reports.q4_prize_drawing(log_date)
-        elif report_id == 'q5':
-            result = reports.q5_student_cumulative(sort_by)
-        elif report_id == 'q6':
-            result = reports.q6_class_participation()
-        elif report_id == 'q7':
-            result = reports.q7_complete_log(log_date)
-        elif report_id == 'q14':
-            result = reports.q14_team_participation()
-        elif report_id == 'q18':
-            result = reports.q18_lead_class_by_grade()
-        elif report_id == 'q19':
-            result = reports.q19_team_minutes()
-        elif report_id == 'q20':
-            result = reports.q20_team_donations()
-        elif report_id == 'q21':
-            result = reports.q21_minutes_integrity_check()
-        elif report_id == 'q8':
-            result = reports.q8_student_reading_details()
-        elif report_id == 'q22':
-            result = reports.q22_student_name_sync_check()
-        elif report_id == 'q23':
-            result = reports.q23_roster_integrity_check()
-        elif report_id == 'q9':
-            result = reports.q9_most_donations_by_grade()
-        elif report_id == 'q10':
-            result = reports.q10_most_minutes_by_grade()
-        elif report_id == 'q11':
-            result = reports.q11_most_sponsors_by_grade()
-        elif report_id == 'q12':
-            result = reports.q12_best_class_by_grade_simplified()
-        elif report_id == 'q13':
-            result = reports.q13_overall_best_class_simplified()
-        elif report_id == 'q15':
-            result = reports.q15_goal_getters()
-        elif report_id == 'q16':
-            result = reports.q16_top_earner_per_team()
-        elif report_id == 'q24':
-            result = reports.q24_database_metadata()
-        else:
-            return jsonify({'error': 'Unknown report'}), 404
+        # Get report data (same dispatch as run_report)
+        try:
+            result = reports.run_report(report_id, request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
 
         # Convert to CSV
         output = io.StringIO()
@@ -3175,8 +3416,8 @@ def export_all():
         metadata['version'] = version
 
         # Get registry info for current database
-        db_id = session.get('active_database_id', DEFAULT_DATABASE_ID)
-        db_info = registry.get_database(db_id)
+        db_id = session.get('active_database_id', get_default_database_id())
+        db_info = get_registry().get_database(db_id)
         if db_info:
             metadata['database_info'] = {
                 'db_id': db_info['db_id'],
@@ -3355,7 +3596,7 @@ Generated by Read-a-Thon System {version}
 def list_databases():
     """List all registered databases from central registry"""
     try:
-        databases = registry.list_databases()
+        databases = get_registry().list_databases()
         return jsonify(databases)
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -3388,6 +3629,7 @@ def register_database():
 @app.route('/api/create_database', methods=['POST'])
 def create_database():
     """Create a new read-a-thon database from CSV files"""
+    from database import database_handles
     try:
         # Get form data
         year = request.form.get('year')
@@ -3472,20 +3714,18 @@ def create_database():
             }), 400
 
         # Create new database
-        new_db = ReadathonDB(db_path)
-
-        # Load data from CSV files
-        class_info_count = new_db.load_class_info_data(class_info_content)
-        grade_rules_count = new_db.load_grade_rules_data(grade_rules_content)
-        roster_count = new_db.load_roster_data(roster_content)
-
-        new_db.close()
+        with database_handles.database(db_path) as new_db:
+            # Load data from CSV files
+            class_info_count = new_db.load_class_info_data(class_info_content)
+            grade_rules_count = new_db.load_grade_rules_data(grade_rules_content)
+            roster_count = new_db.load_roster_data(roster_content)
+            new_db.refresh_comparison_snapshot()
 
         # Register the database in the central registry
         db_filename_only = filename if not filename.startswith('db/') else filename.replace('db/', '')
         display_name = description if description else f"{year} Read-a-Thon"
 
-        db_id = registry.register_database(
+        db_id = get_registry().register_database(
             filename=db_filename_only,
             name=display_name,
             year=int(year),
@@ -3493,7 +3733,7 @@ def create_database():
         )
 
         # Update statistics in registry
-        registry.update_stats(
+        get_registry().update_stats(
             db_id=db_id,
             student_count=roster_count,
             total_days=0,  # No data yet
@@ -3554,7 +3794,7 @@ def get_database_info(year):
 def update_database_stats(db_id):
     """Recalculate statistics for a database by querying its data tables"""
     try:
-        result = registry.recalculate_stats_from_file(db_id)
+        result = get_registry().recalculate_stats_from_file(db_id)
         return jsonify(result)
 
     except Exception as e:
@@ -3566,7 +3806,7 @@ def activate_database(db_id):
     """Set a database as active"""
     try:
         # Update registry
-        result = registry.set_active_database(db_id)
+        result = get_registry().set_active_database(db_id)
 
         if not result['success']:
             return jsonify(result), 400
@@ -3575,7 +3815,7 @@ def activate_database(db_id):
         session['active_database_id'] = db_id
 
         # Save to config
-        db_info = registry.get_database(db_id)
+        db_info = get_registry().get_database(db_id)
         write_config(db_id, db_info['db_filename'])
 
         return jsonify(result)
@@ -3610,7 +3850,7 @@ def get_active_database():
 def delete_database_registration(db_id):
     """Delete a database registration (does not delete the actual .db file)"""
     try:
-        result = registry.delete_database(db_id)
+        result = get_registry().delete_database(db_id)
         return jsonify(result)
 
     except Exception as e:
@@ -3692,6 +3932,7 @@ def clear_tables():
 
             # Commit transaction
             conn.commit()
+            notify_data_changed(db)
 
             # Log the operation
             print(f"[{datetime.now()}] Cleared {len(tables)} tables in {env} environment:")
@@ -3721,7 +3962,7 @@ def workflows_page():
     """Workflow execution page with dynamic workflow data"""
     env = session.get('environment', DEFAULT_DATABASE)
     db = get_current_db()
-    dates = db.get_all_dates()
+    dates = get_contest(db).dates
 
     # Get report counts and lists for each workflow
     qa_reports = get_workflow_reports('qa')
@@ -3777,68 +4018,74 @@ def get_table_metadata_api(table_id):
         return jsonify({'error': str(e)}), 500
 
 
+def get_table_filters():
+    """Column filters for the table API: filter_<column>=<substring> query args"""
+    return {key[len('filter_'):]: value for key, value in request.args.items()
+            if key.startswith('filter_') and value}
+
+
 @app.route('/api/table/<table_id>')
 def view_table(table_id):
-    """View contents of a database table"""
+    """
+    View contents of a database table (or the Q7 complete log)
+
+    Without ?limit the whole (filtered) table is returned. With ?limit=N rows come
+    back one keyset page at a time: pass the response's next_cursor as ?cursor=
+    to get the following page. filter_<column>=text keeps rows whose column
+    contains text (case-insensitive).
+    """
+    from queries import TABLE_BROWSER_SOURCES
     try:
         db = get_current_db()
-        reports = get_current_reports()
 
-        # Handle Q7 Complete Log (query, not a table)
-        if table_id == 'complete_log':
-            report_result = reports.q7_complete_log()
-            return jsonify({
-                'title': 'Q7: Complete Log (Query)',
-                'description': 'Complete denormalized log combining all data from Daily_Logs and Roster',
-                'columns': report_result['columns'],
-                'data': report_result['data'],
-                'row_count': len(report_result['data'])
-            })
-
-        # Map table IDs to actual table names
-        table_map = {
-            'roster': 'Roster',
-            'class_info': 'Class_Info',
-            'grade_rules': 'Grade_Rules',
-            'daily_logs': 'Daily_Logs',
-            'reader_cumulative': 'Reader_Cumulative',
-            'team_color_bonus': 'Team_Color_Bonus',
-            'upload_history': 'Upload_History'
-        }
-
-        if table_id not in table_map:
+        if table_id not in TABLE_BROWSER_SOURCES:
             return jsonify({'error': 'Unknown table'}), 404
 
-        table_name = table_map[table_id]
-
-        # Get table data
-        query = f"SELECT * FROM {table_name}"
-        if table_id == 'daily_logs':
-            query += " ORDER BY log_date DESC, student_name ASC"
-        elif table_id == 'reader_cumulative':
-            query += " ORDER BY team_name ASC, student_name ASC"
-        elif table_id == 'team_color_bonus':
-            query += " ORDER BY event_date DESC, class_name ASC"
-        elif table_id == 'upload_history':
-            query += " ORDER BY upload_timestamp DESC"
-        elif table_id == 'roster':
-            query += " ORDER BY team_name ASC, grade_level ASC, class_name ASC, student_name ASC"
-        elif table_id == 'class_info':
-            query += " ORDER BY team_name ASC, grade_level ASC, class_name ASC"
-
-        data = db.execute_query(query)
+        source = TABLE_BROWSER_SOURCES[table_id]
+        limit = request.args.get('limit', type=int)
+        if limit is not None:
+            limit = max(1, min(limit, TABLE_PAGE_MAX_ROWS))
+
+        try:
+            page = db.get_table_page(table_id, limit=limit, cursor=request.args.get('cursor'),
+                                     filters=get_table_filters())
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
 
+        table_name = source['table']
         return jsonify({
-            'title': f'{table_name} Table',
-            'description': f'Complete contents of the {table_name} table',
-            'columns': list(data[0].keys()) if data else [],
-            'data': data,
-            'row_count': len(data)
+            'title': source['title'],
+            'description': source.get('description', f'Complete contents of the {table_name} table'),
+            'columns': page['columns'],
+            'data': page['data'],
+            'row_count': len(page['data']),
+            'next_cursor': page['next_cursor'],
+            'has_more': page['has_more']
         })
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/table/<table_id>/count')
+def count_table(table_id):
+    """Total rows in a table (or the Q7 complete log) matching the same filter_<column> args"""
+    from queries import TABLE_BROWSER_SOURCES
+    try:
+        db = get_current_db()
+
+        if table_id not in TABLE_BROWSER_SOURCES:
+            return jsonify({'error': 'Unknown table'}), 404
+
+        try:
+            row_count = db.count_table_rows(table_id, filters=get_table_filters())
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        return jsonify({'table_id': table_id, 'row_count': row_count})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
 @app.route('/help')
 def help_page():
     """User manual / help page"""
@@ -3896,6 +4143,36 @@ def serve_prototype(filename):
         return "Prototype not found", 404
 
 
+@app.route('/api/perf', methods=['GET', 'DELETE'])
+def perf_stats():
+    """
+    Rolling performance histograms for report methods and routes.
+
+    Each entry has wall_ms, sql_count and rows summaries (count, mean, p50/p90/p99,
+    max, buckets) plus the slowest SQL statements. JSON by default;
+    ?format=html renders a page. DELETE clears the samples.
+    """
+    if request.method == 'DELETE':
+        perf_monitor.reset()
+        return jsonify({'success': True})
+
+    entries = perf_monitor.get_perf_snapshot()
+    kind = request.args.get('kind')
+    if kind:
+        entries = [e for e in entries if e['kind'] == kind]
+
+    if request.args.get('format') == 'html':
+        env = session.get('environment', DEFAULT_DATABASE)
+        return render_template('perf.html', environment=env, entries=entries,
+                               buckets=perf_monitor.HISTOGRAM_BUCKETS_MS,
+                               window=perf_monitor.HISTOGRAM_WINDOW)
+
+    return jsonify({
+        'window': perf_monitor.HISTOGRAM_WINDOW,
+        'entries': entries
+    })
+
+
 @app.route('/api/group/<group_id>/items')
 def get_group_items_api(group_id):
     """
@@ -3923,15 +4200,74 @@ def get_group_items_api(group_id):
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+def get_workflow_name(workflow_id):
+    """Display name of a workflow from the unified items list"""
+    workflow_item = next((i for i in get_unified_items() if i['id'] == workflow_id and is_workflow(i)), None)
+    return workflow_item['name'] if workflow_item else f'Workflow {workflow_id.upper()}'
+
+
+def iter_workflow_reports(db, reports, items, log_date):
+    """
+    Run workflow reports concurrently, yielding each one as soon as it completes.
+
+    Each report runs on a bounded thread pool with its own read connection.
+    Errors stay with the report that raised them.
+
+    Yields:
+        (index into items, report result, elapsed_ms) in completion order
+    """
+    from database import NoDailyDataError
+
+    def run_workflow_report(item):
+        """Run one workflow report on its own read connection"""
+        start = time.perf_counter()
+        try:
+            with db.thread_read_connection():
+                result = reports.run_report(item['id'], {'date': log_date})
+        except NoDailyDataError:
+            # Prize drawing needs a date - add error message if no data available
+            result = {
+                'title': f"{item['name']} - No Data",
+                'description': 'No daily data available for prize drawing',
+                'columns': [],
+                'data': [],
+                'error': 'No daily data uploaded yet'
+            }
+        except Exception as e:
+            result = {
+                'title': f"{item['name']} - Error",
+                'description': 'Report failed; other workflow reports are unaffected',
+                'columns': [],
+                'data': [],
+                'error': str(e)
+            }
+        return result, (time.perf_counter() - start) * 1000
+
+    with ThreadPoolExecutor(max_workers=max(1, min(WORKFLOW_MAX_WORKERS, len(items)))) as pool:
+        futures = {pool.submit(run_workflow_report, item): index for index, item in enumerate(items)}
+        for future in as_completed(futures):
+            result, elapsed_ms = future.result()
+            yield futures[future], result, elapsed_ms
+
+
 @app.route('/api/workflow/<workflow_id>')
+@conditional_get(when=is_cacheable_workflow)
 def run_workflow(workflow_id):
-    """Run a workflow (sequence of reports) - dynamically queries workflow.{id} tags"""
+    """
+    Run a workflow (sequence of reports) - dynamically queries workflow.{id} tags
+
+    With ?stream=1 the response is NDJSON, one line per event as reports finish:
+        {"type": "start", "workflow_name", "reports": [{"report_id", "name"}, ...]}
+        {"type": "report", "index", "report_id", "elapsed_ms", "report": {...}}  (completion order)
+        {"type": "end", "timing": {...}}
+    """
+    from database import REPORT_REGISTRY
     try:
         log_date = request.args.get('date')
+        stream = request.args.get('stream') == '1'
 
         # Get current environment's report generator
         reports = get_current_reports()
-        db = get_current_db()
 
         # Get reports for this workflow dynamically
         workflow_items = get_workflow_reports(workflow_id)
@@ -3939,87 +4275,216 @@ def run_workflow(workflow_id):
         if not workflow_items:
             return jsonify({'error': f'Workflow {workflow_id} not found or has no reports'}), 404
 
-        # Get workflow metadata
-        all_items = get_unified_items()
-        workflow_item = next((i for i in all_items if i['id'] == workflow_id and is_workflow(i)), None)
-        workflow_name = workflow_item['name'] if workflow_item else f'Workflow {workflow_id.upper()}'
-
-        # Extract report IDs from items
-        report_ids = [item['id'] for item in workflow_items]
-
-        # Run all reports
-        results = []
-        for rid in report_ids:
-            if rid == 'q1':
-                results.append(reports.q1_table_counts())
-            elif rid == 'q2':
-                results.append(reports.q2_daily_summary(log_date, 'class'))
-            elif rid == 'q3':
-                results.append(reports.q3_reader_cumulative_enhanced())
-            elif rid == 'q4':  # Prize drawing needs a date
-                if not log_date:
-                    dates = db.get_all_dates()
-                    log_date = dates[0] if dates else None
-                if log_date:
-                    results.append(reports.q4_prize_drawing(log_date))
-                else:
-                    # Add error message if no data available
-                    results.append({
-                        'title': 'Q4/Slide 4: Prize Drawing - No Data',
-                        'description': 'No daily data available for prize drawing',
-                        'columns': [],
-                        'data': [],
-                        'error': 'No daily data uploaded yet'
-                    })
-            elif rid == 'q5':
-                results.append(reports.q5_student_cumulative('minutes'))
-            elif rid == 'q6':
-                results.append(reports.q6_class_participation())
-            elif rid == 'q7':
-                results.append(reports.q7_complete_log(log_date))
-            elif rid == 'q8':
-                results.append(reports.q8_student_reading_details())
-            elif rid == 'q14':
-                results.append(reports.q14_team_participation())
-            elif rid == 'q18':
-                results.append(reports.q18_lead_class_by_grade())
-            elif rid == 'q19':
-                results.append(reports.q19_team_minutes())
-            elif rid == 'q20':
-                results.append(reports.q20_team_donations())
-            elif rid == 'q21':
-                results.append(reports.q21_minutes_integrity_check())
-            elif rid == 'q22':
-                results.append(reports.q22_student_name_sync_check())
-            elif rid == 'q23':
-                results.append(reports.q23_roster_integrity_check())
-            elif rid == 'q24':
-                results.append(reports.q24_database_metadata())
-            elif rid == 'q9':
-                results.append(reports.q9_most_donations_by_grade())
-            elif rid == 'q10':
-                results.append(reports.q10_most_minutes_by_grade())
-            elif rid == 'q11':
-                results.append(reports.q11_most_sponsors_by_grade())
-            elif rid == 'q12':
-                results.append(reports.q12_best_class_by_grade_simplified())
-            elif rid == 'q13':
-                results.append(reports.q13_overall_best_class_simplified())
-            elif rid == 'q15':
-                results.append(reports.q15_goal_getters())
-            elif rid == 'q16':
-                results.append(reports.q16_top_earner_per_team())
+        workflow_name = get_workflow_name(workflow_id)
+
+        # Workflows only take the date; other params use registry defaults
+        items = [item for item in workflow_items if item['id'] in REPORT_REGISTRY]
+        db = get_current_db()
+
+        def timing_summary(total_ms, elapsed):
+            return {
+                'total_ms': round(total_ms, 1),
+                'workers': min(WORKFLOW_MAX_WORKERS, len(items)),
+                'reports': [{'report_id': item['id'], 'elapsed_ms': round(elapsed[i], 1)}
+                            for i, item in enumerate(items)]
+            }
+
+        if stream:
+            def generate():
+                start = time.perf_counter()
+                elapsed = [0.0] * len(items)
+                yield json.dumps({
+                    'type': 'start',
+                    'workflow_name': workflow_name,
+                    'reports': [{'report_id': item['id'], 'name': item['name']} for item in items]
+                }) + '\n'
+                for index, result, elapsed_ms in iter_workflow_reports(db, reports, items, log_date):
+                    elapsed[index] = elapsed_ms
+                    yield json.dumps({
+                        'type': 'report',
+                        'index': index,
+                        'report_id': items[index]['id'],
+                        'elapsed_ms': round(elapsed_ms, 1),
+                        'report': result
+                    }, default=str) + '\n'
+                yield json.dumps({
+                    'type': 'end',
+                    'timing': timing_summary((time.perf_counter() - start) * 1000, elapsed)
+                }) + '\n'
+
+            return Response(stream_with_context(generate()), mimetype='application/x-ndjson',
+                            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+        start = time.perf_counter()
+        results = [None] * len(items)
+        elapsed = [0.0] * len(items)
+        for index, result, elapsed_ms in iter_workflow_reports(db, reports, items, log_date):
+            results[index] = result
+            elapsed[index] = elapsed_ms
 
         return jsonify({
             'workflow_name': workflow_name,
-            'reports': results
+            'reports': results,
+            'timing': timing_summary((time.perf_counter() - start) * 1000, elapsed)
         })
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
+# ========== Pre-rendered Slide Bundles ==========
+
+def get_slide_bundle_dir(db, workflow_id='qd'):
+    """Absolute folder holding the bundles rendered from one database"""
+    db_name = os.path.splitext(os.path.basename(db.db_path))[0]
+    return os.path.abspath(os.path.join(SLIDE_BUNDLE_DIR, db_name, workflow_id))
+
+
+def build_slide_bundle(db, workflow_id='qd'):
+    """
+    Run a workflow for the latest date and render it as a slide page.
+
+    The database file identity is taken before any report runs, so a write
+    that lands mid-render leaves the bundle stale rather than mislabelled.
+
+    Returns:
+        (bundle dict as stored in report.json, rendered index.html)
+    """
+    from database import REPORT_REGISTRY, ReportGenerator
+    source = db.get_file_identity()
+    log_date = get_contest(db).latest_date
+    items = [item for item in get_workflow_reports(workflow_id) if item['id'] in REPORT_REGISTRY]
+
+    start = time.perf_counter()
+    results = [None] * len(items)
+    for index, result, elapsed_ms in iter_workflow_reports(db, ReportGenerator(db), items, log_date):
+        results[index] = result
+
+    now = datetime.now()
+    bundle = {
+        'workflow_id': workflow_id,
+        'workflow_name': get_workflow_name(workflow_id),
+        'version': now.strftime('%Y%m%d-%H%M%S-%f'),
+        'generated_at': now.isoformat(timespec='seconds'),
+        'log_date': log_date,
+        'render_ms': round((time.perf_counter() - start) * 1000, 1),
+        'source': source,
+        'reports': results
+    }
+    # Rendered straight from the Jinja environment: the page is self-contained and
+    # must not depend on the session-based context processors (no request here)
+    html = app.jinja_env.get_template('slide_bundle.html').render(bundle=bundle)
+    return bundle, html
+
+
+def save_slide_bundle(db, bundle, html):
+    """
+    Write a bundle as a new version folder and point latest.json at it.
+
+    The folder is staged under a dot-name and renamed into place, and
+    latest.json is replaced atomically, so readers never see a partial bundle.
+    Versions beyond SLIDE_BUNDLE_KEEP are removed.
+
+    Returns:
+        Path of the new version folder
+    """
+    bundle_dir = get_slide_bundle_dir(db, bundle['workflow_id'])
+    version = bundle['version']
+    staging = os.path.join(bundle_dir, f'.{version}.tmp')
+    os.makedirs(staging)
+    with open(os.path.join(staging, 'report.json'), 'w') as f:
+        json.dump(bundle, f, default=str)
+    with open(os.path.join(staging, 'index.html'), 'w', encoding='utf-8') as f:
+        f.write(html)
+    version_dir = os.path.join(bundle_dir, version)
+    os.rename(staging, version_dir)
+
+    latest_tmp = os.path.join(bundle_dir, f'.latest.{version}.tmp')
+    with open(latest_tmp, 'w') as f:
+        json.dump({'version': version, 'source': bundle['source']}, f)
+    os.replace(latest_tmp, os.path.join(bundle_dir, 'latest.json'))
+
+    versions = sorted(name for name in os.listdir(bundle_dir)
+                      if not name.startswith('.') and os.path.isdir(os.path.join(bundle_dir, name)))
+    for old_version in versions[:-SLIDE_BUNDLE_KEEP]:
+        shutil.rmtree(os.path.join(bundle_dir, old_version), ignore_errors=True)
+    return version_dir
+
+
+def load_slide_bundle(db, workflow_id='qd'):
+    """
+    Find the latest bundle if it was rendered from the database as it is now.
+
+    Returns:
+        (version, version folder path), or None when there is no bundle or the
+        database has changed since it was rendered
+    """
+    bundle_dir = get_slide_bundle_dir(db, workflow_id)
+    try:
+        with open(os.path.join(bundle_dir, 'latest.json')) as f:
+            latest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if latest.get('source') != db.get_file_identity():
+        return None
+    version_dir = os.path.join(bundle_dir, latest['version'])
+    return (latest['version'], version_dir) if os.path.isdir(version_dir) else None
+
+
+def _render_slide_bundle(db):
+    """Background job: render and save the QD bundle"""
+    bundle, html = build_slide_bundle(db)
+    save_slide_bundle(db, bundle, html)
+
+
+def schedule_slide_bundle(db):
+    """
+    Re-render the QD slide bundle in a background thread after an upload.
+
+    Returns:
+        The started thread, or None when an in-flight render will pick up the change
+    """
+    return schedule_background_job('slide bundle', db, _render_slide_bundle)
+
+
+def serve_slide_bundle(filename, mimetype):
+    """Serve a file from the current bundle, rendering a new bundle live when it is stale"""
+    db = get_current_db()
+    latest = load_slide_bundle(db)
+    if latest:
+        version, version_dir = latest
+        response = send_file(os.path.join(version_dir, filename), mimetype=mimetype)
+    else:
+        bundle, html = build_slide_bundle(db)
+        try:
+            save_slide_bundle(db, bundle, html)
+        except OSError as e:
+            print(f"⚠️  Could not save slide bundle: {e}")
+        version = 'live'
+        body = html if filename == 'index.html' else json.dumps(bundle, default=str)
+        response = Response(body, mimetype=mimetype)
+    response.headers['X-Slide-Bundle'] = version
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+@app.route('/slides/qd')
+def qd_slides():
+    """QD daily slide deck for projecting (pre-rendered after each upload)"""
+    return serve_slide_bundle('index.html', 'text/html')
+
+
+@app.route('/api/slides/qd')
+def qd_slides_data():
+    """QD daily slide deck as JSON (same payload as the bundle's report.json)"""
+    try:
+        return serve_slide_bundle('report.json', 'application/json')
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
 if __name__ == '__main__':
+    create_app_from_argv()
     print("\n" + "="*60)
     print("READ-A-THON REPORTING SYSTEM")
     print("="*60)
@@ -6,17 +6,247 @@ Handles SQLite database creation, initialization, and all data operations
 import sqlite3
 import csv
 import io
+import json
+import base64
 from datetime import datetime
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Callable
 import random
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from contextlib import contextmanager, ExitStack
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal, ROUND_HALF_UP
 from report_metadata import (
-    COLUMN_METADATA,
-    get_report_terms,
     generate_q21_analysis,
     generate_q22_analysis,
     generate_q23_analysis
 )
 from queries import *
+import perf_monitor
+
+
+def _sql_round(value: float, digits: int = 1) -> float:
+    """Round half away from zero like SQLite ROUND() (Python round() uses banker's rounding)"""
+    quantum = Decimal(1).scaleb(-digits)
+    return float(Decimal(repr(value)).quantize(quantum, rounding=ROUND_HALF_UP))
+
+
+class AliasSampler:
+    """
+    Walker/Vose alias table: O(n) build, O(1) weighted sampling with replacement.
+
+    Used for minute-weighted prize drawings. Weights must be non-negative with
+    a positive total.
+    """
+
+    def __init__(self, weights: List[float]):
+        n = len(weights)
+        total = float(sum(weights))
+        scaled = [w * n / total for w in weights]
+        self.prob = [0.0] * n
+        self.alias = list(range(n))
+
+        small = [i for i, w in enumerate(scaled) if w < 1.0]
+        large = [i for i, w in enumerate(scaled) if w >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        for i in small + large:
+            self.prob[i] = 1.0
+
+    def sample(self, rng) -> int:
+        """Draw one index using rng (random.Random or the random module)"""
+        i = int(rng.random() * len(self.prob))
+        return i if rng.random() < self.prob[i] else self.alias[i]
+
+
+def _draw_without_replacement(rng, n: int, k: int, weights: Optional[List[float]] = None) -> List[int]:
+    """
+    Pick k distinct indexes out of n candidates, in draw order.
+
+    Unweighted draws use rng.choice/rng.sample. Weighted draws sample from an
+    AliasSampler and reject repeats; the table is rebuilt over the remaining
+    candidates once rejections outnumber them, so drawing most of a small pool
+    stays cheap. Zero-weight candidates are only drawn (uniformly) once every
+    positive-weight candidate has been taken.
+    """
+    k = min(k, n)
+    if weights is None or not any(weights):
+        if k == 1:
+            return [rng.choice(range(n))]
+        return rng.sample(range(n), k)
+
+    chosen = []
+    taken = set()
+    remaining = [i for i in range(n) if weights[i] > 0]
+    sampler = AliasSampler([weights[i] for i in remaining])
+    rejections = 0
+    while len(chosen) < k and len(taken) < len(remaining):
+        pick = remaining[sampler.sample(rng)]
+        if pick in taken:
+            rejections += 1
+            if rejections > len(remaining) - len(taken):
+                remaining = [i for i in remaining if i not in taken]
+                sampler = AliasSampler([weights[i] for i in remaining])
+                taken = set()
+                rejections = 0
+            continue
+        taken.add(pick)
+        chosen.append(pick)
+
+    if len(chosen) < k:
+        leftover = [i for i in range(n) if i not in set(chosen)]
+        chosen.extend(rng.sample(leftover, k - len(chosen)))
+    return chosen
+
+
+class ContestContext:
+    """
+    Contest-wide facts every dashboard and report needs (see ReadathonDB.get_contest_context).
+
+    Built once per data version and shared between requests and threads, so
+    treat instances as read-only.
+
+    Attributes:
+        dates: Dates with daily logs, newest first (same order as get_all_dates)
+        sorted_dates: Dates with daily logs, oldest first
+        day_numbers: Date -> campaign day (1-based)
+        total_days: Days with daily logs in the whole contest
+        full_contest_range: Display label such as "Oct 10-Oct 15, 2025"
+        roster: Roster rows (student_name, grade_level, team_name, class_name, teacher_name)
+        roster_count: Students on the roster
+        team_names: Team names, alphabetical (team 1 first)
+        grade_levels: Grade levels on the roster, sorted
+        grade_rules: Grade level -> {min_daily_minutes, max_daily_minutes_credit}
+        last_uploads: {'daily': ..., 'cumulative': ...} latest upload timestamp or None
+        upload_summary: Last upload text shown in report metadata
+    """
+
+    def __init__(self, dates: List[str], roster: List[Dict[str, Any]],
+                 grade_rules: Dict[str, Dict[str, Any]], last_uploads: Dict[str, Optional[str]],
+                 upload_summary: str):
+        self.dates = dates
+        self.sorted_dates = sorted(dates)
+        self.day_numbers = {date: day for day, date in enumerate(self.sorted_dates, start=1)}
+        self.total_days = len(self.sorted_dates)
+        if self.sorted_dates:
+            start_date = datetime.strptime(self.sorted_dates[0], '%Y-%m-%d').strftime('%b %d')
+            end_date = datetime.strptime(self.sorted_dates[-1], '%Y-%m-%d').strftime('%b %d, %Y')
+            self.full_contest_range = f"{start_date}-{end_date}"
+        else:
+            self.full_contest_range = "Oct 10-15, 2025"  # Fallback if no dates
+        self.roster = roster
+        self.roster_count = len(roster)
+        self.team_names = sorted({row['team_name'] for row in roster if row['team_name'] is not None})
+        self.grade_levels = sorted({row['grade_level'] for row in roster if row['grade_level'] is not None})
+        self.grade_rules = grade_rules
+        self.last_uploads = last_uploads
+        self.upload_summary = upload_summary
+
+    @property
+    def latest_date(self) -> Optional[str]:
+        """Most recent date with daily logs"""
+        return self.dates[0] if self.dates else None
+
+    def is_log_date(self, date_filter: str) -> bool:
+        """True when date_filter is a specific date with daily logs (not 'all')"""
+        return date_filter in self.day_numbers
+
+    def current_day(self, date_filter: str) -> int:
+        """Campaign day of date_filter, or the total days for 'all' and unknown dates"""
+        return self.day_numbers.get(date_filter, self.total_days)
+
+    def campaign_date(self, date_filter: str) -> str:
+        """Banner subtitle: the selected date, or the full contest range"""
+        return date_filter if self.is_log_date(date_filter) else self.full_contest_range
+
+    def days_through(self, date_filter: str) -> int:
+        """Days with logs on or before date_filter (all days for 'all')"""
+        if date_filter == 'all':
+            return self.total_days
+        return len([d for d in self.sorted_dates if d <= date_filter])
+
+
+class LRUCache:
+    """
+    Thread-safe dict-style cache keeping the max_entries most recently used items.
+
+    Used wherever cache keys come from request parameters (report args, filter
+    periods, database names), so the number of entries stays bounded.
+    on_evict(key, value), if given, is called for every entry dropped, replaced
+    or cleared, outside the cache's lock.
+    """
+
+    def __init__(self, max_entries: int, on_evict: Optional[Callable[[Any, Any], None]] = None):
+        self.max_entries = max_entries
+        self.on_evict = on_evict
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """Value for key (marking it most recently used), else default"""
+        with self._lock:
+            if key not in self._entries:
+                return default
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            dropped = [(key, self._entries.pop(key))] if key in self._entries else []
+            self._entries[key] = value
+            while len(self._entries) > self.max_entries:
+                dropped.append(self._entries.popitem(last=False))
+        self._evicted(dropped)
+
+    def __contains__(self, key) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def clear(self):
+        """Drop every entry"""
+        with self._lock:
+            dropped = list(self._entries.items())
+            self._entries.clear()
+        self._evicted(dropped)
+
+    def _evicted(self, dropped: List[Tuple[Any, Any]]):
+        if self.on_evict:
+            for key, value in dropped:
+                self.on_evict(key, value)
+
+
+def _read_comparison_snapshot_state(conn: sqlite3.Connection, schema: str = 'main') -> Optional[Tuple]:
+    """(built_timestamp, student_count, total_days, total_donations) of a current snapshot, else None"""
+    try:
+        return conn.execute(get_comparison_snapshot_state_query(schema), (COMPARISON_SNAPSHOT_VERSION,)).fetchone()
+    except sqlite3.OperationalError:
+        return None
+
+
+def _read_comparison_snapshot(conn: sqlite3.Connection, filter_period: str,
+                              schema: str = 'main') -> Optional[Dict[str, List[Dict[str, Any]]]]:
+    """Per-metric comparison results from a database's snapshot, or None when it has no current one"""
+    if _read_comparison_snapshot_state(conn, schema) is None:
+        return None
+    rows = conn.execute(get_comparison_snapshot_rows_query(schema), (filter_period,)).fetchall()
+    if not rows:
+        return None  # filter period not snapshotted
+
+    results = split_db_comparison_rows({level: [] for level in DB_COMPARISON_LEVELS})
+    for metric, row_json in rows:
+        results[metric].append(json.loads(row_json))
+    return results
 
 
 class DatabaseRegistry:
@@ -316,8 +546,10 @@ class DatabaseRegistry:
         """
         Recalculate statistics by querying the actual contest database file.
 
-        This opens the contest database, queries Roster, Daily_Logs, and Reader_Cumulative,
-        then updates the registry with the calculated values.
+        This reads the counts from the contest database's comparison snapshot
+        when current (otherwise queries Roster, Daily_Logs, and
+        Reader_Cumulative) through its shared handle, then updates the
+        registry with the values.
 
         Args:
             db_id: Database ID
@@ -331,25 +563,31 @@ class DatabaseRegistry:
             return {'success': False, 'error': f'Database ID {db_id} not found'}
 
         db_path = f"db/{db['db_filename']}"
+        if not Path(db_path).is_file():
+            return {'success': False, 'error': f'Database file not found: {db_path}'}
 
         try:
-            # Open the contest database file
-            contest_conn = sqlite3.connect(db_path)
-            cursor = contest_conn.cursor()
-
-            # Get student count from Roster
-            cursor.execute("SELECT COUNT(*) FROM Roster")
-            student_count = cursor.fetchone()[0]
+            # Use the contest database's shared handle
+            with database_handles.database(db_path) as contest_db:
+                contest_conn = contest_db.get_connection()
+                cursor = contest_conn.cursor()
+
+                # Counts stored by the last upload, while no other write has touched the data
+                snapshot = _read_comparison_snapshot_state(contest_conn)
+                if snapshot:
+                    _, student_count, total_days, total_donations = snapshot
+                else:
+                    # Get student count from Roster
+                    cursor.execute("SELECT COUNT(*) FROM Roster")
+                    student_count = cursor.fetchone()[0]
 
-            # Get total days from Daily_Logs
-            cursor.execute("SELECT COUNT(DISTINCT log_date) FROM Daily_Logs")
-            total_days = cursor.fetchone()[0]
+                    # Get total days from Daily_Logs
+                    cursor.execute("SELECT COUNT(DISTINCT log_date) FROM Daily_Logs")
+                    total_days = cursor.fetchone()[0]
 
-            # Get total donations from Reader_Cumulative
-            cursor.execute("SELECT COALESCE(SUM(donation_amount), 0.0) FROM Reader_Cumulative")
-            total_donations = cursor.fetchone()[0]
-
-            contest_conn.close()
+                    # Get total donations from Reader_Cumulative
+                    cursor.execute("SELECT COALESCE(SUM(donation_amount), 0.0) FROM Reader_Cumulative")
+                    total_donations = cursor.fetchone()[0]
 
             # Update registry with calculated values
             result = self.update_stats(db_id, student_count, total_days, total_donations)
@@ -405,23 +643,75 @@ class DatabaseRegistry:
 class ReadathonDB:
     """Main database class for Read-a-Thon system"""
 
+    # Student metrics that get gold/silver winner highlights on the Students page
+    STUDENT_WINNER_METRICS = (
+        'fundraising', 'sponsors', 'minutes_capped', 'minutes_uncapped',
+        'days_participated', 'participation_pct', 'days_met_goal', 'goal_met_pct'
+    )
+
+    # Students table columns in display order (sortable via get_students_page)
+    STUDENT_TABLE_COLUMNS = (
+        'student_name', 'grade_level', 'team_name', 'class_name', 'teacher_name'
+    ) + STUDENT_WINNER_METRICS
+
     def __init__(self, db_path: str = "readathon.db"):
         self.db_path = db_path
         self.conn = None
+        self._contest_context = None  # (data_version, ContestContext)
+        self._students_master_cache = {}  # date_filter -> (data_version, master result)
+        self._grade_level_classes_cache = {}  # date_filter -> (data_version, class rows)
+        self._report_cache = LRUCache(REPORT_CACHE_MAX_ENTRIES)  # (report_id, args) -> (data_version, report result)
+        self._report_stats = {}  # report_id -> run counters (see ReportGenerator.get_report_stats)
+        self._report_lock = threading.Lock()
+        self._thread_local = threading.local()  # .conn = this thread's read connection, if open
+        self._version_conn = None  # read-only connection that only reads PRAGMA data_version
+        self._version_lock = threading.Lock()
         self.initialize_database()
 
     def get_connection(self):
-        """Get database connection"""
+        """Get database connection (the calling thread's read connection if one is open)"""
+        thread_conn = getattr(self._thread_local, 'conn', None)
+        if thread_conn is not None:
+            return thread_conn
+        return self._get_shared_connection()
+
+    def _get_shared_connection(self):
+        """Get the connection shared by all threads (used for writes)"""
         if self.conn is None:
             self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
             self.conn.row_factory = sqlite3.Row
+            perf_monitor.instrument_connection(self.conn)
         return self.conn
 
+    @contextmanager
+    def thread_read_connection(self):
+        """
+        Route the calling thread's queries through its own read-only connection.
+
+        Inside the block, get_connection() (and so every ReportGenerator method)
+        uses a private connection instead of the shared one, letting worker
+        threads read concurrently. The connection is closed on exit.
+        """
+        uri = Path(self.db_path).absolute().as_uri() + '?mode=ro'
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        perf_monitor.instrument_connection(conn)
+        self._thread_local.conn = conn
+        try:
+            yield conn
+        finally:
+            self._thread_local.conn = None
+            conn.close()
+
     def close(self):
         """Close database connection"""
         if self.conn:
             self.conn.close()
             self.conn = None
+        with self._version_lock:
+            if self._version_conn is not None:
+                self._version_conn.close()
+                self._version_conn = None
 
     def initialize_database(self):
         """Create all tables if they don't exist"""
@@ -931,6 +1221,9 @@ class ReadathonDB:
             cursor.execute(SELECT_ALL_STUDENTS_READER_CUMULATIVE_SET)
             existing_students = set([row[0] for row in cursor.fetchall()])
 
+            # Reconciliation rows follow the Reader_Cumulative replacement via triggers
+            self.ensure_student_reconciliation(cursor)
+
             # Delete all existing data
             cursor.execute(DELETE_ALL_READER_CUMULATIVE)
 
@@ -1108,6 +1401,11 @@ class ReadathonDB:
                 total = sum(minutes_list)
                 result['warnings'].append(f"Duplicate rows for {student_name}: found {len(minutes_list)} rows with minutes {minutes_list}, summed to {total}")
 
+            # Stored cumulative totals and reconciliation rows: the Daily_Logs
+            # triggers add this day's delta as each row below is inserted or replaced
+            self.ensure_reading_totals(cursor)
+            self.ensure_student_reconciliation(cursor)
+
             # Insert data
             for student_name, minutes in minutes_data.items():
                 # Insert or update
@@ -1168,6 +1466,109 @@ class ReadathonDB:
 
         return counts
 
+    def _table_browser_source(self, table_id: str, filters: Optional[Dict[str, str]] = None) -> Tuple[Dict[str, Any], List[str], str, List[Any]]:
+        """
+        Resolve a TABLE_BROWSER_SOURCES entry and its column filters.
+
+        Returns:
+            (source, column names, filter WHERE fragment, filter params)
+
+        Raises:
+            KeyError: Unknown table_id
+            ValueError: Filter on a column the source doesn't have
+        """
+        source = TABLE_BROWSER_SOURCES[table_id]
+        if source['table']:
+            columns = [row[1] for row in self.get_connection().execute(f"PRAGMA table_info({source['table']})")]
+            expressions = {col: col for col in columns}
+        else:
+            columns = list(source['columns'])
+            expressions = source['columns']
+
+        where_parts = []
+        params = []
+        for column, value in (filters or {}).items():
+            if column not in expressions:
+                raise ValueError(f"Unknown filter column: {column}")
+            # Case-insensitive substring match; escape LIKE wildcards in user text
+            escaped = value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            where_parts.append(f"CAST({expressions[column]} AS TEXT) LIKE ? ESCAPE '\\'")
+            params.append(f"%{escaped}%")
+
+        where_sql = "".join(f" AND {part}" for part in where_parts)
+        return source, columns, where_sql, params
+
+    def get_table_page(self, table_id: str, limit: Optional[int] = None, cursor: Optional[str] = None,
+                       filters: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """
+        Get rows of a browsable table (or the complete log) using keyset pagination.
+
+        Rows are ordered by the source's unique order_by keys. The cursor encodes
+        the last row's key values, so each page is an index range scan no matter
+        how deep into the table it is (no OFFSET).
+
+        Args:
+            table_id: TABLE_BROWSER_SOURCES key
+            limit: Page size; None returns every (filtered) row
+            cursor: next_cursor from the previous page; None starts at the top
+            filters: Column name -> case-insensitive substring to match
+
+        Returns:
+            Dict with columns, data, next_cursor (None on the last page), has_more
+
+        Raises:
+            KeyError: Unknown table_id
+            ValueError: Malformed cursor or unknown filter column
+        """
+        source, columns, where_sql, params = self._table_browser_source(table_id, filters)
+        order_by = source['order_by']
+
+        if cursor:
+            try:
+                key_values = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+            except (ValueError, UnicodeDecodeError):
+                raise ValueError("Invalid cursor")
+            if not isinstance(key_values, list) or len(key_values) != len(order_by):
+                raise ValueError("Invalid cursor")
+            keyset_sql, param_indexes = get_keyset_where(order_by)
+            where_sql += f" AND {keyset_sql}"
+            params += [key_values[i] for i in param_indexes]
+
+        # Key expressions ride along as _k columns so the next cursor can be built
+        key_columns = ", ".join(f"{expr} AS _k{i}" for i, (expr, _) in enumerate(order_by))
+        order_sql = ", ".join(f"{expr} {direction}" for expr, direction in order_by)
+        select_sql = source['select'].strip()
+        query = f"{select_sql.replace('SELECT', f'SELECT {key_columns},', 1)} WHERE 1=1{where_sql} ORDER BY {order_sql}"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit + 1)  # One extra row tells us whether there's a next page
+
+        rows = self.get_connection().execute(query, params).fetchall()
+        perf_monitor.add_rows(len(rows))
+        has_more = limit is not None and len(rows) > limit
+        if has_more:
+            rows = rows[:limit]
+
+        key_count = len(order_by)
+        data = [dict(zip(columns, row[key_count:])) for row in rows]
+        next_cursor = None
+        if has_more:
+            last_keys = list(rows[-1][:key_count])
+            next_cursor = base64.urlsafe_b64encode(json.dumps(last_keys).encode()).decode()
+
+        return {
+            'columns': columns,
+            'data': data,
+            'next_cursor': next_cursor,
+            'has_more': has_more
+        }
+
+    def count_table_rows(self, table_id: str, filters: Optional[Dict[str, str]] = None) -> int:
+        """Count rows of a browsable table matching the column filters (see get_table_page)"""
+        source, _, where_sql, params = self._table_browser_source(table_id, filters)
+        query = f"SELECT COUNT(*) FROM ({source['select'].strip()} WHERE 1=1{where_sql})"
+        return self.get_connection().execute(query, params).fetchone()[0]
+
     def get_table_metadata(self, table_id: str) -> Dict[str, Any]:
         """
         Get detailed metadata for a specific table.
@@ -1333,6 +1734,7 @@ class ReadathonDB:
         for row in cursor.fetchall():
             results.append(dict(zip(columns, row)))
 
+        perf_monitor.add_rows(len(results))
         return results
 
     def get_all_dates(self) -> List[str]:
@@ -1578,8 +1980,391 @@ class ReadathonDB:
                 'error': str(e)
             }
 
+    # ========== Prize Drawing Methods ==========
+
+    def get_prize_draws(self, seed: int, winners_per_grade: int, weighted: bool) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """
+        Get persisted batch prize draws for one drawing configuration.
+
+        Returns:
+            Dict mapping (log_date, grade_level) to {'eligibility_hash', 'students'}
+            where students are winner names in draw order
+        """
+        conn = self.get_connection()
+        if not conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'Prize_Draws'").fetchone():
+            return {}
+
+        draws = {}
+        for row in conn.execute(SELECT_PRIZE_DRAWS, (seed, winners_per_grade, int(weighted))):
+            entry = draws.setdefault((row['log_date'], row['grade_level']),
+                                     {'eligibility_hash': row['eligibility_hash'], 'students': []})
+            entry['students'].append(row['student_name'])
+        return draws
+
+    def save_prize_draws(self, seed: int, winners_per_grade: int, weighted: bool,
+                         draws: Dict[Tuple[str, str], Dict[str, Any]]):
+        """
+        Persist batch prize draws, replacing earlier draws for the same date and grade.
+
+        Args:
+            draws: (log_date, grade_level) -> {'eligibility_hash', 'total_eligible', 'students'}
+        """
+        conn = self._get_shared_connection()
+        cursor = conn.cursor()
+        cursor.execute(CREATE_TABLE_PRIZE_DRAWS)
+
+        timestamp = datetime.now().isoformat()
+        for (log_date, grade), draw in draws.items():
+            key = (seed, winners_per_grade, int(weighted), log_date, grade)
+            cursor.execute(DELETE_PRIZE_DRAWS_FOR_GRADE, key)
+            for rank, student_name in enumerate(draw['students'], start=1):
+                cursor.execute(INSERT_PRIZE_DRAW, key + (rank, student_name, draw['total_eligible'],
+                                                        draw['eligibility_hash'], timestamp))
+        conn.commit()
+
+    # ========== Stored Reading Totals ==========
+
+    def has_reading_totals(self) -> bool:
+        """
+        Check whether the stored per-class reading totals exist and are current.
+
+        False until the first daily upload creates them, and after any roster
+        change (the Roster triggers mark them stale until the next rebuild).
+        """
+        try:
+            return self.get_connection().execute(SELECT_READING_TOTALS_BUILT).fetchone() is not None
+        except sqlite3.OperationalError:
+            return False
+
+    def ensure_reading_totals(self, cursor=None):
+        """
+        Create the stored reading totals and their triggers, rebuilding them if stale.
+
+        After this, every Daily_Logs insert, update or delete adjusts the totals
+        of the affected student's class, so Q6/Q14/Q18/Q19 read O(classes) rows
+        instead of re-aggregating every log. The rebuild (a full aggregation)
+        only runs when the totals are new or a roster change invalidated them.
+
+        Args:
+            cursor: Cursor of an open write transaction to join (commits
+                    itself when None)
+        """
+        own_cursor = cursor is None
+        if own_cursor:
+            cursor = self._get_shared_connection().cursor()
+
+        cursor.execute(CREATE_TABLE_CLASS_READING_TOTALS)
+        cursor.execute(CREATE_TABLE_READING_DAYS)
+        cursor.execute(CREATE_TABLE_READING_TOTALS_STATE)
+        for trigger in CREATE_READING_TOTALS_TRIGGERS:
+            cursor.execute(trigger)
+
+        cursor.execute(SELECT_READING_TOTALS_BUILT)
+        if cursor.fetchone() is None:
+            for statement in REBUILD_CLASS_READING_TOTALS:
+                cursor.execute(statement)
+            cursor.execute(INSERT_READING_TOTALS_STATE, (datetime.now().isoformat(),))
+
+        if own_cursor:
+            cursor.connection.commit()
+
+    def has_student_reconciliation(self) -> bool:
+        """Check whether the stored Student_Reconciliation table has been built"""
+        try:
+            return self.get_connection().execute(SELECT_RECONCILIATION_BUILT).fetchone() is not None
+        except sqlite3.OperationalError:
+            return False
+
+    def ensure_student_reconciliation(self, cursor=None):
+        """
+        Create the per-student reconciliation table and its triggers, building it once.
+
+        Triggers on Roster, Daily_Logs and Reader_Cumulative keep each student's
+        daily sums, cumulative minutes, roster presence and Q21 status current,
+        so Q21/Q22/Q23 read one narrow table instead of joining all three.
+
+        Args:
+            cursor: Cursor of an open write transaction to join (commits
+                    itself when None)
+        """
+        own_cursor = cursor is None
+        if own_cursor:
+            cursor = self._get_shared_connection().cursor()
+
+        cursor.execute(CREATE_TABLE_STUDENT_RECONCILIATION)
+        cursor.execute(CREATE_INDEX_STUDENT_RECONCILIATION_STATUS)
+        cursor.execute(CREATE_TABLE_RECONCILIATION_STATE)
+        for trigger in CREATE_RECONCILIATION_TRIGGERS:
+            cursor.execute(trigger)
+
+        cursor.execute(SELECT_RECONCILIATION_BUILT)
+        if cursor.fetchone() is None:
+            for statement in REBUILD_STUDENT_RECONCILIATION:
+                cursor.execute(statement)
+            cursor.execute(INSERT_RECONCILIATION_STATE, (datetime.now().isoformat(),))
+
+        if own_cursor:
+            cursor.connection.commit()
+
+    def refresh_comparison_snapshot(self) -> bool:
+        """
+        Rebuild the stored comparison snapshot (run after each upload commits).
+
+        Stores the rows of every database comparison metric for the full
+        contest and for each logged date, plus the registry summary counts, so
+        comparisons and trends involving this database read stored rows. The
+        metrics are computed on a read connection without holding a lock; only
+        the final write takes one, and it is skipped when another write
+        committed in the meantime (whose own refresh follows). Any later write
+        to the source tables marks the snapshot stale until the next refresh.
+
+        Returns:
+            True if the snapshot was stored
+        """
+        with self.thread_read_connection() as read_conn:
+            data_version = read_conn.execute("PRAGMA data_version").fetchone()[0]
+            periods = ['all'] + [row['log_date'] for row in self.execute_query(SELECT_COMPARISON_SNAPSHOT_DATES)]
+            snapshot_rows = []
+            for period in periods:
+                results = split_db_comparison_rows({level: self.execute_query(get_db_comparison_level_query(level, period))
+                                                    for level in DB_COMPARISON_LEVELS})
+                snapshot_rows.extend((period, metric, position, json.dumps(row))
+                                     for metric, rows in results.items() for position, row in enumerate(rows))
+            summary = tuple(self.execute_query(SELECT_COMPARISON_SNAPSHOT_SUMMARY)[0].values())
+
+            write_conn = sqlite3.connect(self.db_path)
+            try:
+                write_conn.execute("BEGIN IMMEDIATE")
+                if read_conn.execute("PRAGMA data_version").fetchone()[0] != data_version:
+                    write_conn.rollback()
+                    return False
+
+                write_conn.execute(CREATE_TABLE_COMPARISON_SNAPSHOT)
+                write_conn.execute(CREATE_TABLE_COMPARISON_SNAPSHOT_STATE)
+                for trigger in CREATE_COMPARISON_SNAPSHOT_TRIGGERS:
+                    write_conn.execute(trigger)
+                write_conn.execute(DELETE_COMPARISON_SNAPSHOT)
+                write_conn.executemany(INSERT_COMPARISON_SNAPSHOT_ROW, snapshot_rows)
+                write_conn.execute(INSERT_COMPARISON_SNAPSHOT_STATE,
+                                   (COMPARISON_SNAPSHOT_VERSION, datetime.now().isoformat(), *summary))
+                write_conn.commit()
+            finally:
+                write_conn.close()
+        return True
+
+    def get_comparison_snapshot(self, filter_period: str = 'all') -> Optional[Dict[str, List[Dict[str, Any]]]]:
+        """
+        Stored comparison results by metric name for filter_period.
+
+        Returns:
+            The same structure as the split level queries, or None while the
+            snapshot is missing, stale or lacks filter_period
+        """
+        return _read_comparison_snapshot(self.get_connection(), filter_period)
+
+    def get_integrity_totals(self) -> Dict[str, int]:
+        """
+        School-wide Daily_Logs vs Reader_Cumulative minutes.
+
+        Returns:
+            Dict with daily_total, cumulative_total and difference
+        """
+        query = QUERY_INTEGRITY_TOTALS_STORED if self.has_student_reconciliation() else QUERY_INTEGRITY_TOTALS
+        row = self.execute_query(query)[0]
+        return {key: int(row[key] or 0) for key in ('daily_total', 'cumulative_total', 'difference')}
+
+    # ========== Grade Level Page Methods ==========
+
+    def get_grade_level_classes(self, date_filter: str = 'all') -> List[Dict[str, Any]]:
+        """
+        Get the unfiltered Grade Level class table for one date filter (cached).
+
+        Every class row depends only on its own students, so the grade/team
+        filtered tables, grade card rollups and gold/silver winners are all
+        derived in memory from this one result. Entries are reused until the
+        data changes; callers must copy rows before modifying them.
+
+        Args:
+            date_filter: 'all' or specific date (cumulative through date)
+
+        Returns:
+            get_grade_level_classes_query rows for every class, ordered by grade and teacher
+        """
+        version = self.get_data_version()
+        cached = self._grade_level_classes_cache.get(date_filter)
+        if cached and cached[0] == version:
+            return cached[1]
+
+        date_where = ""
+        if self.get_contest_context().is_log_date(date_filter):
+            date_where = f" AND dl.log_date <= '{date_filter}'"
+
+        classes = self.execute_query(get_grade_level_classes_query(date_where, "", ""))
+        self._grade_level_classes_cache[date_filter] = (version, classes)
+        return classes
+
     # ========== Students Page Methods ==========
 
+    def get_data_version(self) -> Tuple[int, Optional[int]]:
+        """
+        Get a cheap token that changes whenever the committed database contents change.
+
+        PRAGMA data_version is read on a private connection that never writes,
+        so it moves with every commit, including those made through the shared
+        connection, and ignores uncommitted writes that other threads' read
+        connections cannot see. While the shared connection has a write
+        transaction open its total_changes is included, so nothing computed
+        mid-transaction is reused after the commit or a rollback. Lets
+        in-memory caches be checked without re-running any aggregation, and is
+        comparable across threads that have their own read connection.
+        """
+        conn = self._get_shared_connection()
+        pending = conn.total_changes if conn.in_transaction else None
+        with self._version_lock:
+            if self._version_conn is None:
+                uri = Path(self.db_path).absolute().as_uri() + '?mode=ro'
+                self._version_conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            data_version = self._version_conn.execute("PRAGMA data_version").fetchone()[0]
+        return (data_version, pending)
+
+    def get_file_identity(self) -> Dict[str, Any]:
+        """
+        Identify the on-disk state of the database file without running SQL.
+
+        Every committed write rewrites the file, so modification time and size
+        change with it. Unlike get_data_version() the identity survives a
+        restart, which lets files rendered from the database (slide bundles)
+        be checked for staleness later.
+
+        Returns:
+            Dict with path (absolute), mtime_ns and size
+        """
+        path = Path(self.db_path).absolute()
+        stat = path.stat()
+        return {'path': str(path), 'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+
+    def get_contest_context(self) -> ContestContext:
+        """
+        Get the contest dates, roster, teams, grade rules and upload timestamps (cached).
+
+        The tab routes, student detail and ReportGenerator all start from these
+        facts, so they are loaded once and reused until the data changes.
+        """
+        version = self.get_data_version()
+        cached = self._contest_context
+        if cached and cached[0] == version:
+            return cached[1]
+
+        dates = self.get_all_dates()
+        roster = self.execute_query("""
+            SELECT student_name, grade_level, team_name, class_name, teacher_name
+            FROM Roster
+            ORDER BY student_name
+        """)
+        grade_rules = {row.pop('grade_level'): row for row in self.execute_query(
+            "SELECT grade_level, min_daily_minutes, max_daily_minutes_credit FROM Grade_Rules")}
+        last_uploads = {}
+        for file_type in ('daily', 'cumulative'):
+            result = self.execute_query(
+                "SELECT MAX(upload_timestamp) as last_updated FROM Upload_History WHERE file_type = ?",
+                (file_type,))
+            last_uploads[file_type] = result[0]['last_updated'] if result else None
+
+        context = ContestContext(dates, roster, grade_rules, last_uploads,
+                                 self._get_upload_summary())
+        self._contest_context = (version, context)
+        return context
+
+    def _get_upload_summary(self) -> str:
+        """Get formatted last upload timestamps for report metadata"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        # Get latest daily upload
+        cursor.execute("""
+            SELECT MAX(upload_timestamp), log_date
+            FROM Upload_History
+            WHERE log_date IS NOT NULL
+            ORDER BY upload_timestamp DESC
+            LIMIT 1
+        """)
+        daily_row = cursor.fetchone()
+
+        # Get latest cumulative upload
+        cursor.execute("""
+            SELECT MAX(upload_timestamp)
+            FROM Upload_History
+            WHERE log_date IS NULL
+            ORDER BY upload_timestamp DESC
+            LIMIT 1
+        """)
+        cumulative_row = cursor.fetchone()
+
+        parts = []
+        if daily_row and daily_row[0]:
+            parts.append(f"Daily Logs ({daily_row[1]}: {daily_row[0][:16]})")
+        if cumulative_row and cumulative_row[0]:
+            parts.append(f"Reader Cumulative ({cumulative_row[0][:16]})")
+
+        return ', '.join(parts) if parts else 'Not available'
+
+    def get_students_master(self, date_filter: str = 'all') -> Dict[str, Any]:
+        """
+        Get the unfiltered per-student aggregate for one date filter (cached).
+
+        The Students page table, banner, gold winners and silver winners are all
+        derived in memory from this one result, so changing the grade or team
+        filter never re-runs SQL. Entries are reused until the data changes.
+
+        Args:
+            date_filter: 'all' or specific date (cumulative through date)
+
+        Returns:
+            Dict with:
+            - students: One get_students_master_query row per Roster student
+            - total_days: Days with logs through date_filter
+            - total_contest_days: Days with logs in the whole contest
+        """
+        version = self.get_data_version()
+        cached = self._students_master_cache.get(date_filter)
+        if cached and cached[0] == version:
+            return cached[1]
+
+        date_where = ""
+        date_where_no_alias = ""
+
+        if date_filter != 'all':
+            date_where = f"AND dl.log_date <= '{date_filter}'"
+            date_where_no_alias = f"AND log_date <= '{date_filter}'"
+
+        # Get query from queries.py (no grade/team filter - filtering happens in memory)
+        query = get_students_master_query(date_where, date_where_no_alias)
+
+        contest = self.get_contest_context()
+        master = {
+            'students': self.execute_query(query),
+            'total_days': contest.days_through(date_filter),
+            'total_contest_days': contest.total_days
+        }
+
+        self._students_master_cache[date_filter] = (version, master)
+        return master
+
+    @staticmethod
+    def _filter_students(students: List[Dict[str, Any]], grade_filter: str = 'all',
+                         team_filter: str = 'all') -> List[Dict[str, Any]]:
+        """Apply grade/team filters to master student rows"""
+        return [s for s in students
+                if (grade_filter == 'all' or s['grade_level'] == grade_filter)
+                and (team_filter == 'all' or s['team_name'] == team_filter)]
+
+    def _max_student_metrics(self, students: List[Dict[str, Any]]) -> Dict[str, float]:
+        """Max value of each highlighted metric across the given student rows"""
+        winners = {}
+        for metric in self.STUDENT_WINNER_METRICS:
+            winners[metric] = max((s[metric] for s in students), default=None)
+        return winners
+
     def get_students_data(self, date_filter: str = 'all', grade_filter: str = 'all',
                           team_filter: str = 'all') -> List[Dict[str, Any]]:
         """
@@ -1598,27 +2383,8 @@ class ReadathonDB:
             - days_participated, participation_pct
             - days_met_goal, goal_met_pct
         """
-        # Build WHERE clauses
-        date_where = ""
-        date_where_no_alias = ""
-        grade_where = ""
-        team_where = ""
-
-        if date_filter != 'all':
-            date_where = f"AND dl.log_date <= '{date_filter}'"
-            date_where_no_alias = f"AND log_date <= '{date_filter}'"
-
-        if grade_filter != 'all':
-            grade_where = f"AND r.grade_level = '{grade_filter}'"
-
-        if team_filter != 'all':
-            team_where = f"AND r.team_name = '{team_filter}'"
-
-        # Get query from queries.py
-        query = get_students_master_query(date_where, date_where_no_alias, grade_where, team_where)
-
-        # Execute and return results
-        return self.execute_query(query)
+        master = self.get_students_master(date_filter)
+        return [dict(s) for s in self._filter_students(master['students'], grade_filter, team_filter)]
 
     def get_student_detail(self, student_name: str, date_filter: str = 'all') -> Dict[str, Any]:
         """
@@ -1653,6 +2419,75 @@ class ReadathonDB:
             'daily': daily_results
         }
 
+    STUDENT_DETAIL_SUMMARY_COLUMNS = (
+        'student_name', 'grade_level', 'team_name', 'class_name', 'teacher_name',
+        'fundraising', 'sponsors', 'total_capped', 'total_uncapped',
+        'days_participated', 'days_met_goal', 'grade_goal'
+    )
+    STUDENT_DETAIL_DAILY_COLUMNS = (
+        'log_date', 'actual_minutes', 'capped_minutes', 'exceeded_cap', 'met_goal', 'grade_goal'
+    )
+
+    def get_student_details_batch(self, student_names: Optional[List[str]] = None,
+                                  class_name: Optional[str] = None,
+                                  date_filter: str = 'all') -> Dict[str, Dict[str, list]]:
+        """
+        Get student detail for a whole class or a list of names with one query.
+
+        Same values as get_student_detail, in a columnar layout so a class worth
+        of details stays small on the wire. Unknown names are left out.
+
+        Args:
+            student_names: Names to include (ignored when class_name is given)
+            class_name: Include every student in this class
+            date_filter: 'all' or specific date (cumulative through date)
+
+        Returns:
+            Dict with:
+            - summary: {column: [value per student]}, students in name order
+            - daily: {column: [value per log entry]}, plus 'student' holding the
+              index of the entry's student in the summary columns
+        """
+        if class_name is not None:
+            student_where, params = "r.class_name = ?", (class_name,)
+        else:
+            student_where = "r.student_name IN (SELECT value FROM json_each(?))"
+            params = (json.dumps(list(student_names or [])),)
+
+        date_where = ""
+        if date_filter != 'all':
+            date_where = f"AND dl.log_date <= '{date_filter}'"
+
+        rows = self.execute_query(get_student_detail_batch_query(student_where, date_where), params)
+
+        summary = {column: [] for column in self.STUDENT_DETAIL_SUMMARY_COLUMNS}
+        daily = {'student': []}
+        daily.update({column: [] for column in self.STUDENT_DETAIL_DAILY_COLUMNS})
+        index = -1
+        for row in rows:
+            if index < 0 or row['student_name'] != summary['student_name'][index]:
+                index += 1
+                for column in self.STUDENT_DETAIL_SUMMARY_COLUMNS:
+                    summary[column].append(row.get(column, 0))
+            if row['log_date'] is None:
+                continue
+
+            # Same aggregates as the single-student summary query
+            minutes = row['actual_minutes']
+            if minutes is not None:
+                summary['total_capped'][index] += min(minutes, 120)
+                summary['total_uncapped'][index] += minutes
+                summary['days_participated'][index] += 1 if minutes > 0 else 0
+            summary['days_met_goal'][index] += row['met_goal'] if row['grade_goal'] is not None else 0
+
+            # The single-student daily query inner-joins Grade_Rules
+            if row['grade_goal'] is not None:
+                daily['student'].append(index)
+                for column in self.STUDENT_DETAIL_DAILY_COLUMNS:
+                    daily[column].append(row[column])
+
+        return {'summary': summary, 'daily': daily}
+
     def get_students_school_winners(self, date_filter: str = 'all') -> Dict[str, float]:
         """
         Get school-wide max values for each metric (gold highlights).
@@ -1668,26 +2503,13 @@ class ReadathonDB:
                 'minutes_capped': 720,
                 'minutes_uncapped': 850,
                 'days_participated': 6,
-                'days_met_goal': 6
+                'participation_pct': 100.0,
+                'days_met_goal': 6,
+                'goal_met_pct': 100.0
             }
         """
-        # Build WHERE clause for date filter
-        date_where = ""
-        if date_filter != 'all':
-            date_where = f"AND dl.log_date <= '{date_filter}'"
-
-        # Get query from queries.py
-        query = get_students_school_winners_query(date_where)
-
-        # Execute query
-        results = self.execute_query(query)
-
-        # Convert to dict
-        winners = {}
-        for row in results:
-            winners[row['metric']] = row['max_value']
-
-        return winners
+        master = self.get_students_master(date_filter)
+        return self._max_student_metrics(master['students'])
 
     def get_students_banner(self, date_filter: str = 'all', grade_filter: str = 'all',
                            team_filter: str = 'all') -> Dict[str, Any]:
@@ -1710,29 +2532,36 @@ class ReadathonDB:
             - goal_met_pct: % of students who met goal ≥1 day
             - total_students: Number of students in filtered group
         """
-        # Build WHERE clauses
-        date_where = ""
-        date_where_no_alias = ""
-        grade_where = ""
-        team_where = ""
-
-        if date_filter != 'all':
-            date_where = f"AND dl.log_date <= '{date_filter}'"
-            date_where_no_alias = f"AND log_date <= '{date_filter}'"
-
-        if grade_filter != 'all':
-            grade_where = f"AND r.grade_level = '{grade_filter}'"
+        master = self.get_students_master(date_filter)
+        students = self._filter_students(master['students'], grade_filter, team_filter)
 
-        if team_filter != 'all':
-            team_where = f"AND r.team_name = '{team_filter}'"
+        total_students = len(students)
+        total_days = master['total_days']
 
-        # Get query from queries.py
-        query = get_students_banner_query(date_where, date_where_no_alias, grade_where, team_where)
+        # Participation: student-days with reading / possible student-days
+        if total_students > 0 and total_days > 0:
+            days_participated = sum(s['days_participated'] for s in students)
+            avg_participation_pct = _sql_round(100.0 * days_participated / (total_students * total_days))
+        else:
+            avg_participation_pct = 0
 
-        # Execute query
-        results = self.execute_query(query)
+        # Goal Met (≥1 Day): students with at least one day at/above grade goal
+        if total_students > 0:
+            goal_met_count = len([s for s in students if s['days_met_goal'] > 0])
+            goal_met_pct = _sql_round(100.0 * goal_met_count / total_students)
+        else:
+            goal_met_pct = 0
 
-        return results[0] if results else {}
+        return {
+            'campaign_days': total_days,
+            'total_contest_days': master['total_contest_days'],
+            'total_fundraising': sum(s['fundraising'] for s in students),
+            'total_minutes': sum(s['minutes_capped'] for s in students),
+            'total_sponsors': sum(s['sponsors'] for s in students),
+            'avg_participation_pct': avg_participation_pct,
+            'goal_met_pct': goal_met_pct,
+            'total_students': total_students
+        }
 
     def get_students_grade_winners(self, date_filter: str = 'all') -> Dict[str, Dict[str, float]]:
         """
@@ -1747,121 +2576,16 @@ class ReadathonDB:
             Dict mapping grade_level -> Dict[metric_name -> max_value]
             Example: {'K': {'fundraising': 100, 'minutes_capped': 500, ...}, '1': {...}, ...}
         """
-        date_where = f"AND dl.log_date <= '{date_filter}'" if date_filter != 'all' else ""
-
-        query = f"""
-        -- Get max values for each metric within each grade
-        SELECT
-            r.grade_level,
-            'fundraising' as metric,
-            MAX(COALESCE(rc.donation_amount, 0)) as max_value
-        FROM Roster r
-        LEFT JOIN Reader_Cumulative rc ON r.student_name = rc.student_name
-        GROUP BY r.grade_level
-
-        UNION ALL
-
-        SELECT
-            r.grade_level,
-            'sponsors' as metric,
-            MAX(COALESCE(rc.sponsors, 0)) as max_value
-        FROM Roster r
-        LEFT JOIN Reader_Cumulative rc ON r.student_name = rc.student_name
-        GROUP BY r.grade_level
-
-        UNION ALL
-
-        SELECT grade_level, 'minutes_capped' as metric, MAX(total_capped) as max_value
-        FROM (
-            SELECT r.grade_level, COALESCE(SUM(MIN(dl.minutes_read, 120)), 0) as total_capped
-            FROM Roster r
-            LEFT JOIN Daily_Logs dl ON r.student_name = dl.student_name {date_where}
-            GROUP BY r.grade_level, r.student_name
-        )
-        GROUP BY grade_level
-
-        UNION ALL
-
-        SELECT grade_level, 'minutes_uncapped' as metric, MAX(total_uncapped) as max_value
-        FROM (
-            SELECT r.grade_level, COALESCE(SUM(dl.minutes_read), 0) as total_uncapped
-            FROM Roster r
-            LEFT JOIN Daily_Logs dl ON r.student_name = dl.student_name {date_where}
-            GROUP BY r.grade_level, r.student_name
-        )
-        GROUP BY grade_level
-
-        UNION ALL
-
-        SELECT grade_level, 'days_participated' as metric, MAX(days_participated) as max_value
-        FROM (
-            SELECT r.grade_level, COUNT(CASE WHEN dl.minutes_read > 0 THEN 1 END) as days_participated
-            FROM Roster r
-            LEFT JOIN Daily_Logs dl ON r.student_name = dl.student_name {date_where}
-            GROUP BY r.grade_level, r.student_name
-        )
-        GROUP BY grade_level
-
-        UNION ALL
-
-        SELECT grade_level, 'participation_pct' as metric, MAX(participation_pct) as max_value
-        FROM (
-            SELECT
-                r.grade_level,
-                CASE
-                    WHEN (SELECT COUNT(DISTINCT log_date) FROM Daily_Logs WHERE 1=1 {date_where}) > 0
-                    THEN ROUND(100.0 * COUNT(CASE WHEN dl.minutes_read > 0 THEN 1 END) / (SELECT COUNT(DISTINCT log_date) FROM Daily_Logs WHERE 1=1 {date_where}), 1)
-                    ELSE 0
-                END as participation_pct
-            FROM Roster r
-            LEFT JOIN Daily_Logs dl ON r.student_name = dl.student_name {date_where}
-            GROUP BY r.grade_level, r.student_name
-        )
-        GROUP BY grade_level
-
-        UNION ALL
-
-        SELECT grade_level, 'days_met_goal' as metric, MAX(days_met_goal) as max_value
-        FROM (
-            SELECT r.grade_level, COUNT(CASE WHEN dl.minutes_read >= gr.min_daily_minutes THEN 1 END) as days_met_goal
-            FROM Roster r
-            LEFT JOIN Daily_Logs dl ON r.student_name = dl.student_name {date_where}
-            LEFT JOIN Grade_Rules gr ON r.grade_level = gr.grade_level
-            GROUP BY r.grade_level, r.student_name
-        )
-        GROUP BY grade_level
-
-        UNION ALL
-
-        SELECT grade_level, 'goal_met_pct' as metric, MAX(goal_met_pct) as max_value
-        FROM (
-            SELECT
-                r.grade_level,
-                CASE
-                    WHEN COUNT(CASE WHEN dl.minutes_read > 0 THEN 1 END) > 0
-                    THEN ROUND(100.0 * COUNT(CASE WHEN dl.minutes_read >= gr.min_daily_minutes THEN 1 END) / COUNT(CASE WHEN dl.minutes_read > 0 THEN 1 END), 1)
-                    ELSE 0
-                END as goal_met_pct
-            FROM Roster r
-            LEFT JOIN Daily_Logs dl ON r.student_name = dl.student_name {date_where}
-            LEFT JOIN Grade_Rules gr ON r.grade_level = gr.grade_level
-            GROUP BY r.grade_level, r.student_name
-        )
-        GROUP BY grade_level
-        """
+        master = self.get_students_master(date_filter)
 
-        results = self.execute_query(query)
+        # Group master rows by grade, then take per-grade maxima
+        students_by_grade = {}
+        for student in master['students']:
+            students_by_grade.setdefault(student['grade_level'], []).append(student)
 
-        # Organize by grade -> metric -> value
         grade_winners = {}
-        for row in results:
-            grade = row['grade_level']
-            metric = row['metric']
-            value = row['max_value']
-
-            if grade not in grade_winners:
-                grade_winners[grade] = {}
-            grade_winners[grade][metric] = value
+        for grade, students in students_by_grade.items():
+            grade_winners[grade] = self._max_student_metrics(students)
 
         return grade_winners
 
@@ -1881,32 +2605,103 @@ class ReadathonDB:
         Returns:
             Dict mapping metric name to max value (same format as get_students_school_winners)
         """
-        # Build WHERE clauses
-        date_where = ""
-        grade_where = ""
-        team_where = ""
-
-        if date_filter != 'all':
-            date_where = f"AND dl.log_date <= '{date_filter}'"
-
-        if grade_filter != 'all':
-            grade_where = f"AND r.grade_level = '{grade_filter}'"
-
-        if team_filter != 'all':
-            team_where = f"AND r.team_name = '{team_filter}'"
+        master = self.get_students_master(date_filter)
+        students = self._filter_students(master['students'], grade_filter, team_filter)
+        return self._max_student_metrics(students)
+
+    @staticmethod
+    def _student_search_text(student: Dict[str, Any], days_in_filter: int) -> str:
+        """Lowercase text of a Students table row as displayed (what the search box matches)"""
+        return ' '.join([
+            str(student['student_name']), str(student['grade_level']), str(student['team_name']),
+            str(student['class_name']), str(student['teacher_name']),
+            f"${student['fundraising']:,.0f}", str(student['sponsors']),
+            f"{student['minutes_capped']:,.0f} min", f"{student['minutes_uncapped']:,.0f} min",
+            f"{student['days_participated']}/{days_in_filter}", f"{student['participation_pct']:.1f}%",
+            str(student['days_met_goal']), f"{student['goal_met_pct']:.1f}%"
+        ]).lower()
+
+    def get_students_page(self, date_filter: str = 'all', grade_filter: str = 'all',
+                          team_filter: str = 'all', search: str = '', sort_by: str = 'student_name',
+                          descending: bool = False, offset: int = 0, limit: int = 100) -> Dict[str, Any]:
+        """
+        Get one window of the Students table, filtered, searched and sorted in memory.
 
-        # Get query from queries.py
-        query = get_students_filtered_winners_query(date_where, grade_where, team_where)
+        Rows come from the cached master aggregate, so paging, sorting and searching
+        never re-run SQL. Each row carries precomputed highlight flags so the page
+        can render any window without the full winner tables.
 
-        # Execute query
-        results = self.execute_query(query)
+        Args:
+            date_filter: 'all' or specific date (cumulative through date)
+            grade_filter: 'all' or grade level
+            team_filter: 'all' or team name
+            search: Case-insensitive text matched against every displayed cell
+            sort_by: One of STUDENT_TABLE_COLUMNS (ties keep student name order)
+            descending: Sort direction
+            offset: First row of the window (after search and sort)
+            limit: Maximum rows in the window
 
-        # Convert to dict
-        winners = {}
-        for row in results:
-            winners[row['metric']] = row['max_value']
+        Returns:
+            Dict with:
+            - rows: Student rows, each with 'highlights' mapping metric -> 'school'
+              (gold, school-wide max) or 'grade' (silver, grade/filtered-group max)
+            - total: Students in the grade/team filter
+            - matched: Students left after the search
+            - offset, limit, sort_by, descending: The window actually returned
+            - highlight_mode: 'gold' (no grade/team filter) or 'silver'
+            - days_in_filter: Days with logs through date_filter
+        """
+        master = self.get_students_master(date_filter)
+        students = self._filter_students(master['students'], grade_filter, team_filter)
+        total = len(students)
+
+        # Same precedence the page has always used: gold, then filtered-group silver, then grade silver
+        school_winners = self._max_student_metrics(master['students'])
+        if grade_filter == 'all' and team_filter == 'all':
+            highlight_mode = 'gold'
+            filtered_winners = {}
+            grade_winners = self.get_students_grade_winners(date_filter)
+        else:
+            highlight_mode = 'silver'
+            filtered_winners = self._max_student_metrics(students)
+            grade_winners = {}
+
+        term = search.strip().lower()
+        if term:
+            students = [s for s in students if term in self._student_search_text(s, master['total_days'])]
+
+        if sort_by not in self.STUDENT_TABLE_COLUMNS:
+            sort_by = 'student_name'
+        students = sorted(students, key=lambda s: s['student_name'])
+        students.sort(key=lambda s: (s[sort_by] is None, s[sort_by]), reverse=descending)
+
+        offset = max(0, offset)
+        rows = []
+        for student in students[offset:offset + max(0, limit)]:
+            highlights = {}
+            for metric in self.STUDENT_WINNER_METRICS:
+                value = student[metric]
+                if value == school_winners.get(metric):
+                    highlights[metric] = 'school'
+                elif highlight_mode == 'silver' and value == filtered_winners.get(metric):
+                    highlights[metric] = 'grade'
+                elif grade_winners and value == grade_winners.get(student['grade_level'], {}).get(metric):
+                    highlights[metric] = 'grade'
+            row = dict(student)
+            row['highlights'] = highlights
+            rows.append(row)
 
-        return winners
+        return {
+            'rows': rows,
+            'total': total,
+            'matched': len(students),
+            'offset': offset,
+            'limit': limit,
+            'sort_by': sort_by,
+            'descending': descending,
+            'highlight_mode': highlight_mode,
+            'days_in_filter': master['total_days']
+        }
 
     def export_all_tables(self) -> Dict[str, List[Dict[str, Any]]]:
         """
@@ -1994,6 +2789,151 @@ class ReadathonDB:
         }
 
 
+class DatabaseHandleManager:
+    """
+    Process-wide shared database handles, one per file, with reference counting.
+
+    Every part of the app that needs a contest database or the registry
+    acquires it here instead of constructing its own ReadathonDB or
+    DatabaseRegistry, so each file is opened (and its schema initialized) once
+    and all callers share its connection and in-memory caches. A handle is
+    closed when its last reference is released. Long-lived owners (the app's
+    database cache, the comparison caches) keep their reference; short-lived
+    users take one with database() / registry().
+    """
+
+    def __init__(self):
+        self._handles = {}  # (handle class, absolute path) -> [handle, reference count]
+        self._lock = threading.Lock()
+
+    def _acquire(self, handle_class, path: str):
+        key = (handle_class, str(Path(path).absolute()))
+        with self._lock:
+            entry = self._handles.get(key)
+            if entry is None:
+                entry = self._handles[key] = [handle_class(path), 0]
+            entry[1] += 1
+            return entry[0]
+
+    def acquire(self, db_path: str) -> 'ReadathonDB':
+        """Shared ReadathonDB for db_path (one more reference; release() it when done)"""
+        return self._acquire(ReadathonDB, db_path)
+
+    def acquire_registry(self, registry_path: str = "db/readathon_registry.db") -> 'DatabaseRegistry':
+        """Shared DatabaseRegistry for registry_path (one more reference; release() it when done)"""
+        return self._acquire(DatabaseRegistry, registry_path)
+
+    def release(self, handle):
+        """Drop one reference to handle, closing it when none are left"""
+        with self._lock:
+            key = next((key for key, entry in self._handles.items() if entry[0] is handle), None)
+            if key is None:
+                return
+            entry = self._handles[key]
+            entry[1] -= 1
+            if entry[1] > 0:
+                return
+            del self._handles[key]
+        handle.close()
+
+    @contextmanager
+    def database(self, db_path: str):
+        """Shared ReadathonDB for the duration of the block"""
+        db = self.acquire(db_path)
+        try:
+            yield db
+        finally:
+            self.release(db)
+
+    @contextmanager
+    def registry(self, registry_path: str = "db/readathon_registry.db"):
+        """Shared DatabaseRegistry for the duration of the block"""
+        registry = self.acquire_registry(registry_path)
+        try:
+            yield registry
+        finally:
+            self.release(registry)
+
+    def get_stats(self) -> List[Dict[str, Any]]:
+        """Open handles with their reference counts"""
+        with self._lock:
+            return [{'type': handle_class.__name__, 'path': path, 'references': entry[1]}
+                    for (handle_class, path), entry in self._handles.items()]
+
+
+database_handles = DatabaseHandleManager()
+
+
+# Cached report results kept per database (keys include request parameters)
+REPORT_CACHE_MAX_ENTRIES = 256
+
+# last_updated of reports stamped with their generation time (refreshed when served from the cache)
+REPORT_TIMESTAMP_PREFIX = 'Report generated: '
+
+
+class NoDailyDataError(ValueError):
+    """A report needs a log date and no daily logs have been uploaded yet"""
+
+
+# Report registry: how each report is invoked, shared by every endpoint that runs reports
+#   method:         ReportGenerator method name
+#   params:         (request arg, default, type) in method call order; type None = pass as-is
+#   date_dependent: result varies with the 'date' arg
+#   requires_date:  missing date defaults to the latest log date (error if no logs yet)
+#   cacheable:      result depends only on database contents and params
+#   max_concurrent: simultaneous runs allowed per process (None = unlimited)
+REPORT_REGISTRY = {
+    'q1': {'method': 'q1_table_counts', 'params': [], 'date_dependent': False, 'requires_date': False, 'cacheable': True, 'max_concurrent': None},
+    'q2': {'method': 'q2_daily_summary', 'params': [('date', None, None), ('group_by', 'class', None)], 'date_dependent': True, 'requires_date': False, 'cacheable': True, 'max_concurrent': None},
+    'q3': {'method': 'q3_reader_cumulative_enhanced', 'params': [], 'date_dependent': False, 'requires_date': False, 'cacheable': True, 'max_concurrent': None},
+    # Random drawing - a fresh draw on every run
+    'q4': {'method': 'q4_prize_drawing', 'params': [('date', None, None), ('seed', None, int)], 'date_dependent': True, 'requires_date': True, 'cacheable': False, 'max_concurrent': None},
+    # Seeded draws for every date; reuses draws saved in Prize_Draws (saving is POST /api/prize_draws only)
+    'q4_batch': {'method': 'q4_prize_drawing_batch', 'params': [('seed', None, int), ('k', 1, int), ('weighted', False, None)], 'date_dependent': False, 'requires_date': False, 'cacheable': False, 'max_concurrent': 1},
+    'q5': {'method': 'q5_student_cumulative', 'params': [('sort_by', 'minutes', None), ('limit', None, int)], 'date_dependent': False, 'requires_date': False, 'cacheable': True, 'max_concurrent': None},
+    'q6': {'method': 'q6_class_participation', 'params': [], 'date_dependent': False, 'requires_date': False, 'cacheable': True, 'max_concurrent': None},
+    # Full denormalized log - largest result set
+    'q7': {'method': 'q7_complete_log', 'params': [('date', None, None)], 'date_dependent': True, 'requires_date': False, 'cacheable': True, 'max_concurrent': 2},
+    'q8': {'method': 'q8_student_reading_details', 'params': [], 'date_dependent': False, 'requires_date': False, 'cacheable': True, 'max_concurrent': None},
+    'q9': {'method': 'q9_most_donations_by_grade', 'params': [], 'date_dependent': False, 'requires_date': False, 'cacheable': True, 'max_concurrent': None},
+    'q10': {'method': 'q10_most_minutes_by_grade', 'params': [], 'date_dependent': False, 'requires_date': False, 'cacheable': True, 'max_concurrent': None},
+    'q11': {'method': 'q11_most_sponsors_by_grade', 'params': [], 'date_dependent': False, 'requires_date': False, 'cacheable': True, 'max_concurrent': None},
+    'q12': {'method': 'q12_best_class_by_grade_simplified', 'params': [], 'date_dependent': False, 'requires_date': False, 'cacheable': True, 'max_concurrent': None},
+    'q13': {'method': 'q13_overall_best_class_simplified', 'params': [], 'date_dependent': False, 'requires_date': False, 'cacheable': True, 'max_concurrent': None},
+    'q14': {'method': 'q14_team_participation', 'params': [], 'date_dependent': False, 'requires_date': False, 'cacheable': True, 'max_concurrent': None},
+    'q15': {'method': 'q15_goal_getters', 'params': [], 'date_dependent': False, 'requires_date': False, 'cacheable': True, 'max_concurrent': None},
+    'q16': {'method': 'q16_top_earner_per_team', 'params': [], 'date_dependent': False, 'requires_date': False, 'cacheable': True, 'max_concurrent': None},
+    'q18': {'method': 'q18_lead_class_by_grade', 'params': [], 'date_dependent': False, 'requires_date': False, 'cacheable': True, 'max_concurrent': None},
+    'q19': {'method': 'q19_team_minutes', 'params': [], 'date_dependent': False, 'requires_date': False, 'cacheable': True, 'max_concurrent': None},
+    'q20': {'method': 'q20_team_donations', 'params': [], 'date_dependent': False, 'requires_date': False, 'cacheable': True, 'max_concurrent': None},
+    'q21': {'method': 'q21_minutes_integrity_check', 'params': [], 'date_dependent': False, 'requires_date': False, 'cacheable': True, 'max_concurrent': None},
+    'q22': {'method': 'q22_student_name_sync_check', 'params': [], 'date_dependent': False, 'requires_date': False, 'cacheable': True, 'max_concurrent': None},
+    'q23': {'method': 'q23_roster_integrity_check', 'params': [], 'date_dependent': False, 'requires_date': False, 'cacheable': True, 'max_concurrent': None},
+    # Reads the separate registry database, so the contest DB's data version doesn't cover it
+    'q24': {'method': 'q24_database_metadata', 'params': [], 'date_dependent': False, 'requires_date': False, 'cacheable': False, 'max_concurrent': None},
+}
+
+# Process-wide concurrency limits for reports that declare max_concurrent
+_REPORT_SEMAPHORES = {
+    report_id: threading.BoundedSemaphore(spec['max_concurrent'])
+    for report_id, spec in REPORT_REGISTRY.items()
+    if spec['max_concurrent']
+}
+
+# Database comparisons: the most recently compared files keep a shared handle open
+# between calls (so their data version is comparable) and results are cached by
+# (file identity, data version); all bounded, since keys come from requests
+COMPARISON_OPEN_DATABASES = 16
+COMPARISON_CACHE_MAX_ENTRIES = 128
+
+_comparison_dbs = LRUCache(COMPARISON_OPEN_DATABASES,   # absolute path -> ReadathonDB reference
+                           on_evict=lambda path, db: database_handles.release(db))
+_comparison_side_cache = LRUCache(COMPARISON_CACHE_MAX_ENTRIES)  # (absolute path, filter_period) -> (stamp, results by query name)
+_comparison_cache = LRUCache(COMPARISON_CACHE_MAX_ENTRIES)       # (path1, path2, filter_period) -> ((stamp1, stamp2), comparisons)
+_comparison_lock = threading.Lock()
+_trend_cache = LRUCache(COMPARISON_CACHE_MAX_ENTRIES)            # (paths, filter_period) -> (stamps, trend)
+
+
 # Report generation functions
 class ReportGenerator:
     """Generates all Read-a-Thon reports"""
@@ -2001,42 +2941,108 @@ class ReportGenerator:
     def __init__(self, db: ReadathonDB):
         self.db = db
 
-    def _get_last_upload_timestamps(self) -> str:
-        """Get formatted last upload timestamps for metadata"""
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
+    def run_report(self, report_id: str, args: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Run a report by ID through REPORT_REGISTRY.
 
-        # Get latest daily upload
-        cursor.execute("""
-            SELECT MAX(upload_timestamp), log_date
-            FROM Upload_History
-            WHERE log_date IS NOT NULL
-            ORDER BY upload_timestamp DESC
-            LIMIT 1
-        """)
-        daily_row = cursor.fetchone()
+        Resolves the report's parameters from args (request args or a plain dict),
+        serves cacheable reports from the per-database cache while the data is
+        unchanged, applies the report's concurrency limit and records timing.
 
-        # Get latest cumulative upload
-        cursor.execute("""
-            SELECT MAX(upload_timestamp)
-            FROM Upload_History
-            WHERE log_date IS NULL
-            ORDER BY upload_timestamp DESC
-            LIMIT 1
-        """)
-        cumulative_row = cursor.fetchone()
+        Args:
+            report_id: Registry key (q1...q24)
+            args: Mapping with .get(); missing params fall back to registry defaults
 
-        parts = []
-        if daily_row and daily_row[0]:
-            parts.append(f"Daily Logs ({daily_row[1]}: {daily_row[0][:16]})")
-        if cumulative_row and cumulative_row[0]:
-            parts.append(f"Reader Cumulative ({cumulative_row[0][:16]})")
+        Returns:
+            Report result dict
 
-        return ', '.join(parts) if parts else 'Not available'
+        Raises:
+            KeyError: Unknown report_id
+            NoDailyDataError: Report requires a date and no daily logs exist yet
+        """
+        spec = REPORT_REGISTRY[report_id]
+        args = args or {}
+
+        params = []
+        for name, default, param_type in spec['params']:
+            value = args.get(name)
+            if value is None or value == '':
+                value = default
+            if param_type is not None and value is not None:
+                try:
+                    value = param_type(value)
+                except (TypeError, ValueError):
+                    value = default
+            params.append(value)
+
+        if spec['requires_date'] and params[0] is None:
+            params[0] = self.db.get_contest_context().latest_date
+            if params[0] is None:
+                raise NoDailyDataError('No data available')
+
+        cache_key = (report_id, tuple(params))
+        version = self.db.get_data_version() if spec['cacheable'] else None
+        if version is not None:
+            cached = self.db._report_cache.get(cache_key)
+            if cached and cached[0] == version:
+                self._record_report_run(report_id, 0.0, cache_hit=True)
+                result = dict(cached[1])
+                if str(result.get('last_updated', '')).startswith(REPORT_TIMESTAMP_PREFIX):
+                    result['last_updated'] = self._get_report_timestamp()  # when served, not when computed
+                return result
+
+        semaphore = _REPORT_SEMAPHORES.get(report_id)
+        if semaphore:
+            semaphore.acquire()
+        try:
+            start = time.perf_counter()
+            result = getattr(self, spec['method'])(*params)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+        finally:
+            if semaphore:
+                semaphore.release()
+
+        self._record_report_run(report_id, elapsed_ms, cache_hit=False)
+        if version is not None:
+            self.db._report_cache[cache_key] = (version, result)
+            result = dict(result)
+        return result
+
+    def _record_report_run(self, report_id: str, elapsed_ms: float, cache_hit: bool):
+        """Accumulate per-report run counters on the database object"""
+        with self.db._report_lock:
+            stats = self.db._report_stats.setdefault(report_id, {
+                'runs': 0, 'cache_hits': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'last_ms': 0.0
+            })
+            if cache_hit:
+                stats['cache_hits'] += 1
+                return
+            stats['runs'] += 1
+            stats['total_ms'] += elapsed_ms
+            stats['max_ms'] = max(stats['max_ms'], elapsed_ms)
+            stats['last_ms'] = elapsed_ms
+
+    def get_report_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get run counters for reports executed through run_report().
+
+        Returns:
+            Dict mapping report_id to runs, cache_hits, total_ms, max_ms, last_ms
+            and avg_ms (over non-cached runs)
+        """
+        with self.db._report_lock:
+            stats = {rid: dict(s) for rid, s in self.db._report_stats.items()}
+        for s in stats.values():
+            s['avg_ms'] = s['total_ms'] / s['runs'] if s['runs'] else 0.0
+        return stats
+
+    def _get_last_upload_timestamps(self) -> str:
+        """Get formatted last upload timestamps for metadata"""
+        return self.db.get_contest_context().upload_summary
 
     def _get_report_timestamp(self) -> str:
         """Get current timestamp for report generation"""
-        return f"Report generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}"
+        return f"{REPORT_TIMESTAMP_PREFIX}{datetime.now().strftime('%Y-%m-%d %H:%M')}"
 
     def q1_table_counts(self) -> Dict[str, Any]:
         """Q1: Total Row Count - utility report"""
@@ -2055,8 +3061,7 @@ class ReportGenerator:
             'last_updated': self._get_report_timestamp(),
             'metadata': {
                 'source_tables': 'All database tables (system query)',
-                'columns': COLUMN_METADATA['q1'],
-                'terms': get_report_terms('q1')
+                'key': 'q1'
             }
         }
 
@@ -2163,8 +3168,7 @@ class ReportGenerator:
             'last_updated': self._get_report_timestamp(),
             'metadata': {
                 'source_tables': 'Roster, Daily_Logs, Class_Info, Grade_Rules',
-                'columns': COLUMN_METADATA['q2'],
-                'terms': get_report_terms('q2')
+                'key': 'q2'
             }
         }
 
@@ -2204,31 +3208,22 @@ class ReportGenerator:
             'last_updated': self._get_report_timestamp(),
             'metadata': {
                 'source_tables': 'Reader_Cumulative, Roster, Daily_Logs, Grade_Rules',
-                'columns': COLUMN_METADATA['q3'],
-                'terms': get_report_terms('q3')
+                'key': 'q3'
             }
         }
 
-    def q4_prize_drawing(self, log_date: str) -> Dict[str, Any]:
-        """Q4/Slide 4: Prize Drawing Entrants - Daily random selection"""
+    @staticmethod
+    def _prize_rng(seed: Optional[int], log_date: str, grade: str):
+        """Random source for one date/grade drawing (independent per date/grade when seeded)"""
+        if seed is None:
+            return random
+        return random.Random(f"{seed}:{log_date}:{grade}")
 
-        # Get all students who met their daily reading goal on this date
-        query = """
-            SELECT DISTINCT
-                r.student_name,
-                r.grade_level,
-                r.class_name,
-                r.teacher_name,
-                dl.minutes_read,
-                gr.min_daily_minutes
-            FROM Roster r
-            INNER JOIN Daily_Logs dl ON r.student_name = dl.student_name
-            INNER JOIN Grade_Rules gr ON r.grade_level = gr.grade_level
-            WHERE dl.log_date = ? AND dl.minutes_read >= gr.min_daily_minutes
-            ORDER BY r.grade_level, r.student_name
-        """
+    def q4_prize_drawing(self, log_date: str, seed: Optional[int] = None) -> Dict[str, Any]:
+        """Q4/Slide 4: Prize Drawing Entrants - Daily random selection (reproducible when seeded)"""
 
-        participants = self.db.execute_query(query, (log_date,))
+        # Get all students who met their daily reading goal on this date
+        participants = self.db.execute_query(QUERY_Q4_PRIZE_DRAWING, (log_date,))
 
         # Group by grade
         by_grade = {}
@@ -2242,7 +3237,8 @@ class ReportGenerator:
         winners = []
         for grade in sorted(by_grade.keys()):
             if by_grade[grade]:
-                winner = random.choice(by_grade[grade])
+                rng = self._prize_rng(seed, log_date, grade)
+                winner = by_grade[grade][_draw_without_replacement(rng, len(by_grade[grade]), 1)[0]]
                 winner['total_eligible'] = len(by_grade[grade])
                 winners.append(winner)
 
@@ -2252,12 +3248,101 @@ class ReportGenerator:
             'columns': ['grade_level', 'student_name', 'class_name', 'teacher_name', 'minutes_read', 'min_daily_minutes', 'total_eligible'],
             'data': winners,
             'sort': 'grade_level (asc)',
-            'note': 'Winners are randomly selected each time this report runs',
+            'note': 'Winners are randomly selected each time this report runs' if seed is None
+                    else f'Seed {seed}: running again with the same seed draws the same winners',
             'last_updated': self._get_report_timestamp(),
             'metadata': {
                 'source_tables': 'Roster, Daily_Logs, Grade_Rules',
-                'columns': COLUMN_METADATA['q4'],
-                'terms': get_report_terms('q4')
+                'key': 'q4'
+            }
+        }
+
+    def q4_prize_drawing_batch(self, seed: Optional[int] = None, winners_per_grade: int = 1,
+                               weighted: Any = False, save: bool = False) -> Dict[str, Any]:
+        """
+        Q4 Batch: Prize drawing winners for every contest date at once.
+
+        Eligibility for all dates comes from one query. Each (date, grade) pool is
+        drawn without replacement from a Random seeded by (seed, date, grade), so
+        a date's winners don't change when later days are uploaded. Draws saved
+        in Prize_Draws are reused while that pool's eligibility (students and
+        minutes) is unchanged; nothing is written unless save is set.
+
+        Args:
+            seed: Drawing seed; None picks a random one (reported in the note)
+            winners_per_grade: Winners drawn per grade per date (k)
+            weighted: Weight entries by credited minutes (capped at the grade's
+                      max_daily_minutes_credit) using an AliasSampler
+            save: Store newly drawn pools in Prize_Draws (requires a seed)
+
+        Raises:
+            ValueError: save requested without a seed
+        """
+        if seed is None:
+            if save:
+                raise ValueError('Saving prize draws requires a seed')
+            seed = random.randrange(1, 1_000_000)
+        winners_per_grade = max(1, int(winners_per_grade or 1))
+        weighted = str(weighted).lower() in ('1', 'true', 'yes', 'on')
+
+        # Eligibility index: (date, grade) -> entrants, in one pass
+        pools = {}
+        for row in self.db.execute_query(QUERY_Q4_PRIZE_ELIGIBILITY_ALL_DATES):
+            pools.setdefault((row['log_date'], row['grade_level']), []).append(row)
+
+        persisted = self.db.get_prize_draws(seed, winners_per_grade, weighted)
+        new_draws = {}
+        results = []
+        for (log_date, grade), entrants in pools.items():
+            eligibility_hash = hashlib.sha1('|'.join(
+                f"{e['student_name']}:{e['credited_minutes']}" for e in entrants).encode()).hexdigest()
+            by_name = {e['student_name']: e for e in entrants}
+
+            draw = persisted.get((log_date, grade))
+            if draw and draw['eligibility_hash'] == eligibility_hash:
+                winners = [by_name[name] for name in draw['students']]
+            else:
+                rng = self._prize_rng(seed, log_date, grade)
+                weights = [e['credited_minutes'] for e in entrants] if weighted else None
+                winners = [entrants[i] for i in _draw_without_replacement(rng, len(entrants), winners_per_grade, weights)]
+                new_draws[(log_date, grade)] = {
+                    'eligibility_hash': eligibility_hash,
+                    'total_eligible': len(entrants),
+                    'students': [w['student_name'] for w in winners]
+                }
+
+            for rank, winner in enumerate(winners, start=1):
+                results.append({
+                    'log_date': log_date,
+                    'grade_level': grade,
+                    'draw_rank': rank,
+                    'student_name': winner['student_name'],
+                    'class_name': winner['class_name'],
+                    'teacher_name': winner['teacher_name'],
+                    'minutes_read': winner['minutes_read'],
+                    'min_daily_minutes': winner['min_daily_minutes'],
+                    'total_eligible': len(entrants)
+                })
+
+        if save and new_draws:
+            self.db.save_prize_draws(seed, winners_per_grade, weighted, new_draws)
+
+        return {
+            'title': 'Q4 Batch: Prize Drawing Winners - All Dates',
+            'description': f'{winners_per_grade} winner(s) per grade per date, drawn without replacement from students who met their daily reading goal'
+                           + (' (weighted by credited minutes)' if weighted else ''),
+            'columns': ['log_date', 'grade_level', 'draw_rank', 'student_name', 'class_name', 'teacher_name',
+                        'minutes_read', 'min_daily_minutes', 'total_eligible'],
+            'data': results,
+            'sort': 'log_date (desc), grade_level (asc), draw_rank (asc)',
+            'note': f'Seed {seed}: running again with the same seed draws the same winners',
+            'seed': seed,
+            'draw_stats': {'pools': len(pools), 'drawn': len(new_draws), 'reused': len(pools) - len(new_draws),
+                           'saved': len(new_draws) if save else 0},
+            'last_updated': self._get_report_timestamp(),
+            'metadata': {
+                'source_tables': 'Roster, Daily_Logs, Grade_Rules, Prize_Draws',
+                'key': 'q4'
             }
         }
 
@@ -2311,49 +3396,14 @@ class ReportGenerator:
             'last_updated': self._get_report_timestamp(),
             'metadata': {
                 'source_tables': 'Roster, Daily_Logs, Grade_Rules, Reader_Cumulative',
-                'columns': COLUMN_METADATA['q5'],
-                'terms': get_report_terms('q5')
+                'key': 'q5'
             }
         }
 
     def q6_class_participation(self) -> Dict[str, Any]:
         """Q6: Class Participation Winner - Cumulative"""
 
-        query = """
-            WITH TotalDays AS (
-                SELECT COUNT(DISTINCT log_date) as total_days
-                FROM Daily_Logs
-            ),
-            BonusData AS (
-                SELECT
-                    class_name,
-                    SUM(bonus_participation_points) as total_bonus
-                FROM Team_Color_Bonus
-                GROUP BY class_name
-            )
-            SELECT
-                r.class_name,
-                r.teacher_name,
-                r.grade_level,
-                r.team_name,
-                ci.total_students,
-                td.total_days as days_with_data,
-                COUNT(DISTINCT CASE WHEN dl.minutes_read > 0 THEN dl.log_date || '-' || r.student_name END) as total_participations_base,
-                COALESCE(bd.total_bonus, 0) as color_bonus_points,
-                COUNT(DISTINCT CASE WHEN dl.minutes_read > 0 THEN dl.log_date || '-' || r.student_name END) + COALESCE(bd.total_bonus, 0) as total_participations_with_color,
-                ROUND(100.0 * COUNT(DISTINCT CASE WHEN dl.minutes_read > 0 THEN dl.log_date || '-' || r.student_name END) /
-                      (ci.total_students * td.total_days), 2) as avg_participation_rate,
-                ROUND(100.0 * (COUNT(DISTINCT CASE WHEN dl.minutes_read > 0 THEN dl.log_date || '-' || r.student_name END) + COALESCE(bd.total_bonus, 0)) /
-                      (ci.total_students * td.total_days), 2) as avg_participation_rate_with_color
-            FROM Roster r
-            INNER JOIN Class_Info ci ON r.class_name = ci.class_name
-            CROSS JOIN TotalDays td
-            LEFT JOIN Daily_Logs dl ON r.student_name = dl.student_name
-            LEFT JOIN BonusData bd ON r.class_name = bd.class_name
-            GROUP BY r.class_name, r.teacher_name, r.grade_level, r.team_name, ci.total_students, td.total_days, bd.total_bonus
-            HAVING td.total_days > 0
-            ORDER BY avg_participation_rate_with_color DESC, r.class_name ASC
-        """
+        query = QUERY_Q6_CLASS_PARTICIPATION_STORED if self.db.has_reading_totals() else QUERY_Q6_CLASS_PARTICIPATION
 
         results = self.db.execute_query(query)
 
@@ -2378,8 +3428,7 @@ class ReportGenerator:
             'last_updated': self._get_report_timestamp(),
             'metadata': {
                 'source_tables': 'Roster, Class_Info, Daily_Logs, Team_Color_Bonus',
-                'columns': COLUMN_METADATA['q6'],
-                'terms': get_report_terms('q6')
+                'key': 'q6'
             }
         }
 
@@ -2421,46 +3470,14 @@ class ReportGenerator:
             'last_updated': self._get_report_timestamp(),
             'metadata': {
                 'source_tables': 'Daily_Logs, Roster',
-                'columns': COLUMN_METADATA['q7'],
-                'terms': get_report_terms('q7')
+                'key': 'q7'
             }
         }
 
     def q14_team_participation(self) -> Dict[str, Any]:
         """Q14/Slide 3: Team Participation Winner - Cumulative"""
 
-        query = """
-            WITH TotalDays AS (
-                SELECT COUNT(DISTINCT log_date) as total_days
-                FROM Daily_Logs
-            ),
-            TeamBonusData AS (
-                SELECT
-                    ci.team_name,
-                    SUM(tcb.bonus_participation_points) as total_bonus
-                FROM Team_Color_Bonus tcb
-                INNER JOIN Class_Info ci ON tcb.class_name = ci.class_name
-                GROUP BY ci.team_name
-            )
-            SELECT
-                r.team_name,
-                COUNT(DISTINCT r.student_name) as total_students,
-                td.total_days as days_with_data,
-                COUNT(DISTINCT CASE WHEN dl.minutes_read > 0 THEN dl.log_date || '-' || r.student_name END) as total_participations_base,
-                COALESCE(tbd.total_bonus, 0) as color_bonus_points,
-                COUNT(DISTINCT CASE WHEN dl.minutes_read > 0 THEN dl.log_date || '-' || r.student_name END) + COALESCE(tbd.total_bonus, 0) as total_participations_with_color,
-                ROUND(100.0 * COUNT(DISTINCT CASE WHEN dl.minutes_read > 0 THEN dl.log_date || '-' || r.student_name END) /
-                      (COUNT(DISTINCT r.student_name) * td.total_days), 2) as avg_participation_rate,
-                ROUND(100.0 * (COUNT(DISTINCT CASE WHEN dl.minutes_read > 0 THEN dl.log_date || '-' || r.student_name END) + COALESCE(tbd.total_bonus, 0)) /
-                      (COUNT(DISTINCT r.student_name) * td.total_days), 2) as avg_participation_rate_with_color
-            FROM Roster r
-            CROSS JOIN TotalDays td
-            LEFT JOIN Daily_Logs dl ON r.student_name = dl.student_name
-            LEFT JOIN TeamBonusData tbd ON r.team_name = tbd.team_name
-            GROUP BY r.team_name, td.total_days, tbd.total_bonus
-            HAVING td.total_days > 0
-            ORDER BY avg_participation_rate_with_color DESC
-        """
+        query = QUERY_Q14_TEAM_PARTICIPATION_STORED if self.db.has_reading_totals() else QUERY_Q14_TEAM_PARTICIPATION
 
         results = self.db.execute_query(query)
 
@@ -2482,70 +3499,14 @@ class ReportGenerator:
             'last_updated': self._get_report_timestamp(),
             'metadata': {
                 'source_tables': 'Roster, Daily_Logs, Class_Info, Team_Color_Bonus',
-                'columns': COLUMN_METADATA['q14'],
-                'terms': get_report_terms('q14')
+                'key': 'q14'
             }
         }
 
     def q18_lead_class_by_grade(self) -> Dict[str, Any]:
         """Q18/Slide 2: Lead Class by Grade - Cumulative"""
 
-        query = """
-            WITH TotalDays AS (
-                SELECT COUNT(DISTINCT log_date) as total_days
-                FROM Daily_Logs
-            ),
-            BonusData AS (
-                SELECT
-                    class_name,
-                    SUM(bonus_participation_points) as total_bonus
-                FROM Team_Color_Bonus
-                GROUP BY class_name
-            ),
-            ClassStats AS (
-                SELECT
-                    r.class_name,
-                    r.teacher_name,
-                    r.grade_level,
-                    r.team_name,
-                    ci.total_students,
-                    td.total_days as days_with_data,
-                    COUNT(DISTINCT CASE WHEN dl.minutes_read > 0 THEN dl.log_date || '-' || r.student_name END) as total_participations_base,
-                    COALESCE(bd.total_bonus, 0) as color_bonus_points,
-                    COUNT(DISTINCT CASE WHEN dl.minutes_read > 0 THEN dl.log_date || '-' || r.student_name END) + COALESCE(bd.total_bonus, 0) as total_participations_with_color,
-                    ROUND(100.0 * COUNT(DISTINCT CASE WHEN dl.minutes_read > 0 THEN dl.log_date || '-' || r.student_name END) /
-                          (ci.total_students * td.total_days), 2) as avg_participation_rate,
-                    ROUND(100.0 * (COUNT(DISTINCT CASE WHEN dl.minutes_read > 0 THEN dl.log_date || '-' || r.student_name END) + COALESCE(bd.total_bonus, 0)) /
-                          (ci.total_students * td.total_days), 2) as avg_participation_rate_with_color
-                FROM Roster r
-                INNER JOIN Class_Info ci ON r.class_name = ci.class_name
-                CROSS JOIN TotalDays td
-                LEFT JOIN Daily_Logs dl ON r.student_name = dl.student_name
-                LEFT JOIN BonusData bd ON r.class_name = bd.class_name
-                GROUP BY r.class_name, r.teacher_name, r.grade_level, r.team_name, ci.total_students, td.total_days, bd.total_bonus
-                HAVING td.total_days > 0
-            ),
-            MaxByGrade AS (
-                SELECT grade_level, MAX(avg_participation_rate_with_color) as max_rate
-                FROM ClassStats
-                GROUP BY grade_level
-            )
-            SELECT
-                cs.grade_level,
-                cs.class_name,
-                cs.teacher_name,
-                cs.team_name,
-                cs.total_students,
-                cs.days_with_data,
-                cs.total_participations_base,
-                cs.color_bonus_points,
-                cs.total_participations_with_color,
-                cs.avg_participation_rate,
-                cs.avg_participation_rate_with_color
-            FROM ClassStats cs
-            INNER JOIN MaxByGrade mbg ON cs.grade_level = mbg.grade_level AND cs.avg_participation_rate_with_color = mbg.max_rate
-            ORDER BY cs.grade_level ASC, cs.class_name ASC
-        """
+        query = QUERY_Q18_LEAD_CLASS_BY_GRADE_STORED if self.db.has_reading_totals() else QUERY_Q18_LEAD_CLASS_BY_GRADE
 
         results = self.db.execute_query(query)
 
@@ -2559,69 +3520,14 @@ class ReportGenerator:
             'last_updated': self._get_report_timestamp(),
             'metadata': {
                 'source_tables': 'Roster, Class_Info, Daily_Logs, Team_Color_Bonus',
-                'columns': COLUMN_METADATA['q18'],
-                'terms': get_report_terms('q18')
+                'key': 'q18'
             }
         }
 
     def q19_team_minutes(self) -> Dict[str, Any]:
         """Q19/Slide 5: Cumulative Team Minutes"""
 
-        query = """
-            WITH TeamBonusMinutes AS (
-                SELECT
-                    ci.team_name,
-                    SUM(tcb.bonus_minutes) as total_bonus
-                FROM Team_Color_Bonus tcb
-                INNER JOIN Class_Info ci ON tcb.class_name = ci.class_name
-                GROUP BY ci.team_name
-            ),
-            TeamTotals AS (
-                SELECT
-                    r.team_name,
-                    COUNT(DISTINCT r.student_name) as total_students,
-                    COALESCE(SUM(MIN(dl.minutes_read, 120)), 0) as total_minutes_base,
-                    COALESCE(SUM(MIN(dl.minutes_read, 120)), 0) / 60 as total_hours_base,
-                    COALESCE(tbm.total_bonus, 0) as bonus_minutes,
-                    COALESCE(SUM(MIN(dl.minutes_read, 120)), 0) + COALESCE(tbm.total_bonus, 0) as total_minutes_with_color,
-                    (COALESCE(SUM(MIN(dl.minutes_read, 120)), 0) + COALESCE(tbm.total_bonus, 0)) / 60 as total_hours_with_color,
-                    ROUND(1.0 * COALESCE(SUM(MIN(dl.minutes_read, 120)), 0) / COUNT(DISTINCT r.student_name), 1) as avg_minutes_per_student,
-                    ROUND(1.0 * (COALESCE(SUM(MIN(dl.minutes_read, 120)), 0) + COALESCE(tbm.total_bonus, 0)) / COUNT(DISTINCT r.student_name), 1) as avg_minutes_per_student_with_color
-                FROM Roster r
-                LEFT JOIN Daily_Logs dl ON r.student_name = dl.student_name
-                LEFT JOIN TeamBonusMinutes tbm ON r.team_name = tbm.team_name
-                GROUP BY r.team_name, tbm.total_bonus
-            ),
-            CombinedResults AS (
-                SELECT
-                    team_name,
-                    total_students,
-                    total_minutes_base,
-                    total_hours_base,
-                    bonus_minutes,
-                    total_minutes_with_color,
-                    total_hours_with_color,
-                    avg_minutes_per_student,
-                    avg_minutes_per_student_with_color
-                FROM TeamTotals
-                UNION ALL
-                SELECT
-                    'TOTAL' as team_name,
-                    SUM(total_students) as total_students,
-                    SUM(total_minutes_base) as total_minutes_base,
-                    SUM(total_hours_base) as total_hours_base,
-                    SUM(bonus_minutes) as bonus_minutes,
-                    SUM(total_minutes_with_color) as total_minutes_with_color,
-                    SUM(total_hours_with_color) as total_hours_with_color,
-                    ROUND(1.0 * SUM(total_minutes_base) / SUM(total_students), 1) as avg_minutes_per_student,
-                    ROUND(1.0 * SUM(total_minutes_with_color) / SUM(total_students), 1) as avg_minutes_per_student_with_color
-                FROM TeamTotals
-            )
-            SELECT * FROM CombinedResults
-            ORDER BY
-                CASE WHEN team_name = 'TOTAL' THEN 2 ELSE 1 END,
-                total_minutes_with_color DESC
-        """
+        query = QUERY_Q19_TEAM_MINUTES_STORED if self.db.has_reading_totals() else QUERY_Q19_TEAM_MINUTES
 
         results = self.db.execute_query(query)
 
@@ -2641,8 +3547,7 @@ Calculation Rules:<br>
             'last_updated': self._get_report_timestamp(),
             'metadata': {
                 'source_tables': 'Roster, Daily_Logs, Team_Color_Bonus, Class_Info',
-                'columns': COLUMN_METADATA['q19'],
-                'terms': get_report_terms('q19')
+                'key': 'q19'
             }
         }
 
@@ -2673,8 +3578,7 @@ Calculation Rules:<br>
             'last_updated': self._get_report_timestamp(),
             'metadata': {
                 'source_tables': 'Roster, Reader_Cumulative',
-                'columns': COLUMN_METADATA['q20'],
-                'terms': get_report_terms('q20')
+                'key': 'q20'
             }
         }
 
@@ -2682,61 +3586,27 @@ Calculation Rules:<br>
         """Q21: Data Sync & Minutes Integrity Check - Verify students are synced and daily minutes match cumulative"""
 
         # Get actual date range from Daily_Logs for dynamic display
-        date_range_query = """
-            SELECT
-                MIN(log_date) as min_date,
-                MAX(log_date) as max_date
-            FROM Daily_Logs
-        """
-        date_result = self.db.execute_query(date_range_query)
+        sorted_dates = self.db.get_contest_context().sorted_dates
 
         # Format dates as MM/DD
         date_range = None
-        if date_result and date_result[0]['min_date'] and date_result[0]['max_date']:
-            from datetime import datetime
-            min_date = datetime.strptime(date_result[0]['min_date'], '%Y-%m-%d')
-            max_date = datetime.strptime(date_result[0]['max_date'], '%Y-%m-%d')
+        if sorted_dates:
+            min_date = datetime.strptime(sorted_dates[0], '%Y-%m-%d')
+            max_date = datetime.strptime(sorted_dates[-1], '%Y-%m-%d')
             date_range = f"{min_date.month}/{min_date.day}-{max_date.month}/{max_date.day}"
 
-        query = """
-            SELECT
-                r.student_name,
-                r.team_name,
-                r.class_name,
-                COALESCE(SUM(dl.minutes_read), 0) as daily_minutes_sum,
-                COALESCE(SUM(MIN(dl.minutes_read, 120)), 0) as daily_minutes_capped,
-                COALESCE(rc.cumulative_minutes, 0) as cumulative_minutes,
-                COALESCE(rc.cumulative_minutes, 0) - COALESCE(SUM(dl.minutes_read), 0) as difference,
-                CASE
-                    WHEN COALESCE(rc.cumulative_minutes, 0) = COALESCE(SUM(dl.minutes_read), 0) THEN 'OK'
-                    WHEN rc.cumulative_minutes IS NULL AND SUM(dl.minutes_read) > 0 THEN 'MISSING_CUMULATIVE'
-                    WHEN rc.cumulative_minutes > 0 AND SUM(dl.minutes_read) IS NULL THEN 'MISSING_DAILY'
-                    WHEN COALESCE(rc.cumulative_minutes, 0) != COALESCE(SUM(dl.minutes_read), 0) THEN 'MINUTES_MISMATCH'
-                    ELSE 'NO_DATA'
-                END as status
-            FROM Roster r
-            LEFT JOIN Daily_Logs dl ON r.student_name = dl.student_name
-            LEFT JOIN Reader_Cumulative rc ON r.student_name = rc.student_name
-            GROUP BY r.student_name, r.team_name, r.class_name, rc.cumulative_minutes
-            HAVING status != 'NO_DATA'
-            ORDER BY
-                CASE status
-                    WHEN 'MINUTES_MISMATCH' THEN 1
-                    WHEN 'MISSING_CUMULATIVE' THEN 2
-                    WHEN 'MISSING_DAILY' THEN 3
-                    WHEN 'OK' THEN 4
-                END,
-                ABS(difference) DESC,
-                r.student_name ASC
-        """
+        if self.db.has_student_reconciliation():
+            query = QUERY_Q21_MINUTES_INTEGRITY_STORED
+        else:
+            query = QUERY_Q21_MINUTES_INTEGRITY
 
         results = self.db.execute_query(query)
 
         # Count issues
-        issues = [r for r in results if r['status'] != 'OK']
-        ok_count = len([r for r in results if r['status'] == 'OK'])
+        ok_count = sum(1 for r in results if r['status'] == 'OK')
+        issues_count = len(results) - ok_count
 
-        note = f"Found {len(issues)} discrepancies and {ok_count} matching records"
+        note = f"Found {issues_count} discrepancies and {ok_count} matching records"
 
         return {
             'title': 'Q21: Data Sync & Minutes Integrity Check',
@@ -2750,8 +3620,7 @@ Calculation Rules:<br>
             'last_updated': self._get_last_upload_timestamps(),
             'metadata': {
                 'source_tables': 'Daily_Logs, Reader_Cumulative (primary) • Roster (reference)',
-                'columns': COLUMN_METADATA['q21'],
-                'terms': get_report_terms('q21')
+                'key': 'q21'
             },
             'analysis': generate_q21_analysis(results, date_range=date_range)
         }
@@ -2788,39 +3657,17 @@ Calculation Rules:<br>
             'last_updated': self._get_report_timestamp(),
             'metadata': {
                 'source_tables': 'Roster, Daily_Logs, Grade_Rules',
-                'columns': COLUMN_METADATA['q8'],
-                'terms': get_report_terms('q8')
+                'key': 'q8'
             }
         }
 
     def q22_student_name_sync_check(self) -> Dict[str, Any]:
         """Q22: Student Name Sync Check - Verify students with reading minutes are synced between Daily_Logs and Reader_Cumulative"""
 
-        query = """
-            SELECT
-                COALESCE(dl.student_name, rc.student_name) as student_name,
-                CASE
-                    WHEN dl.student_name IS NOT NULL AND rc.student_name IS NOT NULL THEN 'OK'
-                    WHEN dl.student_name IS NOT NULL AND rc.student_name IS NULL THEN 'IN_DAILY_ONLY'
-                    WHEN dl.student_name IS NULL AND rc.student_name IS NOT NULL THEN 'IN_CUMULATIVE_ONLY'
-                END as status,
-                CASE WHEN dl.student_name IS NOT NULL THEN 'Yes' ELSE 'No' END as in_daily_logs,
-                CASE WHEN rc.student_name IS NOT NULL THEN 'Yes' ELSE 'No' END as in_reader_cumulative
-            FROM (
-                SELECT DISTINCT student_name FROM Daily_Logs WHERE minutes_read > 0
-            ) dl
-            FULL OUTER JOIN (
-                SELECT DISTINCT student_name FROM Reader_Cumulative WHERE cumulative_minutes > 0
-            ) rc ON dl.student_name = rc.student_name
-            WHERE dl.student_name IS NULL OR rc.student_name IS NULL
-            ORDER BY
-                CASE status
-                    WHEN 'IN_DAILY_ONLY' THEN 1
-                    WHEN 'IN_CUMULATIVE_ONLY' THEN 2
-                    ELSE 3
-                END,
-                student_name ASC
-        """
+        if self.db.has_student_reconciliation():
+            query = QUERY_Q22_STUDENT_NAME_SYNC_STORED
+        else:
+            query = QUERY_Q22_STUDENT_NAME_SYNC
 
         results = self.db.execute_query(query)
 
@@ -2847,8 +3694,7 @@ Calculation Rules:<br>
             'last_updated': self._get_last_upload_timestamps(),
             'metadata': {
                 'source_tables': 'Daily_Logs, Reader_Cumulative (primary)',
-                'columns': COLUMN_METADATA['q22'],
-                'terms': get_report_terms('q22')
+                'key': 'q22'
             },
             'analysis': generate_q22_analysis(results)
         }
@@ -2856,32 +3702,10 @@ Calculation Rules:<br>
     def q23_roster_integrity_check(self) -> Dict[str, Any]:
         """Q23: Roster Integrity Check - Verify all students in Daily_Logs and Reader_Cumulative exist in Roster"""
 
-        query = """
-            SELECT
-                student_name,
-                found_in_table,
-                CASE
-                    WHEN in_roster = 1 THEN 'OK'
-                    ELSE 'MISSING_FROM_ROSTER'
-                END as status
-            FROM (
-                SELECT
-                    student_name,
-                    'Daily_Logs' as found_in_table,
-                    (SELECT COUNT(*) FROM Roster WHERE Roster.student_name = dl.student_name) as in_roster
-                FROM (SELECT DISTINCT student_name FROM Daily_Logs WHERE minutes_read > 0) dl
-
-                UNION
-
-                SELECT
-                    student_name,
-                    'Reader_Cumulative' as found_in_table,
-                    (SELECT COUNT(*) FROM Roster WHERE Roster.student_name = rc.student_name) as in_roster
-                FROM (SELECT DISTINCT student_name FROM Reader_Cumulative) rc
-            )
-            WHERE in_roster = 0
-            ORDER BY student_name ASC, found_in_table ASC
-        """
+        if self.db.has_student_reconciliation():
+            query = QUERY_Q23_ROSTER_INTEGRITY_STORED
+        else:
+            query = QUERY_Q23_ROSTER_INTEGRITY
 
         results = self.db.execute_query(query)
 
@@ -2906,8 +3730,7 @@ Calculation Rules:<br>
             'last_updated': self._get_last_upload_timestamps(),
             'metadata': {
                 'source_tables': 'Daily_Logs, Reader_Cumulative, Roster',
-                'columns': COLUMN_METADATA['q23'],
-                'terms': get_report_terms('q23')
+                'key': 'q23'
             },
             'analysis': generate_q23_analysis(results)
         }
@@ -2915,8 +3738,8 @@ Calculation Rules:<br>
     def q24_database_metadata(self) -> Dict[str, Any]:
         """Q24: Database_Registry - Multi-Year Database Registry"""
         # Query the central registry database (separate from contest databases)
-        registry = DatabaseRegistry()
-        databases = registry.list_databases()
+        with database_handles.registry() as registry:
+            databases = registry.list_databases()
 
         # Format results for report display
         results = []
@@ -2943,22 +3766,7 @@ Calculation Rules:<br>
             'last_updated': self._get_report_timestamp(),
             'metadata': {
                 'source_tables': 'Database_Registry (db/readathon_registry.db - separate database file)',
-                'columns': {
-                    'db_id': 'Unique database identifier (auto-increment)',
-                    'year': 'School year for this database',
-                    'db_filename': 'Database filename (e.g., readathon_2026.db)',
-                    'description': 'Optional description of database',
-                    'created_timestamp': 'When database was registered',
-                    'status': 'ACTIVE or INACTIVE',
-                    'student_count': 'Number of students in Roster',
-                    'total_days': 'Number of reading days recorded',
-                    'total_donations': 'Total fundraising dollars'
-                },
-                'terms': {
-                    'Active Database': 'The currently selected database in use',
-                    'Registry': 'Central table in separate database tracking all year databases',
-                    'Multi-Year': 'System supports managing multiple school years'
-                }
+                'key': 'q24'
             }
         }
 
@@ -3001,8 +3809,7 @@ Calculation Rules:<br>
             'last_updated': self._get_report_timestamp(),
             'metadata': {
                 'source_tables': 'Roster, Reader_Cumulative',
-                'columns': COLUMN_METADATA['q9'],
-                'terms': get_report_terms('q9')
+                'key': 'q9'
             }
         }
 
@@ -3055,8 +3862,7 @@ Calculation Rules:<br>
             'last_updated': self._get_report_timestamp(),
             'metadata': {
                 'source_tables': 'Roster, Daily_Logs',
-                'columns': COLUMN_METADATA['q10'],
-                'terms': get_report_terms('q10')
+                'key': 'q10'
             }
         }
 
@@ -3099,66 +3905,14 @@ Calculation Rules:<br>
             'last_updated': self._get_report_timestamp(),
             'metadata': {
                 'source_tables': 'Roster, Reader_Cumulative',
-                'columns': COLUMN_METADATA['q11'],
-                'terms': get_report_terms('q11')
+                'key': 'q11'
             }
         }
 
     def q12_best_class_by_grade_simplified(self) -> Dict[str, Any]:
         """Q12: Best Class Per Grade - Simplified (1 winner per grade)"""
 
-        query = """
-            WITH TotalDays AS (
-                SELECT COUNT(DISTINCT log_date) as total_days
-                FROM Daily_Logs
-            ),
-            BonusData AS (
-                SELECT
-                    class_name,
-                    SUM(bonus_participation_points) as total_bonus
-                FROM Team_Color_Bonus
-                GROUP BY class_name
-            ),
-            ClassStats AS (
-                SELECT
-                    r.class_name,
-                    r.teacher_name,
-                    r.grade_level,
-                    r.team_name,
-                    ci.total_students,
-                    td.total_days as days_with_data,
-                    COUNT(DISTINCT CASE WHEN dl.minutes_read > 0 THEN dl.log_date || '-' || r.student_name END) as total_participations_base,
-                    COALESCE(bd.total_bonus, 0) as color_bonus_points,
-                    ROUND(100.0 * COUNT(DISTINCT CASE WHEN dl.minutes_read > 0 THEN dl.log_date || '-' || r.student_name END) /
-                          (ci.total_students * td.total_days), 2) as avg_participation_rate,
-                    ROUND(100.0 * (COUNT(DISTINCT CASE WHEN dl.minutes_read > 0 THEN dl.log_date || '-' || r.student_name END) + COALESCE(bd.total_bonus, 0)) /
-                          (ci.total_students * td.total_days), 2) as avg_participation_rate_with_color
-                FROM Roster r
-                INNER JOIN Class_Info ci ON r.class_name = ci.class_name
-                CROSS JOIN TotalDays td
-                LEFT JOIN Daily_Logs dl ON r.student_name = dl.student_name
-                LEFT JOIN BonusData bd ON r.class_name = bd.class_name
-                GROUP BY r.class_name, r.teacher_name, r.grade_level, r.team_name, ci.total_students, td.total_days, bd.total_bonus
-                HAVING td.total_days > 0
-            ),
-            MaxByGrade AS (
-                SELECT grade_level, MAX(avg_participation_rate_with_color) as max_rate
-                FROM ClassStats
-                GROUP BY grade_level
-            )
-            SELECT
-                cs.grade_level,
-                cs.class_name,
-                cs.teacher_name,
-                cs.team_name,
-                cs.total_participations_base,
-                cs.color_bonus_points,
-                cs.avg_participation_rate,
-                cs.avg_participation_rate_with_color
-            FROM ClassStats cs
-            INNER JOIN MaxByGrade mbg ON cs.grade_level = mbg.grade_level AND cs.avg_participation_rate_with_color = mbg.max_rate
-            ORDER BY cs.grade_level ASC, cs.class_name ASC
-        """
+        query = QUERY_Q12_BEST_CLASS_BY_GRADE
 
         results = self.db.execute_query(query)
 
@@ -3172,46 +3926,14 @@ Calculation Rules:<br>
             'last_updated': self._get_report_timestamp(),
             'metadata': {
                 'source_tables': 'Roster, Class_Info, Daily_Logs, Team_Color_Bonus',
-                'columns': COLUMN_METADATA['q12'],
-                'terms': get_report_terms('q12')
+                'key': 'q12'
             }
         }
 
     def q13_overall_best_class_simplified(self) -> Dict[str, Any]:
         """Q13: Overall Best Class in School - Simplified (1 winner school-wide)"""
 
-        query = """
-            WITH TotalDays AS (
-                SELECT COUNT(DISTINCT log_date) as total_days
-                FROM Daily_Logs
-            ),
-            BonusData AS (
-                SELECT
-                    class_name,
-                    SUM(bonus_participation_points) as total_bonus
-                FROM Team_Color_Bonus
-                GROUP BY class_name
-            )
-            SELECT
-                r.class_name,
-                r.teacher_name,
-                r.grade_level,
-                r.team_name,
-                COUNT(DISTINCT CASE WHEN dl.minutes_read > 0 THEN dl.log_date || '-' || r.student_name END) as total_participations_base,
-                COALESCE(bd.total_bonus, 0) as color_bonus_points,
-                ROUND(100.0 * COUNT(DISTINCT CASE WHEN dl.minutes_read > 0 THEN dl.log_date || '-' || r.student_name END) /
-                      (ci.total_students * td.total_days), 2) as avg_participation_rate,
-                ROUND(100.0 * (COUNT(DISTINCT CASE WHEN dl.minutes_read > 0 THEN dl.log_date || '-' || r.student_name END) + COALESCE(bd.total_bonus, 0)) /
-                      (ci.total_students * td.total_days), 2) as avg_participation_rate_with_color
-            FROM Roster r
-            INNER JOIN Class_Info ci ON r.class_name = ci.class_name
-            CROSS JOIN TotalDays td
-            LEFT JOIN Daily_Logs dl ON r.student_name = dl.student_name
-            LEFT JOIN BonusData bd ON r.class_name = bd.class_name
-            GROUP BY r.class_name, r.teacher_name, r.grade_level, r.team_name, ci.total_students, td.total_days, bd.total_bonus
-            HAVING td.total_days > 0
-            ORDER BY avg_participation_rate_with_color DESC, r.class_name ASC
-        """
+        query = QUERY_Q13_OVERALL_BEST_CLASS
 
         results = self.db.execute_query(query)
 
@@ -3235,45 +3957,14 @@ Calculation Rules:<br>
             'last_updated': self._get_report_timestamp(),
             'metadata': {
                 'source_tables': 'Roster, Class_Info, Daily_Logs, Team_Color_Bonus',
-                'columns': COLUMN_METADATA['q13'],
-                'terms': get_report_terms('q13')
+                'key': 'q13'
             }
         }
 
     def q15_goal_getters(self) -> Dict[str, Any]:
         """Q15: Goal Getters - All Students Who Met Goal Every Day (All qualifying students)"""
 
-        query = """
-            WITH TotalDays AS (
-                SELECT COUNT(DISTINCT log_date) as total_days
-                FROM Daily_Logs
-            ),
-            StudentGoalDays AS (
-                SELECT
-                    r.student_name,
-                    r.grade_level,
-                    r.team_name,
-                    r.class_name,
-                    COUNT(DISTINCT dl.log_date) as days_with_data,
-                    SUM(CASE WHEN dl.minutes_read >= gr.min_daily_minutes THEN 1 ELSE 0 END) as days_met_goal,
-                    td.total_days
-                FROM Roster r
-                CROSS JOIN TotalDays td
-                LEFT JOIN Daily_Logs dl ON r.student_name = dl.student_name
-                LEFT JOIN Grade_Rules gr ON r.grade_level = gr.grade_level
-                GROUP BY r.student_name, r.grade_level, r.team_name, r.class_name, td.total_days
-                HAVING days_met_goal = td.total_days AND days_with_data = td.total_days
-            )
-            SELECT
-                student_name,
-                grade_level,
-                days_met_goal,
-                total_days,
-                team_name,
-                class_name
-            FROM StudentGoalDays
-            ORDER BY grade_level ASC, student_name ASC
-        """
+        query = QUERY_Q15_GOAL_GETTERS
 
         results = self.db.execute_query(query)
 
@@ -3293,8 +3984,7 @@ Calculation Rules:<br>
             'last_updated': self._get_report_timestamp(),
             'metadata': {
                 'source_tables': 'Roster, Daily_Logs, Grade_Rules',
-                'columns': COLUMN_METADATA['q15'],
-                'terms': get_report_terms('q15')
+                'key': 'q15'
             }
         }
 
@@ -3337,11 +4027,94 @@ Calculation Rules:<br>
             'last_updated': self._get_report_timestamp(),
             'metadata': {
                 'source_tables': 'Roster, Reader_Cumulative',
-                'columns': COLUMN_METADATA['q16'],
-                'terms': get_report_terms('q16')
+                'key': 'q16'
             }
         }
 
+    @staticmethod
+    @contextmanager
+    def _comparison_db(db_filename: str):
+        """
+        Shared handle for a database being compared, held for the block.
+
+        The COMPARISON_OPEN_DATABASES most recently compared files also keep a
+        reference in _comparison_dbs between calls; evicting one releases that
+        reference, and the handle closes once no comparison still holds it.
+        """
+        path = str(Path('db', db_filename).absolute())
+        with database_handles.database(f'db/{db_filename}') as db:
+            with _comparison_lock:
+                if _comparison_dbs.get(path) is not db:
+                    _comparison_dbs[path] = database_handles.acquire(f'db/{db_filename}')
+            yield db
+
+    @staticmethod
+    def _get_comparison_stamp(db: 'ReadathonDB') -> Tuple[str, int, int, Tuple[int, int]]:
+        """(path, mtime_ns, size, data version) - changes whenever the database's contents may have"""
+        identity = db.get_file_identity()
+        return (identity['path'], identity['mtime_ns'], identity['size'], db.get_data_version())
+
+    @classmethod
+    def _load_comparison_sides(cls, sides: List[Tuple['ReadathonDB', tuple]], filter_period: str,
+                               queries: Dict[str, str]) -> List[Tuple[Dict[str, List[Dict[str, Any]]], float, bool]]:
+        """
+        Per-metric results for each (db, stamp) side, from the cache where still current.
+
+        Sides that are missing or stale are read from the database's stored
+        comparison snapshot when it is current; the rest run concurrently (each
+        file once, even when both sides are the same database). Either way they
+        are cached for later calls. queries are the per-level statements from
+        get_db_comparison_level_query; their rows are split back into one
+        result list per metric.
+
+        Returns:
+            One (results by metric name, elapsed_ms, cached) triple per side, in order
+        """
+        loaded = {}
+        for db, stamp in sides:
+            cached = _comparison_side_cache.get((stamp[0], filter_period))
+            if cached and cached[0] == stamp:
+                loaded[stamp[0]] = (cached[1], 0.0, True)
+
+        pending = {stamp[0]: (db, stamp) for db, stamp in sides if stamp[0] not in loaded}
+        for path, (db, stamp) in list(pending.items()):
+            start = time.perf_counter()
+            results = db.get_comparison_snapshot(filter_period)
+            if results is not None:
+                _comparison_side_cache[(path, filter_period)] = (stamp, results)
+                loaded[path] = (results, (time.perf_counter() - start) * 1000, False)
+                del pending[path]
+
+        if pending:
+            batches = cls._run_comparison_batches([db for db, _ in pending.values()], queries)
+            for (path, (_, stamp)), (level_rows, elapsed_ms) in zip(pending.items(), batches):
+                results = split_db_comparison_rows(level_rows)
+                _comparison_side_cache[(path, filter_period)] = (stamp, results)
+                loaded[path] = (results, elapsed_ms, False)
+
+        return [loaded[stamp[0]] for _, stamp in sides]
+
+    @staticmethod
+    def _run_comparison_batches(dbs: List['ReadathonDB'],
+                                queries: Dict[str, str]) -> List[Tuple[Dict[str, List[Dict[str, Any]]], float]]:
+        """
+        Run the same named query batch against each database concurrently.
+
+        Each database's batch runs on its own thread and read connection, so
+        the files are read at the same time instead of strictly interleaved.
+
+        Returns:
+            One (results by query name, elapsed_ms) pair per database, in order
+        """
+        def run_batch(db):
+            start = time.perf_counter()
+            with db.thread_read_connection():
+                results = {name: db.execute_query(query) for name, query in queries.items()}
+            return results, (time.perf_counter() - start) * 1000
+
+        with ThreadPoolExecutor(max_workers=len(dbs)) as pool:
+            return list(pool.map(run_batch, dbs))
+
     def _format_tied_winners(self, winners: List[Dict], name_field: str = 'student_name') -> Dict[str, Any]:
         """
         Format a list of tied winners into a display string and metadata.
@@ -3406,64 +4179,43 @@ Calculation Rules:<br>
                         'winner': 'db1' or 'db2' or 'tie'
                     },
                     ...
-                ]
+                ],
+                'timing': {'db1_ms': ..., 'db2_ms': ..., 'db1_cached': bool, 'db2_cached': bool}
             }
+
+        Each side's per-metric results, and the comparisons for the pair, are
+        cached by database file identity, data version and filter_period, so a
+        closed year's side is computed once and reused in every comparison.
         """
-        from queries import (
-            QUERY_DB_REGISTRY_LIST,
-            get_db_comparison_school_fundraising,
-            get_db_comparison_school_minutes,
-            get_db_comparison_school_sponsors,
-            get_db_comparison_school_participation,
-            get_db_comparison_school_size,
-            get_db_comparison_school_avg_participation,
-            get_db_comparison_school_goal_met,
-            get_db_comparison_school_all_days_active,
-            get_db_comparison_school_goal_met_all_days,
-            get_db_comparison_school_color_war_points,
-            get_db_comparison_student_top_fundraiser,
-            get_db_comparison_student_top_reader,
-            get_db_comparison_student_top_sponsors,
-            get_db_comparison_student_top_participation,
-            get_db_comparison_student_goal_met,
-            get_db_comparison_student_all_days_active,
-            get_db_comparison_student_goal_met_all_days,
-            get_db_comparison_student_avg_minutes_per_day,
-            get_db_comparison_student_total_days,
-            get_db_comparison_team_top,
-            get_db_comparison_team_sponsors,
-            get_db_comparison_team_participation,
-            get_db_comparison_team_avg_participation,
-            get_db_comparison_team_goal_met,
-            get_db_comparison_team_all_days_active,
-            get_db_comparison_team_goal_met_all_days,
-            get_db_comparison_team_color_war_points,
-            get_db_comparison_grade_top,
-            get_db_comparison_grade_sponsors,
-            get_db_comparison_grade_participation,
-            get_db_comparison_grade_avg_participation,
-            get_db_comparison_grade_goal_met,
-            get_db_comparison_grade_all_days_active,
-            get_db_comparison_grade_goal_met_all_days,
-            get_db_comparison_grade_color_war_points,
-            get_db_comparison_class_top,
-            get_db_comparison_class_sponsors,
-            get_db_comparison_class_participation,
-            get_db_comparison_class_avg_participation,
-            get_db_comparison_class_goal_met,
-            get_db_comparison_class_all_days_active,
-            get_db_comparison_class_goal_met_all_days,
-            get_db_comparison_class_color_war_points
-        )
+        from queries import DB_COMPARISON_LEVELS, get_db_comparison_level_query
 
         # Get database registry for metadata
-        registry = DatabaseRegistry()
-        db1_info = registry.get_database_by_name(db1_filename)
-        db2_info = registry.get_database_by_name(db2_filename)
+        with database_handles.registry() as registry:
+            db1_info = registry.get_database_by_name(db1_filename)
+            db2_info = registry.get_database_by_name(db2_filename)
+
+        # Shared handles for both databases, stamped with their current version
+        with self._comparison_db(db1_filename) as db1, self._comparison_db(db2_filename) as db2:
+            db1_stamp = self._get_comparison_stamp(db1)
+            db2_stamp = self._get_comparison_stamp(db2)
+
+            pair_key = (db1_stamp[0], db2_stamp[0], filter_period)
+            cached = _comparison_cache.get(pair_key)
+            if cached and cached[0] == (db1_stamp, db2_stamp):
+                return {
+                    'db1_info': db1_info,
+                    'db2_info': db2_info,
+                    'filter_period': filter_period,
+                    'comparisons': cached[1],
+                    'timing': {'db1_ms': 0.0, 'db2_ms': 0.0, 'db1_cached': True, 'db2_cached': True}
+                }
 
-        # Connect to both databases
-        db1 = ReadathonDB(f'db/{db1_filename}')
-        db2 = ReadathonDB(f'db/{db2_filename}')
+            # One consolidated query per entity level; each database runs the batch on its own connection
+            level_queries = {level: get_db_comparison_level_query(level, filter_period)
+                             for level in DB_COMPARISON_LEVELS}
+
+            (db1_results, db1_ms, db1_cached), (db2_results, db2_ms, db2_cached) = self._load_comparison_sides(
+                [(db1, db1_stamp), (db2, db2_stamp)], filter_period, level_queries)
 
         comparisons = []
 
@@ -3486,8 +4238,8 @@ Calculation Rules:<br>
 
         # School-level comparisons
         # School - Fundraising
-        db1_school_fundraising = db1.execute_query(get_db_comparison_school_fundraising(filter_period))[0]
-        db2_school_fundraising = db2.execute_query(get_db_comparison_school_fundraising(filter_period))[0]
+        db1_school_fundraising = db1_results['school_fundraising'][0]
+        db2_school_fundraising = db2_results['school_fundraising'][0]
 
         comparisons.append({
             'entity_level': 'School',
@@ -3507,8 +4259,8 @@ Calculation Rules:<br>
         })
 
         # School - Minutes
-        db1_school_minutes = db1.execute_query(get_db_comparison_school_minutes(filter_period))[0]
-        db2_school_minutes = db2.execute_query(get_db_comparison_school_minutes(filter_period))[0]
+        db1_school_minutes = db1_results['school_minutes'][0]
+        db2_school_minutes = db2_results['school_minutes'][0]
 
         comparisons.append({
             'entity_level': 'School',
@@ -3528,8 +4280,8 @@ Calculation Rules:<br>
         })
 
         # School - Sponsors
-        db1_school_sponsors = db1.execute_query(get_db_comparison_school_sponsors())[0]
-        db2_school_sponsors = db2.execute_query(get_db_comparison_school_sponsors())[0]
+        db1_school_sponsors = db1_results['school_sponsors'][0]
+        db2_school_sponsors = db2_results['school_sponsors'][0]
 
         comparisons.append({
             'entity_level': 'School',
@@ -3549,8 +4301,8 @@ Calculation Rules:<br>
         })
 
         # School - Participation
-        db1_school_participation = db1.execute_query(get_db_comparison_school_participation(filter_period))[0]
-        db2_school_participation = db2.execute_query(get_db_comparison_school_participation(filter_period))[0]
+        db1_school_participation = db1_results['school_participation'][0]
+        db2_school_participation = db2_results['school_participation'][0]
 
         comparisons.append({
             'entity_level': 'School',
@@ -3570,8 +4322,8 @@ Calculation Rules:<br>
         })
 
         # School - Size
-        db1_school_size = db1.execute_query(get_db_comparison_school_size())[0]
-        db2_school_size = db2.execute_query(get_db_comparison_school_size())[0]
+        db1_school_size = db1_results['school_size'][0]
+        db2_school_size = db2_results['school_size'][0]
 
         comparisons.append({
             'entity_level': 'School',
@@ -3592,8 +4344,8 @@ Calculation Rules:<br>
 
         # Student-level comparisons
         # Student - Fundraising
-        db1_student_fundraising_list = db1.execute_query(get_db_comparison_student_top_fundraiser())
-        db2_student_fundraising_list = db2.execute_query(get_db_comparison_student_top_fundraiser())
+        db1_student_fundraising_list = db1_results['student_top_fundraiser']
+        db2_student_fundraising_list = db2_results['student_top_fundraiser']
 
         db1_fundraising_fmt = self._format_tied_winners(db1_student_fundraising_list)
         db2_fundraising_fmt = self._format_tied_winners(db2_student_fundraising_list)
@@ -3623,8 +4375,8 @@ Calculation Rules:<br>
         })
 
         # Student - Minutes
-        db1_student_minutes_list = db1.execute_query(get_db_comparison_student_top_reader(filter_period))
-        db2_student_minutes_list = db2.execute_query(get_db_comparison_student_top_reader(filter_period))
+        db1_student_minutes_list = db1_results['student_top_reader']
+        db2_student_minutes_list = db2_results['student_top_reader']
 
         db1_minutes_fmt = self._format_tied_winners(db1_student_minutes_list)
         db2_minutes_fmt = self._format_tied_winners(db2_student_minutes_list)
@@ -3654,8 +4406,8 @@ Calculation Rules:<br>
         })
 
         # Student - Sponsors
-        db1_student_sponsors_list = db1.execute_query(get_db_comparison_student_top_sponsors())
-        db2_student_sponsors_list = db2.execute_query(get_db_comparison_student_top_sponsors())
+        db1_student_sponsors_list = db1_results['student_top_sponsors']
+        db2_student_sponsors_list = db2_results['student_top_sponsors']
 
         db1_sponsors_fmt = self._format_tied_winners(db1_student_sponsors_list)
         db2_sponsors_fmt = self._format_tied_winners(db2_student_sponsors_list)
@@ -3694,8 +4446,8 @@ Calculation Rules:<br>
 
         for metric_key, metric_name, honors_filter, format_type in team_metrics:
             # Get all tied winners for tie counting
-            db1_team_list = db1.execute_query(get_db_comparison_team_top(metric_key, filter_period if honors_filter else None))
-            db2_team_list = db2.execute_query(get_db_comparison_team_top(metric_key, filter_period if honors_filter else None))
+            db1_team_list = db1_results[f'team_top_{metric_key}']
+            db2_team_list = db2_results[f'team_top_{metric_key}']
 
             # Count ties and pick first winner
             db1_tie_count = len(db1_team_list)
@@ -3745,8 +4497,8 @@ Calculation Rules:<br>
 
         for metric_key, metric_name, honors_filter, format_type in grade_metrics:
             # Get all tied winners for tie counting
-            db1_grade_list = db1.execute_query(get_db_comparison_grade_top(metric_key, filter_period if honors_filter else None))
-            db2_grade_list = db2.execute_query(get_db_comparison_grade_top(metric_key, filter_period if honors_filter else None))
+            db1_grade_list = db1_results[f'grade_top_{metric_key}']
+            db2_grade_list = db2_results[f'grade_top_{metric_key}']
 
             # Count ties and pick first winner
             db1_tie_count = len(db1_grade_list)
@@ -3796,8 +4548,8 @@ Calculation Rules:<br>
 
         for metric_key, metric_name, honors_filter, format_type in class_metrics:
             # Get all tied winners for tie counting
-            db1_class_list = db1.execute_query(get_db_comparison_class_top(metric_key, filter_period if honors_filter else None))
-            db2_class_list = db2.execute_query(get_db_comparison_class_top(metric_key, filter_period if honors_filter else None))
+            db1_class_list = db1_results[f'class_top_{metric_key}']
+            db2_class_list = db2_results[f'class_top_{metric_key}']
 
             # Count ties and pick first winner
             db1_tie_count = len(db1_class_list)
@@ -3843,8 +4595,8 @@ Calculation Rules:<br>
 
         # Additional School-level comparisons
         # School - Avg Participation % (With Color)
-        db1_school_avg_part = db1.execute_query(get_db_comparison_school_avg_participation(filter_period))[0]
-        db2_school_avg_part = db2.execute_query(get_db_comparison_school_avg_participation(filter_period))[0]
+        db1_school_avg_part = db1_results['school_avg_participation'][0]
+        db2_school_avg_part = db2_results['school_avg_participation'][0]
 
         comparisons.append({
             'entity_level': 'School',
@@ -3864,8 +4616,8 @@ Calculation Rules:<br>
         })
 
         # School - Goal Met (≥1 Day)
-        db1_school_goal = db1.execute_query(get_db_comparison_school_goal_met(filter_period))[0]
-        db2_school_goal = db2.execute_query(get_db_comparison_school_goal_met(filter_period))[0]
+        db1_school_goal = db1_results['school_goal_met'][0]
+        db2_school_goal = db2_results['school_goal_met'][0]
 
         comparisons.append({
             'entity_level': 'School',
@@ -3885,8 +4637,8 @@ Calculation Rules:<br>
         })
 
         # School - All N Days Active %
-        db1_school_all_days_result = db1.execute_query(get_db_comparison_school_all_days_active(filter_period))
-        db2_school_all_days_result = db2.execute_query(get_db_comparison_school_all_days_active(filter_period))
+        db1_school_all_days_result = db1_results['school_all_days_active']
+        db2_school_all_days_result = db2_results['school_all_days_active']
 
         # Handle case where no students logged every day
         db1_school_all_days = db1_school_all_days_result[0] if db1_school_all_days_result else {
@@ -3914,8 +4666,8 @@ Calculation Rules:<br>
         })
 
         # School - Goal Met All Days %
-        db1_school_goal_all_result = db1.execute_query(get_db_comparison_school_goal_met_all_days(filter_period))
-        db2_school_goal_all_result = db2.execute_query(get_db_comparison_school_goal_met_all_days(filter_period))
+        db1_school_goal_all_result = db1_results['school_goal_met_all_days']
+        db2_school_goal_all_result = db2_results['school_goal_met_all_days']
 
         # Handle case where no students met goal every day
         db1_school_goal_all = db1_school_goal_all_result[0] if db1_school_goal_all_result else {
@@ -3943,8 +4695,8 @@ Calculation Rules:<br>
         })
 
         # School - Color War Points
-        db1_school_points = db1.execute_query(get_db_comparison_school_color_war_points())[0]
-        db2_school_points = db2.execute_query(get_db_comparison_school_color_war_points())[0]
+        db1_school_points = db1_results['school_color_war_points'][0]
+        db2_school_points = db2_results['school_color_war_points'][0]
 
         comparisons.append({
             'entity_level': 'School',
@@ -3965,8 +4717,8 @@ Calculation Rules:<br>
 
         # Additional Team-level comparisons
         # Team - Sponsors
-        db1_team_sponsors = db1.execute_query(get_db_comparison_team_sponsors())[0]
-        db2_team_sponsors = db2.execute_query(get_db_comparison_team_sponsors())[0]
+        db1_team_sponsors = db1_results['team_sponsors'][0]
+        db2_team_sponsors = db2_results['team_sponsors'][0]
 
         comparisons.append({
             'entity_level': 'Team',
@@ -3988,8 +4740,8 @@ Calculation Rules:<br>
         })
 
         # Team - Total Participating (≥1 Day)
-        db1_team_part = db1.execute_query(get_db_comparison_team_participation(filter_period))[0]
-        db2_team_part = db2.execute_query(get_db_comparison_team_participation(filter_period))[0]
+        db1_team_part = db1_results['team_participation'][0]
+        db2_team_part = db2_results['team_participation'][0]
 
         comparisons.append({
             'entity_level': 'Team',
@@ -4011,8 +4763,8 @@ Calculation Rules:<br>
         })
 
         # Team - Avg Participation % (With Color)
-        db1_team_avg = db1.execute_query(get_db_comparison_team_avg_participation(filter_period))[0]
-        db2_team_avg = db2.execute_query(get_db_comparison_team_avg_participation(filter_period))[0]
+        db1_team_avg = db1_results['team_avg_participation'][0]
+        db2_team_avg = db2_results['team_avg_participation'][0]
 
         comparisons.append({
             'entity_level': 'Team',
@@ -4034,8 +4786,8 @@ Calculation Rules:<br>
         })
 
         # Team - Goal Met (≥1 Day)
-        db1_team_goal = db1.execute_query(get_db_comparison_team_goal_met(filter_period))[0]
-        db2_team_goal = db2.execute_query(get_db_comparison_team_goal_met(filter_period))[0]
+        db1_team_goal = db1_results['team_goal_met'][0]
+        db2_team_goal = db2_results['team_goal_met'][0]
 
         comparisons.append({
             'entity_level': 'Team',
@@ -4057,8 +4809,8 @@ Calculation Rules:<br>
         })
 
         # Team - All N Days Active %
-        db1_team_all_days_result = db1.execute_query(get_db_comparison_team_all_days_active(filter_period))
-        db2_team_all_days_result = db2.execute_query(get_db_comparison_team_all_days_active(filter_period))
+        db1_team_all_days_result = db1_results['team_all_days_active']
+        db2_team_all_days_result = db2_results['team_all_days_active']
 
         # Handle case where no team has all students active every day
         db1_team_all_days = db1_team_all_days_result[0] if db1_team_all_days_result else {
@@ -4088,8 +4840,8 @@ Calculation Rules:<br>
         })
 
         # Team - Goal Met All Days %
-        db1_team_goal_all_result = db1.execute_query(get_db_comparison_team_goal_met_all_days(filter_period))
-        db2_team_goal_all_result = db2.execute_query(get_db_comparison_team_goal_met_all_days(filter_period))
+        db1_team_goal_all_result = db1_results['team_goal_met_all_days']
+        db2_team_goal_all_result = db2_results['team_goal_met_all_days']
 
         # Handle case where no team has students who met goal every day
         db1_team_goal_all = db1_team_goal_all_result[0] if db1_team_goal_all_result else {
@@ -4119,8 +4871,8 @@ Calculation Rules:<br>
         })
 
         # Team - Color War Points
-        db1_team_points = db1.execute_query(get_db_comparison_team_color_war_points())[0]
-        db2_team_points = db2.execute_query(get_db_comparison_team_color_war_points())[0]
+        db1_team_points = db1_results['team_color_war_points'][0]
+        db2_team_points = db2_results['team_color_war_points'][0]
 
         comparisons.append({
             'entity_level': 'Team',
@@ -4143,8 +4895,8 @@ Calculation Rules:<br>
 
         # Additional Grade-level comparisons
         # Grade - Sponsors
-        db1_grade_sponsors = db1.execute_query(get_db_comparison_grade_sponsors())[0]
-        db2_grade_sponsors = db2.execute_query(get_db_comparison_grade_sponsors())[0]
+        db1_grade_sponsors = db1_results['grade_sponsors'][0]
+        db2_grade_sponsors = db2_results['grade_sponsors'][0]
 
         comparisons.append({
             'entity_level': 'Grade',
@@ -4166,8 +4918,8 @@ Calculation Rules:<br>
         })
 
         # Grade - Total Participating (≥1 Day)
-        db1_grade_part = db1.execute_query(get_db_comparison_grade_participation(filter_period))[0]
-        db2_grade_part = db2.execute_query(get_db_comparison_grade_participation(filter_period))[0]
+        db1_grade_part = db1_results['grade_participation'][0]
+        db2_grade_part = db2_results['grade_participation'][0]
 
         comparisons.append({
             'entity_level': 'Grade',
@@ -4189,8 +4941,8 @@ Calculation Rules:<br>
         })
 
         # Grade - Avg Participation % (With Color)
-        db1_grade_avg = db1.execute_query(get_db_comparison_grade_avg_participation(filter_period))[0]
-        db2_grade_avg = db2.execute_query(get_db_comparison_grade_avg_participation(filter_period))[0]
+        db1_grade_avg = db1_results['grade_avg_participation'][0]
+        db2_grade_avg = db2_results['grade_avg_participation'][0]
 
         comparisons.append({
             'entity_level': 'Grade',
@@ -4212,8 +4964,8 @@ Calculation Rules:<br>
         })
 
         # Grade - Goal Met (≥1 Day)
-        db1_grade_goal = db1.execute_query(get_db_comparison_grade_goal_met(filter_period))[0]
-        db2_grade_goal = db2.execute_query(get_db_comparison_grade_goal_met(filter_period))[0]
+        db1_grade_goal = db1_results['grade_goal_met'][0]
+        db2_grade_goal = db2_results['grade_goal_met'][0]
 
         comparisons.append({
             'entity_level': 'Grade',
@@ -4235,8 +4987,8 @@ Calculation Rules:<br>
         })
 
         # Grade - All N Days Active %
-        db1_grade_all_days_result = db1.execute_query(get_db_comparison_grade_all_days_active(filter_period))
-        db2_grade_all_days_result = db2.execute_query(get_db_comparison_grade_all_days_active(filter_period))
+        db1_grade_all_days_result = db1_results['grade_all_days_active']
+        db2_grade_all_days_result = db2_results['grade_all_days_active']
 
         # Handle case where no grade has all students active every day
         db1_grade_all_days = db1_grade_all_days_result[0] if db1_grade_all_days_result else {
@@ -4266,8 +5018,8 @@ Calculation Rules:<br>
         })
 
         # Grade - Goal Met All Days %
-        db1_grade_goal_all_result = db1.execute_query(get_db_comparison_grade_goal_met_all_days(filter_period))
-        db2_grade_goal_all_result = db2.execute_query(get_db_comparison_grade_goal_met_all_days(filter_period))
+        db1_grade_goal_all_result = db1_results['grade_goal_met_all_days']
+        db2_grade_goal_all_result = db2_results['grade_goal_met_all_days']
 
         # Handle case where no grade has students who met goal every day
         db1_grade_goal_all = db1_grade_goal_all_result[0] if db1_grade_goal_all_result else {
@@ -4297,8 +5049,8 @@ Calculation Rules:<br>
         })
 
         # Grade - Color War Points
-        db1_grade_points = db1.execute_query(get_db_comparison_grade_color_war_points())[0]
-        db2_grade_points = db2.execute_query(get_db_comparison_grade_color_war_points())[0]
+        db1_grade_points = db1_results['grade_color_war_points'][0]
+        db2_grade_points = db2_results['grade_color_war_points'][0]
 
         comparisons.append({
             'entity_level': 'Grade',
@@ -4321,8 +5073,8 @@ Calculation Rules:<br>
 
         # Additional Class-level comparisons
         # Class - Sponsors
-        db1_class_sponsors = db1.execute_query(get_db_comparison_class_sponsors())[0]
-        db2_class_sponsors = db2.execute_query(get_db_comparison_class_sponsors())[0]
+        db1_class_sponsors = db1_results['class_sponsors'][0]
+        db2_class_sponsors = db2_results['class_sponsors'][0]
 
         comparisons.append({
             'entity_level': 'Class',
@@ -4344,8 +5096,8 @@ Calculation Rules:<br>
         })
 
         # Class - Total Participating (≥1 Day)
-        db1_class_part = db1.execute_query(get_db_comparison_class_participation(filter_period))[0]
-        db2_class_part = db2.execute_query(get_db_comparison_class_participation(filter_period))[0]
+        db1_class_part = db1_results['class_participation'][0]
+        db2_class_part = db2_results['class_participation'][0]
 
         comparisons.append({
             'entity_level': 'Class',
@@ -4367,8 +5119,8 @@ Calculation Rules:<br>
         })
 
         # Class - Avg Participation % (With Color)
-        db1_class_avg = db1.execute_query(get_db_comparison_class_avg_participation(filter_period))[0]
-        db2_class_avg = db2.execute_query(get_db_comparison_class_avg_participation(filter_period))[0]
+        db1_class_avg = db1_results['class_avg_participation'][0]
+        db2_class_avg = db2_results['class_avg_participation'][0]
 
         comparisons.append({
             'entity_level': 'Class',
@@ -4390,8 +5142,8 @@ Calculation Rules:<br>
         })
 
         # Class - Goal Met (≥1 Day)
-        db1_class_goal = db1.execute_query(get_db_comparison_class_goal_met(filter_period))[0]
-        db2_class_goal = db2.execute_query(get_db_comparison_class_goal_met(filter_period))[0]
+        db1_class_goal = db1_results['class_goal_met'][0]
+        db2_class_goal = db2_results['class_goal_met'][0]
 
         comparisons.append({
             'entity_level': 'Class',
@@ -4413,8 +5165,8 @@ Calculation Rules:<br>
         })
 
         # Class - All N Days Active %
-        db1_class_all_days_result = db1.execute_query(get_db_comparison_class_all_days_active(filter_period))
-        db2_class_all_days_result = db2.execute_query(get_db_comparison_class_all_days_active(filter_period))
+        db1_class_all_days_result = db1_results['class_all_days_active']
+        db2_class_all_days_result = db2_results['class_all_days_active']
 
         # Handle case where no class has all students active every day
         db1_class_all_days = db1_class_all_days_result[0] if db1_class_all_days_result else {
@@ -4446,8 +5198,8 @@ Calculation Rules:<br>
         })
 
         # Class - Goal Met All Days %
-        db1_class_goal_all_result = db1.execute_query(get_db_comparison_class_goal_met_all_days(filter_period))
-        db2_class_goal_all_result = db2.execute_query(get_db_comparison_class_goal_met_all_days(filter_period))
+        db1_class_goal_all_result = db1_results['class_goal_met_all_days']
+        db2_class_goal_all_result = db2_results['class_goal_met_all_days']
 
         # Handle case where no class has students who met goal every day
         db1_class_goal_all = db1_class_goal_all_result[0] if db1_class_goal_all_result else {
@@ -4479,8 +5231,8 @@ Calculation Rules:<br>
         })
 
         # Class - Color War Points
-        db1_class_points = db1.execute_query(get_db_comparison_class_color_war_points())[0]
-        db2_class_points = db2.execute_query(get_db_comparison_class_color_war_points())[0]
+        db1_class_points = db1_results['class_color_war_points'][0]
+        db2_class_points = db2_results['class_color_war_points'][0]
 
         comparisons.append({
             'entity_level': 'Class',
@@ -4503,8 +5255,8 @@ Calculation Rules:<br>
 
         # Additional Student-level comparisons
         # Student - Participation %
-        db1_student_part_list = db1.execute_query(get_db_comparison_student_top_participation(filter_period))
-        db2_student_part_list = db2.execute_query(get_db_comparison_student_top_participation(filter_period))
+        db1_student_part_list = db1_results['student_top_participation']
+        db2_student_part_list = db2_results['student_top_participation']
 
         db1_part_fmt = self._format_tied_winners(db1_student_part_list)
         db2_part_fmt = self._format_tied_winners(db2_student_part_list)
@@ -4534,8 +5286,8 @@ Calculation Rules:<br>
         })
 
         # Student - Goal Met (Days)
-        db1_student_goal_list = db1.execute_query(get_db_comparison_student_goal_met(filter_period))
-        db2_student_goal_list = db2.execute_query(get_db_comparison_student_goal_met(filter_period))
+        db1_student_goal_list = db1_results['student_goal_met']
+        db2_student_goal_list = db2_results['student_goal_met']
 
         db1_goal_fmt = self._format_tied_winners(db1_student_goal_list)
         db2_goal_fmt = self._format_tied_winners(db2_student_goal_list)
@@ -4565,8 +5317,8 @@ Calculation Rules:<br>
         })
 
         # Student - All Days Active (100%)
-        db1_student_all_list = db1.execute_query(get_db_comparison_student_all_days_active(filter_period))
-        db2_student_all_list = db2.execute_query(get_db_comparison_student_all_days_active(filter_period))
+        db1_student_all_list = db1_results['student_all_days_active']
+        db2_student_all_list = db2_results['student_all_days_active']
 
         db1_all_fmt = self._format_tied_winners(db1_student_all_list)
         db2_all_fmt = self._format_tied_winners(db2_student_all_list)
@@ -4596,8 +5348,8 @@ Calculation Rules:<br>
         })
 
         # Student - Goal Met All Days
-        db1_student_goal_all_list = db1.execute_query(get_db_comparison_student_goal_met_all_days(filter_period))
-        db2_student_goal_all_list = db2.execute_query(get_db_comparison_student_goal_met_all_days(filter_period))
+        db1_student_goal_all_list = db1_results['student_goal_met_all_days']
+        db2_student_goal_all_list = db2_results['student_goal_met_all_days']
 
         db1_goal_all_fmt = self._format_tied_winners(db1_student_goal_all_list)
         db2_goal_all_fmt = self._format_tied_winners(db2_student_goal_all_list)
@@ -4627,8 +5379,8 @@ Calculation Rules:<br>
         })
 
         # Student - Avg Minutes Per Day
-        db1_student_avg_list = db1.execute_query(get_db_comparison_student_avg_minutes_per_day(filter_period))
-        db2_student_avg_list = db2.execute_query(get_db_comparison_student_avg_minutes_per_day(filter_period))
+        db1_student_avg_list = db1_results['student_avg_minutes_per_day']
+        db2_student_avg_list = db2_results['student_avg_minutes_per_day']
 
         db1_avg_fmt = self._format_tied_winners(db1_student_avg_list)
         db2_avg_fmt = self._format_tied_winners(db2_student_avg_list)
@@ -4658,8 +5410,8 @@ Calculation Rules:<br>
         })
 
         # Student - Total Days Active
-        db1_student_days_list = db1.execute_query(get_db_comparison_student_total_days(filter_period))
-        db2_student_days_list = db2.execute_query(get_db_comparison_student_total_days(filter_period))
+        db1_student_days_list = db1_results['student_total_days']
+        db2_student_days_list = db2_results['student_total_days']
 
         db1_days_fmt = self._format_tied_winners(db1_student_days_list)
         db2_days_fmt = self._format_tied_winners(db2_student_days_list)
@@ -4688,9 +5440,115 @@ Calculation Rules:<br>
             'format': 'number'
         })
 
+        _comparison_cache[pair_key] = ((db1_stamp, db2_stamp), comparisons)
+
         return {
             'db1_info': db1_info,
             'db2_info': db2_info,
             'filter_period': filter_period,
-            'comparisons': comparisons
+            'comparisons': comparisons,
+            'timing': {'db1_ms': round(db1_ms, 1), 'db2_ms': round(db2_ms, 1),
+                       'db1_cached': db1_cached, 'db2_cached': db2_cached}
+        }
+
+    def get_database_trend(self, db_filenames: List[str], filter_period: str = 'all') -> Dict[str, Any]:
+        """
+        Comparison metrics for any number of databases as per-metric time series.
+
+        The databases are attached read-only to one connection. Years with a
+        current comparison snapshot are read from it; the rest are computed
+        together: one cross-database statement per entity level (see
+        get_db_comparison_trend_query), in batches of as many files as SQLite
+        allows to be attached at once.
+
+        Args:
+            db_filenames: Database filenames in db/ (e.g., ['readathon_2024.db', 'readathon_2025.db'])
+            filter_period: Date filter ('all' or specific date like '2025-10-15')
+
+        Returns:
+            Dict containing:
+            {
+                'databases': [registry info per database, oldest year first],
+                'filter_period': filter_period,
+                'series': {metric name: [result rows per database, in 'databases' order]},
+                'timing': {'ms': ..., 'statements': ..., 'snapshots': ..., 'cached': bool}
+            }
+
+        Raises:
+            ValueError: If no databases are given or a file does not exist
+        """
+        from queries import DB_COMPARISON_LEVELS, get_db_comparison_trend_query
+
+        if not db_filenames:
+            raise ValueError("Select at least one database")
+        for db_filename in db_filenames:
+            if not Path('db', db_filename).is_file():
+                raise ValueError(f"Database file not found: {db_filename}")
+
+        # Chronological order; databases without a registered year keep their given order at the end
+        with database_handles.registry() as registry:
+            infos = {db_filename: registry.get_database_by_name(db_filename) for db_filename in dict.fromkeys(db_filenames)}
+        years = {name: (infos[name] or {}).get('year') for name in infos}
+        ordered = sorted(infos, key=lambda name: (years[name] is None, years[name] or 0))
+
+        with ExitStack() as handles:
+            stamps = tuple(self._get_comparison_stamp(handles.enter_context(self._comparison_db(name)))
+                           for name in ordered)
+        trend_key = (tuple(stamp[0] for stamp in stamps), filter_period)
+        databases = [infos[name] or {'db_filename': name} for name in ordered]
+        cached = _trend_cache.get(trend_key)
+        if cached and cached[0] == stamps:
+            return {'databases': databases, 'filter_period': filter_period, 'series': cached[1],
+                    'timing': {'ms': 0.0, 'statements': 0, 'snapshots': 0, 'cached': True}}
+
+        start = time.perf_counter()
+        statements = 0
+        snapshots = 0
+        results = []
+        conn = sqlite3.connect(':memory:', uri=True)
+        conn.row_factory = sqlite3.Row
+        perf_monitor.instrument_connection(conn)
+        try:
+            batch_size = conn.getlimit(sqlite3.SQLITE_LIMIT_ATTACHED)
+            for offset in range(0, len(stamps), batch_size):
+                batch = stamps[offset:offset + batch_size]
+                schemas = [f"y{index}" for index in range(len(batch))]
+                for schema, stamp in zip(schemas, batch):
+                    conn.execute("ATTACH DATABASE ? AS " + schema, (Path(stamp[0]).as_uri() + '?mode=ro',))
+                batch_results = [_read_comparison_snapshot(conn, filter_period, schema) for schema in schemas]
+                snapshots += sum(result is not None for result in batch_results)
+
+                live = [index for index, result in enumerate(batch_results) if result is None]
+                if live:
+                    level_rows = {level: [dict(row) for row in conn.execute(get_db_comparison_trend_query(
+                                              level, [schemas[index] for index in live], filter_period))]
+                                  for level in DB_COMPARISON_LEVELS}
+                    statements += len(level_rows)
+                    for position, index in enumerate(live):
+                        batch_results[index] = split_db_comparison_rows({
+                            level: [row for row in rows if row['db_index'] == position]
+                            for level, rows in level_rows.items()})
+                results.extend(batch_results)
+                for schema in schemas:
+                    conn.execute("DETACH DATABASE " + schema)
+        finally:
+            conn.close()
+
+        series = {metric: [result[metric] for result in results] for metric in results[0]}
+        _trend_cache[trend_key] = (stamps, series)
+
+        return {
+            'databases': databases,
+            'filter_period': filter_period,
+            'series': series,
+            'timing': {'ms': round((time.perf_counter() - start) * 1000, 1), 'statements': statements,
+                       'snapshots': snapshots, 'cached': False}
         }
+
+
+# Profile the report methods listed in REPORT_REGISTRY (wall time, SQL statements,
+# rows) for /api/perf. This is the only place ReportGenerator methods are wrapped;
+# a report added to the registry is profiled under its method name.
+for _spec in REPORT_REGISTRY.values():
+    _method = _spec['method']
+    setattr(ReportGenerator, _method, perf_monitor.profiled('report', _method)(getattr(ReportGenerator, _method)))
@@ -0,0 +1,287 @@
+"""
+Performance Monitor Module
+
+Lightweight, always-on instrumentation for reports and routes:
+- Spans time a unit of work (a ReportGenerator.q* method, a Flask route)
+- Every SQLite connection opened by ReadathonDB reports each statement to the
+  innermost active spans via set_trace_callback; connections used inside a
+  span also get a set_progress_handler, removed when the span ends
+- Completed spans feed rolling histograms served at /api/perf
+
+Usage:
+    import perf_monitor
+    perf_monitor.instrument_connection(conn)
+    with perf_monitor.span('report', 'q6'):
+        ...
+    perf_monitor.get_perf_snapshot()
+"""
+
+import re
+import sqlite3
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from functools import wraps
+from typing import Dict, Any, List, Optional
+
+# Samples kept per histogram (older samples roll off)
+HISTOGRAM_WINDOW = 500
+
+# Histogram bucket upper bounds (ms); the last bucket is open-ended
+HISTOGRAM_BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+
+# SQLite VM instructions between progress ticks. Ticks mark the last moment a
+# statement was still running, which tightens per-statement timings. The
+# handler is only installed while a span is using the connection.
+PROGRESS_INTERVAL = 1000
+
+# Distinct statements tracked per span name (keeps memory bounded)
+MAX_STATEMENTS_PER_NAME = 50
+
+
+class RollingHistogram:
+    """Fixed-size window of samples with bucket counts and percentiles"""
+
+    def __init__(self, window: int = HISTOGRAM_WINDOW):
+        self.samples = deque(maxlen=window)
+        self.total_count = 0
+
+    def add(self, value: float):
+        self.samples.append(value)
+        self.total_count += 1
+
+    def summary(self) -> Dict[str, Any]:
+        """Count, mean, p50/p90/p99, max and bucket counts over the window"""
+        values = sorted(self.samples)
+        if not values:
+            return {'count': 0, 'window': 0}
+
+        def percentile(p):
+            return values[min(len(values) - 1, int(p / 100.0 * len(values)))]
+
+        buckets = [0] * (len(HISTOGRAM_BUCKETS_MS) + 1)
+        for v in values:
+            buckets[bisect_left(HISTOGRAM_BUCKETS_MS, v)] += 1
+
+        return {
+            'count': self.total_count,
+            'window': len(values),
+            'mean': round(sum(values) / len(values), 3),
+            'p50': round(percentile(50), 3),
+            'p90': round(percentile(90), 3),
+            'p99': round(percentile(99), 3),
+            'max': round(values[-1], 3),
+            'buckets': {
+                (f'<={bound}' if i < len(HISTOGRAM_BUCKETS_MS) else f'>{HISTOGRAM_BUCKETS_MS[-1]}'): count
+                for i, (bound, count) in enumerate(zip(HISTOGRAM_BUCKETS_MS + [None], buckets))
+            }
+        }
+
+
+class _Span:
+    """One in-flight unit of work and the SQL it has issued so far"""
+
+    __slots__ = ('kind', 'name', 'start', 'sql_count', 'rows', 'statements')
+
+    def __init__(self, kind: str, name: str):
+        self.kind = kind
+        self.name = name
+        self.start = time.perf_counter()
+        self.sql_count = 0
+        self.rows = 0
+        self.statements = {}  # normalized SQL -> [count, total_ms]
+
+
+class _ThreadState(threading.local):
+    def __init__(self):
+        self.spans = []            # active spans, outermost first
+        self.statement = None      # (normalized SQL, start time) of the running statement
+        self.last_tick = None      # time of the last progress tick for that statement
+        self.ticking = {}          # id(connection) -> connection this thread's spans installed the handler on
+
+
+_state = _ThreadState()
+_lock = threading.Lock()
+_ticking_threads = {}  # id(connection) -> threads whose spans need its progress handler
+_stats = {}  # (kind, name) -> {'wall_ms', 'sql_count', 'rows' histograms, 'statements': {sql: histogram}}
+
+
+def _normalize_sql(sql: str) -> str:
+    """Collapse whitespace and literals so repeated statements group together"""
+    sql = re.sub(r"'[^']*'", "?", sql)
+    sql = re.sub(r"\b\d+(\.\d+)?\b", "?", sql)
+    sql = re.sub(r"\s+", " ", sql).strip()
+    return sql[:200]
+
+
+def _finish_statement(now: float):
+    """Close the running statement, crediting its time to every active span"""
+    statement = _state.statement
+    if statement is None:
+        return
+    sql, start = statement
+    end = _state.last_tick if _state.last_tick is not None else now
+    elapsed_ms = (max(end, start) - start) * 1000
+    for span in _state.spans:
+        entry = span.statements.setdefault(sql, [0, 0.0])
+        entry[0] += 1
+        entry[1] += elapsed_ms
+    _state.statement = None
+    _state.last_tick = None
+
+
+def _trace_callback(conn, sql: str):
+    """sqlite3 trace callback: called as each statement starts"""
+    if not _state.spans:
+        return
+    if id(conn) not in _state.ticking:
+        _start_ticking(conn)
+    now = time.perf_counter()
+    _finish_statement(now)
+    for span in _state.spans:
+        span.sql_count += 1
+    _state.statement = (_normalize_sql(sql), now)
+
+
+def _progress_handler():
+    """sqlite3 progress handler: records that the current statement is still running"""
+    if _state.statement is not None:
+        _state.last_tick = time.perf_counter()
+    return 0  # Non-zero would abort the statement
+
+
+def _start_ticking(conn):
+    """
+    Install the progress handler on a connection this thread's spans are using.
+
+    It takes effect from the connection's next step, so a span's first
+    statement on a connection is timed from trace callbacks alone.
+    """
+    _state.ticking[id(conn)] = conn
+    with _lock:
+        if not _ticking_threads.get(id(conn)):
+            conn.set_progress_handler(_progress_handler, PROGRESS_INTERVAL)
+        _ticking_threads[id(conn)] = _ticking_threads.get(id(conn), 0) + 1
+
+
+def _stop_ticking():
+    """Remove the progress handler from connections no other thread's spans are using"""
+    with _lock:
+        for key, conn in _state.ticking.items():
+            _ticking_threads[key] -= 1
+            if _ticking_threads[key]:
+                continue
+            del _ticking_threads[key]
+            try:
+                conn.set_progress_handler(None, 0)
+            except sqlite3.ProgrammingError:
+                pass  # Already closed
+    _state.ticking.clear()
+
+
+def instrument_connection(conn):
+    """Attach statement tracing to a sqlite3 connection (no-op cost outside spans)"""
+    conn.set_trace_callback(lambda sql: _trace_callback(conn, sql))
+    return conn
+
+
+def add_rows(count: int):
+    """Credit fetched rows to every active span on this thread"""
+    for span in _state.spans:
+        span.rows += count
+
+
+class span:
+    """
+    Context manager timing one unit of work.
+
+    Nested spans each record their own totals (a route span includes the SQL
+    of the reports it runs).
+    """
+
+    def __init__(self, kind: str, name: str):
+        self.kind = kind
+        self.name = name
+        self._span = None
+
+    def __enter__(self):
+        self._span = _Span(self.kind, self.name)
+        _state.spans.append(self._span)
+        return self._span
+
+    def __exit__(self, exc_type, exc, tb):
+        now = time.perf_counter()
+        _finish_statement(now)
+        _state.spans.remove(self._span)
+        if not _state.spans:
+            _stop_ticking()
+        _record(self._span, (now - self._span.start) * 1000)
+        return False
+
+
+def profiled(kind: str, name: Optional[str] = None):
+    """Decorator running the function inside a span (name defaults to the function name)"""
+    def decorator(func):
+        span_name = name or func.__name__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(kind, span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _record(finished: _Span, wall_ms: float):
+    with _lock:
+        stats = _stats.get((finished.kind, finished.name))
+        if stats is None:
+            stats = _stats[(finished.kind, finished.name)] = {
+                'wall_ms': RollingHistogram(),
+                'sql_count': RollingHistogram(),
+                'rows': RollingHistogram(),
+                'statements': {}
+            }
+        stats['wall_ms'].add(wall_ms)
+        stats['sql_count'].add(finished.sql_count)
+        stats['rows'].add(finished.rows)
+        for sql, (count, total_ms) in finished.statements.items():
+            histogram = stats['statements'].get(sql)
+            if histogram is None:
+                if len(stats['statements']) >= MAX_STATEMENTS_PER_NAME:
+                    continue
+                histogram = stats['statements'][sql] = RollingHistogram()
+            histogram.add(total_ms / count)
+
+
+def get_perf_snapshot() -> List[Dict[str, Any]]:
+    """
+    Summaries of everything recorded so far, slowest p90 wall time first.
+
+    Returns:
+        List of dicts with kind, name, wall_ms, sql_count and rows summaries,
+        and statements (each with sql and an ms summary, slowest first)
+    """
+    with _lock:
+        entries = []
+        for (kind, name), stats in _stats.items():
+            statements = [{'sql': sql, 'ms': histogram.summary()}
+                          for sql, histogram in stats['statements'].items()]
+            statements.sort(key=lambda s: s['ms'].get('p90', 0), reverse=True)
+            entries.append({
+                'kind': kind,
+                'name': name,
+                'wall_ms': stats['wall_ms'].summary(),
+                'sql_count': stats['sql_count'].summary(),
+                'rows': stats['rows'].summary(),
+                'statements': statements
+            })
+    entries.sort(key=lambda e: e['wall_ms'].get('p90', 0), reverse=True)
+    return entries
+
+
+def reset():
+    """Forget all recorded samples"""
+    with _lock:
+        _stats.clear()
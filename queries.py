@@ -3,6 +3,8 @@ SQL Queries Module for Read-a-Thon Database
 Contains all SQL queries extracted from database.py, organized as constants and template functions.
 """
 
+import re
+
 # ============================================================================
 # CREATE TABLE STATEMENTS
 # ============================================================================
@@ -102,6 +104,23 @@ CREATE_TABLE_TEAM_COLOR_BONUS = """
     )
 """
 
+# Prize_Draws - persisted seeded prize drawings (created on first batch draw)
+CREATE_TABLE_PRIZE_DRAWS = """
+    CREATE TABLE IF NOT EXISTS Prize_Draws (
+        seed INTEGER NOT NULL,
+        winners_per_grade INTEGER NOT NULL,
+        weighted INTEGER NOT NULL,
+        log_date TEXT NOT NULL,
+        grade_level TEXT NOT NULL,
+        draw_rank INTEGER NOT NULL,
+        student_name TEXT NOT NULL,
+        total_eligible INTEGER NOT NULL,
+        eligibility_hash TEXT NOT NULL,
+        draw_timestamp TEXT NOT NULL,
+        PRIMARY KEY (seed, winners_per_grade, weighted, log_date, grade_level, draw_rank)
+    )
+"""
+
 # ============================================================================
 # ALTER TABLE STATEMENTS
 # ============================================================================
@@ -356,6 +375,177 @@ SELECT_DATE_RANGE_DAILY_LOGS = """
     FROM Daily_Logs
 """
 
+# ============================================================================
+# COMPOSABLE SQL FRAGMENTS
+# ============================================================================
+# Shared CTEs are defined once here and composed into statements with
+# compose_query(). Fragment placeholders (filled from FRAGMENT_DEFAULTS or the
+# caller) follow the conventions used throughout this module:
+#   {date_where}          - "AND dl.log_date <= '...'" (Daily_Logs aliased dl)
+#   {date_where_no_alias} - "AND log_date <= '...'"    (unaliased Daily_Logs)
+#   {class_where}         - "AND ci.grade_level = '...' AND ci.team_name = '...'"
+
+FRAGMENT_DEFAULTS = {
+    'date_where': '',
+    'date_where_no_alias': '',
+    'class_where': ''
+}
+
+SQL_FRAGMENTS = {
+    # Days with any logged reading (honors date filter)
+    'TotalDays': """
+        SELECT COUNT(DISTINCT log_date) as total_days
+        FROM Daily_Logs
+        WHERE 1=1 {date_where_no_alias}
+    """,
+
+    # Team Color Bonus per class (minutes and participation points)
+    'ColorBonus': """
+        SELECT
+            class_name,
+            SUM(bonus_minutes) as bonus_minutes,
+            SUM(bonus_participation_points) as bonus_points
+        FROM Team_Color_Bonus
+        GROUP BY class_name
+    """,
+
+    # Team Color Bonus rolled up per team
+    'TeamColorBonus': """
+        SELECT
+            ci.team_name,
+            SUM(tcb.bonus_minutes) as bonus_minutes,
+            SUM(tcb.bonus_participation_points) as bonus_points
+        FROM Team_Color_Bonus tcb
+        INNER JOIN Class_Info ci ON tcb.class_name = ci.class_name
+        GROUP BY ci.team_name
+    """,
+
+    # Team Color Bonus rolled up per grade
+    'GradeColorBonus': """
+        SELECT
+            ci.grade_level,
+            SUM(tcb.bonus_minutes) as bonus_minutes,
+            SUM(tcb.bonus_participation_points) as bonus_points
+        FROM Team_Color_Bonus tcb
+        INNER JOIN Class_Info ci ON tcb.class_name = ci.class_name
+        GROUP BY ci.grade_level
+    """,
+
+    # Capped minutes per class (honors date and class filters)
+    'ClassMinutes': """
+        SELECT
+            ci.class_name,
+            ci.teacher_name,
+            ci.grade_level,
+            ci.team_name,
+            SUM(MIN(dl.minutes_read, 120)) as base_minutes
+        FROM Class_Info ci
+        JOIN Roster r ON ci.class_name = r.class_name
+        LEFT JOIN Daily_Logs dl ON r.student_name = dl.student_name {date_where}
+        WHERE 1=1 {class_where}
+        GROUP BY ci.class_name, ci.teacher_name, ci.grade_level, ci.team_name
+    """
+}
+
+def compose_query(fragments, select_sql, extra_ctes=None, **params):
+    """
+    Build a statement from shared SQL_FRAGMENTS plus query-specific CTEs.
+
+    Args:
+        fragments: SQL_FRAGMENTS names to include (duplicates are emitted once)
+        select_sql: Final SELECT, which may reference any included CTE
+        extra_ctes: Optional list of (name, sql) CTEs specific to this statement,
+                    emitted after the shared fragments so they can build on them
+        **params: Fragment placeholder values (see FRAGMENT_DEFAULTS)
+
+    Example:
+        compose_query(['TotalDays', 'ColorBonus'],
+                      "SELECT td.total_days, cb.* FROM TotalDays td, ColorBonus cb",
+                      date_where_no_alias="AND log_date <= '2025-10-12'")
+    """
+    values = dict(FRAGMENT_DEFAULTS, **params)
+
+    ctes = []
+    included = set()
+    for name in fragments:
+        if name in included:
+            continue
+        included.add(name)
+        ctes.append(f"{name} AS ({SQL_FRAGMENTS[name].format(**values)})")
+
+    for name, sql in extra_ctes or []:
+        ctes.append(f"{name} AS ({sql})")
+
+    if not ctes:
+        return select_sql
+
+    return "\n        WITH " + ",\n        ".join(ctes) + "\n" + select_sql
+
+# Scalar metrics that can be requested together. Each metric names the source
+# it aggregates over; metrics sharing a source are computed in one pass.
+#   source name -> (required fragments, FROM/WHERE clause)
+SQL_METRIC_SOURCES = {
+    'roster': ([], "FROM Roster r"),
+    'reader_cumulative': ([], "FROM Reader_Cumulative rc"),
+    'daily_logs': ([], "FROM Daily_Logs dl WHERE 1=1 {date_where}"),
+    'daily_goals': ([], """FROM Daily_Logs dl
+            JOIN Roster r ON dl.student_name = r.student_name
+            JOIN Grade_Rules gr ON r.grade_level = gr.grade_level
+            WHERE 1=1 {date_where}"""),
+    'color_bonus': (['ColorBonus'], "FROM ColorBonus")
+}
+
+#   metric name -> (source name, aggregate expression)
+SQL_METRICS = {
+    'total_roster': ('roster', "COUNT(*)"),
+    'total_fundraising': ('reader_cumulative', "COALESCE(SUM(rc.donation_amount), 0)"),
+    'fundraising_students': ('reader_cumulative', "COUNT(DISTINCT CASE WHEN rc.donation_amount > 0 THEN rc.student_name END)"),
+    'total_sponsors': ('reader_cumulative', "COALESCE(SUM(rc.sponsors), 0)"),
+    'total_days': ('daily_logs', "COUNT(DISTINCT dl.log_date)"),
+    'total_minutes_base': ('daily_logs', "COALESCE(SUM(MIN(dl.minutes_read, 120)), 0)"),
+    'participating_students': ('daily_logs', "COUNT(DISTINCT CASE WHEN dl.minutes_read > 0 THEN dl.student_name END)"),
+    'goals_met_students': ('daily_goals', "COUNT(DISTINCT CASE WHEN dl.minutes_read >= gr.min_daily_minutes THEN dl.student_name END)"),
+    'bonus_minutes': ('color_bonus', "COALESCE(SUM(bonus_minutes), 0)"),
+    'bonus_points': ('color_bonus', "COALESCE(SUM(bonus_points), 0)")
+}
+
+def compose_metrics_query(metric_names, **params):
+    """
+    Merge several SQL_METRICS into one single-row statement.
+
+    Metrics over the same source share one aggregation CTE (one scan per
+    source); the final SELECT cross joins the per-source rows.
+
+    Args:
+        metric_names: SQL_METRICS names; each becomes a result column
+        **params: Fragment placeholder values (see FRAGMENT_DEFAULTS)
+
+    Returns:
+        SQL string returning exactly one row
+    """
+    values = dict(FRAGMENT_DEFAULTS, **params)
+
+    # Group requested metrics by source, preserving request order
+    by_source = {}
+    for name in metric_names:
+        source, _ = SQL_METRICS[name]
+        by_source.setdefault(source, []).append(name)
+
+    fragments = []
+    extra_ctes = []
+    for source, names in by_source.items():
+        source_fragments, from_sql = SQL_METRIC_SOURCES[source]
+        fragments.extend(source_fragments)
+        columns = ",\n            ".join(f"{SQL_METRICS[n][1]} as {n}" for n in names)
+        extra_ctes.append((f"Metrics_{source}",
+                           f"\n            SELECT\n            {columns}\n            {from_sql.format(**values)}\n        "))
+
+    select_columns = ", ".join(metric_names)
+    from_ctes = ", ".join(f"Metrics_{source}" for source in by_source)
+
+    return compose_query(fragments, f"        SELECT {select_columns}\n        FROM {from_ctes}\n",
+                         extra_ctes=extra_ctes, **params)
+
 # ============================================================================
 # REPORT QUERIES - Q2 Daily Summary
 # ============================================================================
@@ -478,6 +668,42 @@ QUERY_Q4_PRIZE_DRAWING = """
     ORDER BY r.grade_level, r.student_name
 """
 
+# Eligible entrants for every date in one pass (batch drawing)
+QUERY_Q4_PRIZE_ELIGIBILITY_ALL_DATES = """
+    SELECT DISTINCT
+        dl.log_date,
+        r.student_name,
+        r.grade_level,
+        r.class_name,
+        r.teacher_name,
+        dl.minutes_read,
+        gr.min_daily_minutes,
+        MIN(dl.minutes_read, gr.max_daily_minutes_credit) as credited_minutes
+    FROM Roster r
+    INNER JOIN Daily_Logs dl ON r.student_name = dl.student_name
+    INNER JOIN Grade_Rules gr ON r.grade_level = gr.grade_level
+    WHERE dl.minutes_read >= gr.min_daily_minutes
+    ORDER BY dl.log_date DESC, r.grade_level, r.student_name
+"""
+
+SELECT_PRIZE_DRAWS = """
+    SELECT log_date, grade_level, draw_rank, student_name, eligibility_hash
+    FROM Prize_Draws
+    WHERE seed = ? AND winners_per_grade = ? AND weighted = ?
+    ORDER BY log_date, grade_level, draw_rank
+"""
+
+DELETE_PRIZE_DRAWS_FOR_GRADE = """
+    DELETE FROM Prize_Draws
+    WHERE seed = ? AND winners_per_grade = ? AND weighted = ? AND log_date = ? AND grade_level = ?
+"""
+
+INSERT_PRIZE_DRAW = """
+    INSERT INTO Prize_Draws (seed, winners_per_grade, weighted, log_date, grade_level, draw_rank,
+                             student_name, total_eligible, eligibility_hash, draw_timestamp)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
 # ============================================================================
 # REPORT QUERIES - Q5 Student Cumulative
 # ============================================================================
@@ -522,18 +748,9 @@ def get_q5_student_cumulative_query(sort_by='minutes', limit=None):
 # REPORT QUERIES - Q6 Class Participation
 # ============================================================================
 
-QUERY_Q6_CLASS_PARTICIPATION = """
-    WITH TotalDays AS (
-        SELECT COUNT(DISTINCT log_date) as total_days
-        FROM Daily_Logs
-    ),
-    BonusData AS (
-        SELECT
-            class_name,
-            SUM(bonus_participation_points) as total_bonus
-        FROM Team_Color_Bonus
-        GROUP BY class_name
-    )
+QUERY_Q6_CLASS_PARTICIPATION = compose_query(
+    ['TotalDays', 'ColorBonus'],
+    """
     SELECT
         r.class_name,
         r.teacher_name,
@@ -542,21 +759,22 @@ QUERY_Q6_CLASS_PARTICIPATION = """
         ci.total_students,
         td.total_days as days_with_data,
         COUNT(DISTINCT CASE WHEN dl.minutes_read > 0 THEN dl.log_date || '-' || r.student_name END) as total_participations_base,
-        COALESCE(bd.total_bonus, 0) as color_bonus_points,
-        COUNT(DISTINCT CASE WHEN dl.minutes_read > 0 THEN dl.log_date || '-' || r.student_name END) + COALESCE(bd.total_bonus, 0) as total_participations_with_color,
+        COALESCE(cb.bonus_points, 0) as color_bonus_points,
+        COUNT(DISTINCT CASE WHEN dl.minutes_read > 0 THEN dl.log_date || '-' || r.student_name END) + COALESCE(cb.bonus_points, 0) as total_participations_with_color,
         ROUND(100.0 * COUNT(DISTINCT CASE WHEN dl.minutes_read > 0 THEN dl.log_date || '-' || r.student_name END) /
               (ci.total_students * td.total_days), 2) as avg_participation_rate,
-        ROUND(100.0 * (COUNT(DISTINCT CASE WHEN dl.minutes_read > 0 THEN dl.log_date || '-' || r.student_name END) + COALESCE(bd.total_bonus, 0)) /
+        ROUND(100.0 * (COUNT(DISTINCT CASE WHEN dl.minutes_read > 0 THEN dl.log_date || '-' || r.student_name END) + COALESCE(cb.bonus_points, 0)) /
               (ci.total_students * td.total_days), 2) as avg_participation_rate_with_color
     FROM Roster r
     INNER JOIN Class_Info ci ON r.class_name = ci.class_name
     CROSS JOIN TotalDays td
     LEFT JOIN Daily_Logs dl ON r.student_name = dl.student_name
-    LEFT JOIN BonusData bd ON r.class_name = bd.class_name
-    GROUP BY r.class_name, r.teacher_name, r.grade_level, r.team_name, ci.total_students, td.total_days, bd.total_bonus
+    LEFT JOIN ColorBonus cb ON r.class_name = cb.class_name
+    GROUP BY r.class_name, r.teacher_name, r.grade_level, r.team_name, ci.total_students, td.total_days, cb.bonus_points
     HAVING td.total_days > 0
     ORDER BY avg_participation_rate_with_color DESC, r.class_name ASC
 """
+)
 
 # ============================================================================
 # REPORT QUERIES - Q7 Complete Log
@@ -700,19 +918,24 @@ QUERY_Q11_MOST_SPONSORS_BY_GRADE = """
 # REPORT QUERIES - Q12 Best Class by Grade (Simplified)
 # ============================================================================
 
-QUERY_Q12_BEST_CLASS_BY_GRADE = """
-    WITH TotalDays AS (
-        SELECT COUNT(DISTINCT log_date) as total_days
-        FROM Daily_Logs
-    ),
-    BonusData AS (
-        SELECT
-            class_name,
-            SUM(bonus_participation_points) as total_bonus
-        FROM Team_Color_Bonus
-        GROUP BY class_name
-    ),
-    ClassStats AS (
+QUERY_Q12_BEST_CLASS_BY_GRADE = compose_query(
+    ['TotalDays', 'ColorBonus'],
+    """
+    SELECT
+        cs.grade_level,
+        cs.class_name,
+        cs.teacher_name,
+        cs.team_name,
+        cs.total_participations_base,
+        cs.color_bonus_points,
+        cs.avg_participation_rate,
+        cs.avg_participation_rate_with_color
+    FROM ClassStats cs
+    INNER JOIN MaxByGrade mbg ON cs.grade_level = mbg.grade_level AND cs.avg_participation_rate_with_color = mbg.max_rate
+    ORDER BY cs.grade_level ASC, cs.class_name ASC
+""",
+    extra_ctes=[
+        ('ClassStats', """
         SELECT
             r.class_name,
             r.teacher_name,
@@ -721,122 +944,103 @@ QUERY_Q12_BEST_CLASS_BY_GRADE = """
             ci.total_students,
             td.total_days as days_with_data,
             COUNT(DISTINCT CASE WHEN dl.minutes_read > 0 THEN dl.log_date || '-' || r.student_name END) as total_participations_base,
-            COALESCE(bd.total_bonus, 0) as color_bonus_points,
+            COALESCE(cb.bonus_points, 0) as color_bonus_points,
             ROUND(100.0 * COUNT(DISTINCT CASE WHEN dl.minutes_read > 0 THEN dl.log_date || '-' || r.student_name END) /
                   (ci.total_students * td.total_days), 2) as avg_participation_rate,
-            ROUND(100.0 * (COUNT(DISTINCT CASE WHEN dl.minutes_read > 0 THEN dl.log_date || '-' || r.student_name END) + COALESCE(bd.total_bonus, 0)) /
+            ROUND(100.0 * (COUNT(DISTINCT CASE WHEN dl.minutes_read > 0 THEN dl.log_date || '-' || r.student_name END) + COALESCE(cb.bonus_points, 0)) /
                   (ci.total_students * td.total_days), 2) as avg_participation_rate_with_color
         FROM Roster r
         INNER JOIN Class_Info ci ON r.class_name = ci.class_name
         CROSS JOIN TotalDays td
         LEFT JOIN Daily_Logs dl ON r.student_name = dl.student_name
-        LEFT JOIN BonusData bd ON r.class_name = bd.class_name
-        GROUP BY r.class_name, r.teacher_name, r.grade_level, r.team_name, ci.total_students, td.total_days, bd.total_bonus
+        LEFT JOIN ColorBonus cb ON r.class_name = cb.class_name
+        GROUP BY r.class_name, r.teacher_name, r.grade_level, r.team_name, ci.total_students, td.total_days, cb.bonus_points
         HAVING td.total_days > 0
-    ),
-    MaxByGrade AS (
+    """),
+        ('MaxByGrade', """
         SELECT grade_level, MAX(avg_participation_rate_with_color) as max_rate
         FROM ClassStats
         GROUP BY grade_level
-    )
-    SELECT
-        cs.grade_level,
-        cs.class_name,
-        cs.teacher_name,
-        cs.team_name,
-        cs.total_participations_base,
-        cs.color_bonus_points,
-        cs.avg_participation_rate,
-        cs.avg_participation_rate_with_color
-    FROM ClassStats cs
-    INNER JOIN MaxByGrade mbg ON cs.grade_level = mbg.grade_level AND cs.avg_participation_rate_with_color = mbg.max_rate
-    ORDER BY cs.grade_level ASC, cs.class_name ASC
-"""
+    """)
+    ]
+)
 
 # ============================================================================
 # REPORT QUERIES - Q13 Overall Best Class (Simplified)
 # ============================================================================
 
-QUERY_Q13_OVERALL_BEST_CLASS = """
-    WITH TotalDays AS (
-        SELECT COUNT(DISTINCT log_date) as total_days
-        FROM Daily_Logs
-    ),
-    BonusData AS (
-        SELECT
-            class_name,
-            SUM(bonus_participation_points) as total_bonus
-        FROM Team_Color_Bonus
-        GROUP BY class_name
-    )
+QUERY_Q13_OVERALL_BEST_CLASS = compose_query(
+    ['TotalDays', 'ColorBonus'],
+    """
     SELECT
         r.class_name,
         r.teacher_name,
         r.grade_level,
         r.team_name,
         COUNT(DISTINCT CASE WHEN dl.minutes_read > 0 THEN dl.log_date || '-' || r.student_name END) as total_participations_base,
-        COALESCE(bd.total_bonus, 0) as color_bonus_points,
+        COALESCE(cb.bonus_points, 0) as color_bonus_points,
         ROUND(100.0 * COUNT(DISTINCT CASE WHEN dl.minutes_read > 0 THEN dl.log_date || '-' || r.student_name END) /
               (ci.total_students * td.total_days), 2) as avg_participation_rate,
-        ROUND(100.0 * (COUNT(DISTINCT CASE WHEN dl.minutes_read > 0 THEN dl.log_date || '-' || r.student_name END) + COALESCE(bd.total_bonus, 0)) /
+        ROUND(100.0 * (COUNT(DISTINCT CASE WHEN dl.minutes_read > 0 THEN dl.log_date || '-' || r.student_name END) + COALESCE(cb.bonus_points, 0)) /
               (ci.total_students * td.total_days), 2) as avg_participation_rate_with_color
     FROM Roster r
     INNER JOIN Class_Info ci ON r.class_name = ci.class_name
     CROSS JOIN TotalDays td
     LEFT JOIN Daily_Logs dl ON r.student_name = dl.student_name
-    LEFT JOIN BonusData bd ON r.class_name = bd.class_name
-    GROUP BY r.class_name, r.teacher_name, r.grade_level, r.team_name, ci.total_students, td.total_days, bd.total_bonus
+    LEFT JOIN ColorBonus cb ON r.class_name = cb.class_name
+    GROUP BY r.class_name, r.teacher_name, r.grade_level, r.team_name, ci.total_students, td.total_days, cb.bonus_points
     HAVING td.total_days > 0
     ORDER BY avg_participation_rate_with_color DESC, r.class_name ASC
 """
+)
 
 # ============================================================================
 # REPORT QUERIES - Q14 Team Participation
 # ============================================================================
 
-QUERY_Q14_TEAM_PARTICIPATION = """
-    WITH TotalDays AS (
-        SELECT COUNT(DISTINCT log_date) as total_days
-        FROM Daily_Logs
-    ),
-    TeamBonusData AS (
-        SELECT
-            ci.team_name,
-            SUM(tcb.bonus_participation_points) as total_bonus
-        FROM Team_Color_Bonus tcb
-        INNER JOIN Class_Info ci ON tcb.class_name = ci.class_name
-        GROUP BY ci.team_name
-    )
+QUERY_Q14_TEAM_PARTICIPATION = compose_query(
+    ['TotalDays', 'TeamColorBonus'],
+    """
     SELECT
         r.team_name,
         COUNT(DISTINCT r.student_name) as total_students,
         td.total_days as days_with_data,
         COUNT(DISTINCT CASE WHEN dl.minutes_read > 0 THEN dl.log_date || '-' || r.student_name END) as total_participations_base,
-        COALESCE(tbd.total_bonus, 0) as color_bonus_points,
-        COUNT(DISTINCT CASE WHEN dl.minutes_read > 0 THEN dl.log_date || '-' || r.student_name END) + COALESCE(tbd.total_bonus, 0) as total_participations_with_color,
+        COALESCE(tcb.bonus_points, 0) as color_bonus_points,
+        COUNT(DISTINCT CASE WHEN dl.minutes_read > 0 THEN dl.log_date || '-' || r.student_name END) + COALESCE(tcb.bonus_points, 0) as total_participations_with_color,
         ROUND(100.0 * COUNT(DISTINCT CASE WHEN dl.minutes_read > 0 THEN dl.log_date || '-' || r.student_name END) /
               (COUNT(DISTINCT r.student_name) * td.total_days), 2) as avg_participation_rate,
-        ROUND(100.0 * (COUNT(DISTINCT CASE WHEN dl.minutes_read > 0 THEN dl.log_date || '-' || r.student_name END) + COALESCE(tbd.total_bonus, 0)) /
+        ROUND(100.0 * (COUNT(DISTINCT CASE WHEN dl.minutes_read > 0 THEN dl.log_date || '-' || r.student_name END) + COALESCE(tcb.bonus_points, 0)) /
               (COUNT(DISTINCT r.student_name) * td.total_days), 2) as avg_participation_rate_with_color
     FROM Roster r
     CROSS JOIN TotalDays td
     LEFT JOIN Daily_Logs dl ON r.student_name = dl.student_name
-    LEFT JOIN TeamBonusData tbd ON r.team_name = tbd.team_name
-    GROUP BY r.team_name, td.total_days, tbd.total_bonus
+    LEFT JOIN TeamColorBonus tcb ON r.team_name = tcb.team_name
+    GROUP BY r.team_name, td.total_days, tcb.bonus_points
     HAVING td.total_days > 0
     ORDER BY avg_participation_rate_with_color DESC
 """
+)
 
 # ============================================================================
 # REPORT QUERIES - Q15 Goal Getters
 # ============================================================================
 
-QUERY_Q15_GOAL_GETTERS = """
-    WITH TotalDays AS (
-        SELECT COUNT(DISTINCT log_date) as total_days
-        FROM Daily_Logs
-    ),
-    StudentGoalDays AS (
+QUERY_Q15_GOAL_GETTERS = compose_query(
+    ['TotalDays'],
+    """
+    SELECT
+        student_name,
+        grade_level,
+        days_met_goal,
+        total_days,
+        team_name,
+        class_name
+    FROM StudentGoalDays
+    ORDER BY grade_level ASC, student_name ASC
+""",
+    extra_ctes=[
+        ('StudentGoalDays', """
         SELECT
             r.student_name,
             r.grade_level,
@@ -851,17 +1055,9 @@ QUERY_Q15_GOAL_GETTERS = """
         LEFT JOIN Grade_Rules gr ON r.grade_level = gr.grade_level
         GROUP BY r.student_name, r.grade_level, r.team_name, r.class_name, td.total_days
         HAVING days_met_goal = td.total_days AND days_with_data = td.total_days
-    )
-    SELECT
-        student_name,
-        grade_level,
-        days_met_goal,
-        total_days,
-        team_name,
-        class_name
-    FROM StudentGoalDays
-    ORDER BY grade_level ASC, student_name ASC
-"""
+    """)
+    ]
+)
 
 # ============================================================================
 # REPORT QUERIES - Q16 Top Earner Per Team
@@ -895,19 +1091,27 @@ QUERY_Q16_TOP_EARNER_PER_TEAM = """
 # REPORT QUERIES - Q18 Lead Class by Grade
 # ============================================================================
 
-QUERY_Q18_LEAD_CLASS_BY_GRADE = """
-    WITH TotalDays AS (
-        SELECT COUNT(DISTINCT log_date) as total_days
-        FROM Daily_Logs
-    ),
-    BonusData AS (
-        SELECT
-            class_name,
-            SUM(bonus_participation_points) as total_bonus
-        FROM Team_Color_Bonus
-        GROUP BY class_name
-    ),
-    ClassStats AS (
+QUERY_Q18_LEAD_CLASS_BY_GRADE = compose_query(
+    ['TotalDays', 'ColorBonus'],
+    """
+    SELECT
+        cs.grade_level,
+        cs.class_name,
+        cs.teacher_name,
+        cs.team_name,
+        cs.total_students,
+        cs.days_with_data,
+        cs.total_participations_base,
+        cs.color_bonus_points,
+        cs.total_participations_with_color,
+        cs.avg_participation_rate,
+        cs.avg_participation_rate_with_color
+    FROM ClassStats cs
+    INNER JOIN MaxByGrade mbg ON cs.grade_level = mbg.grade_level AND cs.avg_participation_rate_with_color = mbg.max_rate
+    ORDER BY cs.grade_level ASC, cs.class_name ASC
+""",
+    extra_ctes=[
+        ('ClassStats', """
         SELECT
             r.class_name,
             r.teacher_name,
@@ -916,72 +1120,41 @@ QUERY_Q18_LEAD_CLASS_BY_GRADE = """
             ci.total_students,
             td.total_days as days_with_data,
             COUNT(DISTINCT CASE WHEN dl.minutes_read > 0 THEN dl.log_date || '-' || r.student_name END) as total_participations_base,
-            COALESCE(bd.total_bonus, 0) as color_bonus_points,
-            COUNT(DISTINCT CASE WHEN dl.minutes_read > 0 THEN dl.log_date || '-' || r.student_name END) + COALESCE(bd.total_bonus, 0) as total_participations_with_color,
+            COALESCE(cb.bonus_points, 0) as color_bonus_points,
+            COUNT(DISTINCT CASE WHEN dl.minutes_read > 0 THEN dl.log_date || '-' || r.student_name END) + COALESCE(cb.bonus_points, 0) as total_participations_with_color,
             ROUND(100.0 * COUNT(DISTINCT CASE WHEN dl.minutes_read > 0 THEN dl.log_date || '-' || r.student_name END) /
                   (ci.total_students * td.total_days), 2) as avg_participation_rate,
-            ROUND(100.0 * (COUNT(DISTINCT CASE WHEN dl.minutes_read > 0 THEN dl.log_date || '-' || r.student_name END) + COALESCE(bd.total_bonus, 0)) /
+            ROUND(100.0 * (COUNT(DISTINCT CASE WHEN dl.minutes_read > 0 THEN dl.log_date || '-' || r.student_name END) + COALESCE(cb.bonus_points, 0)) /
                   (ci.total_students * td.total_days), 2) as avg_participation_rate_with_color
         FROM Roster r
         INNER JOIN Class_Info ci ON r.class_name = ci.class_name
         CROSS JOIN TotalDays td
         LEFT JOIN Daily_Logs dl ON r.student_name = dl.student_name
-        LEFT JOIN BonusData bd ON r.class_name = bd.class_name
-        GROUP BY r.class_name, r.teacher_name, r.grade_level, r.team_name, ci.total_students, td.total_days, bd.total_bonus
+        LEFT JOIN ColorBonus cb ON r.class_name = cb.class_name
+        GROUP BY r.class_name, r.teacher_name, r.grade_level, r.team_name, ci.total_students, td.total_days, cb.bonus_points
         HAVING td.total_days > 0
-    ),
-    MaxByGrade AS (
+    """),
+        ('MaxByGrade', """
         SELECT grade_level, MAX(avg_participation_rate_with_color) as max_rate
         FROM ClassStats
         GROUP BY grade_level
-    )
-    SELECT
-        cs.grade_level,
-        cs.class_name,
-        cs.teacher_name,
-        cs.team_name,
-        cs.total_students,
-        cs.days_with_data,
-        cs.total_participations_base,
-        cs.color_bonus_points,
-        cs.total_participations_with_color,
-        cs.avg_participation_rate,
-        cs.avg_participation_rate_with_color
-    FROM ClassStats cs
-    INNER JOIN MaxByGrade mbg ON cs.grade_level = mbg.grade_level AND cs.avg_participation_rate_with_color = mbg.max_rate
-    ORDER BY cs.grade_level ASC, cs.class_name ASC
-"""
+    """)
+    ]
+)
 
 # ============================================================================
 # REPORT QUERIES - Q19 Team Minutes
 # ============================================================================
 
-QUERY_Q19_TEAM_MINUTES = """
-    WITH TeamBonusMinutes AS (
-        SELECT
-            ci.team_name,
-            SUM(tcb.bonus_minutes) as total_bonus
-        FROM Team_Color_Bonus tcb
-        INNER JOIN Class_Info ci ON tcb.class_name = ci.class_name
-        GROUP BY ci.team_name
-    ),
-    TeamTotals AS (
-        SELECT
-            r.team_name,
-            COUNT(DISTINCT r.student_name) as total_students,
-            COALESCE(SUM(MIN(dl.minutes_read, 120)), 0) as total_minutes_base,
-            COALESCE(SUM(MIN(dl.minutes_read, 120)), 0) / 60 as total_hours_base,
-            COALESCE(tbm.total_bonus, 0) as bonus_minutes,
-            COALESCE(SUM(MIN(dl.minutes_read, 120)), 0) + COALESCE(tbm.total_bonus, 0) as total_minutes_with_color,
-            (COALESCE(SUM(MIN(dl.minutes_read, 120)), 0) + COALESCE(tbm.total_bonus, 0)) / 60 as total_hours_with_color,
-            ROUND(1.0 * COALESCE(SUM(MIN(dl.minutes_read, 120)), 0) / COUNT(DISTINCT r.student_name), 1) as avg_minutes_per_student,
-            ROUND(1.0 * (COALESCE(SUM(MIN(dl.minutes_read, 120)), 0) + COALESCE(tbm.total_bonus, 0)) / COUNT(DISTINCT r.student_name), 1) as avg_minutes_per_student_with_color
-        FROM Roster r
-        LEFT JOIN Daily_Logs dl ON r.student_name = dl.student_name
-        LEFT JOIN TeamBonusMinutes tbm ON r.team_name = tbm.team_name
-        GROUP BY r.team_name, tbm.total_bonus
-    ),
-    CombinedResults AS (
+# Team rows plus a TOTAL row; the stored-totals variant below reuses both
+_Q19_SELECT = """
+    SELECT * FROM CombinedResults
+    ORDER BY
+        CASE WHEN team_name = 'TOTAL' THEN 2 ELSE 1 END,
+        total_minutes_with_color DESC
+"""
+
+_Q19_COMBINED_RESULTS = ('CombinedResults', """
         SELECT
             team_name,
             total_students,
@@ -1005,13 +1178,234 @@ QUERY_Q19_TEAM_MINUTES = """
             ROUND(1.0 * SUM(total_minutes_base) / SUM(total_students), 1) as avg_minutes_per_student,
             ROUND(1.0 * SUM(total_minutes_with_color) / SUM(total_students), 1) as avg_minutes_per_student_with_color
         FROM TeamTotals
+    """)
+
+QUERY_Q19_TEAM_MINUTES = compose_query(
+    ['TeamColorBonus'],
+    _Q19_SELECT,
+    extra_ctes=[
+        ('TeamTotals', """
+        SELECT
+            r.team_name,
+            COUNT(DISTINCT r.student_name) as total_students,
+            COALESCE(SUM(MIN(dl.minutes_read, 120)), 0) as total_minutes_base,
+            COALESCE(SUM(MIN(dl.minutes_read, 120)), 0) / 60 as total_hours_base,
+            COALESCE(tcb.bonus_minutes, 0) as bonus_minutes,
+            COALESCE(SUM(MIN(dl.minutes_read, 120)), 0) + COALESCE(tcb.bonus_minutes, 0) as total_minutes_with_color,
+            (COALESCE(SUM(MIN(dl.minutes_read, 120)), 0) + COALESCE(tcb.bonus_minutes, 0)) / 60 as total_hours_with_color,
+            ROUND(1.0 * COALESCE(SUM(MIN(dl.minutes_read, 120)), 0) / COUNT(DISTINCT r.student_name), 1) as avg_minutes_per_student,
+            ROUND(1.0 * (COALESCE(SUM(MIN(dl.minutes_read, 120)), 0) + COALESCE(tcb.bonus_minutes, 0)) / COUNT(DISTINCT r.student_name), 1) as avg_minutes_per_student_with_color
+        FROM Roster r
+        LEFT JOIN Daily_Logs dl ON r.student_name = dl.student_name
+        LEFT JOIN TeamColorBonus tcb ON r.team_name = tcb.team_name
+        GROUP BY r.team_name, tcb.bonus_minutes
+    """),
+        _Q19_COMBINED_RESULTS
+    ]
+)
+
+# ============================================================================
+# STORED READING TOTALS - Incremental Cumulative Aggregates (Q6, Q14, Q18, Q19)
+# ============================================================================
+# Per-class participation and capped-minute totals, plus a row count per log
+# date, kept current by triggers on Daily_Logs: every inserted, updated or
+# deleted log row adds or removes its own contribution, so a daily upload only
+# touches the classes of the students in that day's file. Roster changes move
+# students between classes, so they mark the totals stale instead
+# (Reading_Totals_State emptied) until the next rebuild.
+#
+# Created by the first daily upload (see ReadathonDB.ensure_reading_totals);
+# reports fall back to the from-scratch queries while the totals are missing
+# or stale.
+
+CREATE_TABLE_CLASS_READING_TOTALS = """
+    CREATE TABLE IF NOT EXISTS Class_Reading_Totals (
+        class_name TEXT NOT NULL,
+        teacher_name TEXT NOT NULL,
+        grade_level TEXT NOT NULL,
+        team_name TEXT NOT NULL,
+        total_students INTEGER NOT NULL,
+        participations INTEGER NOT NULL DEFAULT 0,
+        capped_minutes INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (class_name, teacher_name, grade_level, team_name)
     )
-    SELECT * FROM CombinedResults
-    ORDER BY
-        CASE WHEN team_name = 'TOTAL' THEN 2 ELSE 1 END,
-        total_minutes_with_color DESC
 """
 
+CREATE_TABLE_READING_DAYS = """
+    CREATE TABLE IF NOT EXISTS Reading_Days (
+        log_date TEXT PRIMARY KEY,
+        log_count INTEGER NOT NULL
+    )
+"""
+
+CREATE_TABLE_READING_TOTALS_STATE = """
+    CREATE TABLE IF NOT EXISTS Reading_Totals_State (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        built_timestamp TEXT NOT NULL
+    )
+"""
+
+# Roster group of one student (row value matched against the totals key)
+_READING_TOTALS_CLASS_OF = """(class_name, teacher_name, grade_level, team_name) =
+            (SELECT class_name, teacher_name, grade_level, team_name FROM Roster WHERE student_name = {row}.student_name)"""
+
+def _reading_totals_apply(row, sign):
+    """Trigger statements adding (sign '+') or removing (sign '-') one Daily_Logs row"""
+    return f"""
+        UPDATE Class_Reading_Totals
+        SET participations = participations {sign} COALESCE({row}.minutes_read > 0, 0),
+            capped_minutes = capped_minutes {sign} COALESCE(MIN({row}.minutes_read, 120), 0)
+        WHERE {_READING_TOTALS_CLASS_OF.format(row=row)};
+        INSERT INTO Reading_Days (log_date, log_count) VALUES ({row}.log_date, {sign}1)
+        ON CONFLICT(log_date) DO UPDATE SET log_count = log_count {sign} 1;""" + (f"""
+        DELETE FROM Reading_Days WHERE log_date = {row}.log_date AND log_count <= 0;""" if sign == '-' else "")
+
+CREATE_READING_TOTALS_TRIGGERS = [
+    f"""CREATE TRIGGER IF NOT EXISTS Daily_Logs_Totals_Insert AFTER INSERT ON Daily_Logs
+    BEGIN{_reading_totals_apply('NEW', '+')}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS Daily_Logs_Totals_Update AFTER UPDATE ON Daily_Logs
+    BEGIN{_reading_totals_apply('NEW', '+')}{_reading_totals_apply('OLD', '-')}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS Daily_Logs_Totals_Delete AFTER DELETE ON Daily_Logs
+    BEGIN{_reading_totals_apply('OLD', '-')}
+    END""",
+] + [
+    f"""CREATE TRIGGER IF NOT EXISTS Roster_Totals_{event.title()} AFTER {event} ON Roster
+    BEGIN
+        DELETE FROM Reading_Totals_State;
+    END"""
+    for event in ('INSERT', 'UPDATE', 'DELETE')
+]
+
+SELECT_READING_TOTALS_BUILT = "SELECT built_timestamp FROM Reading_Totals_State WHERE id = 1"
+
+REBUILD_CLASS_READING_TOTALS = [
+    "DELETE FROM Class_Reading_Totals",
+    """
+    INSERT INTO Class_Reading_Totals
+        (class_name, teacher_name, grade_level, team_name, total_students, participations, capped_minutes)
+    SELECT
+        r.class_name,
+        r.teacher_name,
+        r.grade_level,
+        r.team_name,
+        COUNT(DISTINCT r.student_name),
+        COALESCE(SUM(dl.minutes_read > 0), 0),
+        COALESCE(SUM(MIN(dl.minutes_read, 120)), 0)
+    FROM Roster r
+    LEFT JOIN Daily_Logs dl ON r.student_name = dl.student_name
+    GROUP BY r.class_name, r.teacher_name, r.grade_level, r.team_name
+    """,
+    "DELETE FROM Reading_Days",
+    """
+    INSERT INTO Reading_Days (log_date, log_count)
+    SELECT log_date, COUNT(*) FROM Daily_Logs GROUP BY log_date
+    """
+]
+
+INSERT_READING_TOTALS_STATE = """
+    INSERT OR REPLACE INTO Reading_Totals_State (id, built_timestamp) VALUES (1, ?)
+"""
+
+# Stored counterparts of the TotalDays fragment and the Q6/Q18 class statistics
+_STORED_TOTAL_DAYS = ('StoredTotalDays', """
+        SELECT COUNT(*) as total_days FROM Reading_Days
+    """)
+
+_STORED_CLASS_STATS = ('StoredClassStats', """
+        SELECT
+            crt.class_name,
+            crt.teacher_name,
+            crt.grade_level,
+            crt.team_name,
+            ci.total_students,
+            td.total_days as days_with_data,
+            crt.participations as total_participations_base,
+            COALESCE(cb.bonus_points, 0) as color_bonus_points,
+            crt.participations + COALESCE(cb.bonus_points, 0) as total_participations_with_color,
+            ROUND(100.0 * crt.participations /
+                  (ci.total_students * td.total_days), 2) as avg_participation_rate,
+            ROUND(100.0 * (crt.participations + COALESCE(cb.bonus_points, 0)) /
+                  (ci.total_students * td.total_days), 2) as avg_participation_rate_with_color
+        FROM Class_Reading_Totals crt
+        INNER JOIN Class_Info ci ON crt.class_name = ci.class_name
+        CROSS JOIN StoredTotalDays td
+        LEFT JOIN ColorBonus cb ON crt.class_name = cb.class_name
+        WHERE td.total_days > 0
+    """)
+
+QUERY_Q6_CLASS_PARTICIPATION_STORED = compose_query(
+    ['ColorBonus'],
+    """
+    SELECT * FROM StoredClassStats
+    ORDER BY avg_participation_rate_with_color DESC, class_name ASC
+""",
+    extra_ctes=[_STORED_TOTAL_DAYS, _STORED_CLASS_STATS]
+)
+
+QUERY_Q14_TEAM_PARTICIPATION_STORED = compose_query(
+    ['TeamColorBonus'],
+    """
+    SELECT
+        crt.team_name,
+        SUM(crt.total_students) as total_students,
+        td.total_days as days_with_data,
+        SUM(crt.participations) as total_participations_base,
+        COALESCE(tcb.bonus_points, 0) as color_bonus_points,
+        SUM(crt.participations) + COALESCE(tcb.bonus_points, 0) as total_participations_with_color,
+        ROUND(100.0 * SUM(crt.participations) /
+              (SUM(crt.total_students) * td.total_days), 2) as avg_participation_rate,
+        ROUND(100.0 * (SUM(crt.participations) + COALESCE(tcb.bonus_points, 0)) /
+              (SUM(crt.total_students) * td.total_days), 2) as avg_participation_rate_with_color
+    FROM Class_Reading_Totals crt
+    CROSS JOIN StoredTotalDays td
+    LEFT JOIN TeamColorBonus tcb ON crt.team_name = tcb.team_name
+    GROUP BY crt.team_name, td.total_days, tcb.bonus_points
+    HAVING td.total_days > 0
+    ORDER BY avg_participation_rate_with_color DESC
+""",
+    extra_ctes=[_STORED_TOTAL_DAYS]
+)
+
+QUERY_Q18_LEAD_CLASS_BY_GRADE_STORED = compose_query(
+    ['ColorBonus'],
+    """
+    SELECT cs.*
+    FROM StoredClassStats cs
+    INNER JOIN MaxByGrade mbg ON cs.grade_level = mbg.grade_level AND cs.avg_participation_rate_with_color = mbg.max_rate
+    ORDER BY cs.grade_level ASC, cs.class_name ASC
+""",
+    extra_ctes=[_STORED_TOTAL_DAYS, _STORED_CLASS_STATS, ('MaxByGrade', """
+        SELECT grade_level, MAX(avg_participation_rate_with_color) as max_rate
+        FROM StoredClassStats
+        GROUP BY grade_level
+    """)]
+)
+
+QUERY_Q19_TEAM_MINUTES_STORED = compose_query(
+    ['TeamColorBonus'],
+    _Q19_SELECT,
+    extra_ctes=[
+        ('TeamTotals', """
+        SELECT
+            crt.team_name,
+            SUM(crt.total_students) as total_students,
+            SUM(crt.capped_minutes) as total_minutes_base,
+            SUM(crt.capped_minutes) / 60 as total_hours_base,
+            COALESCE(tcb.bonus_minutes, 0) as bonus_minutes,
+            SUM(crt.capped_minutes) + COALESCE(tcb.bonus_minutes, 0) as total_minutes_with_color,
+            (SUM(crt.capped_minutes) + COALESCE(tcb.bonus_minutes, 0)) / 60 as total_hours_with_color,
+            ROUND(1.0 * SUM(crt.capped_minutes) / SUM(crt.total_students), 1) as avg_minutes_per_student,
+            ROUND(1.0 * (SUM(crt.capped_minutes) + COALESCE(tcb.bonus_minutes, 0)) / SUM(crt.total_students), 1) as avg_minutes_per_student_with_color
+        FROM Class_Reading_Totals crt
+        LEFT JOIN TeamColorBonus tcb ON crt.team_name = tcb.team_name
+        GROUP BY crt.team_name, tcb.bonus_minutes
+    """),
+        _Q19_COMBINED_RESULTS
+    ]
+)
+
 # ============================================================================
 # REPORT QUERIES - Q20 Team Donations
 # ============================================================================
@@ -1126,6 +1520,324 @@ QUERY_Q23_ROSTER_INTEGRITY = """
     ORDER BY student_name ASC, found_in_table ASC
 """
 
+# ============================================================================
+# STUDENT RECONCILIATION - Incremental Integrity Table (Q21, Q22, Q23)
+# ============================================================================
+# One row per student seen in Roster, Daily_Logs or Reader_Cumulative with
+# their daily sums, cumulative minutes, roster presence and Q21 status. Kept
+# current by triggers on all three tables, so daily and cumulative uploads
+# update only the students they touch and the integrity reports read this
+# table instead of joining the source tables.
+#
+# Created by the first daily or cumulative upload (see
+# ReadathonDB.ensure_student_reconciliation); reports fall back to the
+# queries above until then.
+
+CREATE_TABLE_STUDENT_RECONCILIATION = """
+    CREATE TABLE IF NOT EXISTS Student_Reconciliation (
+        student_name TEXT PRIMARY KEY,
+        in_roster INTEGER NOT NULL DEFAULT 0,
+        team_name TEXT,
+        class_name TEXT,
+        daily_minutes_count INTEGER NOT NULL DEFAULT 0,
+        daily_minutes_sum INTEGER NOT NULL DEFAULT 0,
+        daily_minutes_capped INTEGER NOT NULL DEFAULT 0,
+        daily_reading_days INTEGER NOT NULL DEFAULT 0,
+        in_cumulative INTEGER NOT NULL DEFAULT 0,
+        cumulative_minutes INTEGER,
+        status TEXT NOT NULL DEFAULT 'OK'
+    )
+"""
+
+CREATE_INDEX_STUDENT_RECONCILIATION_STATUS = """
+    CREATE INDEX IF NOT EXISTS idx_student_reconciliation_status ON Student_Reconciliation (status)
+"""
+
+CREATE_TABLE_RECONCILIATION_STATE = """
+    CREATE TABLE IF NOT EXISTS Reconciliation_State (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        built_timestamp TEXT NOT NULL
+    )
+"""
+
+# Q21 status from the stored columns (same rules as QUERY_Q21_MINUTES_INTEGRITY;
+# daily_minutes_count = 0 stands for SUM(minutes_read) IS NULL)
+_RECONCILIATION_STATUS = """CASE
+                WHEN COALESCE(cumulative_minutes, 0) = daily_minutes_sum THEN 'OK'
+                WHEN cumulative_minutes IS NULL AND daily_minutes_count > 0 AND daily_minutes_sum > 0 THEN 'MISSING_CUMULATIVE'
+                WHEN cumulative_minutes > 0 AND daily_minutes_count = 0 THEN 'MISSING_DAILY'
+                ELSE 'MINUTES_MISMATCH'
+            END"""
+
+def _reconciliation_add_student(row):
+    """
+    Trigger statement creating the student's row (with roster fields) if missing.
+
+    NOT EXISTS rather than INSERT OR IGNORE: inside a trigger, OR IGNORE is
+    overridden by the conflict policy of the statement that fired it.
+    """
+    return f"""
+        INSERT INTO Student_Reconciliation (student_name, in_roster, team_name, class_name)
+        SELECT {row}.student_name, r.student_name IS NOT NULL, r.team_name, r.class_name
+        FROM (SELECT 1) LEFT JOIN Roster r ON r.student_name = {row}.student_name
+        WHERE NOT EXISTS (SELECT 1 FROM Student_Reconciliation WHERE student_name = {row}.student_name);"""
+
+def _reconciliation_refresh_status(row):
+    return f"""
+        UPDATE Student_Reconciliation SET status = {_RECONCILIATION_STATUS}
+        WHERE student_name = {row}.student_name;"""
+
+def _reconciliation_daily(row, sign):
+    """Trigger statements adding (sign '+') or removing (sign '-') one Daily_Logs row"""
+    return _reconciliation_add_student(row) + f"""
+        UPDATE Student_Reconciliation
+        SET daily_minutes_count = daily_minutes_count {sign} ({row}.minutes_read IS NOT NULL),
+            daily_minutes_sum = daily_minutes_sum {sign} COALESCE({row}.minutes_read, 0),
+            daily_minutes_capped = daily_minutes_capped {sign} COALESCE(MIN({row}.minutes_read, 120), 0),
+            daily_reading_days = daily_reading_days {sign} COALESCE({row}.minutes_read > 0, 0)
+        WHERE student_name = {row}.student_name;""" + _reconciliation_refresh_status(row)
+
+def _reconciliation_cumulative(row, present):
+    """Trigger statements recording a Reader_Cumulative row (present) or its removal"""
+    values = f"in_cumulative = 1, cumulative_minutes = {row}.cumulative_minutes" if present \
+        else "in_cumulative = 0, cumulative_minutes = NULL"
+    return _reconciliation_add_student(row) + f"""
+        UPDATE Student_Reconciliation SET {values}
+        WHERE student_name = {row}.student_name;""" + _reconciliation_refresh_status(row)
+
+def _reconciliation_roster(row, present):
+    """Trigger statements recording a Roster row (present) or its removal"""
+    values = f"in_roster = 1, team_name = {row}.team_name, class_name = {row}.class_name" if present \
+        else "in_roster = 0, team_name = NULL, class_name = NULL"
+    return _reconciliation_add_student(row) + f"""
+        UPDATE Student_Reconciliation SET {values}
+        WHERE student_name = {row}.student_name;"""
+
+def _reconciliation_triggers(table, apply_old, apply_new):
+    prefix = f"{table}_Reconciliation"
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS {prefix}_Insert AFTER INSERT ON {table}\n    BEGIN{apply_new}\n    END",
+        f"CREATE TRIGGER IF NOT EXISTS {prefix}_Update AFTER UPDATE ON {table}\n    BEGIN{apply_old}{apply_new}\n    END",
+        f"CREATE TRIGGER IF NOT EXISTS {prefix}_Delete AFTER DELETE ON {table}\n    BEGIN{apply_old}\n    END",
+    ]
+
+CREATE_RECONCILIATION_TRIGGERS = (
+    _reconciliation_triggers('Daily_Logs', _reconciliation_daily('OLD', '-'), _reconciliation_daily('NEW', '+'))
+    + _reconciliation_triggers('Reader_Cumulative', _reconciliation_cumulative('OLD', False),
+                               _reconciliation_cumulative('NEW', True))
+    + _reconciliation_triggers('Roster', _reconciliation_roster('OLD', False), _reconciliation_roster('NEW', True))
+)
+
+SELECT_RECONCILIATION_BUILT = "SELECT built_timestamp FROM Reconciliation_State WHERE id = 1"
+
+REBUILD_STUDENT_RECONCILIATION = [
+    "DELETE FROM Student_Reconciliation",
+    f"""
+    INSERT INTO Student_Reconciliation
+        (student_name, in_roster, team_name, class_name, daily_minutes_count, daily_minutes_sum,
+         daily_minutes_capped, daily_reading_days, in_cumulative, cumulative_minutes)
+    SELECT
+        s.student_name,
+        r.student_name IS NOT NULL,
+        r.team_name,
+        r.class_name,
+        COALESCE(d.minutes_count, 0),
+        COALESCE(d.minutes_sum, 0),
+        COALESCE(d.minutes_capped, 0),
+        COALESCE(d.reading_days, 0),
+        rc.student_name IS NOT NULL,
+        rc.cumulative_minutes
+    FROM (
+        SELECT student_name FROM Roster
+        UNION SELECT student_name FROM Daily_Logs
+        UNION SELECT student_name FROM Reader_Cumulative
+    ) s
+    LEFT JOIN Roster r ON r.student_name = s.student_name
+    LEFT JOIN (
+        SELECT
+            student_name,
+            COUNT(minutes_read) as minutes_count,
+            COALESCE(SUM(minutes_read), 0) as minutes_sum,
+            COALESCE(SUM(MIN(minutes_read, 120)), 0) as minutes_capped,
+            SUM(minutes_read > 0) as reading_days
+        FROM Daily_Logs
+        GROUP BY student_name
+    ) d ON d.student_name = s.student_name
+    LEFT JOIN Reader_Cumulative rc ON rc.student_name = s.student_name
+    """,
+    f"UPDATE Student_Reconciliation SET status = {_RECONCILIATION_STATUS}"
+]
+
+INSERT_RECONCILIATION_STATE = """
+    INSERT OR REPLACE INTO Reconciliation_State (id, built_timestamp) VALUES (1, ?)
+"""
+
+QUERY_Q21_MINUTES_INTEGRITY_STORED = """
+    SELECT
+        student_name,
+        team_name,
+        class_name,
+        daily_minutes_sum,
+        daily_minutes_capped,
+        COALESCE(cumulative_minutes, 0) as cumulative_minutes,
+        COALESCE(cumulative_minutes, 0) - daily_minutes_sum as difference,
+        status
+    FROM Student_Reconciliation
+    WHERE in_roster = 1
+    ORDER BY
+        CASE status
+            WHEN 'MINUTES_MISMATCH' THEN 1
+            WHEN 'MISSING_CUMULATIVE' THEN 2
+            WHEN 'MISSING_DAILY' THEN 3
+            WHEN 'OK' THEN 4
+        END,
+        ABS(difference) DESC,
+        student_name ASC
+"""
+
+QUERY_Q22_STUDENT_NAME_SYNC_STORED = """
+    SELECT
+        student_name,
+        CASE WHEN daily_reading_days > 0 THEN 'IN_DAILY_ONLY' ELSE 'IN_CUMULATIVE_ONLY' END as status,
+        CASE WHEN daily_reading_days > 0 THEN 'Yes' ELSE 'No' END as in_daily_logs,
+        CASE WHEN cumulative_minutes > 0 THEN 'Yes' ELSE 'No' END as in_reader_cumulative
+    FROM Student_Reconciliation
+    WHERE (daily_reading_days > 0) != (COALESCE(cumulative_minutes, 0) > 0)
+    ORDER BY
+        CASE WHEN daily_reading_days > 0 THEN 1 ELSE 2 END,  -- IN_DAILY_ONLY first (the table's own status column is Q21's)
+        student_name ASC
+"""
+
+QUERY_Q23_ROSTER_INTEGRITY_STORED = """
+    SELECT student_name, 'Daily_Logs' as found_in_table, 'MISSING_FROM_ROSTER' as status
+    FROM Student_Reconciliation
+    WHERE in_roster = 0 AND daily_reading_days > 0
+    UNION ALL
+    SELECT student_name, 'Reader_Cumulative' as found_in_table, 'MISSING_FROM_ROSTER' as status
+    FROM Student_Reconciliation
+    WHERE in_roster = 0 AND in_cumulative = 1
+    ORDER BY student_name ASC, found_in_table ASC
+"""
+
+# School-wide Daily_Logs vs Reader_Cumulative minutes (admin verification)
+QUERY_INTEGRITY_TOTALS = """
+    SELECT
+        COALESCE(SUM(dl.minutes_read), 0) as daily_total,
+        COALESCE(SUM(rc.cumulative_minutes), 0) as cumulative_total,
+        COALESCE(SUM(rc.cumulative_minutes), 0) - COALESCE(SUM(dl.minutes_read), 0) as difference
+    FROM (SELECT SUM(minutes_read) as minutes_read FROM Daily_Logs) dl,
+         (SELECT SUM(cumulative_minutes) as cumulative_minutes FROM Reader_Cumulative) rc
+"""
+
+QUERY_INTEGRITY_TOTALS_STORED = """
+    SELECT
+        COALESCE(SUM(daily_minutes_sum), 0) as daily_total,
+        COALESCE(SUM(cumulative_minutes), 0) as cumulative_total,
+        COALESCE(SUM(cumulative_minutes), 0) - COALESCE(SUM(daily_minutes_sum), 0) as difference
+    FROM Student_Reconciliation
+"""
+
+# ============================================================================
+# TABLE BROWSER QUERIES (keyset pagination)
+# ============================================================================
+# Sources for /api/table/<table_id>. order_by lists (expression, direction) keys
+# that together are unique per row, so the last row of a page is a stable cursor.
+#   table:   Physical table (its columns are filterable by name), or None
+#   columns: For joined sources, output column -> SQL expression
+TABLE_BROWSER_SOURCES = {
+    'roster': {
+        'title': 'Roster Table',
+        'table': 'Roster',
+        'select': "SELECT * FROM Roster",
+        'order_by': [('team_name', 'ASC'), ('grade_level', 'ASC'), ('class_name', 'ASC'), ('student_name', 'ASC')]
+    },
+    'class_info': {
+        'title': 'Class_Info Table',
+        'table': 'Class_Info',
+        'select': "SELECT * FROM Class_Info",
+        'order_by': [('team_name', 'ASC'), ('grade_level', 'ASC'), ('class_name', 'ASC')]
+    },
+    'grade_rules': {
+        'title': 'Grade_Rules Table',
+        'table': 'Grade_Rules',
+        'select': "SELECT * FROM Grade_Rules",
+        'order_by': [('rowid', 'ASC')]
+    },
+    'daily_logs': {
+        'title': 'Daily_Logs Table',
+        'table': 'Daily_Logs',
+        'select': "SELECT * FROM Daily_Logs",
+        'order_by': [('log_date', 'DESC'), ('student_name', 'ASC')]
+    },
+    'reader_cumulative': {
+        'title': 'Reader_Cumulative Table',
+        'table': 'Reader_Cumulative',
+        'select': "SELECT * FROM Reader_Cumulative",
+        # team_name is nullable; COALESCE keeps NULLs first and comparable
+        'order_by': [("COALESCE(team_name, '')", 'ASC'), ('student_name', 'ASC')]
+    },
+    'team_color_bonus': {
+        'title': 'Team_Color_Bonus Table',
+        'table': 'Team_Color_Bonus',
+        'select': "SELECT * FROM Team_Color_Bonus",
+        'order_by': [('event_date', 'DESC'), ('class_name', 'ASC')]
+    },
+    'upload_history': {
+        'title': 'Upload_History Table',
+        'table': 'Upload_History',
+        'select': "SELECT * FROM Upload_History",
+        'order_by': [('upload_timestamp', 'DESC'), ('upload_id', 'DESC')]
+    },
+    'complete_log': {
+        'title': 'Q7: Complete Log (Query)',
+        'description': 'Complete denormalized log combining all data from Daily_Logs and Roster',
+        'table': None,
+        'columns': {
+            'log_date': 'dl.log_date',
+            'student_name': 'dl.student_name',
+            'minutes_read': 'dl.minutes_read',
+            'class_name': 'r.class_name',
+            'home_room': 'r.home_room',
+            'teacher_name': 'r.teacher_name',
+            'grade_level': 'r.grade_level',
+            'team_name': 'r.team_name'
+        },
+        'select': """
+            SELECT
+                dl.log_date,
+                dl.student_name,
+                dl.minutes_read,
+                r.class_name,
+                r.home_room,
+                r.teacher_name,
+                r.grade_level,
+                r.team_name
+            FROM Daily_Logs dl
+            INNER JOIN Roster r ON dl.student_name = r.student_name
+        """,
+        'order_by': [('dl.log_date', 'DESC'), ('r.team_name', 'ASC'), ('r.class_name', 'ASC'), ('dl.student_name', 'ASC')]
+    }
+}
+
+def get_keyset_where(order_by):
+    """
+    Build the "rows after the cursor" predicate for (expression, direction) keys.
+
+    Expands to (k1 > ?) OR (k1 = ? AND k2 > ?) OR ... with < for DESC keys.
+
+    Returns:
+        (sql, param_indexes) where param_indexes[i] is the key whose cursor value
+        binds to the i-th placeholder
+    """
+    clauses = []
+    param_indexes = []
+    for i, (expr, direction) in enumerate(order_by):
+        op = '<' if direction == 'DESC' else '>'
+        parts = [f"{order_by[j][0]} = ?" for j in range(i)] + [f"{expr} {op} ?"]
+        param_indexes.extend(range(i + 1))
+        clauses.append("(" + " AND ".join(parts) + ")")
+    return "(" + " OR ".join(clauses) + ")", param_indexes
+
 # ============================================================================
 # GRADE LEVEL TAB QUERIES
 # ============================================================================
@@ -1655,287 +2367,40 @@ def get_student_detail_query(date_where=""):
 
     return summary_query, daily_query
 
-def get_students_school_winners_query(date_where=""):
-    """
-    Get school-wide winners (gold highlights) for all metrics.
-
-    Returns one row per metric with the max value across ALL students.
-    Used to identify which students get gold oval highlights.
-
-    Args:
-        date_where: SQL WHERE clause for date filtering
-
-    Returns columns: metric_name, max_value
-    """
-    return f"""
-        SELECT 'fundraising' as metric, MAX(COALESCE(rc.donation_amount, 0)) as max_value
-        FROM Reader_Cumulative rc
-
-        UNION ALL
-
-        SELECT 'sponsors' as metric, MAX(COALESCE(rc.sponsors, 0)) as max_value
-        FROM Reader_Cumulative rc
-
-        UNION ALL
-
-        SELECT 'minutes_capped' as metric, MAX(total_capped) as max_value
-        FROM (
-            SELECT SUM(MIN(dl.minutes_read, 120)) as total_capped
-            FROM Daily_Logs dl
-            WHERE 1=1 {date_where}
-            GROUP BY dl.student_name
-        )
-
-        UNION ALL
-
-        SELECT 'minutes_uncapped' as metric, MAX(total_uncapped) as max_value
-        FROM (
-            SELECT SUM(dl.minutes_read) as total_uncapped
-            FROM Daily_Logs dl
-            WHERE 1=1 {date_where}
-            GROUP BY dl.student_name
-        )
-
-        UNION ALL
-
-        SELECT 'days_participated' as metric, MAX(days_participated) as max_value
-        FROM (
-            SELECT COUNT(CASE WHEN dl.minutes_read > 0 THEN 1 END) as days_participated
-            FROM Daily_Logs dl
-            WHERE 1=1 {date_where}
-            GROUP BY dl.student_name
-        )
-
-        UNION ALL
-
-        SELECT 'days_met_goal' as metric, MAX(days_met_goal) as max_value
-        FROM (
-            SELECT COUNT(CASE WHEN dl.minutes_read >= gr.min_daily_minutes THEN 1 END) as days_met_goal
-            FROM Roster r
-            LEFT JOIN Daily_Logs dl ON r.student_name = dl.student_name {date_where}
-            LEFT JOIN Grade_Rules gr ON r.grade_level = gr.grade_level
-            GROUP BY r.student_name
-        )
-
-        UNION ALL
-
-        SELECT 'participation_pct' as metric, MAX(participation_pct) as max_value
-        FROM (
-            SELECT CASE
-                WHEN (SELECT COUNT(DISTINCT log_date) FROM Daily_Logs WHERE 1=1 {date_where}) > 0
-                THEN ROUND(100.0 * COUNT(CASE WHEN dl.minutes_read > 0 THEN 1 END) / (SELECT COUNT(DISTINCT log_date) FROM Daily_Logs WHERE 1=1 {date_where}), 1)
-                ELSE 0
-            END as participation_pct
-            FROM Roster r
-            LEFT JOIN Daily_Logs dl ON r.student_name = dl.student_name {date_where}
-            GROUP BY r.student_name
-        )
-
-        UNION ALL
-
-        SELECT 'goal_met_pct' as metric, MAX(goal_met_pct) as max_value
-        FROM (
-            SELECT CASE
-                WHEN COUNT(CASE WHEN dl.minutes_read > 0 THEN 1 END) > 0
-                THEN ROUND(100.0 * COUNT(CASE WHEN dl.minutes_read >= gr.min_daily_minutes THEN 1 END) / COUNT(CASE WHEN dl.minutes_read > 0 THEN 1 END), 1)
-                ELSE 0
-            END as goal_met_pct
-            FROM Roster r
-            LEFT JOIN Daily_Logs dl ON r.student_name = dl.student_name {date_where}
-            LEFT JOIN Grade_Rules gr ON r.grade_level = gr.grade_level
-            GROUP BY r.student_name
-        )
-    """
-
-def get_students_banner_query(date_where="", date_where_no_alias="", grade_where="", team_where=""):
-    """
-    Get banner metrics for Students page (6 metrics matching School/Teams/Grade pages).
-
-    Metrics (in order):
-    1. Campaign Day - Full contest status (no filter)
-    2. Fundraising - Total for filtered students (no date filter)
-    3. Minutes Read - Total capped minutes for filtered students (honors date filter)
-    4. Sponsors - Total sponsors for filtered students (no date filter)
-    5. Avg. Participation - Average of (days_participated / total_days * 100) across filtered students (honors date filter)
-    6. Goal Met (≥1 Day) - Filtered students who met goal ≥1 day (honors date filter)
-
-    Args:
-        date_where: SQL WHERE clause for date filtering with alias
-        date_where_no_alias: SQL WHERE clause for date filtering without alias
-        grade_where: SQL WHERE clause for grade filtering
-        team_where: SQL WHERE clause for team filtering
-    """
-    return f"""
-        WITH FilteredStudents AS (
-            SELECT COUNT(DISTINCT r.student_name) as total_students
-            FROM Roster r
-            WHERE 1=1 {grade_where} {team_where}
-        ),
-        TotalDays AS (
-            SELECT COUNT(DISTINCT log_date) as total_days
-            FROM Daily_Logs
-            WHERE 1=1 {date_where_no_alias}
-        ),
-        AllDays AS (
-            SELECT COUNT(DISTINCT log_date) as all_days
-            FROM Daily_Logs
-        ),
-        Fundraising AS (
-            SELECT
-                COALESCE(SUM(rc.donation_amount), 0) as total_fundraising,
-                MAX(rc.donation_amount) as max_fundraising
-            FROM Roster r
-            LEFT JOIN Reader_Cumulative rc ON r.student_name = rc.student_name
-            WHERE 1=1 {grade_where} {team_where}
-        ),
-        Minutes AS (
-            SELECT
-                COALESCE(SUM(MIN(dl.minutes_read, 120)), 0) as total_minutes
-            FROM Roster r
-            LEFT JOIN Daily_Logs dl ON r.student_name = dl.student_name {date_where}
-            WHERE 1=1 {grade_where} {team_where}
-        ),
-        Sponsors AS (
-            SELECT
-                COALESCE(SUM(rc.sponsors), 0) as total_sponsors
-            FROM Roster r
-            LEFT JOIN Reader_Cumulative rc ON r.student_name = rc.student_name
-            WHERE 1=1 {grade_where} {team_where}
-        ),
-        Participation AS (
-            SELECT
-                CASE WHEN (SELECT total_students FROM FilteredStudents) > 0 AND (SELECT total_days FROM TotalDays) > 0
-                    THEN ROUND(100.0 * COUNT(*) / ((SELECT total_students FROM FilteredStudents) * (SELECT total_days FROM TotalDays)), 1)
-                    ELSE 0
-                END as avg_participation_pct
-            FROM Roster r
-            INNER JOIN Daily_Logs dl ON r.student_name = dl.student_name {date_where}
-            WHERE dl.minutes_read > 0 {grade_where} {team_where}
-        ),
-        GoalMet AS (
-            SELECT
-                COUNT(DISTINCT r.student_name) as goal_met_count
-            FROM Roster r
-            LEFT JOIN Daily_Logs dl ON r.student_name = dl.student_name {date_where}
-            LEFT JOIN Grade_Rules gr ON r.grade_level = gr.grade_level
-            WHERE dl.minutes_read >= gr.min_daily_minutes {grade_where} {team_where}
-        )
-        SELECT
-            (SELECT total_days FROM TotalDays) as campaign_days,
-            (SELECT all_days FROM AllDays) as total_contest_days,
-            (SELECT total_fundraising FROM Fundraising) as total_fundraising,
-            (SELECT total_minutes FROM Minutes) as total_minutes,
-            (SELECT total_sponsors FROM Sponsors) as total_sponsors,
-            ROUND(COALESCE((SELECT avg_participation_pct FROM Participation), 0), 1) as avg_participation_pct,
-            CASE WHEN (SELECT total_students FROM FilteredStudents) > 0
-                THEN ROUND(100.0 * (SELECT goal_met_count FROM GoalMet) / (SELECT total_students FROM FilteredStudents), 1)
-                ELSE 0
-            END as goal_met_pct,
-            (SELECT total_students FROM FilteredStudents) as total_students
-    """
-
-def get_students_filtered_winners_query(date_where="", grade_where="", team_where=""):
+def get_student_detail_batch_query(student_where, date_where=""):
     """
-    Get winners within the current filter group (silver highlights).
+    Student detail for many students in a single query.
 
-    Only used when grade_filter != 'all' OR team_filter != 'all'
-    Returns max values for each metric within the filtered group.
+    Returns one row per (student, log date), or one row with a NULL log_date for
+    a student without logs. Each row carries the student's roster, fundraising
+    and grade goal columns next to that day's minutes, so the caller can fold
+    the rows into the summary and daily breakdown of get_student_detail_query.
 
     Args:
+        student_where: SQL condition on Roster r selecting the students
         date_where: SQL WHERE clause for date filtering
-        grade_where: SQL WHERE clause for grade filtering
-        team_where: SQL WHERE clause for team filtering
-
-    Returns columns: metric_name, max_value
     """
     return f"""
-        SELECT 'fundraising' as metric, MAX(COALESCE(rc.donation_amount, 0)) as max_value
-        FROM Roster r
-        LEFT JOIN Reader_Cumulative rc ON r.student_name = rc.student_name
-        WHERE 1=1 {grade_where} {team_where}
-
-        UNION ALL
-
-        SELECT 'sponsors' as metric, MAX(COALESCE(rc.sponsors, 0)) as max_value
+        SELECT
+            r.student_name,
+            r.grade_level,
+            r.team_name,
+            r.class_name,
+            r.teacher_name,
+            COALESCE(rc.donation_amount, 0) as fundraising,
+            COALESCE(rc.sponsors, 0) as sponsors,
+            gr.min_daily_minutes as grade_goal,
+            dl.log_date,
+            dl.minutes_read as actual_minutes,
+            CASE WHEN dl.minutes_read > 120 THEN 120 ELSE dl.minutes_read END as capped_minutes,
+            CASE WHEN dl.minutes_read > 120 THEN 1 ELSE 0 END as exceeded_cap,
+            CASE WHEN dl.minutes_read >= gr.min_daily_minutes THEN 1 ELSE 0 END as met_goal
         FROM Roster r
         LEFT JOIN Reader_Cumulative rc ON r.student_name = rc.student_name
-        WHERE 1=1 {grade_where} {team_where}
-
-        UNION ALL
-
-        SELECT 'minutes_capped' as metric, MAX(total_capped) as max_value
-        FROM (
-            SELECT SUM(MIN(dl.minutes_read, 120)) as total_capped
-            FROM Roster r
-            LEFT JOIN Daily_Logs dl ON r.student_name = dl.student_name {date_where}
-            WHERE 1=1 {grade_where} {team_where}
-            GROUP BY dl.student_name
-        )
-
-        UNION ALL
-
-        SELECT 'minutes_uncapped' as metric, MAX(total_uncapped) as max_value
-        FROM (
-            SELECT SUM(dl.minutes_read) as total_uncapped
-            FROM Roster r
-            LEFT JOIN Daily_Logs dl ON r.student_name = dl.student_name {date_where}
-            WHERE 1=1 {grade_where} {team_where}
-            GROUP BY dl.student_name
-        )
-
-        UNION ALL
-
-        SELECT 'days_participated' as metric, MAX(days_participated) as max_value
-        FROM (
-            SELECT COUNT(CASE WHEN dl.minutes_read > 0 THEN 1 END) as days_participated
-            FROM Roster r
-            LEFT JOIN Daily_Logs dl ON r.student_name = dl.student_name {date_where}
-            WHERE 1=1 {grade_where} {team_where}
-            GROUP BY dl.student_name
-        )
-
-        UNION ALL
-
-        SELECT 'days_met_goal' as metric, MAX(days_met_goal) as max_value
-        FROM (
-            SELECT COUNT(CASE WHEN dl.minutes_read >= gr.min_daily_minutes THEN 1 END) as days_met_goal
-            FROM Roster r
-            LEFT JOIN Daily_Logs dl ON r.student_name = dl.student_name {date_where}
-            LEFT JOIN Grade_Rules gr ON r.grade_level = gr.grade_level
-            WHERE 1=1 {grade_where} {team_where}
-            GROUP BY r.student_name
-        )
-
-        UNION ALL
-
-        SELECT 'participation_pct' as metric, MAX(participation_pct) as max_value
-        FROM (
-            SELECT CASE
-                WHEN (SELECT COUNT(DISTINCT log_date) FROM Daily_Logs WHERE 1=1 {date_where}) > 0
-                THEN ROUND(100.0 * COUNT(CASE WHEN dl.minutes_read > 0 THEN 1 END) / (SELECT COUNT(DISTINCT log_date) FROM Daily_Logs WHERE 1=1 {date_where}), 1)
-                ELSE 0
-            END as participation_pct
-            FROM Roster r
-            LEFT JOIN Daily_Logs dl ON r.student_name = dl.student_name {date_where}
-            WHERE 1=1 {grade_where} {team_where}
-            GROUP BY r.student_name
-        )
-
-        UNION ALL
-
-        SELECT 'goal_met_pct' as metric, MAX(goal_met_pct) as max_value
-        FROM (
-            SELECT CASE
-                WHEN COUNT(CASE WHEN dl.minutes_read > 0 THEN 1 END) > 0
-                THEN ROUND(100.0 * COUNT(CASE WHEN dl.minutes_read >= gr.min_daily_minutes THEN 1 END) / COUNT(CASE WHEN dl.minutes_read > 0 THEN 1 END), 1)
-                ELSE 0
-            END as goal_met_pct
-            FROM Roster r
-            LEFT JOIN Daily_Logs dl ON r.student_name = dl.student_name {date_where}
-            LEFT JOIN Grade_Rules gr ON r.grade_level = gr.grade_level
-            WHERE 1=1 {grade_where} {team_where}
-            GROUP BY r.student_name
-        )
+        LEFT JOIN Daily_Logs dl ON r.student_name = dl.student_name {date_where}
+        LEFT JOIN Grade_Rules gr ON r.grade_level = gr.grade_level
+        WHERE {student_where}
+        ORDER BY r.student_name, dl.log_date
     """
 
 def get_school_wide_leaders_query(date_where="", grade=None, team=None):
@@ -1951,7 +2416,7 @@ def get_school_wide_leaders_query(date_where="", grade=None, team=None):
     grade_where = f" AND ci.grade_level = '{grade}'" if grade else ""
     team_where = f" AND ci.team_name = '{team}'" if team else ""
 
-    return f"""
+    return compose_query(['ClassMinutes', 'ColorBonus'], f"""
         SELECT * FROM (
             SELECT
                 'fundraising' as metric,
@@ -1973,26 +2438,6 @@ def get_school_wide_leaders_query(date_where="", grade=None, team=None):
 
         SELECT * FROM (
             -- Minutes with color bonus (matches table calculation)
-            WITH ClassMinutes AS (
-                SELECT
-                    ci.class_name,
-                    ci.teacher_name,
-                    ci.grade_level,
-                    ci.team_name,
-                    SUM(MIN(dl.minutes_read, 120)) as base_minutes
-                FROM Class_Info ci
-                JOIN Roster r ON ci.class_name = r.class_name
-                LEFT JOIN Daily_Logs dl ON r.student_name = dl.student_name {date_where}
-                WHERE 1=1 {grade_where} {team_where}
-                GROUP BY ci.class_name, ci.teacher_name, ci.grade_level, ci.team_name
-            ),
-            ColorBonus AS (
-                SELECT
-                    class_name,
-                    SUM(bonus_minutes) as bonus_minutes
-                FROM Team_Color_Bonus
-                GROUP BY class_name
-            )
             SELECT
                 'minutes' as metric,
                 cm.class_name,
@@ -2054,13 +2499,6 @@ def get_school_wide_leaders_query(date_where="", grade=None, team=None):
                 FROM ClassDailyParticipation
                 GROUP BY class_name, teacher_name, grade_level, team_name, total_students
             ),
-            ColorBonus AS (
-                SELECT
-                    class_name,
-                    SUM(bonus_participation_points) as bonus_points
-                FROM Team_Color_Bonus
-                GROUP BY class_name
-            ),
             DaysCount AS (
                 SELECT COUNT(DISTINCT dl.log_date) as total_days
                 FROM Daily_Logs dl
@@ -2101,7 +2539,7 @@ def get_school_wide_leaders_query(date_where="", grade=None, team=None):
             ORDER BY value DESC
             LIMIT 1
         )
-    """
+    """, date_where=date_where, class_where=f"{grade_where} {team_where}")
 
 # Q24 - Database_Metadata (Multi-Year Database Registry)
 QUERY_Q24_DATABASE_METADATA = """
@@ -2371,8 +2809,10 @@ def get_db_comparison_team_top(metric, date_filter=None):
         date_filter: Optional date filter for time-based metrics
     """
     date_where = ""
+    date_where_dl2 = ""
     if date_filter and date_filter != 'all' and metric in ['minutes', 'participation']:
         date_where = f"AND dl.log_date <= '{date_filter}'"
+        date_where_dl2 = f"AND dl2.log_date <= '{date_filter}'"
 
     if metric == 'fundraising':
         return f"""
@@ -2433,7 +2873,7 @@ def get_db_comparison_team_top(metric, date_filter=None):
                         SELECT COALESCE(SUM(CASE WHEN dl2.minutes_read > 120 THEN 120 ELSE dl2.minutes_read END), 0) as team_minutes
                         FROM Roster r2
                         LEFT JOIN Daily_Logs dl2 ON r2.student_name = dl2.student_name
-                        WHERE dl2.minutes_read > 0 {date_where}
+                        WHERE dl2.minutes_read > 0 {date_where_dl2}
                         GROUP BY r2.team_name
                     )
                 )
@@ -2493,8 +2933,10 @@ def get_db_comparison_grade_top(metric, date_filter=None):
         date_filter: Optional date filter for time-based metrics
     """
     date_where = ""
+    date_where_dl2 = ""
     if date_filter and date_filter != 'all' and metric in ['minutes', 'participation']:
         date_where = f"AND dl.log_date <= '{date_filter}'"
+        date_where_dl2 = f"AND dl2.log_date <= '{date_filter}'"
 
     if metric == 'fundraising':
         return f"""
@@ -2555,7 +2997,7 @@ def get_db_comparison_grade_top(metric, date_filter=None):
                         SELECT COALESCE(SUM(CASE WHEN dl2.minutes_read > 120 THEN 120 ELSE dl2.minutes_read END), 0) as grade_minutes
                         FROM Roster r2
                         LEFT JOIN Daily_Logs dl2 ON r2.student_name = dl2.student_name
-                        WHERE dl2.minutes_read > 0 {date_where}
+                        WHERE dl2.minutes_read > 0 {date_where_dl2}
                         GROUP BY r2.grade_level
                     )
                 )
@@ -2614,8 +3056,10 @@ def get_db_comparison_class_top(metric, date_filter=None):
         date_filter: Optional date filter for time-based metrics
     """
     date_where = ""
+    date_where_dl2 = ""
     if date_filter and date_filter != 'all' and metric in ['minutes', 'participation']:
         date_where = f"AND dl.log_date <= '{date_filter}'"
+        date_where_dl2 = f"AND dl2.log_date <= '{date_filter}'"
 
     if metric == 'fundraising':
         return """
@@ -2661,7 +3105,7 @@ def get_db_comparison_class_top(metric, date_filter=None):
                     FROM Class_Info ci2
                     LEFT JOIN Roster r2 ON ci2.class_name = r2.class_name
                     LEFT JOIN Daily_Logs dl2 ON r2.student_name = dl2.student_name
-                    WHERE dl2.minutes_read > 0 {date_where}
+                    WHERE dl2.minutes_read > 0 {date_where_dl2}
                     GROUP BY ci2.class_name
                 )
             )
@@ -3637,8 +4081,10 @@ def get_db_comparison_student_top_participation(date_filter=None):
 def get_db_comparison_student_goal_met(date_filter=None):
     """Get student who met goal most days (returns all tied winners)"""
     date_where = ""
+    date_where_dl2 = ""
     if date_filter and date_filter != 'all':
         date_where = f"AND dl.log_date <= '{date_filter}'"
+        date_where_dl2 = f"AND dl2.log_date <= '{date_filter}'"
 
     return f"""
         SELECT
@@ -3661,7 +4107,7 @@ def get_db_comparison_student_goal_met(date_filter=None):
                 FROM Roster r2
                 LEFT JOIN Daily_Logs dl2 ON r2.student_name = dl2.student_name
                 LEFT JOIN Grade_Rules gr2 ON r2.grade_level = gr2.grade_level
-                WHERE dl2.minutes_read > 0 {date_where}
+                WHERE dl2.minutes_read > 0 {date_where_dl2}
                 GROUP BY r2.student_name
             )
         )
@@ -3822,3 +4268,793 @@ def get_db_comparison_student_total_days(date_filter=None):
         )
         ORDER BY r.student_name
     """
+
+# ============================================================================
+# DATABASE COMPARISON - CONSOLIDATED PER-LEVEL QUERIES
+# ============================================================================
+# The 49 get_db_comparison_* metrics above are also available as one statement
+# per entity level. Each level query computes per-student (and per-class)
+# aggregates once, derives every metric of that level from them, and returns
+# all metric rows together tagged with a 'metric' column. Rows are padded to a
+# shared column list; split_db_comparison_rows() restores each metric's own
+# columns (DB_COMPARISON_COLUMNS). Single-winner metrics break ties by name.
+
+DB_COMPARISON_LEVELS = ['school', 'student', 'team', 'grade', 'class']
+
+_STUDENT_COLUMNS = ['student_name', 'class_name', 'teacher_name', 'grade_level', 'team_name']
+_CLASS_COLUMNS = ['class_name', 'teacher_name', 'grade_level', 'team_name']
+
+
+def _group_comparison_columns(level, group, other):
+    """Metric columns for the team and grade levels (other: the class detail column)"""
+    return {
+        f'{level}_top_fundraising': [group, 'total_fundraising', 'class_name', 'teacher_name', other],
+        f'{level}_top_minutes': [group, 'total_minutes', 'class_name', 'teacher_name', other],
+        f'{level}_top_size': [group, 'student_count', 'class_count'],
+        f'{level}_sponsors': [group, 'total_sponsors', 'class_name', other],
+        f'{level}_participation': [group, 'participation_pct', 'participating_count', 'total_count'],
+        f'{level}_avg_participation': [group, 'total_students', 'total_days', 'total_participations',
+                                       'color_bonus', 'avg_participation_with_color'],
+        f'{level}_goal_met': [group, 'goal_met_pct', 'students_who_met_goal', 'total_students'],
+        f'{level}_all_days_active': [group, 'all_days_active_pct', 'students_all_days', 'total_students',
+                                     'total_days'],
+        f'{level}_goal_met_all_days': [group, 'goal_met_all_days_pct', 'students_goal_all_days', 'total_students',
+                                       'total_days'],
+        f'{level}_color_war_points': [group, 'total_points', 'base_points', 'bonus_points']
+    }
+
+
+# Result columns of every comparison metric, by metric name
+DB_COMPARISON_COLUMNS = {
+    'school_fundraising': ['total_fundraising'] + _CLASS_COLUMNS + ['class_fundraising'],
+    'school_minutes': ['total_minutes'] + _CLASS_COLUMNS + ['class_minutes'],
+    'school_sponsors': ['total_sponsors'] + _CLASS_COLUMNS + ['class_sponsors'],
+    'school_participation': ['participation_pct', 'participating_count', 'total_count'] + _CLASS_COLUMNS +
+                            ['class_participation'],
+    'school_size': ['student_count', 'class_count'],
+    'school_avg_participation': ['avg_participation_pct_base', 'avg_participation_pct_with_color',
+                                 'total_students', 'total_days', 'total_bonus'],
+    'school_goal_met': ['goal_met_pct', 'students_who_met_goal', 'total_students'],
+    'school_all_days_active': ['all_days_active_pct', 'students_all_days', 'total_students', 'total_days'],
+    'school_goal_met_all_days': ['goal_met_all_days_pct', 'students_goal_all_days', 'total_students', 'total_days'],
+    'school_color_war_points': ['total_points', 'base_points', 'bonus_points'],
+    'student_top_fundraiser': _STUDENT_COLUMNS + ['fundraising'],
+    'student_top_reader': _STUDENT_COLUMNS + ['total_minutes'],
+    'student_top_sponsors': _STUDENT_COLUMNS + ['sponsor_count'],
+    'student_top_participation': _STUDENT_COLUMNS + ['days_active', 'participation_pct'],
+    'student_goal_met': _STUDENT_COLUMNS + ['days_met_goal', 'goal_met_pct'],
+    'student_all_days_active': _STUDENT_COLUMNS + ['days_active', 'total_days'],
+    'student_goal_met_all_days': _STUDENT_COLUMNS + ['days_met_goal', 'total_days'],
+    'student_avg_minutes_per_day': _STUDENT_COLUMNS + ['avg_minutes_per_day', 'days_active'],
+    'student_total_days': _STUDENT_COLUMNS + ['total_days'],
+    **_group_comparison_columns('team', 'team_name', 'grade_level'),
+    **_group_comparison_columns('grade', 'grade_level', 'team_name'),
+    'class_top_fundraising': _CLASS_COLUMNS + ['total_fundraising'],
+    'class_top_minutes': _CLASS_COLUMNS + ['total_minutes'],
+    'class_top_size': _CLASS_COLUMNS + ['total_students'],
+    'class_sponsors': _CLASS_COLUMNS + ['total_sponsors'],
+    'class_participation': _CLASS_COLUMNS + ['participation_pct', 'participating_count', 'total_count'],
+    'class_avg_participation': _CLASS_COLUMNS + ['total_students', 'total_days', 'total_participations',
+                                                 'color_bonus', 'avg_participation_with_color'],
+    'class_goal_met': _CLASS_COLUMNS + ['goal_met_pct', 'students_who_met_goal', 'total_students'],
+    'class_all_days_active': _CLASS_COLUMNS + ['all_days_active_pct', 'students_all_days', 'total_students',
+                                               'total_days'],
+    'class_goal_met_all_days': _CLASS_COLUMNS + ['goal_met_all_days_pct', 'students_goal_all_days',
+                                                 'total_students', 'total_days'],
+    'class_color_war_points': _CLASS_COLUMNS + ['total_points', 'base_points', 'bonus_points']
+}
+
+
+def get_db_comparison_metric_queries(date_filter=None):
+    """
+    The individual get_db_comparison_* query for every metric, by metric name.
+
+    Fundraising, sponsors, size and color war metrics are cumulative and
+    ignore date_filter, as do the team/grade/class fundraising and size tops.
+    """
+    queries = {
+        'school_fundraising': get_db_comparison_school_fundraising(date_filter),
+        'school_minutes': get_db_comparison_school_minutes(date_filter),
+        'school_sponsors': get_db_comparison_school_sponsors(),
+        'school_participation': get_db_comparison_school_participation(date_filter),
+        'school_size': get_db_comparison_school_size(),
+        'school_avg_participation': get_db_comparison_school_avg_participation(date_filter),
+        'school_goal_met': get_db_comparison_school_goal_met(date_filter),
+        'school_all_days_active': get_db_comparison_school_all_days_active(date_filter),
+        'school_goal_met_all_days': get_db_comparison_school_goal_met_all_days(date_filter),
+        'school_color_war_points': get_db_comparison_school_color_war_points(),
+        'student_top_fundraiser': get_db_comparison_student_top_fundraiser(),
+        'student_top_reader': get_db_comparison_student_top_reader(date_filter),
+        'student_top_sponsors': get_db_comparison_student_top_sponsors(),
+        'student_top_participation': get_db_comparison_student_top_participation(date_filter),
+        'student_goal_met': get_db_comparison_student_goal_met(date_filter),
+        'student_all_days_active': get_db_comparison_student_all_days_active(date_filter),
+        'student_goal_met_all_days': get_db_comparison_student_goal_met_all_days(date_filter),
+        'student_avg_minutes_per_day': get_db_comparison_student_avg_minutes_per_day(date_filter),
+        'student_total_days': get_db_comparison_student_total_days(date_filter),
+        'team_sponsors': get_db_comparison_team_sponsors(),
+        'team_participation': get_db_comparison_team_participation(date_filter),
+        'team_avg_participation': get_db_comparison_team_avg_participation(date_filter),
+        'team_goal_met': get_db_comparison_team_goal_met(date_filter),
+        'team_all_days_active': get_db_comparison_team_all_days_active(date_filter),
+        'team_goal_met_all_days': get_db_comparison_team_goal_met_all_days(date_filter),
+        'team_color_war_points': get_db_comparison_team_color_war_points(),
+        'grade_sponsors': get_db_comparison_grade_sponsors(),
+        'grade_participation': get_db_comparison_grade_participation(date_filter),
+        'grade_avg_participation': get_db_comparison_grade_avg_participation(date_filter),
+        'grade_goal_met': get_db_comparison_grade_goal_met(date_filter),
+        'grade_all_days_active': get_db_comparison_grade_all_days_active(date_filter),
+        'grade_goal_met_all_days': get_db_comparison_grade_goal_met_all_days(date_filter),
+        'grade_color_war_points': get_db_comparison_grade_color_war_points(),
+        'class_sponsors': get_db_comparison_class_sponsors(),
+        'class_participation': get_db_comparison_class_participation(date_filter),
+        'class_avg_participation': get_db_comparison_class_avg_participation(date_filter),
+        'class_goal_met': get_db_comparison_class_goal_met(date_filter),
+        'class_all_days_active': get_db_comparison_class_all_days_active(date_filter),
+        'class_goal_met_all_days': get_db_comparison_class_goal_met_all_days(date_filter),
+        'class_color_war_points': get_db_comparison_class_color_war_points()
+    }
+    for metric, honors_filter in (('fundraising', False), ('minutes', True), ('size', False)):
+        metric_filter = date_filter if honors_filter else None
+        queries[f'team_top_{metric}'] = get_db_comparison_team_top(metric, metric_filter)
+        queries[f'grade_top_{metric}'] = get_db_comparison_grade_top(metric, metric_filter)
+        queries[f'class_top_{metric}'] = get_db_comparison_class_top(metric, metric_filter)
+    return queries
+
+
+def _db_comparison_shared_ctes(date_filter):
+    """
+    Per-student, per-log-student and per-class aggregates the level queries share.
+
+    Date-filtered counts keep the period condition inside each aggregate so one
+    pass over Daily_Logs also yields the unfiltered color war points.
+    period_rows counts the Roster/Daily_Logs join rows a "WHERE 1=1 AND
+    dl.log_date <= ..." filter keeps (a student without logs keeps one row
+    only when there is no date filter), matching the per-metric queries.
+    """
+    filtered = bool(date_filter and date_filter != 'all')
+    in_period = f"dl.log_date <= '{date_filter}'" if filtered else "1=1"
+    empty_class_rows = 0 if filtered else 1
+
+    return {
+        'ComparisonStudents': f"""
+            SELECT
+                s.*,
+                s.days_active > 0 AND s.days_active = td.total_days as all_days_active,
+                s.period_rows > 0 AND s.days_met_goal = td.total_days as goal_all_days
+            FROM (
+                SELECT
+                    r.student_name,
+                    r.class_name,
+                    r.teacher_name,
+                    r.grade_level,
+                    r.team_name,
+                    rc.donation_amount,
+                    rc.sponsors,
+                    COUNT(CASE WHEN {in_period} THEN 1 END) as period_rows,
+                    COUNT(CASE WHEN dl.minutes_read > 0 AND {in_period} THEN 1 END) as days_active,
+                    SUM(CASE WHEN dl.minutes_read > 0 AND {in_period} THEN MIN(dl.minutes_read, 120) END) as capped_minutes,
+                    ROUND(AVG(CASE WHEN dl.minutes_read > 0 AND {in_period} THEN MIN(dl.minutes_read, 120) END), 1) as avg_minutes,
+                    COUNT(CASE WHEN dl.minutes_read >= gr.min_daily_minutes AND {in_period} THEN 1 END) as days_met_goal,
+                    COUNT(CASE WHEN dl.minutes_read > 0 AND dl.minutes_read >= gr.min_daily_minutes
+                               AND {in_period} THEN 1 END) as active_days_met_goal,
+                    COUNT(CASE WHEN dl.minutes_read > 0 THEN 1 END) as points
+                FROM Roster r
+                LEFT JOIN Reader_Cumulative rc ON r.student_name = rc.student_name
+                LEFT JOIN Daily_Logs dl ON r.student_name = dl.student_name
+                LEFT JOIN Grade_Rules gr ON r.grade_level = gr.grade_level
+                GROUP BY r.student_name
+            ) s
+            CROSS JOIN TotalDays td
+        """,
+
+        # Every student in Daily_Logs, on the roster or not (school totals and student maximums)
+        'ComparisonLogStudents': f"""
+            SELECT
+                dl.student_name,
+                COUNT(CASE WHEN dl.minutes_read > 0 AND {in_period} THEN 1 END) as days_active,
+                SUM(CASE WHEN dl.minutes_read > 0 AND {in_period} THEN MIN(dl.minutes_read, 120) END) as capped_minutes,
+                ROUND(AVG(CASE WHEN dl.minutes_read > 0 AND {in_period} THEN MIN(dl.minutes_read, 120) END), 1) as avg_minutes,
+                COUNT(CASE WHEN dl.minutes_read > 0 THEN 1 END) as points
+            FROM Daily_Logs dl
+            GROUP BY dl.student_name
+        """,
+
+        'ComparisonClasses': f"""
+            SELECT
+                ci.class_name,
+                ci.teacher_name,
+                ci.grade_level,
+                ci.team_name,
+                ci.total_students,
+                COUNT(s.student_name) as roster_students,
+                COALESCE(SUM(s.period_rows), {empty_class_rows}) as period_rows,
+                COALESCE(SUM(s.donation_amount), 0) as fundraising,
+                COALESCE(SUM(s.sponsors), 0) as sponsors,
+                SUM(s.capped_minutes) as capped_minutes,
+                COUNT(CASE WHEN s.days_active > 0 THEN 1 END) as participating,
+                COALESCE(SUM(s.days_active), 0) as participations,
+                COUNT(CASE WHEN s.period_rows > 0 THEN 1 END) as kept_students,
+                COUNT(CASE WHEN s.period_rows > 0 AND s.days_met_goal > 0 THEN 1 END) as students_met_goal,
+                COALESCE(SUM(s.all_days_active), 0) as students_all_days,
+                COALESCE(SUM(s.goal_all_days), 0) as students_goal_all_days,
+                COALESCE(SUM(s.points), 0) as points
+            FROM Class_Info ci
+            LEFT JOIN ComparisonStudents s ON ci.class_name = s.class_name
+            GROUP BY ci.class_name
+        """
+    }
+
+
+def _db_comparison_school_metrics():
+    """School-level metric CTEs"""
+    return ['ColorBonus'], ['ComparisonStudents', 'ComparisonLogStudents', 'ComparisonClasses'], [], {
+        'school_fundraising': """
+            SELECT
+                (SELECT COALESCE(SUM(donation_amount), 0) FROM Reader_Cumulative) as total_fundraising,
+                class_name, teacher_name, grade_level, team_name,
+                fundraising as class_fundraising
+            FROM ComparisonClasses
+            ORDER BY fundraising DESC, class_name
+            LIMIT 1
+        """,
+        'school_minutes': """
+            SELECT
+                (SELECT COALESCE(SUM(capped_minutes), 0) FROM ComparisonLogStudents) as total_minutes,
+                class_name, teacher_name, grade_level, team_name,
+                capped_minutes as class_minutes
+            FROM ComparisonClasses
+            WHERE capped_minutes IS NOT NULL
+            ORDER BY capped_minutes DESC, class_name
+            LIMIT 1
+        """,
+        'school_sponsors': """
+            SELECT
+                (SELECT COALESCE(SUM(sponsors), 0) FROM Reader_Cumulative) as total_sponsors,
+                class_name, teacher_name, grade_level, team_name,
+                sponsors as class_sponsors
+            FROM ComparisonClasses
+            ORDER BY sponsors DESC, class_name
+            LIMIT 1
+        """,
+        'school_participation': """
+            SELECT
+                sp.participation_pct, sp.participating_count, sp.total_count,
+                tc.class_name, tc.teacher_name, tc.grade_level, tc.team_name,
+                tc.participating * 100.0 / NULLIF(tc.total_students, 0) as class_participation
+            FROM (
+                SELECT
+                    COUNT(CASE WHEN days_active > 0 THEN 1 END) * 100.0 /
+                        NULLIF(COUNT(CASE WHEN period_rows > 0 THEN 1 END), 0) as participation_pct,
+                    COUNT(CASE WHEN days_active > 0 THEN 1 END) as participating_count,
+                    COUNT(CASE WHEN period_rows > 0 THEN 1 END) as total_count
+                FROM ComparisonStudents
+            ) sp, (
+                SELECT * FROM ComparisonClasses
+                WHERE period_rows > 0
+                ORDER BY participating * 100.0 / NULLIF(total_students, 0) DESC, class_name
+                LIMIT 1
+            ) tc
+        """,
+        'school_size': """
+            SELECT COUNT(*) as student_count, COUNT(DISTINCT class_name) as class_count
+            FROM ComparisonStudents
+        """,
+        'school_avg_participation': """
+            SELECT
+                ROUND(100.0 * SUM(s.days_active) / (COUNT(*) * td.total_days), 2) as avg_participation_pct_base,
+                ROUND(100.0 * (SUM(s.days_active) + cb.total_bonus) / (COUNT(*) * td.total_days), 2)
+                    as avg_participation_pct_with_color,
+                COUNT(*) as total_students,
+                td.total_days,
+                cb.total_bonus
+            FROM ComparisonStudents s
+            CROSS JOIN TotalDays td
+            CROSS JOIN (SELECT COALESCE(SUM(bonus_points), 0) as total_bonus FROM ColorBonus) cb
+            WHERE td.total_days > 0 AND s.period_rows > 0
+        """,
+        'school_goal_met': """
+            SELECT
+                ROUND(100.0 * SUM(days_met_goal > 0) / NULLIF(COUNT(*), 0), 2) as goal_met_pct,
+                SUM(days_met_goal > 0) as students_who_met_goal,
+                COUNT(*) as total_students
+            FROM ComparisonStudents
+            WHERE period_rows > 0
+        """,
+        'school_all_days_active': """
+            SELECT
+                ROUND(100.0 * SUM(s.all_days_active) / NULLIF(COUNT(*), 0), 2) as all_days_active_pct,
+                SUM(s.all_days_active) as students_all_days,
+                COUNT(*) as total_students,
+                td.total_days
+            FROM ComparisonStudents s
+            CROSS JOIN TotalDays td
+        """,
+        'school_goal_met_all_days': """
+            SELECT
+                ROUND(100.0 * SUM(s.goal_all_days) / NULLIF(COUNT(*), 0), 2) as goal_met_all_days_pct,
+                SUM(s.goal_all_days) as students_goal_all_days,
+                COUNT(*) as total_students,
+                td.total_days
+            FROM ComparisonStudents s
+            CROSS JOIN TotalDays td
+        """,
+        'school_color_war_points': """
+            SELECT
+                pp.base_points + bp.bonus_points as total_points,
+                pp.base_points,
+                bp.bonus_points
+            FROM (SELECT COALESCE(SUM(points), 0) as base_points FROM ComparisonLogStudents) pp,
+                 (SELECT COALESCE(SUM(bonus_points), 0) as bonus_points FROM ColorBonus) bp
+        """
+    }
+
+
+def _db_comparison_student_metrics():
+    """Student-level metric CTEs (every metric returns all tied winners)"""
+    student = ", ".join(f"s.{column}" for column in _STUDENT_COLUMNS)
+    participation = f"""
+            SELECT {student}, s.days_active,
+                   ROUND(100.0 * s.days_active / td.total_days, 2) as participation_pct
+            FROM ComparisonStudents s
+            CROSS JOIN TotalDays td
+        """
+    return [], ['ComparisonStudents', 'ComparisonLogStudents'], [('StudentParticipation', participation)], {
+        'student_top_fundraiser': f"""
+            SELECT {student}, COALESCE(s.donation_amount, 0) as fundraising
+            FROM ComparisonStudents s
+            WHERE COALESCE(s.donation_amount, 0) = (
+                SELECT MAX(COALESCE(donation_amount, 0)) FROM Reader_Cumulative
+            )
+        """,
+        'student_top_reader': f"""
+            SELECT {student}, s.capped_minutes as total_minutes
+            FROM ComparisonStudents s
+            WHERE s.capped_minutes = (SELECT MAX(capped_minutes) FROM ComparisonLogStudents)
+        """,
+        'student_top_sponsors': f"""
+            SELECT {student}, COALESCE(s.sponsors, 0) as sponsor_count
+            FROM ComparisonStudents s
+            WHERE COALESCE(s.sponsors, 0) = (
+                SELECT MAX(COALESCE(sponsors, 0)) FROM Reader_Cumulative
+            )
+        """,
+        'student_top_participation': """
+            SELECT * FROM StudentParticipation
+            WHERE participation_pct = (SELECT MAX(participation_pct) FROM StudentParticipation)
+        """,
+        'student_goal_met': f"""
+            SELECT {student}, s.active_days_met_goal as days_met_goal,
+                   ROUND(100.0 * s.active_days_met_goal / NULLIF(s.days_active, 0), 2) as goal_met_pct
+            FROM ComparisonStudents s
+            WHERE s.days_active > 0 AND s.active_days_met_goal = (
+                SELECT MAX(active_days_met_goal) FROM ComparisonStudents WHERE days_active > 0
+            )
+        """,
+        'student_all_days_active': f"""
+            SELECT {student}, s.days_active, td.total_days
+            FROM ComparisonStudents s
+            CROSS JOIN TotalDays td
+            WHERE s.all_days_active
+        """,
+        'student_goal_met_all_days': f"""
+            SELECT {student}, s.days_met_goal, td.total_days
+            FROM ComparisonStudents s
+            CROSS JOIN TotalDays td
+            WHERE s.goal_all_days
+        """,
+        'student_avg_minutes_per_day': f"""
+            SELECT {student}, s.avg_minutes as avg_minutes_per_day, s.days_active
+            FROM ComparisonStudents s
+            WHERE s.days_active >= 3 AND s.avg_minutes = (
+                SELECT MAX(avg_minutes) FROM ComparisonLogStudents WHERE days_active >= 3
+            )
+        """,
+        'student_total_days': f"""
+            SELECT {student}, s.days_active as total_days
+            FROM ComparisonStudents s
+            WHERE s.days_active > 0 AND s.days_active = (
+                SELECT MAX(days_active) FROM ComparisonLogStudents
+            )
+        """
+    }
+
+
+def _db_comparison_group_metrics(level, group, other, bonus_fragment):
+    """Team- or grade-level metric CTEs (group: the Roster column grouped on)"""
+    groups = f"Comparison_{level}"
+    group_stats = f"""
+            SELECT
+                s.{group},
+                COUNT(*) as roster_students,
+                COUNT(DISTINCT s.class_name) as class_count,
+                COALESCE(SUM(s.donation_amount), 0) as fundraising,
+                COALESCE(SUM(s.sponsors), 0) as sponsors,
+                SUM(s.capped_minutes) as capped_minutes,
+                COUNT(CASE WHEN s.days_active > 0 THEN 1 END) as participating,
+                SUM(s.days_active) as participations,
+                COUNT(CASE WHEN s.period_rows > 0 THEN 1 END) as kept_students,
+                COUNT(CASE WHEN s.period_rows > 0 AND s.days_met_goal > 0 THEN 1 END) as students_met_goal,
+                SUM(s.all_days_active) as students_all_days,
+                SUM(s.goal_all_days) as students_goal_all_days,
+                SUM(s.points) as points
+            FROM ComparisonStudents s
+            GROUP BY s.{group}
+        """
+
+    def top_with_class(value, label, where="1=1"):
+        # Every group tied on value, with the best class across those groups
+        tied = f"SELECT {group} FROM {groups} WHERE {value} = (SELECT MAX({value}) FROM {groups})"
+        return f"""
+            SELECT g.{group}, g.{value} as {label}, c.class_name, c.teacher_name, c.{other}
+            FROM {groups} g, (
+                SELECT * FROM ComparisonClasses
+                WHERE {where} AND {group} IN ({tied})
+                ORDER BY {value} DESC, class_name
+                LIMIT 1
+            ) c
+            WHERE g.{group} IN ({tied})
+        """
+
+    return [bonus_fragment], ['ComparisonStudents', 'ComparisonClasses'], [(groups, group_stats)], {
+        f'{level}_top_fundraising': top_with_class('fundraising', 'total_fundraising'),
+        f'{level}_top_minutes': top_with_class('capped_minutes', 'total_minutes', 'capped_minutes IS NOT NULL'),
+        f'{level}_top_size': f"""
+            SELECT {group}, roster_students as student_count, class_count
+            FROM {groups}
+            ORDER BY roster_students DESC, {group}
+            LIMIT 1
+        """,
+        f'{level}_sponsors': f"""
+            SELECT g.{group}, g.sponsors as total_sponsors, c.class_name, c.{other}
+            FROM (SELECT * FROM {groups} ORDER BY sponsors DESC, {group} LIMIT 1) g, (
+                SELECT * FROM ComparisonClasses
+                WHERE {group} = (SELECT {group} FROM {groups} ORDER BY sponsors DESC, {group} LIMIT 1)
+                ORDER BY sponsors DESC, class_name
+                LIMIT 1
+            ) c
+        """,
+        f'{level}_participation': f"""
+            SELECT {group},
+                   participating * 100.0 / NULLIF(kept_students, 0) as participation_pct,
+                   participating as participating_count,
+                   kept_students as total_count
+            FROM {groups}
+            WHERE kept_students > 0
+            ORDER BY participation_pct DESC, {group}
+            LIMIT 1
+        """,
+        f'{level}_avg_participation': f"""
+            SELECT
+                g.{group},
+                g.kept_students as total_students,
+                td.total_days,
+                g.participations as total_participations,
+                COALESCE(b.bonus_points, 0) as color_bonus,
+                ROUND(100.0 * (g.participations + COALESCE(b.bonus_points, 0)) /
+                      (g.kept_students * td.total_days), 2) as avg_participation_with_color
+            FROM {groups} g
+            CROSS JOIN TotalDays td
+            LEFT JOIN {bonus_fragment} b ON g.{group} = b.{group}
+            WHERE td.total_days > 0 AND g.kept_students > 0
+            ORDER BY avg_participation_with_color DESC, g.{group}
+            LIMIT 1
+        """,
+        f'{level}_goal_met': f"""
+            SELECT {group},
+                   ROUND(100.0 * students_met_goal / NULLIF(kept_students, 0), 2) as goal_met_pct,
+                   students_met_goal as students_who_met_goal,
+                   kept_students as total_students
+            FROM {groups}
+            WHERE kept_students > 0
+            ORDER BY goal_met_pct DESC, {group}
+            LIMIT 1
+        """,
+        f'{level}_all_days_active': f"""
+            SELECT g.{group},
+                   ROUND(100.0 * g.students_all_days / NULLIF(g.roster_students, 0), 2) as all_days_active_pct,
+                   g.students_all_days,
+                   g.roster_students as total_students,
+                   td.total_days
+            FROM {groups} g
+            CROSS JOIN TotalDays td
+            ORDER BY all_days_active_pct DESC, g.{group}
+            LIMIT 1
+        """,
+        f'{level}_goal_met_all_days': f"""
+            SELECT g.{group},
+                   ROUND(100.0 * g.students_goal_all_days / NULLIF(g.roster_students, 0), 2) as goal_met_all_days_pct,
+                   g.students_goal_all_days,
+                   g.roster_students as total_students,
+                   td.total_days
+            FROM {groups} g
+            CROSS JOIN TotalDays td
+            ORDER BY goal_met_all_days_pct DESC, g.{group}
+            LIMIT 1
+        """,
+        f'{level}_color_war_points': f"""
+            SELECT g.{group},
+                   g.points + COALESCE(b.bonus_points, 0) as total_points,
+                   g.points as base_points,
+                   COALESCE(b.bonus_points, 0) as bonus_points
+            FROM {groups} g
+            LEFT JOIN {bonus_fragment} b ON g.{group} = b.{group}
+            ORDER BY total_points DESC, g.{group}
+            LIMIT 1
+        """
+    }
+
+
+def _db_comparison_class_metrics():
+    """Class-level metric CTEs"""
+    cls = ", ".join(f"c.{column}" for column in _CLASS_COLUMNS)
+    return ['ColorBonus'], ['ComparisonStudents', 'ComparisonClasses'], [], {
+        'class_top_fundraising': f"""
+            SELECT {cls}, c.fundraising as total_fundraising
+            FROM ComparisonClasses c
+            WHERE c.fundraising = (SELECT MAX(fundraising) FROM ComparisonClasses)
+        """,
+        'class_top_minutes': f"""
+            SELECT {cls}, c.capped_minutes as total_minutes
+            FROM ComparisonClasses c
+            WHERE c.capped_minutes = (SELECT MAX(capped_minutes) FROM ComparisonClasses)
+        """,
+        'class_top_size': f"""
+            SELECT {cls}, c.total_students
+            FROM ComparisonClasses c
+            ORDER BY c.total_students DESC, c.class_name
+            LIMIT 1
+        """,
+        'class_sponsors': f"""
+            SELECT {cls}, c.sponsors as total_sponsors
+            FROM ComparisonClasses c
+            ORDER BY c.sponsors DESC, c.class_name
+            LIMIT 1
+        """,
+        'class_participation': f"""
+            SELECT {cls},
+                   c.participating * 100.0 / NULLIF(c.total_students, 0) as participation_pct,
+                   c.participating as participating_count,
+                   c.total_students as total_count
+            FROM ComparisonClasses c
+            WHERE c.period_rows > 0
+            ORDER BY participation_pct DESC, c.class_name
+            LIMIT 1
+        """,
+        'class_avg_participation': f"""
+            SELECT {cls},
+                   c.total_students,
+                   td.total_days,
+                   c.participations as total_participations,
+                   COALESCE(b.bonus_points, 0) as color_bonus,
+                   ROUND(100.0 * (c.participations + COALESCE(b.bonus_points, 0)) /
+                         (c.total_students * td.total_days), 2) as avg_participation_with_color
+            FROM ComparisonClasses c
+            CROSS JOIN TotalDays td
+            LEFT JOIN ColorBonus b ON c.class_name = b.class_name
+            WHERE td.total_days > 0 AND c.period_rows > 0
+            ORDER BY avg_participation_with_color DESC, c.class_name
+            LIMIT 1
+        """,
+        'class_goal_met': f"""
+            SELECT {cls},
+                   ROUND(100.0 * c.students_met_goal / NULLIF(c.kept_students, 0), 2) as goal_met_pct,
+                   c.students_met_goal as students_who_met_goal,
+                   c.kept_students as total_students
+            FROM ComparisonClasses c
+            WHERE c.kept_students > 0
+            ORDER BY goal_met_pct DESC, c.class_name
+            LIMIT 1
+        """,
+        'class_all_days_active': f"""
+            SELECT {cls},
+                   ROUND(100.0 * c.students_all_days / NULLIF(c.total_students, 0), 2) as all_days_active_pct,
+                   c.students_all_days,
+                   c.total_students,
+                   td.total_days
+            FROM ComparisonClasses c
+            CROSS JOIN TotalDays td
+            ORDER BY all_days_active_pct DESC, c.class_name
+            LIMIT 1
+        """,
+        'class_goal_met_all_days': f"""
+            SELECT {cls},
+                   ROUND(100.0 * c.students_goal_all_days / NULLIF(c.total_students, 0), 2) as goal_met_all_days_pct,
+                   c.students_goal_all_days,
+                   c.total_students,
+                   td.total_days
+            FROM ComparisonClasses c
+            CROSS JOIN TotalDays td
+            ORDER BY goal_met_all_days_pct DESC, c.class_name
+            LIMIT 1
+        """,
+        'class_color_war_points': f"""
+            SELECT {cls},
+                   c.points + COALESCE(b.bonus_points, 0) as total_points,
+                   c.points as base_points,
+                   COALESCE(b.bonus_points, 0) as bonus_points
+            FROM ComparisonClasses c
+            LEFT JOIN ColorBonus b ON c.class_name = b.class_name
+            WHERE c.roster_students > 0
+            ORDER BY total_points DESC, c.class_name
+            LIMIT 1
+        """
+    }
+
+
+_DB_COMPARISON_LEVEL_METRICS = {
+    'school': _db_comparison_school_metrics,
+    'student': _db_comparison_student_metrics,
+    'team': lambda: _db_comparison_group_metrics('team', 'team_name', 'grade_level', 'TeamColorBonus'),
+    'grade': lambda: _db_comparison_group_metrics('grade', 'grade_level', 'team_name', 'GradeColorBonus'),
+    'class': _db_comparison_class_metrics
+}
+
+
+_DB_COMPARISON_TABLES = re.compile(
+    r'\b(FROM|JOIN)\s+(Roster|Reader_Cumulative|Daily_Logs|Grade_Rules|Class_Info|Team_Color_Bonus)\b')
+
+
+def get_db_comparison_level_query(level, date_filter=None, schema=None):
+    """
+    One statement returning every comparison metric of an entity level.
+
+    Args:
+        level: One of DB_COMPARISON_LEVELS
+        date_filter: Optional date filter ('all' or a date); cumulative metrics ignore it
+        schema: Optional attached database name to read the data tables from
+
+    Returns:
+        SQL string; each row carries the metric name in 'metric' plus the
+        union of the level's metric columns (see split_db_comparison_rows)
+    """
+    fragments, shared_names, level_ctes, metrics = _DB_COMPARISON_LEVEL_METRICS[level]()
+    shared = _db_comparison_shared_ctes(date_filter)
+
+    columns = []
+    for metric in metrics:
+        columns.extend(column for column in DB_COMPARISON_COLUMNS[metric] if column not in columns)
+
+    extra_ctes = [(name, shared[name]) for name in shared_names] + level_ctes
+    selects = []
+    for metric, sql in metrics.items():
+        extra_ctes.append((f"Metric_{metric}", sql))
+        own = DB_COMPARISON_COLUMNS[metric]
+        padded = ", ".join(column if column in own else f"NULL as {column}" for column in columns)
+        selects.append(f"        SELECT '{metric}' as metric, {own[0]} as sort_key, {padded} FROM Metric_{metric}")
+
+    date_where_no_alias = ""
+    if date_filter and date_filter != 'all':
+        date_where_no_alias = f"AND log_date <= '{date_filter}'"
+
+    select_sql = "\n        UNION ALL\n".join(selects) + "\n        ORDER BY metric, sort_key\n"
+    query = compose_query(['TotalDays'] + fragments, select_sql, extra_ctes=extra_ctes,
+                          date_where_no_alias=date_where_no_alias)
+    if schema:
+        query = _DB_COMPARISON_TABLES.sub(rf'\1 {schema}.\2', query)
+    return query
+
+
+def get_db_comparison_trend_query(level, schemas, date_filter=None):
+    """
+    One cross-database statement returning a level's metrics for several attached databases.
+
+    Args:
+        level: One of DB_COMPARISON_LEVELS
+        schemas: Attached database names, in series order
+        date_filter: Optional date filter ('all' or a date); cumulative metrics ignore it
+
+    Returns:
+        SQL string; rows are the level query's rows prefixed with 'db_index',
+        the position of their database in schemas
+    """
+    selects = [f"SELECT {index} as db_index, * FROM (\n{get_db_comparison_level_query(level, date_filter, schema)})"
+               for index, schema in enumerate(schemas)]
+    return "\nUNION ALL\n".join(selects) + "\nORDER BY db_index, metric, sort_key\n"
+
+
+def split_db_comparison_rows(rows_by_level):
+    """
+    Split level query rows into per-metric result lists with each metric's own columns.
+
+    Args:
+        rows_by_level: Dict of level -> rows from get_db_comparison_level_query
+
+    Returns:
+        Dict of metric name -> list of row dicts (empty for metrics without rows)
+    """
+    results = {metric: [] for metric in DB_COMPARISON_COLUMNS if metric.split('_')[0] in rows_by_level}
+    for rows in rows_by_level.values():
+        for row in rows:
+            metric = row['metric']
+            results[metric].append({column: row[column] for column in DB_COMPARISON_COLUMNS[metric]})
+    return results
+
+
+# ============================================================================
+# DATABASE COMPARISON - SUMMARY SNAPSHOT
+# ============================================================================
+# Every comparison metric's rows (with their top-entity context), stored per
+# filter period in the contest database itself, plus the registry summary
+# counts. Cross-year features (comparison, trend, registry stats) read these
+# few rows instead of rescanning another year's raw tables.
+#
+# Refreshed in the same transaction as each upload (see
+# ReadathonDB.refresh_comparison_snapshot). Triggers on the source tables mark
+# it stale (Comparison_Snapshot_State emptied) after any other write; readers
+# fall back to the level queries while it is missing, stale, built by another
+# COMPARISON_SNAPSHOT_VERSION or lacks the requested filter period.
+
+COMPARISON_SNAPSHOT_VERSION = 1  # bump whenever the comparison metrics or their columns change
+
+CREATE_TABLE_COMPARISON_SNAPSHOT = """
+    CREATE TABLE IF NOT EXISTS Comparison_Snapshot (
+        filter_period TEXT NOT NULL,
+        metric TEXT NOT NULL,
+        position INTEGER NOT NULL,
+        row_json TEXT NOT NULL,
+        PRIMARY KEY (filter_period, metric, position)
+    )
+"""
+
+CREATE_TABLE_COMPARISON_SNAPSHOT_STATE = """
+    CREATE TABLE IF NOT EXISTS Comparison_Snapshot_State (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        snapshot_version INTEGER NOT NULL,
+        built_timestamp TEXT NOT NULL,
+        student_count INTEGER NOT NULL,
+        total_days INTEGER NOT NULL,
+        total_donations REAL NOT NULL
+    )
+"""
+
+CREATE_COMPARISON_SNAPSHOT_TRIGGERS = [
+    f"""CREATE TRIGGER IF NOT EXISTS {table}_Snapshot_{event.title()} AFTER {event} ON {table}
+    BEGIN
+        DELETE FROM Comparison_Snapshot_State;
+    END"""
+    for table in ('Roster', 'Class_Info', 'Grade_Rules', 'Daily_Logs', 'Reader_Cumulative', 'Team_Color_Bonus')
+    for event in ('INSERT', 'UPDATE', 'DELETE')
+]
+
+# Snapshotted filter periods besides 'all'
+SELECT_COMPARISON_SNAPSHOT_DATES = "SELECT DISTINCT log_date FROM Daily_Logs ORDER BY log_date"
+
+# Same counts as DatabaseRegistry.recalculate_stats_from_file
+SELECT_COMPARISON_SNAPSHOT_SUMMARY = """
+    SELECT
+        (SELECT COUNT(*) FROM Roster) as student_count,
+        (SELECT COUNT(DISTINCT log_date) FROM Daily_Logs) as total_days,
+        (SELECT COALESCE(SUM(donation_amount), 0.0) FROM Reader_Cumulative) as total_donations
+"""
+
+DELETE_COMPARISON_SNAPSHOT = "DELETE FROM Comparison_Snapshot"
+
+INSERT_COMPARISON_SNAPSHOT_ROW = """
+    INSERT INTO Comparison_Snapshot (filter_period, metric, position, row_json) VALUES (?, ?, ?, ?)
+"""
+
+INSERT_COMPARISON_SNAPSHOT_STATE = """
+    INSERT OR REPLACE INTO Comparison_Snapshot_State
+        (id, snapshot_version, built_timestamp, student_count, total_days, total_donations)
+    VALUES (1, ?, ?, ?, ?, ?)
+"""
+
+
+def get_comparison_snapshot_state_query(schema='main'):
+    """Current snapshot state of a (possibly attached) database; takes the snapshot version as parameter"""
+    return f"""
+        SELECT built_timestamp, student_count, total_days, total_donations
+        FROM {schema}.Comparison_Snapshot_State
+        WHERE id = 1 AND snapshot_version = ?
+    """
+
+
+def get_comparison_snapshot_rows_query(schema='main'):
+    """Stored metric rows of one filter period; takes the filter period as parameter"""
+    return f"""
+        SELECT metric, row_json
+        FROM {schema}.Comparison_Snapshot
+        WHERE filter_period = ?
+        ORDER BY metric, position
+    """
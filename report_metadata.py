@@ -4,10 +4,16 @@ Enhanced Report Metadata Module
 Provides column descriptions, terms glossary, and analysis generators
 for all Read-a-Thon reports.
 
+Report results carry only a metadata key; the column descriptions and terms
+for every key are served once from /api/report_metadata (see
+get_all_report_metadata and REPORT_METADATA_VERSION).
+
 Usage:
     from report_metadata import COLUMN_METADATA, get_relevant_terms, generate_q21_analysis
 """
 
+import hashlib
+import json
 from typing import Dict, Any, List, Optional
 
 # ============================================================================
@@ -94,6 +100,17 @@ GLOBAL_TERMS = {
         'definition': 'The master list of all students in the school, stored in the Roster database table. Includes each student\'s name, class, teacher, team, and grade level. This is the authoritative source for student information and is used to join data from Daily_Logs and Reader_Cumulative.',
         'see_also': ['Student']
     },
+
+    # ===== MULTI-YEAR DATABASES =====
+    'Active Database': {
+        'definition': 'The currently selected database in use'
+    },
+    'Multi-Year': {
+        'definition': 'System supports managing multiple school years'
+    },
+    'Registry': {
+        'definition': 'Central table in separate database tracking all year databases'
+    },
 }
 
 # ============================================================================
@@ -890,6 +907,19 @@ COLUMN_METADATA = {
             'description': 'OK if student exists in Roster, MISSING_FROM_ROSTER if they have reading data but no roster entry'
         }
     },
+
+    # Q24: Database_Registry
+    'q24': {
+        'db_id': {'description': 'Unique database identifier (auto-increment)'},
+        'year': {'description': 'School year for this database'},
+        'db_filename': {'description': 'Database filename (e.g., readathon_2026.db)'},
+        'description': {'description': 'Optional description of database'},
+        'created_timestamp': {'description': 'When database was registered'},
+        'status': {'description': 'ACTIVE or INACTIVE'},
+        'student_count': {'description': 'Number of students in Roster'},
+        'total_days': {'description': 'Number of reading days recorded'},
+        'total_donations': {'description': 'Total fundraising dollars'}
+    },
 }
 
 # ============================================================================
@@ -944,13 +974,44 @@ def generate_q21_analysis(results: List[Dict[str, Any]], date_range: Optional[st
     # Use provided date range or fall back to default
     contest_period = date_range if date_range else "10/10-10/15"
 
-    # Calculate totals for reconciliation
+    # Calculate totals for reconciliation and classify rows in a single pass
     # - daily_minutes_capped: SUM(MIN(minutes_read, 120)) - official counting with 120 min/day cap
     # - daily_minutes_sum: SUM(minutes_read) - uncapped daily total
     # - cumulative_minutes: Reader_Cumulative total (uncapped, may include out-of-range dates)
-    total_daily_capped = sum(r.get('daily_minutes_capped', r['daily_minutes_sum']) for r in results)
-    total_daily_uncapped = sum(r['daily_minutes_sum'] for r in results)
-    total_cumulative = sum(r['cumulative_minutes'] for r in results)
+    total_daily_capped = 0
+    total_daily_uncapped = 0
+    total_cumulative = 0
+
+    issues = []
+    minutes_mismatch = []
+    missing_cumulative = []
+    missing_daily = []
+    positive_diff = []  # MINUTES_MISMATCH with Cumulative > Daily (out-of-range)
+    negative_diff = []  # MINUTES_MISMATCH with Daily > Cumulative (data error)
+    cap_exceders = []   # Students who exceeded the 120-minute cap
+
+    for r in results:
+        total_daily_capped += r.get('daily_minutes_capped', r['daily_minutes_sum'])
+        total_daily_uncapped += r['daily_minutes_sum']
+        total_cumulative += r['cumulative_minutes']
+
+        if r.get('daily_minutes_capped', 0) < r['daily_minutes_sum']:
+            cap_exceders.append(r)
+
+        status = r['status']
+        if status == 'MINUTES_MISMATCH':
+            issues.append(r)
+            minutes_mismatch.append(r)
+            if r['difference'] > 0:
+                positive_diff.append(r)
+            elif r['difference'] < 0:
+                negative_diff.append(r)
+        elif status == 'MISSING_CUMULATIVE':
+            issues.append(r)
+            missing_cumulative.append(r)
+        elif status == 'MISSING_DAILY':
+            issues.append(r)
+            missing_daily.append(r)
 
     # Calculate the three key numbers:
     # 1. Capping effect: How many minutes students read beyond the 120 min/day cap
@@ -973,21 +1034,6 @@ def generate_q21_analysis(results: List[Dict[str, Any]], date_range: Optional[st
             'insights': ['Data integrity verified - all systems in sync']
         }
 
-    # Filter for issues to identify affected students and create detailed breakdowns
-    issues = [r for r in results if r['status'] in ['MINUTES_MISMATCH', 'MISSING_CUMULATIVE', 'MISSING_DAILY']]
-
-    # Separate by status type for detailed analysis
-    minutes_mismatch = [r for r in issues if r['status'] == 'MINUTES_MISMATCH']
-    missing_cumulative = [r for r in issues if r['status'] == 'MISSING_CUMULATIVE']
-    missing_daily = [r for r in issues if r['status'] == 'MISSING_DAILY']
-
-    # For MINUTES_MISMATCH, separate by positive/negative differences (for data sync subcategories)
-    positive_diff = [r for r in minutes_mismatch if r['difference'] > 0]  # Cumulative > Daily (out-of-range)
-    negative_diff = [r for r in minutes_mismatch if r['difference'] < 0]  # Daily > Cumulative (data error)
-
-    # Identify students who exceeded the 120-minute cap
-    cap_exceders = [r for r in results if r.get('daily_minutes_capped', 0) < r['daily_minutes_sum']]
-
     breakdown = []
 
     # ============================================================================
@@ -1337,6 +1383,7 @@ REPORT_TERM_SETS = {
     'q18': ['Class', 'Grade Level', 'Participation', 'Team'],
     'q19': ['Team', 'Cumulative', 'Reader Cumulative'],
     'q20': ['Team', 'Donations / Sponsors', 'Reader Cumulative'],
+    'q24': ['Active Database', 'Registry', 'Multi-Year'],
 }
 
 
@@ -1352,3 +1399,35 @@ def get_report_terms(report_id: str) -> Dict[str, Any]:
     """
     term_keys = REPORT_TERM_SETS.get(report_id, [])
     return get_relevant_terms(term_keys)
+
+
+# ============================================================================
+# REPORT METADATA PAYLOAD
+# ============================================================================
+
+def get_report_metadata(metadata_key: str) -> Dict[str, Any]:
+    """
+    Get the column descriptions and terms for one report
+
+    Args:
+        metadata_key: Key carried in a report result's metadata (e.g., 'q21')
+
+    Returns:
+        Dictionary with 'columns' and 'terms' for this report
+    """
+    return {
+        'columns': COLUMN_METADATA.get(metadata_key, {}),
+        'terms': get_report_terms(metadata_key)
+    }
+
+
+def get_all_report_metadata() -> Dict[str, Dict[str, Any]]:
+    """Get column descriptions and terms for every report, keyed by metadata key"""
+    keys = sorted(set(COLUMN_METADATA) | set(REPORT_TERM_SETS))
+    return {key: get_report_metadata(key) for key in keys}
+
+
+# Content hash of the static metadata, so clients can cache it until it changes
+REPORT_METADATA_VERSION = hashlib.sha1(
+    json.dumps(get_all_report_metadata(), sort_keys=True).encode('utf-8')
+).hexdigest()[:12]
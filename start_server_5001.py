@@ -1,8 +1,9 @@
 #!/usr/bin/env python3
 """Start the Flask app on port 5001 in debug mode"""
-from app import app
+from app import create_app_from_argv
 
 if __name__ == '__main__':
+    app = create_app_from_argv()
     print("\n" + "="*60)
     print("READ-A-THON REPORTING SYSTEM (Port 5001)")
     print("="*60)
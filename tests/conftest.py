@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Shared Test Fixtures
+
+scratch_db and client give a test its own copy of the sample database, so
+uploads, prize draws and slide bundles never write to the tracked
+db/readathon_sample.db. Test files that need a client on the real sample
+database define their own client fixture, which overrides this one.
+
+Created: 2026-10-19
+"""
+
+import shutil
+import pytest
+import app as app_module
+from database import ReadathonDB, ReportGenerator
+
+
+@pytest.fixture
+def scratch_db(tmp_path, monkeypatch):
+    """Scratch copy of the sample database (slide bundles written under tmp_path)."""
+    monkeypatch.setattr(app_module, 'SLIDE_BUNDLE_DIR', str(tmp_path / 'slide_bundles'))
+    path = tmp_path / 'readathon_scratch.db'
+    shutil.copy('db/readathon_sample.db', path)
+    return ReadathonDB(str(path))
+
+
+@pytest.fixture
+def client(scratch_db, monkeypatch):
+    """Test client whose active database is the scratch copy (empty dashboard context cache)."""
+    app_module.app.config['TESTING'] = True
+    monkeypatch.setattr(app_module, 'get_current_db', lambda: scratch_db)
+    monkeypatch.setattr(app_module, 'get_current_reports', lambda: ReportGenerator(scratch_db))
+    monkeypatch.setattr(app_module, '_tab_context_cache', app_module.OrderedDict())
+    with app_module.app.test_client() as client:
+        yield client
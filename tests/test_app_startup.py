@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test App Startup
+
+Covers the lazy app factory: importing app opens no databases, loads none of
+the data layer and stays within the import budget, and the startup database
+is resolved from create_app() settings on first use.
+
+Created: 2026-10-19
+"""
+
+import subprocess
+import sys
+import pytest
+import app as app_module
+
+# Time spent importing app beyond Flask itself (module body plus its light imports)
+APP_IMPORT_BUDGET_MS = 300
+
+# Data-layer modules that must wait for the first request that needs them
+DEFERRED_MODULES = ('database', 'queries', 'report_metadata')
+
+
+def import_app_in_subprocess():
+    """Import app in a fresh interpreter with -X importtime; returns the completed process"""
+    return subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import app'],
+                          capture_output=True, text=True, timeout=60)
+
+
+def parse_import_times(stderr):
+    """Map module name -> cumulative import time (microseconds) from -X importtime output"""
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+class TestImportApp:
+    """Test that importing app stays cheap"""
+
+    def test_import_is_silent_and_skips_data_layer(self):
+        """Verify import app prints nothing and loads no data-layer modules"""
+        result = import_app_in_subprocess()
+        assert result.returncode == 0, result.stderr
+        assert result.stdout == ''
+        times = parse_import_times(result.stderr)
+        assert 'app' in times
+        for module in DEFERRED_MODULES:
+            assert module not in times, f"{module} imported by import app"
+
+    def test_import_within_budget(self):
+        """Verify import app (beyond Flask) stays under APP_IMPORT_BUDGET_MS"""
+        times = parse_import_times(import_app_in_subprocess().stderr)
+        app_ms = (times['app'] - times.get('flask', 0)) / 1000
+        assert app_ms < APP_IMPORT_BUDGET_MS, f"import app took {app_ms:.0f}ms beyond Flask"
+
+
+class TestCreateApp:
+    """Test create_app settings and default database resolution"""
+
+    @pytest.fixture
+    def restore_startup(self):
+        """Put back READATHON_DATABASE and the resolved default after the test"""
+        original = app_module.app.config.get('READATHON_DATABASE')
+        yield
+        app_module.create_app({'READATHON_DATABASE': original})
+
+    def test_database_setting_resolved_on_first_use(self, restore_startup):
+        """Verify READATHON_DATABASE picks the default database by filename or alias"""
+        assert app_module.create_app({'READATHON_DATABASE': 'readathon_sample.db'}) is app_module.app
+        expected = app_module.get_registry().get_database_by_name('readathon_sample.db')['db_id']
+        assert app_module.get_default_database_id() == expected
+
+        db_info, reason = app_module.resolve_default_database()
+        assert db_info['db_id'] == expected
+        assert '--db readathon_sample.db' in reason
+
+    def test_unknown_database_raises(self, restore_startup):
+        """Verify an unknown READATHON_DATABASE raises LookupError"""
+        app_module.create_app({'READATHON_DATABASE': 'no_such_database.db'})
+        with pytest.raises(LookupError):
+            app_module.get_default_database_id()
+
+    def test_argv_unknown_database_exits(self, restore_startup, capsys):
+        """Verify create_app_from_argv lists the databases and exits for an unknown --db"""
+        with pytest.raises(SystemExit):
+            app_module.create_app_from_argv(['--db', 'no_such_database.db'])
+        out = capsys.readouterr().out
+        assert 'Database not found: no_such_database.db' in out
+        assert 'Available databases:' in out
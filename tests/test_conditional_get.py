@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Test Conditional GET (ETags)
+
+Covers ETags on the dashboard tabs, /api/report, /api/workflow and
+/student: 304 for a matching If-None-Match without any SQL, and new tags
+when filters, uploads or the database file change.
+
+Created: 2026-10-19
+"""
+
+import pytest
+import app as app_module
+import perf_monitor
+
+
+def revalidate(client, url):
+    """Fetch url, then fetch it again with the returned ETag."""
+    first = client.get(url)
+    assert first.status_code == 200
+    etag = first.headers['ETag']
+    return etag, client.get(url, headers={'If-None-Match': etag})
+
+
+class TestConditionalGet:
+    """Test 304 responses and ETag changes"""
+
+    @pytest.mark.parametrize('url', ['/school', '/teams', '/classes', '/students',
+                                     '/api/report/q6', '/api/workflow/qc'])
+    def test_matching_etag_returns_304(self, client, url):
+        """Verify a repeat request with the ETag gets an empty 304"""
+        etag, second = revalidate(client, url)
+        assert second.status_code == 304
+        assert second.data == b''
+        assert second.headers['ETag'] == etag
+
+    def test_304_runs_no_sql(self, client):
+        """Verify the 304 path issues no SQL statements"""
+        etag, _ = revalidate(client, '/school')
+        perf_monitor.reset()
+        assert client.get('/school', headers={'If-None-Match': etag}).status_code == 304
+        route = next(e for e in perf_monitor.get_perf_snapshot() if e['name'] == 'school_tab')
+        assert route['sql_count']['max'] == 0
+
+    def test_filters_change_etag(self, client, scratch_db):
+        """Verify filter parameters are part of the ETag"""
+        log_date = scratch_db.get_all_dates()[0]
+        all_dates = client.get('/school').headers['ETag']
+        one_date = client.get(f'/school?date={log_date}').headers['ETag']
+        assert all_dates != one_date
+
+    def test_data_changes_invalidate(self, client, scratch_db):
+        """Verify app writes and direct database writes both change the ETag"""
+        etag = client.get('/teams').headers['ETag']
+        app_module.notify_data_changed(scratch_db)
+        assert client.get('/teams', headers={'If-None-Match': etag}).status_code == 200
+
+        etag = client.get('/teams').headers['ETag']
+        conn = scratch_db.get_connection()
+        conn.execute("UPDATE Daily_Logs SET minutes_read = minutes_read + 1 "
+                     "WHERE rowid = (SELECT MIN(rowid) FROM Daily_Logs)")
+        conn.commit()
+        assert client.get('/teams', headers={'If-None-Match': etag}).status_code == 200
+
+    def test_student_detail(self, client, scratch_db):
+        """Verify the student detail JSON revalidates"""
+        name = scratch_db.execute_query("SELECT student_name FROM Roster LIMIT 1")[0]['student_name']
+        _, second = revalidate(client, f'/student/{name}')
+        assert second.status_code == 304
+
+    def test_random_reports_have_no_etag(self, client):
+        """Verify the unseeded prize drawing and QD workflow are never cached"""
+        assert 'ETag' not in client.get('/api/report/q4').headers
+        assert 'ETag' not in client.get('/api/workflow/qd').headers
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Test Contest Context
+
+Covers ReadathonDB.get_contest_context (dates, day numbers, roster, teams,
+grade rules and upload timestamps cached per data version) and its reuse by
+the tab routes, student detail and ReportGenerator.
+
+Created: 2026-10-19
+"""
+
+import pytest
+import app as app_module
+from database import ReportGenerator
+
+
+class TestContestContext:
+    """Test get_contest_context"""
+
+    def test_matches_direct_queries(self, scratch_db):
+        """Verify the context holds the same facts the routes used to query"""
+        contest = scratch_db.get_contest_context()
+        dates = scratch_db.get_all_dates()
+        assert contest.dates == dates
+        assert contest.sorted_dates == sorted(dates)
+        assert [contest.day_numbers[d] for d in contest.sorted_dates] == list(range(1, len(dates) + 1))
+        assert contest.latest_date == dates[0]
+
+        teams = scratch_db.execute_query("SELECT DISTINCT team_name FROM Roster ORDER BY team_name")
+        assert contest.team_names == [row['team_name'] for row in teams]
+        assert contest.roster_count == scratch_db.execute_query(
+            "SELECT COUNT(*) as n FROM Roster")[0]['n']
+        assert set(contest.grade_rules) == {row['grade_level'] for row in
+                                            scratch_db.execute_query("SELECT grade_level FROM Grade_Rules")}
+
+    def test_day_helpers(self, scratch_db):
+        """Verify current day, campaign date and days-through for specific dates and 'all'"""
+        contest = scratch_db.get_contest_context()
+        first, last = contest.sorted_dates[0], contest.sorted_dates[-1]
+        assert contest.current_day(first) == 1
+        assert contest.current_day('all') == contest.total_days
+        assert contest.campaign_date(last) == last
+        assert contest.campaign_date('all') == contest.full_contest_range
+        assert contest.days_through('2000-01-01') == 0
+        assert contest.days_through('all') == contest.total_days
+
+    def test_cached_until_data_changes(self, scratch_db):
+        """Verify one context per data version"""
+        contest = scratch_db.get_contest_context()
+        assert scratch_db.get_contest_context() is contest
+
+        conn = scratch_db.get_connection()
+        conn.execute("INSERT INTO Upload_History (log_date, upload_timestamp, file_type) "
+                     "VALUES (NULL, '2099-01-01 00:00:00', 'cumulative')")
+        conn.commit()
+        refreshed = scratch_db.get_contest_context()
+        assert refreshed is not contest
+        assert refreshed.last_uploads['cumulative'] == '2099-01-01 00:00:00'
+        assert ReportGenerator(scratch_db)._get_last_upload_timestamps() == refreshed.upload_summary
+
+
+class TestContestContextReuse:
+    """Test that routes no longer re-read the contest preamble"""
+
+    def test_tabs_do_not_requery_dates(self, client, scratch_db, monkeypatch):
+        """Verify the tab routes and student detail read dates only through the cached context"""
+        scratch_db.get_contest_context()
+        calls = []
+        original = scratch_db.get_all_dates
+        monkeypatch.setattr(scratch_db, 'get_all_dates', lambda: calls.append(1) or original())
+
+        log_date = scratch_db.get_contest_context().latest_date
+        name = scratch_db.get_contest_context().roster[0]['student_name']
+        for url in ['/school', '/teams', '/classes', '/students', f'/students?date={log_date}',
+                    f'/student/{name}?date={log_date}']:
+            assert client.get(url).status_code == 200
+        assert calls == []
+
+    def test_one_context_per_request(self, client, scratch_db, monkeypatch):
+        """Verify get_contest returns the same instance for the whole request"""
+        seen = []
+        original = app_module.get_contest
+
+        def recording(db):
+            contest = original(db)
+            if app_module.has_request_context():  # ignore background warmups from other tests
+                seen.append(contest)
+            return contest
+
+        monkeypatch.setattr(app_module, 'get_contest', recording)
+        client.get('/teams')
+        assert seen and all(contest is seen[0] for contest in seen)
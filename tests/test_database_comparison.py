@@ -7,6 +7,8 @@ comparisons and maintains proper data calculations across different databases.
 
 import pytest
 import re
+import shutil
+import sqlite3
 from app import app
 from database import ReportGenerator, ReadathonDB
 
@@ -650,3 +652,209 @@ class TestDatabaseComparison:
         assert 'and 2 others' in result['names']
         assert result['tie_count'] == 5
         assert result['grade_context'] == 'Various'  # Multiple grades
+
+    def test_comparison_batches_run_concurrently(self, sample_db):
+        """Verify each database's query batch runs on its own thread with the same results."""
+        import threading
+        from database import ReportGenerator, ReadathonDB
+        db1 = ReadathonDB('db/readathon_sample.db')
+        db2 = ReadathonDB('db/readathon_sample.db')
+        queries = {'size': 'SELECT COUNT(*) AS n FROM Roster', 'days': 'SELECT COUNT(*) AS n FROM Daily_Logs'}
+
+        barrier = threading.Barrier(2, timeout=5)
+        for db in (db1, db2):
+            original = db.execute_query
+            # Both sides must be inside their batch at the same time to pass the barrier
+            db.execute_query = lambda query, params=(), original=original: barrier.wait() is not None and original(query, params)
+
+        (results1, ms1), (results2, ms2) = ReportGenerator._run_comparison_batches([db1, db2], queries)
+        assert results1 == results2 == {name: sample_db.execute_query(query) for name, query in queries.items()}
+        assert ms1 >= 0 and ms2 >= 0
+
+    def test_comparison_reports_side_latency(self, client, sample_db):
+        """Verify the comparison result carries each side's query latency and the page shows it."""
+        from database import ReportGenerator
+        result = ReportGenerator(sample_db).get_database_comparison('readathon_sample.db', 'readathon_sample.db', 'all')
+        assert set(result['timing']) == {'db1_ms', 'db2_ms', 'db1_cached', 'db2_cached'}
+        assert len(result['comparisons']) == 49
+
+        response = client.get('/database-comparison?db1=readathon_sample.db&db2=readathon_sample.db&filter=all')
+        assert 'Query Time:' in response.data.decode('utf-8')
+
+    def test_comparison_cached_by_file_version(self, tmp_path, monkeypatch):
+        """Verify sides and pairs are reused until a database changes, and only that side recomputes."""
+        from database import ReportGenerator, ReadathonDB
+        (tmp_path / 'db').mkdir()
+        for name in ('readathon_registry.db', 'readathon_sample.db'):
+            shutil.copy(f'db/{name}', tmp_path / 'db' / name)
+        shutil.copy('db/readathon_sample.db', tmp_path / 'db' / 'readathon_copy.db')
+        monkeypatch.chdir(tmp_path)
+        reports = ReportGenerator(ReadathonDB('db/readathon_sample.db'))
+
+        first = reports.get_database_comparison('readathon_sample.db', 'readathon_copy.db', 'all')
+        assert not first['timing']['db1_cached'] and not first['timing']['db2_cached']
+        again = reports.get_database_comparison('readathon_sample.db', 'readathon_copy.db', 'all')
+        assert again['timing']['db1_cached'] and again['timing']['db2_cached']
+        assert again['comparisons'] == first['comparisons']
+
+        # Each side's values are reused in a different pairing
+        swapped = reports.get_database_comparison('readathon_copy.db', 'readathon_sample.db', 'all')
+        assert swapped['timing']['db1_cached'] and swapped['timing']['db2_cached']
+
+        conn = sqlite3.connect('db/readathon_copy.db')
+        conn.execute("UPDATE Reader_Cumulative SET donation_amount = donation_amount + 1000")
+        conn.commit()
+        conn.close()
+
+        changed = reports.get_database_comparison('readathon_sample.db', 'readathon_copy.db', 'all')
+        assert changed['timing']['db1_cached'] and not changed['timing']['db2_cached']
+        school = next(c for c in changed['comparisons'] if c['entity_level'] == 'School' and c['metric'] == 'Fundraising')
+        assert school['db2_value']['value'] > school['db1_value']['value']
+
+    def test_comparison_caches_bounded(self, sample_db, monkeypatch):
+        """Verify the side, pair and trend caches keep only their most recently used entries."""
+        import database
+        from database import ReportGenerator, LRUCache
+        for name in ('_comparison_side_cache', '_comparison_cache', '_trend_cache'):
+            monkeypatch.setattr(database, name, LRUCache(2))
+        reports = ReportGenerator(sample_db)
+        for filter_period in ['all', '2025-10-10', '2025-10-11']:
+            reports.get_database_comparison('readathon_sample.db', 'readathon_2025.db', filter_period)
+            reports.get_database_trend(['readathon_sample.db', 'readathon_2025.db'], filter_period)
+        assert len(database._comparison_side_cache) == 2
+        assert len(database._comparison_cache) == 2
+        assert len(database._trend_cache) == 2
+
+        again = reports.get_database_comparison('readathon_sample.db', 'readathon_2025.db', '2025-10-11')
+        assert again['timing']['db1_cached'] and again['timing']['db2_cached']
+
+    def test_trend_matches_level_queries(self, sample_db):
+        """Verify each year's trend values equal that database's own level queries."""
+        from database import ReportGenerator, ReadathonDB
+        from queries import DB_COMPARISON_LEVELS, get_db_comparison_level_query, split_db_comparison_rows
+        reports = ReportGenerator(sample_db)
+        filenames = ['readathon_sample.db', 'readathon_2025.db']
+        for filter_period in ['all', '2025-10-10']:
+            trend = reports.get_database_trend(filenames, filter_period)
+            assert [info['db_filename'] for info in trend['databases']] == ['readathon_2025.db', 'readathon_sample.db']
+            for index, info in enumerate(trend['databases']):
+                db = ReadathonDB(f"db/{info['db_filename']}")
+                expected = split_db_comparison_rows({level: db.execute_query(get_db_comparison_level_query(level, filter_period))
+                                                     for level in DB_COMPARISON_LEVELS})
+                assert {metric: values[index] for metric, values in trend['series'].items()} == expected
+
+    def test_trend_attaches_more_files_than_sqlite_limit(self, tmp_path, monkeypatch):
+        """Verify trends over more databases than can be attached at once run in batches."""
+        from database import ReportGenerator, ReadathonDB
+        (tmp_path / 'db').mkdir()
+        for name in ('readathon_registry.db', 'readathon_sample.db'):
+            shutil.copy(f'db/{name}', tmp_path / 'db' / name)
+        filenames = [f'readathon_copy{index:02d}.db' for index in range(12)]
+        for index, name in enumerate(filenames):
+            shutil.copy('db/readathon_sample.db', tmp_path / 'db' / name)
+            conn = sqlite3.connect(tmp_path / 'db' / name)
+            conn.execute("UPDATE Reader_Cumulative SET donation_amount = donation_amount + ?", (index,))
+            conn.commit()
+            conn.close()
+        monkeypatch.chdir(tmp_path)
+        reports = ReportGenerator(ReadathonDB('db/readathon_sample.db'))
+
+        trend = reports.get_database_trend(filenames)
+        assert trend['timing']['statements'] == 10
+        totals = [rows[0]['total_fundraising'] for rows in trend['series']['school_fundraising']]
+        assert all(earlier < later for earlier, later in zip(totals, totals[1:]))  # given order kept
+        assert reports.get_database_trend(filenames)['timing']['cached']
+
+    def test_trend_api(self, client):
+        """Verify /api/database_trend returns per-metric series and rejects unknown files."""
+        response = client.get('/api/database_trend?db=readathon_sample.db&db=readathon_2025.db&filter=all')
+        data = response.get_json()
+        assert response.status_code == 200 and data['success']
+        assert len(data['series']) == 49
+        assert all(len(values) == 2 for values in data['series'].values())
+
+        assert client.get('/api/database_trend?db=missing.db').status_code == 400
+        assert client.get('/api/database_trend').status_code == 400
+
+
+@pytest.fixture
+def snapshot_dir(tmp_path, monkeypatch):
+    """Scratch db/ directory with the registry, the sample database and a copy of it."""
+    (tmp_path / 'db').mkdir()
+    for name in ('readathon_registry.db', 'readathon_sample.db'):
+        shutil.copy(f'db/{name}', tmp_path / 'db' / name)
+    shutil.copy('db/readathon_sample.db', tmp_path / 'db' / 'readathon_copy.db')
+    monkeypatch.chdir(tmp_path)
+    return tmp_path / 'db'
+
+
+class TestComparisonSnapshot:
+    """Test the per-database comparison snapshot read by cross-year features."""
+
+    def test_snapshot_matches_level_queries(self, snapshot_dir):
+        """Verify every snapshotted period equals the live level queries, until a write makes it stale."""
+        from queries import DB_COMPARISON_LEVELS, get_db_comparison_level_query, split_db_comparison_rows
+        db = ReadathonDB('db/readathon_copy.db')
+        assert db.get_comparison_snapshot('all') is None
+        assert db.refresh_comparison_snapshot()
+
+        for period in ['all'] + db.get_all_dates():
+            live = split_db_comparison_rows({level: db.execute_query(get_db_comparison_level_query(level, period))
+                                             for level in DB_COMPARISON_LEVELS})
+            assert db.get_comparison_snapshot(period) == live, period
+        assert db.get_comparison_snapshot('not-a-period') is None
+
+        conn = sqlite3.connect('db/readathon_copy.db')
+        conn.execute("UPDATE Reader_Cumulative SET sponsors = sponsors + 1")
+        conn.commit()
+        conn.close()
+        assert db.get_comparison_snapshot('all') is None
+
+    def test_refresh_skipped_when_data_changes_meanwhile(self, snapshot_dir):
+        """Verify a refresh that raced another write stores nothing."""
+        db = ReadathonDB('db/readathon_copy.db')
+        original = db.execute_query
+
+        def write_during_refresh(query, params=()):
+            conn = sqlite3.connect('db/readathon_copy.db')
+            conn.execute("UPDATE Reader_Cumulative SET sponsors = sponsors + 1")
+            conn.commit()
+            conn.close()
+            db.execute_query = original
+            return original(query, params)
+
+        db.execute_query = write_during_refresh
+        assert not db.refresh_comparison_snapshot()
+        assert db.get_comparison_snapshot('all') is None
+
+    def test_cross_year_features_read_snapshots(self, snapshot_dir):
+        """Verify comparison, trend and registry stats use current snapshots with unchanged results."""
+        from database import DatabaseRegistry
+        reports = ReportGenerator(ReadathonDB('db/readathon_sample.db'))
+        live_trend = reports.get_database_trend(['readathon_sample.db', 'readathon_copy.db'])
+        live_comparison = reports.get_database_comparison('readathon_sample.db', 'readathon_copy.db', 'all')
+
+        for name in ('readathon_sample.db', 'readathon_copy.db'):
+            assert ReadathonDB(f'db/{name}').refresh_comparison_snapshot()
+
+        trend = reports.get_database_trend(['readathon_sample.db', 'readathon_copy.db'])
+        assert trend['timing']['snapshots'] == 2 and trend['timing']['statements'] == 0
+        assert trend['series'] == live_trend['series']
+        comparison = reports.get_database_comparison('readathon_sample.db', 'readathon_copy.db', 'all')
+        assert comparison['comparisons'] == live_comparison['comparisons']
+
+        registry = DatabaseRegistry()
+        db_id = registry.get_database_by_name('readathon_sample.db')['db_id']
+        stats = registry.recalculate_stats_from_file(db_id)
+        conn = sqlite3.connect('db/readathon_sample.db')
+        assert (stats['student_count'], stats['total_days'], stats['total_donations']) == conn.execute(
+            "SELECT (SELECT COUNT(*) FROM Roster), (SELECT COUNT(DISTINCT log_date) FROM Daily_Logs), "
+            "(SELECT COALESCE(SUM(donation_amount), 0.0) FROM Reader_Cumulative)").fetchone()
+        conn.close()
+
+    def test_upload_schedules_refresh(self, snapshot_dir):
+        """Verify the post-upload bookkeeping rebuilds the snapshot in the background."""
+        import app as app_module
+        db = ReadathonDB('db/readathon_copy.db')
+        app_module.schedule_comparison_snapshot(db).join()
+        assert db.get_comparison_snapshot('all') is not None
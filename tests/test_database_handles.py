@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test Shared Database Handles
+
+Covers the reference-counted handle manager: each file is opened once and
+shared, handles close with their last reference, and the app's database
+cache, comparisons and registry lookups all reuse the same handles.
+
+Created: 2026-10-19
+"""
+
+import os
+import shutil
+import pytest
+import app as app_module
+import database
+from database import DatabaseHandleManager, ReadathonDB, ReportGenerator, database_handles
+
+
+@pytest.fixture
+def scratch_path(tmp_path):
+    """Scratch copy of the sample database."""
+    path = tmp_path / 'readathon_handles.db'
+    shutil.copy('db/readathon_sample.db', path)
+    return str(path)
+
+
+class TestDatabaseHandleManager:
+    """Test acquire/release reference counting"""
+
+    def test_one_handle_per_file(self, scratch_path):
+        """Verify every acquire of a file returns the same open handle"""
+        handles = DatabaseHandleManager()
+        first = handles.acquire(scratch_path)
+        assert handles.acquire(scratch_path) is first
+        with handles.database(scratch_path) as db:
+            assert db is first
+        assert handles.get_stats() == [{'type': 'ReadathonDB', 'path': scratch_path, 'references': 2}]
+
+    def test_closed_with_last_reference(self, scratch_path):
+        """Verify a handle stays open while referenced and closes after the last release"""
+        handles = DatabaseHandleManager()
+        db = handles.acquire(scratch_path)
+        handles.acquire(scratch_path)
+        db.execute_query("SELECT 1")
+
+        handles.release(db)
+        assert db.conn is not None
+        handles.release(db)
+        assert db.conn is None and handles.get_stats() == []
+        assert handles.acquire(scratch_path) is not db
+
+    def test_registry_shared(self):
+        """Verify registry lookups share one DatabaseRegistry"""
+        handles = DatabaseHandleManager()
+        with handles.registry() as first, handles.registry() as second:
+            assert first is second
+            assert first.list_databases()
+
+
+class TestSharedHandles:
+    """Test that the app and comparisons reuse handles"""
+
+    def test_app_and_comparisons_share_handles(self):
+        """Verify app.get_database and comparisons use the same handle for a file"""
+        db_id = app_module.get_registry().get_database_by_name('readathon_sample.db')['db_id']
+        app_db = app_module.get_database(db_id)
+        with ReportGenerator._comparison_db('readathon_sample.db') as db:
+            assert db is app_db
+        assert app_module.get_registry() is database_handles.acquire_registry()
+        database_handles.release(app_module.get_registry())
+
+    def test_repeated_comparisons_open_nothing_new(self):
+        """Verify comparisons and trends do not leave new handles behind"""
+        db_id = app_module.get_registry().get_database_by_name('readathon_sample.db')['db_id']
+        reports = ReportGenerator(app_module.get_database(db_id))
+        reports.get_database_comparison('readathon_sample.db', 'readathon_2025.db', 'all')
+        before = database_handles.get_stats()
+        for _ in range(3):
+            reports.get_database_comparison('readathon_sample.db', 'readathon_2025.db', 'all')
+            reports.get_database_trend(['readathon_sample.db', 'readathon_2025.db'])
+        assert database_handles.get_stats() == before
+
+    def test_evicted_comparison_handles_close(self, tmp_path, monkeypatch):
+        """Verify handles kept open for comparisons are released when evicted"""
+        (tmp_path / 'db').mkdir()
+        shutil.copy('db/readathon_registry.db', tmp_path / 'db' / 'readathon_registry.db')
+        for name in ('readathon_a.db', 'readathon_b.db', 'readathon_c.db'):
+            shutil.copy('db/readathon_sample.db', tmp_path / 'db' / name)
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(database, '_comparison_dbs', database.LRUCache(
+            2, on_evict=lambda path, db: database_handles.release(db)))
+
+        def references(name):
+            path = os.path.abspath(os.path.join('db', name))
+            return sum(entry['references'] for entry in database_handles.get_stats() if entry['path'] == path)
+
+        reports = ReportGenerator(ReadathonDB('db/readathon_a.db'))
+        reports.get_database_comparison('readathon_a.db', 'readathon_b.db', 'all')
+        assert references('readathon_a.db') == 1 and references('readathon_b.db') == 1
+
+        reports.get_database_comparison('readathon_c.db', 'readathon_b.db', 'all')
+        assert references('readathon_a.db') == 0
+        assert references('readathon_b.db') == 1 and references('readathon_c.db') == 1
+
+        database._comparison_dbs.clear()
+        assert references('readathon_b.db') == 0 and references('readathon_c.db') == 0
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test Grade Level Class Table
+
+Covers the per-date cached class table behind the Grade Level tab: filtered
+views, grade card rollups and gold/silver winners derived in memory match
+the filtered SQL they replace, and team-filtered pages render.
+
+Created: 2026-10-19
+"""
+
+import pytest
+import app as app_module
+from database import ReadathonDB
+from queries import get_grade_level_classes_query, get_grade_aggregations_query
+
+
+@pytest.fixture
+def sample_db():
+    """Sample database instance."""
+    return ReadathonDB('db/readathon_sample.db')
+
+
+@pytest.fixture
+def client():
+    """Test client on the sample database."""
+    app_module.app.config['TESTING'] = True
+    with app_module.app.test_client() as client:
+        with client.session_transaction() as sess:
+            sess['environment'] = 'sample'
+        yield client
+
+
+def filter_combinations(db):
+    contest = db.get_contest_context()
+    for date_filter in ['all'] + contest.dates:
+        for grade in ['all'] + contest.grade_levels:
+            for team in ['all'] + contest.team_names:
+                yield date_filter, grade, team
+
+
+def sql_wheres(date_filter, grade, team):
+    date_where = f" AND dl.log_date <= '{date_filter}'" if date_filter != 'all' else ""
+    grade_where = f" AND ci.grade_level = '{grade}'" if grade != 'all' else ""
+    team_where = f" AND ci.team_name = '{team}'" if team != 'all' else ""
+    return date_where, grade_where, team_where
+
+
+class TestGradeLevelClasses:
+    """Test get_grade_level_classes and the in-memory derivations"""
+
+    def test_cached_per_date(self, sample_db):
+        """Verify the class table is queried once per date filter"""
+        assert sample_db.get_grade_level_classes('all') is sample_db.get_grade_level_classes('all')
+
+    def test_filtered_views_match_filtered_query(self, sample_db):
+        """Verify in-memory grade/team filtering equals the filtered SQL"""
+        for date_filter, grade, team in filter_combinations(sample_db):
+            expected = sample_db.execute_query(get_grade_level_classes_query(*sql_wheres(date_filter, grade, team)))
+            derived = [cls for cls in sample_db.get_grade_level_classes(date_filter)
+                       if grade in ('all', cls['grade_level']) and team in ('all', cls['team_name'])]
+            assert derived == expected, (date_filter, grade, team)
+
+    def test_winners_match_per_metric_max(self, sample_db):
+        """Verify the one-pass winners equal a max() per metric"""
+        classes = sample_db.get_grade_level_classes('all')
+        school, grades = app_module.find_grade_level_winners(classes)
+        for metric, column in app_module.GRADE_LEVEL_WINNER_METRICS:
+            assert school[metric] == max(cls[column] for cls in classes)
+            for grade, winners in grades.items():
+                assert winners[metric] == max(cls[column] for cls in classes if cls['grade_level'] == grade)
+
+    def test_grade_rollup_matches_aggregation_query(self, sample_db):
+        """Verify grade card counts equal the SQL grade aggregation"""
+        contest = sample_db.get_contest_context()
+        for date_filter, grade, team in filter_combinations(sample_db):
+            date_where, grade_where, team_where = sql_wheres(date_filter, grade, team)
+            expected = sample_db.execute_query(get_grade_aggregations_query(date_where, grade_where, team_where))
+            classes = [cls for cls in sample_db.get_grade_level_classes(date_filter)
+                       if grade in ('all', cls['grade_level']) and team in ('all', cls['team_name'])]
+            derived = app_module.summarize_grade_level_classes(contest, classes)
+            columns = ('grade_level', 'num_classes', 'num_students', 'team1_students', 'team2_students')
+            assert [{c: row[c] for c in columns} for row in derived] == \
+                   [{c: row[c] for c in columns} for row in expected], (date_filter, grade, team)
+
+
+class TestGradeLevelTeamFilter:
+    """Test team-filtered Grade Level pages"""
+
+    def test_team_filter_renders(self, client, sample_db):
+        """Verify team filters no longer fail on the per-grade student lookup"""
+        for team in sample_db.get_contest_context().team_names:
+            response = client.get(f'/classes?team={team}')
+            assert response.status_code == 200
+            assert b'no such column' not in response.data
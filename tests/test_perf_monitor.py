@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Test Performance Monitor
+
+Covers the rolling histograms, span SQL/row accounting on instrumented
+connections, and the /api/perf endpoint with ?profile=1 request profiling.
+
+Created: 2026-10-19
+"""
+
+import pytest
+import perf_monitor
+from database import ReadathonDB
+
+
+@pytest.fixture(autouse=True)
+def clean_stats():
+    """Start every test with no recorded samples."""
+    perf_monitor.reset()
+    yield
+    perf_monitor.reset()
+
+
+@pytest.fixture
+def client():
+    """Create test client with an empty report cache so report methods actually run"""
+    from app import app, get_current_db
+    app.config['TESTING'] = True
+    with app.test_request_context():
+        get_current_db()._report_cache.clear()
+    with app.test_client() as client:
+        yield client
+
+
+def find_entry(kind, name):
+    for entry in perf_monitor.get_perf_snapshot():
+        if entry['kind'] == kind and entry['name'] == name:
+            return entry
+    return None
+
+
+class TestRollingHistogram:
+    """Test histogram summaries"""
+
+    def test_empty_summary(self):
+        """Verify an empty histogram reports zero samples"""
+        assert perf_monitor.RollingHistogram().summary() == {'count': 0, 'window': 0}
+
+    def test_percentiles_and_buckets(self):
+        """Verify percentiles and bucket counts over 1..100 ms"""
+        histogram = perf_monitor.RollingHistogram()
+        for value in range(1, 101):
+            histogram.add(value)
+        summary = histogram.summary()
+        assert summary['count'] == 100
+        assert summary['p50'] == 51
+        assert summary['p90'] == 91
+        assert summary['max'] == 100
+        assert sum(summary['buckets'].values()) == 100
+        assert summary['buckets']['<=10'] == 5
+
+    def test_window_rolls_off_old_samples(self):
+        """Verify only the newest samples count toward percentiles"""
+        histogram = perf_monitor.RollingHistogram(window=3)
+        for value in [1000, 1, 2, 3]:
+            histogram.add(value)
+        summary = histogram.summary()
+        assert summary['count'] == 4
+        assert summary['window'] == 3
+        assert summary['max'] == 3
+
+
+class TestSpans:
+    """Test SQL and row accounting"""
+
+    def test_span_counts_statements_and_rows(self):
+        """Verify a span records each statement and the rows execute_query fetched"""
+        db = ReadathonDB('db/readathon_sample.db')
+        roster_size = db.execute_query("SELECT COUNT(*) as n FROM Roster")[0]['n']
+
+        with perf_monitor.span('test', 'roster'):
+            db.execute_query("SELECT * FROM Roster")
+            db.execute_query("SELECT COUNT(*) as n FROM Roster")
+
+        entry = find_entry('test', 'roster')
+        assert entry['sql_count']['max'] == 2
+        assert entry['rows']['max'] == roster_size + 1
+        assert any('FROM Roster' in s['sql'] for s in entry['statements'])
+
+    def test_nested_spans_both_record(self):
+        """Verify outer spans include the SQL of inner spans"""
+        db = ReadathonDB('db/readathon_sample.db')
+        with perf_monitor.span('test', 'outer'):
+            with perf_monitor.span('test', 'inner'):
+                db.execute_query("SELECT 1 as one")
+        assert find_entry('test', 'outer')['sql_count']['max'] == 1
+        assert find_entry('test', 'inner')['sql_count']['max'] == 1
+
+    def test_progress_handler_only_inside_spans(self, monkeypatch):
+        """Verify progress ticks happen only while a span is using the connection"""
+        ticks = []
+        monkeypatch.setattr(perf_monitor, '_progress_handler', lambda: ticks.append(1) or 0)
+        db = ReadathonDB('db/readathon_sample.db')
+        counting = ("WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n WHERE x < 20000) "
+                    "SELECT COUNT(*) as c FROM n")
+        db.execute_query(counting)
+        assert ticks == []
+
+        with perf_monitor.span('test', 'ticks'):
+            db.execute_query("SELECT 1 as one")  # installs the handler from the next statement on
+            db.execute_query(counting)
+        assert ticks
+
+        after_span = len(ticks)
+        db.execute_query(counting)
+        assert len(ticks) == after_span
+
+    def test_sql_outside_spans_is_not_recorded(self):
+        """Verify untraced work leaves no samples"""
+        ReadathonDB('db/readathon_sample.db').execute_query("SELECT 1 as one")
+        assert perf_monitor.get_perf_snapshot() == []
+
+
+class TestPerfApi:
+    """Test /api/perf and ?profile=1"""
+
+    def test_perf_lists_route_and_report(self, client):
+        """Verify running a report records both the route and the report method"""
+        assert client.get('/api/report/q6').status_code == 200
+
+        data = client.get('/api/perf').get_json()
+        names = {(e['kind'], e['name']) for e in data['entries']}
+        assert ('route', 'run_report') in names
+        assert ('report', 'q6_class_participation') in names
+
+        report = find_entry('report', 'q6_class_participation')
+        assert report['sql_count']['max'] >= 1
+        assert report['rows']['max'] >= 1
+
+    def test_perf_kind_filter_and_html(self, client):
+        """Verify ?kind= filters entries and ?format=html renders a page"""
+        client.get('/api/report/q6')
+        data = client.get('/api/perf?kind=route').get_json()
+        assert data['entries']
+        assert all(e['kind'] == 'route' for e in data['entries'])
+
+        response = client.get('/api/perf?format=html')
+        assert response.status_code == 200
+        assert b'run_report' in response.data
+
+    def test_delete_resets(self, client):
+        """Verify DELETE clears recorded samples"""
+        client.get('/api/report/q6')
+        assert client.delete('/api/perf').get_json()['success'] is True
+        assert find_entry('report', 'q6_class_participation') is None
+
+    def test_profile_param_returns_cprofile_dump(self, client):
+        """Verify ?profile=1 replaces the response with pstats output"""
+        response = client.get('/api/report/q6?profile=1')
+        assert response.status_code == 200
+        assert response.mimetype == 'text/plain'
+        assert b'function calls' in response.data
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Test Prize Drawing (Q4)
+
+Covers seeded single-date drawings, the all-dates batch drawing with
+persisted draws, and the AliasSampler used for minute-weighted draws.
+
+Created: 2026-10-19
+"""
+
+import random
+import pytest
+from collections import Counter
+from database import ReadathonDB, ReportGenerator, AliasSampler, _draw_without_replacement
+
+
+@pytest.fixture
+def sample_db():
+    """Get sample database instance for verification queries."""
+    return ReadathonDB('db/readathon_sample.db')
+
+
+class TestAliasSampler:
+    """Test weighted sampling"""
+
+    def test_frequencies_follow_weights(self):
+        """Verify sample frequencies are proportional to weights"""
+        rng = random.Random(42)
+        sampler = AliasSampler([1, 3, 6])
+        counts = Counter(sampler.sample(rng) for _ in range(60000))
+        assert counts[0] / 60000 == pytest.approx(0.1, abs=0.01)
+        assert counts[1] / 60000 == pytest.approx(0.3, abs=0.01)
+        assert counts[2] / 60000 == pytest.approx(0.6, abs=0.01)
+
+    def test_draw_without_replacement_is_distinct(self):
+        """Verify weighted draws never repeat and zero weights come last"""
+        rng = random.Random(1)
+        for _ in range(50):
+            picks = _draw_without_replacement(rng, 5, 5, [4, 0, 1, 2, 3])
+            assert sorted(picks) == [0, 1, 2, 3, 4]
+            assert picks[-1] == 1
+
+    def test_k_larger_than_pool(self):
+        """Verify asking for more winners than entrants returns everyone once"""
+        assert sorted(_draw_without_replacement(random.Random(3), 3, 10)) == [0, 1, 2]
+
+
+class TestSeededDrawing:
+    """Test reproducible drawings"""
+
+    def test_seeded_single_date_is_reproducible(self, sample_db):
+        """Verify the same seed draws the same Q4 winners"""
+        reports = ReportGenerator(sample_db)
+        log_date = sample_db.get_all_dates()[0]
+        first = reports.q4_prize_drawing(log_date, seed=123)['data']
+        second = reports.q4_prize_drawing(log_date, seed=123)['data']
+        assert first == second
+
+    def test_batch_covers_every_date_and_grade(self, scratch_db):
+        """Verify the batch draws k winners per grade for every date with eligible students"""
+        reports = ReportGenerator(scratch_db)
+        result = reports.q4_prize_drawing_batch(seed=5, winners_per_grade=2)
+
+        for log_date in scratch_db.get_all_dates():
+            single = reports.q4_prize_drawing(log_date, seed=5)['data']
+            batch_rows = [r for r in result['data'] if r['log_date'] == log_date]
+            assert {r['grade_level'] for r in batch_rows} == {w['grade_level'] for w in single}
+            for winner in single:
+                grade_rows = [r for r in batch_rows if r['grade_level'] == winner['grade_level']]
+                assert len(grade_rows) == min(2, winner['total_eligible'])
+                assert len({r['student_name'] for r in grade_rows}) == len(grade_rows)
+
+    def test_batch_first_winner_matches_seeded_single_date(self, scratch_db):
+        """Verify batch rank-1 winners equal the seeded single-date draw"""
+        reports = ReportGenerator(scratch_db)
+        batch = reports.q4_prize_drawing_batch(seed=9)['data']
+        for log_date in scratch_db.get_all_dates():
+            single = {w['grade_level']: w['student_name'] for w in reports.q4_prize_drawing(log_date, seed=9)['data']}
+            assert {r['grade_level']: r['student_name'] for r in batch if r['log_date'] == log_date} == single
+
+    def test_batch_reuses_persisted_draws(self, scratch_db):
+        """Verify a rerun reads persisted draws and redraws only changed pools"""
+        reports = ReportGenerator(scratch_db)
+        first = reports.q4_prize_drawing_batch(seed=11, weighted='1', save=True)
+        assert first['draw_stats']['reused'] == 0
+        assert first['draw_stats']['saved'] == first['draw_stats']['pools']
+
+        second = reports.q4_prize_drawing_batch(seed=11, weighted='1')
+        assert second['data'] == first['data']
+        assert second['draw_stats']['drawn'] == 0
+
+        # Changing one entrant's minutes invalidates only that date/grade pool
+        row = first['data'][0]
+        conn = scratch_db.get_connection()
+        conn.execute("UPDATE Daily_Logs SET minutes_read = minutes_read + 1 WHERE log_date = ? AND student_name = ?",
+                     (row['log_date'], row['student_name']))
+        conn.commit()
+        third = reports.q4_prize_drawing_batch(seed=11, weighted='1')
+        assert third['draw_stats']['drawn'] == 1
+
+    def test_unsaved_batch_writes_nothing(self, scratch_db):
+        """Verify a batch draw without save leaves Prize_Draws untouched"""
+        reports = ReportGenerator(scratch_db)
+        identity = scratch_db.get_file_identity()
+        result = reports.q4_prize_drawing_batch(seed=13)
+        assert result['draw_stats']['saved'] == 0
+        assert scratch_db.get_prize_draws(13, 1, False) == {}
+        assert scratch_db.get_file_identity() == identity
+
+    def test_save_requires_seed(self, scratch_db):
+        """Verify saving an unseeded (random) draw is refused"""
+        with pytest.raises(ValueError):
+            ReportGenerator(scratch_db).q4_prize_drawing_batch(save=True)
+
+    def test_batch_via_report_api(self, client):
+        """Verify q4_batch runs through the report endpoint without saving draws"""
+        response = client.get('/api/report/q4_batch?seed=3&k=1&save=1')
+        assert response.status_code == 200
+        assert response.get_json()['seed'] == 3
+        assert response.get_json()['draw_stats']['saved'] == 0
+
+    def test_save_via_post(self, client):
+        """Verify POST /api/prize_draws saves seeded draws that later GETs reuse"""
+        assert client.post('/api/prize_draws', data={'k': 1}).status_code == 400
+
+        saved = client.post('/api/prize_draws', data={'seed': 4, 'k': 1}).get_json()
+        assert saved['draw_stats']['saved'] == saved['draw_stats']['pools']
+        rerun = client.get('/api/report/q4_batch?seed=4&k=1').get_json()
+        assert rerun['draw_stats']['drawn'] == 0
+        assert rerun['data'] == saved['data']
+
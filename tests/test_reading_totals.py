@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Test Stored Reading Totals
+
+Verifies that the trigger-maintained per-class totals behind Q6/Q14/Q18/Q19
+and the Student_Reconciliation table behind Q21/Q22/Q23 stay equal to the
+from-scratch queries across daily and cumulative uploads, deletes and edits,
+and that roster changes make the class totals fall back.
+
+Created: 2026-10-19
+"""
+
+import shutil
+import pytest
+from database import ReadathonDB, ReportGenerator
+from queries import (
+    QUERY_Q6_CLASS_PARTICIPATION, QUERY_Q6_CLASS_PARTICIPATION_STORED,
+    QUERY_Q14_TEAM_PARTICIPATION, QUERY_Q14_TEAM_PARTICIPATION_STORED,
+    QUERY_Q18_LEAD_CLASS_BY_GRADE, QUERY_Q18_LEAD_CLASS_BY_GRADE_STORED,
+    QUERY_Q19_TEAM_MINUTES, QUERY_Q19_TEAM_MINUTES_STORED,
+    QUERY_Q21_MINUTES_INTEGRITY, QUERY_Q21_MINUTES_INTEGRITY_STORED,
+    QUERY_Q22_STUDENT_NAME_SYNC, QUERY_Q22_STUDENT_NAME_SYNC_STORED,
+    QUERY_Q23_ROSTER_INTEGRITY, QUERY_Q23_ROSTER_INTEGRITY_STORED,
+    QUERY_INTEGRITY_TOTALS, QUERY_INTEGRITY_TOTALS_STORED
+)
+
+QUERY_PAIRS = [
+    (QUERY_Q6_CLASS_PARTICIPATION, QUERY_Q6_CLASS_PARTICIPATION_STORED),
+    (QUERY_Q14_TEAM_PARTICIPATION, QUERY_Q14_TEAM_PARTICIPATION_STORED),
+    (QUERY_Q18_LEAD_CLASS_BY_GRADE, QUERY_Q18_LEAD_CLASS_BY_GRADE_STORED),
+    (QUERY_Q19_TEAM_MINUTES, QUERY_Q19_TEAM_MINUTES_STORED),
+]
+
+RECONCILIATION_QUERY_PAIRS = [
+    (QUERY_Q21_MINUTES_INTEGRITY, QUERY_Q21_MINUTES_INTEGRITY_STORED),
+    (QUERY_Q22_STUDENT_NAME_SYNC, QUERY_Q22_STUDENT_NAME_SYNC_STORED),
+    (QUERY_Q23_ROSTER_INTEGRITY, QUERY_Q23_ROSTER_INTEGRITY_STORED),
+    (QUERY_INTEGRITY_TOTALS, QUERY_INTEGRITY_TOTALS_STORED),
+]
+
+
+class MockFile:
+    """Minimal stand-in for an uploaded CSV file"""
+
+    def __init__(self, content):
+        self.content = content
+        self.filename = 'daily.csv'
+
+    def read(self):
+        return self.content.encode('utf-8')
+
+
+@pytest.fixture
+def scratch_db(tmp_path):
+    """Copy of the sample database that uploads can modify."""
+    path = tmp_path / 'readathon_totals.db'
+    shutil.copy('db/readathon_sample.db', path)
+    return ReadathonDB(str(path))
+
+
+@pytest.fixture
+def students(scratch_db):
+    return [r['student_name'] for r in scratch_db.execute_query(
+        "SELECT student_name FROM Roster ORDER BY student_name")]
+
+
+def upload(db, log_date, minutes_by_student):
+    csv = "Reader Name,Minutes\n" + "".join(f"{name},{minutes}\n" for name, minutes in minutes_by_student.items())
+    result = db.upload_daily_data(log_date, MockFile(csv))
+    assert result['success'], result['errors']
+
+
+def assert_stored_matches(db, pairs=QUERY_PAIRS):
+    for full_query, stored_query in pairs:
+        assert db.execute_query(stored_query) == db.execute_query(full_query)
+
+
+class TestStoredReadingTotals:
+    """Test incremental maintenance of the stored totals"""
+
+    def test_missing_until_first_upload(self, scratch_db, students):
+        """Verify totals are created by the first daily upload"""
+        assert not scratch_db.has_reading_totals()
+        upload(scratch_db, '2030-01-01', {students[0]: 30})
+        assert scratch_db.has_reading_totals()
+        assert_stored_matches(scratch_db)
+
+    def test_upload_new_and_replaced_dates(self, scratch_db, students):
+        """Verify new-date and replacement uploads keep totals exact (caps and zeros included)"""
+        upload(scratch_db, '2030-01-01', {name: (i * 37) % 200 for i, name in enumerate(students)})
+        assert_stored_matches(scratch_db)
+
+        existing_date = scratch_db.get_all_dates()[-1]
+        upload(scratch_db, existing_date, {name: (i * 11) % 150 for i, name in enumerate(students[:5])})
+        assert_stored_matches(scratch_db)
+
+    def test_deletes_and_edits(self, scratch_db, students):
+        """Verify direct Daily_Logs changes are applied by the triggers"""
+        upload(scratch_db, '2030-01-01', {name: 45 for name in students})
+        conn = scratch_db.get_connection()
+        conn.execute("DELETE FROM Daily_Logs WHERE log_date = ?", (scratch_db.get_all_dates()[0],))
+        conn.execute("UPDATE Daily_Logs SET minutes_read = 0 WHERE student_name = ?", (students[1],))
+        conn.commit()
+        assert_stored_matches(scratch_db)
+
+    def test_roster_change_falls_back_then_rebuilds(self, scratch_db, students):
+        """Verify a roster change marks totals stale and the next upload rebuilds them"""
+        upload(scratch_db, '2030-01-01', {students[0]: 60})
+        conn = scratch_db.get_connection()
+        conn.execute("UPDATE Roster SET class_name = (SELECT class_name FROM Roster WHERE student_name = ?) "
+                     "WHERE student_name = ?", (students[0], students[-1]))
+        conn.commit()
+        assert not scratch_db.has_reading_totals()
+
+        # Reports use the from-scratch queries while stale
+        reports = ReportGenerator(scratch_db)
+        assert reports.q6_class_participation()['data'] == scratch_db.execute_query(QUERY_Q6_CLASS_PARTICIPATION)
+
+        upload(scratch_db, '2030-01-02', {students[-1]: 20})
+        assert scratch_db.has_reading_totals()
+        assert_stored_matches(scratch_db)
+
+
+class TestStudentReconciliation:
+    """Test the trigger-maintained integrity table"""
+
+    def test_built_by_first_upload(self, scratch_db, students):
+        """Verify the table is created by the first upload and matches Q21/Q22/Q23"""
+        assert not scratch_db.has_student_reconciliation()
+        upload(scratch_db, '2030-01-01', {students[0]: 150, 'Not In Roster': 20})
+        assert scratch_db.has_student_reconciliation()
+        assert_stored_matches(scratch_db, RECONCILIATION_QUERY_PAIRS)
+
+    def test_tracks_cumulative_and_roster_changes(self, scratch_db, students):
+        """Verify Reader_Cumulative and Roster edits update the flagged rows"""
+        scratch_db.ensure_student_reconciliation()
+        conn = scratch_db.get_connection()
+        conn.execute("UPDATE Reader_Cumulative SET cumulative_minutes = cumulative_minutes + 15 WHERE student_name = ?",
+                     (students[0],))
+        conn.execute("DELETE FROM Reader_Cumulative WHERE student_name = ?", (students[1],))
+        conn.execute("INSERT INTO Reader_Cumulative (student_name, cumulative_minutes, upload_timestamp) "
+                     "VALUES ('Not In Roster', 40, '2030-01-01')")
+        conn.execute("DELETE FROM Roster WHERE student_name = ?", (students[2],))
+        conn.commit()
+        assert_stored_matches(scratch_db, RECONCILIATION_QUERY_PAIRS)
+
+        reports = ReportGenerator(scratch_db)
+        assert any(r['student_name'] == 'Not In Roster' for r in reports.q23_roster_integrity_check()['data'])
+        statuses = {r['student_name']: r['status'] for r in reports.q21_minutes_integrity_check()['data']}
+        assert statuses[students[0]] == 'MINUTES_MISMATCH'
+        assert students[2] not in statuses
+
+    def test_integrity_totals(self, scratch_db, students):
+        """Verify school-wide integrity totals read from the table match the source tables"""
+        before = scratch_db.get_integrity_totals()
+        upload(scratch_db, '2030-01-01', {students[0]: 25})
+        after = scratch_db.get_integrity_totals()
+        assert after['daily_total'] == before['daily_total'] + 25
+        assert after['difference'] == after['cumulative_total'] - after['daily_total']
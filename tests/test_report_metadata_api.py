@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Test Report Metadata Endpoint
+
+Covers the split of static column descriptions and terms out of report
+results: every report carries only a metadata key that resolves in
+/api/report_metadata, and the versioned endpoint is long-cacheable and
+revalidates by ETag.
+
+Created: 2026-10-19
+"""
+
+import pytest
+from database import REPORT_REGISTRY
+from report_metadata import COLUMN_METADATA, REPORT_METADATA_VERSION, get_report_terms
+
+
+class TestReportMetadataKeys:
+    """Test that report results reference metadata by key"""
+
+    def test_reports_carry_only_a_key(self, client):
+        """Verify no report embeds columns or terms and every key resolves"""
+        catalog = client.get('/api/report_metadata').get_json()['reports']
+        for report_id in REPORT_REGISTRY:
+            result = client.get(f'/api/report/{report_id}').get_json()
+            if 'metadata' not in result:
+                continue
+            assert 'columns' not in result['metadata'] and 'terms' not in result['metadata'], report_id
+            assert result['metadata']['key'] in catalog, report_id
+
+    def test_catalog_matches_report_metadata(self, client):
+        """Verify each key serves the same columns and terms reports used to embed"""
+        catalog = client.get('/api/report_metadata').get_json()['reports']
+        for key, columns in COLUMN_METADATA.items():
+            assert catalog[key]['columns'] == columns
+            assert catalog[key]['terms'] == get_report_terms(key)
+
+
+class TestReportMetadataCaching:
+    """Test caching headers on /api/report_metadata"""
+
+    def test_versioned_url_is_long_cached(self, client):
+        """Verify ?v=<version> is immutable and other URLs revalidate"""
+        response = client.get(f'/api/report_metadata?v={REPORT_METADATA_VERSION}')
+        assert 'immutable' in response.headers['Cache-Control']
+        assert response.get_json()['version'] == REPORT_METADATA_VERSION
+        assert client.get('/api/report_metadata?v=stale').headers['Cache-Control'] == 'no-cache'
+
+    def test_revalidates_by_version(self, client):
+        """Verify a matching If-None-Match answers 304"""
+        first = client.get('/api/report_metadata')
+        second = client.get('/api/report_metadata', headers={'If-None-Match': first.headers['ETag']})
+        assert second.status_code == 304
+
+    def test_pages_load_versioned_url(self, client):
+        """Verify pages request the versioned URL and resolve keys before rendering"""
+        html = client.get('/reports').data.decode()
+        assert f'/api/report_metadata?v={REPORT_METADATA_VERSION}' in html
+        assert 'displayReport(await attachReportMetadata(result))' in html
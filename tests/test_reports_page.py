@@ -485,3 +485,246 @@ class TestReportsPage:
         table_count = len(table_items)
         assert f'Database Tables ({table_count})' in html, \
             f"Database Tables count mismatch"
+
+
+class TestReportRegistry:
+    """Test REPORT_REGISTRY dispatch shared by report, export and workflow endpoints."""
+
+    def test_every_report_item_is_registered(self):
+        """Verify each report on the Reports page has a registry entry."""
+        from database import REPORT_REGISTRY, ReportGenerator
+        report_ids = [item['id'] for item in get_unified_items() if 'report' in item['groups']]
+        for report_id in report_ids:
+            assert report_id in REPORT_REGISTRY, f"{report_id} missing from REPORT_REGISTRY"
+            assert hasattr(ReportGenerator, REPORT_REGISTRY[report_id]['method'])
+
+    def test_unknown_report_returns_404(self, client):
+        """Verify report and export endpoints reject unknown IDs."""
+        assert client.get('/api/report/q99').status_code == 404
+        assert client.get('/api/export/q99').status_code == 404
+
+    def test_registry_defaults_applied(self, sample_db):
+        """Verify missing params fall back to registry defaults (q4 uses latest date)."""
+        from database import ReportGenerator
+        reports = ReportGenerator(sample_db)
+        latest = sample_db.get_all_dates()[0]
+        assert reports.run_report('q4')['title'] == reports.q4_prize_drawing(latest)['title']
+        assert reports.run_report('q2', {'date': latest})['data'] == reports.q2_daily_summary(latest, 'class')['data']
+
+    def test_cacheable_report_served_from_cache(self, sample_db):
+        """Verify repeat runs of a cacheable report hit the cache until data changes."""
+        from database import ReportGenerator
+        reports = ReportGenerator(sample_db)
+        first = reports.run_report('q19')
+        second = reports.run_report('q19')
+        assert first == second
+        stats = reports.get_report_stats()['q19']
+        assert stats['runs'] == 1
+        assert stats['cache_hits'] == 1
+
+    def test_cached_report_stamped_when_served(self, scratch_db, monkeypatch):
+        """Verify a report served from the cache shows when it was served, not computed."""
+        from database import ReportGenerator
+        reports = ReportGenerator(scratch_db)
+        reports.run_report('q19')
+        monkeypatch.setattr(ReportGenerator, '_get_report_timestamp', lambda self: 'Report generated: later')
+        assert reports.run_report('q19')['last_updated'] == 'Report generated: later'
+        assert reports.get_report_stats()['q19']['cache_hits'] == 1
+
+    def test_report_cache_bounded(self, scratch_db, monkeypatch):
+        """Verify the report cache keeps only the most recently used parameter sets."""
+        from database import ReportGenerator
+        monkeypatch.setattr(scratch_db._report_cache, 'max_entries', 3)
+        reports = ReportGenerator(scratch_db)
+        for limit in range(1, 6):
+            reports.run_report('q5', {'limit': limit})
+        assert len(scratch_db._report_cache) == 3
+        reports.run_report('q5', {'limit': 5})
+        assert reports.get_report_stats()['q5']['cache_hits'] == 1
+
+    def test_cache_ignores_uncommitted_writes(self, scratch_db):
+        """Verify a report read during an open write is not reused after the commit or a rollback."""
+        from database import ReportGenerator
+        reports = ReportGenerator(scratch_db)
+        original = reports.run_report('q19')['data']
+        shared = scratch_db.get_connection()
+        bump = ("UPDATE Daily_Logs SET minutes_read = 0 "
+                "WHERE rowid = (SELECT MIN(rowid) FROM Daily_Logs WHERE minutes_read > 0)")
+
+        # A worker reads committed data while the upload's transaction is open
+        shared.execute(bump)
+        with scratch_db.thread_read_connection():
+            assert reports.run_report('q19')['data'] == original
+        shared.commit()
+        committed = reports.run_report('q19')['data']
+        assert committed != original
+
+        # The shared connection sees its own uncommitted write, which is then rolled back
+        shared.execute(bump)
+        assert reports.run_report('q19')['data'] != committed
+        shared.rollback()
+        assert reports.run_report('q19')['data'] == committed
+
+    def test_falsy_args_passed_through(self, sample_db, monkeypatch):
+        """Verify falsy args such as limit=0 reach the report instead of the default."""
+        from database import ReportGenerator, REPORT_REGISTRY
+        calls = []
+        monkeypatch.setattr(ReportGenerator, 'q5_student_cumulative',
+                            lambda self, sort_by, limit: calls.append((sort_by, limit)) or {})
+        monkeypatch.setitem(REPORT_REGISTRY, 'q5', dict(REPORT_REGISTRY['q5'], cacheable=False))
+        reports = ReportGenerator(sample_db)
+        reports.run_report('q5', {'limit': 0})
+        reports.run_report('q5', {'limit': '0', 'sort_by': ''})
+        assert calls == [('minutes', 0), ('minutes', 0)]
+
+    def test_random_report_not_cached(self, sample_db):
+        """Verify the prize drawing re-runs on every call."""
+        from database import ReportGenerator
+        reports = ReportGenerator(sample_db)
+        reports.run_report('q4')
+        reports.run_report('q4')
+        assert reports.get_report_stats()['q4']['runs'] == 2
+
+    def test_workflow_reports_match_individual_reports(self, client):
+        """Verify a workflow returns the same data as running each report directly."""
+        workflow = client.get('/api/workflow/qc').get_json()
+        for result in workflow['reports']:
+            report_id = result['title'].split(':')[0].split('/')[0].lower()
+            single = client.get(f'/api/report/{report_id}').get_json()
+            assert single['data'] == result['data'], report_id
+
+
+class TestWorkflowExecution:
+    """Test concurrent workflow execution (/api/workflow/<id>)."""
+
+    def test_results_keep_workflow_order(self, client):
+        """Verify reports come back in workflow tag order despite running concurrently."""
+        from app import get_workflow_reports
+        expected = [item['id'] for item in get_workflow_reports('qa')]
+        data = client.get('/api/workflow/qa').get_json()
+        assert [t['report_id'] for t in data['timing']['reports']] == expected
+        assert len(data['reports']) == len(expected)
+
+    def test_timing_reported(self, client):
+        """Verify total and per-report timings are included."""
+        data = client.get('/api/workflow/qd').get_json()
+        assert data['timing']['total_ms'] >= 0
+        assert all(t['elapsed_ms'] >= 0 for t in data['timing']['reports'])
+
+    def test_failing_report_does_not_abort_workflow(self, client, monkeypatch):
+        """Verify one failing report yields an error entry while the rest still run."""
+        from database import ReportGenerator, REPORT_REGISTRY
+
+        def broken(self):
+            raise RuntimeError('boom')
+
+        monkeypatch.setattr(ReportGenerator, 'q19_team_minutes', broken)
+        monkeypatch.setitem(REPORT_REGISTRY, 'q19', dict(REPORT_REGISTRY['q19'], cacheable=False))
+        data = client.get('/api/workflow/qc').get_json()
+        errors = [r for r in data['reports'] if r.get('error')]
+        assert len(errors) == 1
+        assert errors[0]['error'] == 'boom'
+        assert len(data['reports']) > 1
+
+    def test_value_errors_not_reported_as_missing_data(self, client, monkeypatch):
+        """Verify only NoDailyDataError becomes the 'no daily data' entry; other errors surface."""
+        from database import ReportGenerator, REPORT_REGISTRY
+
+        def broken(self):
+            raise ValueError('bad value')
+
+        monkeypatch.setattr(ReportGenerator, 'q19_team_minutes', broken)
+        monkeypatch.setitem(REPORT_REGISTRY, 'q19', dict(REPORT_REGISTRY['q19'], cacheable=False))
+        data = client.get('/api/workflow/qc').get_json()
+        errors = [r for r in data['reports'] if r.get('error')]
+        assert [e['error'] for e in errors] == ['bad value']
+        assert errors[0]['title'].endswith(' - Error')
+
+    def test_thread_read_connection_is_private_and_read_only(self, sample_db):
+        """Verify the per-thread connection replaces the shared one only inside the block."""
+        import sqlite3
+        shared = sample_db.get_connection()
+        with sample_db.thread_read_connection() as conn:
+            assert sample_db.get_connection() is conn
+            assert conn is not shared
+            with pytest.raises(sqlite3.OperationalError):
+                conn.execute("DELETE FROM Roster")
+        assert sample_db.get_connection() is shared
+
+    def test_stream_mode_emits_ndjson_events(self, client):
+        """Verify ?stream=1 sends start, one event per report, then end."""
+        import json
+        response = client.get('/api/workflow/qc?stream=1')
+        assert response.status_code == 200
+        assert response.mimetype == 'application/x-ndjson'
+
+        events = [json.loads(line) for line in response.get_data(as_text=True).splitlines() if line]
+        assert events[0]['type'] == 'start'
+        assert events[-1]['type'] == 'end'
+
+        report_events = [e for e in events if e['type'] == 'report']
+        assert len(report_events) == len(events[0]['reports'])
+        assert sorted(e['index'] for e in report_events) == list(range(len(report_events)))
+
+        # Same reports as the buffered response, once placed by index
+        buffered = client.get('/api/workflow/qc').get_json()
+        streamed = [None] * len(report_events)
+        for e in report_events:
+            streamed[e['index']] = e['report']
+        assert [r['data'] for r in streamed] == [r['data'] for r in buffered['reports']]
+
+    def test_stream_unknown_workflow_returns_json_error(self, client):
+        """Verify streaming an unknown workflow still returns a JSON 404."""
+        response = client.get('/api/workflow/zz?stream=1')
+        assert response.status_code == 404
+        assert 'error' in response.get_json()
+
+
+class TestTableApi:
+    """Test keyset-paginated /api/table/<table_id> and its count endpoint."""
+
+    TABLE_IDS = ['roster', 'class_info', 'grade_rules', 'daily_logs', 'reader_cumulative',
+                 'team_color_bonus', 'upload_history', 'complete_log']
+
+    def test_pages_concatenate_to_full_table(self, client):
+        """Verify walking next_cursor pages returns exactly the unpaginated rows in order."""
+        for table_id in self.TABLE_IDS:
+            full = client.get(f'/api/table/{table_id}').get_json()
+            assert full['has_more'] is False
+
+            rows = []
+            url = f'/api/table/{table_id}?limit=2'
+            while True:
+                page = client.get(url).get_json()
+                assert len(page['data']) <= 2
+                rows.extend(page['data'])
+                if not page['has_more']:
+                    break
+                url = f"/api/table/{table_id}?limit=2&cursor={page['next_cursor']}"
+            assert rows == full['data'], table_id
+
+    def test_count_matches_rows(self, client, sample_db):
+        """Verify the count endpoint matches the table's row count."""
+        response = client.get('/api/table/daily_logs/count').get_json()
+        expected = sample_db.execute_query("SELECT COUNT(*) as n FROM Daily_Logs")[0]['n']
+        assert response['row_count'] == expected
+
+    def test_column_filter_applied_to_rows_and_count(self, client, sample_db):
+        """Verify filter_<column> narrows both the rows and the count."""
+        student = sample_db.execute_query("SELECT student_name FROM Daily_Logs LIMIT 1")[0]['student_name']
+        rows = client.get(f'/api/table/complete_log?filter_student_name={student}').get_json()['data']
+        count = client.get(f'/api/table/complete_log/count?filter_student_name={student}').get_json()['row_count']
+        assert rows and all(student in r['student_name'] for r in rows)
+        assert count == len(rows)
+
+    def test_filter_wildcards_are_literal(self, client):
+        """Verify % in filter text matches a literal percent sign, not everything."""
+        data = client.get('/api/table/roster?filter_student_name=%25').get_json()['data']
+        assert data == []
+
+    def test_bad_requests(self, client):
+        """Verify unknown tables, filter columns and cursors are rejected."""
+        assert client.get('/api/table/nope').status_code == 404
+        assert client.get('/api/table/nope/count').status_code == 404
+        assert client.get('/api/table/roster?filter_bogus=x').status_code == 400
+        assert client.get('/api/table/roster?limit=2&cursor=not-a-cursor').status_code == 400
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Test Pre-rendered Slide Bundles
+
+Covers rendering the QD workflow to a versioned bundle on disk, staleness
+detection from the database file identity, the background render scheduled
+after uploads, and the /slides/qd and /api/slides/qd endpoints with their
+live fallback.
+
+Created: 2026-10-19
+"""
+
+import json
+import os
+import pytest
+import app as app_module
+
+
+def touch_db(db):
+    """Commit a write so the database file identity changes."""
+    conn = db.get_connection()
+    conn.execute("UPDATE Daily_Logs SET minutes_read = minutes_read + 1 "
+                 "WHERE rowid = (SELECT MIN(rowid) FROM Daily_Logs)")
+    conn.commit()
+
+
+class TestSlideBundle:
+    """Test rendering, saving and loading bundles"""
+
+    def test_bundle_contains_every_qd_report(self, scratch_db):
+        """Verify the bundle runs all QD reports for the latest date"""
+        bundle, html = app_module.build_slide_bundle(scratch_db)
+        qd_ids = [item['id'] for item in app_module.get_workflow_reports('qd')]
+        assert len(bundle['reports']) == len(qd_ids)
+        assert bundle['log_date'] == scratch_db.get_all_dates()[0]
+        assert bundle['workflow_name'] in html
+
+        version_dir = app_module.save_slide_bundle(scratch_db, bundle, html)
+        with open(os.path.join(version_dir, 'report.json')) as f:
+            assert json.load(f)['version'] == bundle['version']
+        assert app_module.load_slide_bundle(scratch_db) == (bundle['version'], version_dir)
+
+    def test_write_makes_bundle_stale(self, scratch_db):
+        """Verify a committed write means the bundle is no longer served"""
+        app_module.save_slide_bundle(scratch_db, *app_module.build_slide_bundle(scratch_db))
+        touch_db(scratch_db)
+        assert app_module.load_slide_bundle(scratch_db) is None
+
+    def test_old_versions_pruned(self, scratch_db, monkeypatch):
+        """Verify only the newest SLIDE_BUNDLE_KEEP versions stay on disk"""
+        monkeypatch.setattr(app_module, 'SLIDE_BUNDLE_KEEP', 2)
+        for _ in range(4):
+            version_dir = app_module.save_slide_bundle(scratch_db, *app_module.build_slide_bundle(scratch_db))
+        bundle_dir = os.path.dirname(version_dir)
+        assert sorted(os.listdir(bundle_dir))[-1] == 'latest.json'
+        assert len([name for name in os.listdir(bundle_dir) if name != 'latest.json']) == 2
+
+    def test_scheduled_render(self, scratch_db):
+        """Verify the post-upload hook renders a fresh bundle in the background"""
+        touch_db(scratch_db)
+        thread = app_module.schedule_slide_bundle(scratch_db)
+        thread.join(timeout=30)
+        assert app_module.load_slide_bundle(scratch_db) is not None
+
+
+class TestSlideEndpoints:
+    """Test /slides/qd and /api/slides/qd"""
+
+    def test_live_fallback_then_static(self, client):
+        """Verify the first request renders live and later requests serve the saved bundle"""
+        first = client.get('/slides/qd')
+        assert first.status_code == 200
+        assert first.headers['X-Slide-Bundle'] == 'live'
+        assert b'QD: Daily Slide Update' in first.data
+
+        second = client.get('/slides/qd')
+        assert second.headers['X-Slide-Bundle'] != 'live'
+        assert second.data == first.data
+
+    def test_json_matches_bundle(self, client, scratch_db):
+        """Verify the JSON endpoint serves the bundle's report.json"""
+        bundle, html = app_module.build_slide_bundle(scratch_db)
+        app_module.save_slide_bundle(scratch_db, bundle, html)
+        response = client.get('/api/slides/qd')
+        assert response.headers['X-Slide-Bundle'] == bundle['version']
+        assert response.get_json()['version'] == bundle['version']
+
+        touch_db(scratch_db)
+        assert client.get('/api/slides/qd').headers['X-Slide-Bundle'] == 'live'
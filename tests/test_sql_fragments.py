@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test Composable SQL Fragments
+
+Verifies that statements built from the shared SQL_FRAGMENTS library
+(compose_query / compose_metrics_query) return the same values as the
+equivalent standalone SQL against the sample database.
+
+Created: 2026-10-19
+"""
+
+import pytest
+from database import ReadathonDB
+from queries import SQL_FRAGMENTS, compose_query, compose_metrics_query, SQL_METRICS
+
+
+@pytest.fixture
+def sample_db():
+    """Get sample database instance for verification queries."""
+    return ReadathonDB('db/readathon_sample.db')
+
+
+@pytest.fixture
+def last_date(sample_db):
+    """Earliest-but-one log date, so date filters actually exclude rows."""
+    dates = sorted(sample_db.get_all_dates())
+    return dates[1] if len(dates) > 1 else dates[0]
+
+
+class TestComposeQuery:
+    """Test CTE assembly"""
+
+    def test_no_fragments_returns_select_unchanged(self):
+        """Verify a statement without CTEs is passed through as-is"""
+        assert compose_query([], "SELECT 1") == "SELECT 1"
+
+    def test_duplicate_fragments_emitted_once(self):
+        """Verify a fragment requested twice appears once in the WITH list"""
+        sql = compose_query(['ColorBonus', 'ColorBonus'], "SELECT * FROM ColorBonus")
+        assert sql.count("ColorBonus AS (") == 1
+
+    def test_extra_ctes_follow_shared_fragments(self):
+        """Verify query-specific CTEs can reference shared fragments"""
+        sql = compose_query(['TotalDays'], "SELECT * FROM Doubled",
+                            extra_ctes=[('Doubled', "SELECT total_days * 2 as d FROM TotalDays")])
+        assert sql.index("TotalDays AS (") < sql.index("Doubled AS (")
+
+    def test_date_filter_applied_to_total_days(self, sample_db, last_date):
+        """Verify TotalDays honors the date placeholder"""
+        sql = compose_query(['TotalDays'], "SELECT total_days FROM TotalDays",
+                            date_where_no_alias=f"AND log_date <= '{last_date}'")
+        expected = sample_db.execute_query(
+            "SELECT COUNT(DISTINCT log_date) as n FROM Daily_Logs WHERE log_date <= ?", (last_date,))
+        assert sample_db.execute_query(sql)[0]['total_days'] == expected[0]['n']
+
+    def test_color_bonus_matches_source_table(self, sample_db):
+        """Verify ColorBonus per-class totals match Team_Color_Bonus"""
+        rows = sample_db.execute_query(compose_query(
+            ['ColorBonus'], "SELECT * FROM ColorBonus ORDER BY class_name"))
+        expected = sample_db.execute_query("""
+            SELECT class_name, SUM(bonus_minutes) as bonus_minutes,
+                   SUM(bonus_participation_points) as bonus_points
+            FROM Team_Color_Bonus GROUP BY class_name ORDER BY class_name
+        """)
+        assert rows == expected
+
+    def test_all_fragments_compile(self, sample_db):
+        """Verify every fragment is valid SQL with default placeholders"""
+        for name in SQL_FRAGMENTS:
+            sample_db.execute_query(compose_query([name], f"SELECT * FROM {name}"))
+
+
+class TestComposeMetricsQuery:
+    """Test merged scalar metrics"""
+
+    def test_returns_single_row_with_requested_columns(self, sample_db):
+        """Verify all metrics come back as one row in request order"""
+        names = list(SQL_METRICS)
+        rows = sample_db.execute_query(compose_metrics_query(names))
+        assert len(rows) == 1
+        assert list(rows[0].keys()) == names
+
+    def test_metrics_match_standalone_queries(self, sample_db, last_date):
+        """Verify merged metrics equal the separate per-metric queries"""
+        date_where = f"AND dl.log_date <= '{last_date}'"
+        row = sample_db.execute_query(compose_metrics_query(
+            ['total_roster', 'total_fundraising', 'total_minutes_base',
+             'participating_students', 'goals_met_students', 'bonus_points'],
+            date_where=date_where))[0]
+
+        def scalar(sql):
+            return sample_db.execute_query(sql)[0]['v']
+
+        assert row['total_roster'] == scalar("SELECT COUNT(*) as v FROM Roster")
+        assert row['total_fundraising'] == scalar(
+            "SELECT COALESCE(SUM(donation_amount), 0) as v FROM Reader_Cumulative")
+        assert row['total_minutes_base'] == scalar(f"""
+            SELECT COALESCE(SUM(MIN(dl.minutes_read, 120)), 0) as v
+            FROM Daily_Logs dl WHERE 1=1 {date_where}""")
+        assert row['participating_students'] == scalar(f"""
+            SELECT COUNT(DISTINCT dl.student_name) as v
+            FROM Daily_Logs dl WHERE dl.minutes_read > 0 {date_where}""")
+        assert row['goals_met_students'] == scalar(f"""
+            SELECT COUNT(DISTINCT dl.student_name) as v
+            FROM Daily_Logs dl
+            JOIN Roster r ON dl.student_name = r.student_name
+            JOIN Grade_Rules gr ON r.grade_level = gr.grade_level
+            WHERE dl.minutes_read >= gr.min_daily_minutes {date_where}""")
+        assert row['bonus_points'] == scalar(
+            "SELECT COALESCE(SUM(bonus_participation_points), 0) as v FROM Team_Color_Bonus")
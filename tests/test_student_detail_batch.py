@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test Batched Student Detail
+
+Covers ReadathonDB.get_student_details_batch and /api/students/detail: the
+columnar layout matches the single-student /student/<name> detail for every
+student and date filter, class and name selection, and the Students tab
+prefetch hook.
+
+Created: 2026-10-19
+"""
+
+import pytest
+import app as app_module
+from database import ReadathonDB
+
+
+@pytest.fixture
+def sample_db():
+    """Sample database instance."""
+    return ReadathonDB('db/readathon_sample.db')
+
+
+@pytest.fixture
+def client():
+    """Test client on the sample database."""
+    app_module.app.config['TESTING'] = True
+    with app_module.app.test_client() as client:
+        with client.session_transaction() as sess:
+            sess['environment'] = 'sample'
+        yield client
+
+
+def unpack(batch):
+    """Per-student {summary, daily} dicts from the columnar layout, keyed by name."""
+    summary, daily = batch['summary'], batch['daily']
+    details = {}
+    for i, name in enumerate(summary['student_name']):
+        details[name] = {
+            'summary': {column: values[i] for column, values in summary.items()},
+            'daily': [{column: daily[column][j] for column in daily if column != 'student'}
+                      for j, index in enumerate(daily['student']) if index == i]
+        }
+    return details
+
+
+def roster_names(db):
+    return [row['student_name'] for row in db.execute_query("SELECT student_name FROM Roster")]
+
+
+class TestStudentDetailBatch:
+    """Test get_student_details_batch"""
+
+    def test_matches_single_student_detail(self, sample_db):
+        """Verify every student's batched detail equals get_student_detail for every date filter"""
+        names = roster_names(sample_db)
+        for date_filter in ['all'] + sample_db.get_all_dates():
+            details = unpack(sample_db.get_student_details_batch(names, date_filter=date_filter))
+            assert sorted(details) == sorted(names)
+            for name in names:
+                assert details[name] == sample_db.get_student_detail(name, date_filter)
+
+    def test_class_selection(self, sample_db):
+        """Verify class_name selects exactly the class roster"""
+        class_name = sample_db.execute_query("SELECT class_name FROM Roster LIMIT 1")[0]['class_name']
+        expected = [row['student_name'] for row in sample_db.execute_query(
+            "SELECT student_name FROM Roster WHERE class_name = ? ORDER BY student_name", (class_name,))]
+        batch = sample_db.get_student_details_batch(class_name=class_name)
+        assert batch['summary']['student_name'] == expected
+
+    def test_unknown_names_left_out(self, sample_db):
+        """Verify names not on the roster are skipped"""
+        batch = sample_db.get_student_details_batch(['nobody', "o'brien"])
+        assert batch['summary']['student_name'] == []
+        assert batch['daily']['student'] == []
+
+
+class TestStudentDetailBatchApi:
+    """Test /api/students/detail"""
+
+    def test_api_matches_single_endpoint(self, client, sample_db):
+        """Verify the batch endpoint returns the same data as one /student/<name> call per name"""
+        names = roster_names(sample_db)[:3]
+        log_date = sample_db.get_all_dates()[0]
+        query = '&'.join(f'name={name}' for name in names)
+        batch = client.get(f'/api/students/detail?date={log_date}&{query}').get_json()
+        details = unpack(batch)
+        for name in names:
+            single = client.get(f'/student/{name}?date={log_date}').get_json()
+            assert details[name]['summary'] == single['summary']
+            assert details[name]['daily'] == single['daily']
+            assert batch['days_in_filter'] == single['days_in_filter']
+
+    def test_api_requires_selection(self, client):
+        """Verify a request without class or name is a 400"""
+        assert client.get('/api/students/detail').status_code == 400
+
+    def test_students_page_prefetches(self, client):
+        """Verify the Students tab prefetches details and reuses them in the modal"""
+        html = client.get('/students').data.decode()
+        assert 'function prefetchStudentDetails()' in html
+        assert '/api/students/detail?' in html
+        assert 'studentDetailCache.get(studentName)' in html
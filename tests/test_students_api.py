@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Test Server-side Students Paging
+
+Covers ReadathonDB.get_students_page and /api/students: sorting, search,
+paging windows, the per-row highlight flags, and that /students renders the
+first window with the pager only when the group is larger than one window.
+
+Created: 2026-10-19
+"""
+
+import pytest
+import app as app_module
+from database import ReadathonDB
+
+
+@pytest.fixture
+def sample_db():
+    """Sample database instance."""
+    return ReadathonDB('db/readathon_sample.db')
+
+
+@pytest.fixture
+def client():
+    """Test client on the sample database."""
+    app_module.app.config['TESTING'] = True
+    with app_module.app.test_client() as client:
+        with client.session_transaction() as sess:
+            sess['environment'] = 'sample'
+        yield client
+
+
+class TestStudentsPage:
+    """Test get_students_page"""
+
+    def test_windows_cover_sorted_group(self, sample_db):
+        """Verify consecutive windows add up to the full sorted group"""
+        full = sample_db.get_students_page(sort_by='minutes_capped', descending=True, limit=1000)
+        minutes = [row['minutes_capped'] for row in full['rows']]
+        assert minutes == sorted(minutes, reverse=True)
+        assert full['matched'] == full['total'] == len(full['rows'])
+
+        names = []
+        for offset in range(0, full['total'], 3):
+            page = sample_db.get_students_page(sort_by='minutes_capped', descending=True,
+                                               offset=offset, limit=3)
+            names += [row['student_name'] for row in page['rows']]
+        assert names == [row['student_name'] for row in full['rows']]
+
+    def test_unknown_sort_falls_back_to_name(self, sample_db):
+        """Verify an unknown sort column sorts by student name"""
+        page = sample_db.get_students_page(sort_by='password', limit=1000)
+        assert page['sort_by'] == 'student_name'
+        names = [row['student_name'] for row in page['rows']]
+        assert names == sorted(names)
+
+    def test_search_matches_any_displayed_cell(self, sample_db):
+        """Verify search narrows matched but not total"""
+        student = sample_db.get_students_page(limit=1)['rows'][0]
+        page = sample_db.get_students_page(search=student['student_name'].upper(), limit=1000)
+        assert student['student_name'] in [row['student_name'] for row in page['rows']]
+        assert page['matched'] <= page['total']
+
+        page = sample_db.get_students_page(search='no such student', limit=1000)
+        assert page['matched'] == 0 and page['total'] > 0
+
+    def test_highlight_flags(self, sample_db):
+        """Verify gold flags mark school-wide maxima and silver applies to filtered groups"""
+        page = sample_db.get_students_page(limit=1000)
+        assert page['highlight_mode'] == 'gold'
+        for metric in sample_db.STUDENT_WINNER_METRICS:
+            best = max(row[metric] for row in page['rows'])
+            for row in page['rows']:
+                assert (row['highlights'].get(metric) == 'school') == (row[metric] == best)
+
+        grade = page['rows'][0]['grade_level']
+        filtered = sample_db.get_students_page(grade_filter=grade, limit=1000)
+        assert filtered['highlight_mode'] == 'silver'
+        assert all(row['grade_level'] == grade for row in filtered['rows'])
+        for metric in sample_db.STUDENT_WINNER_METRICS:
+            best = max(row[metric] for row in filtered['rows'])
+            assert all(metric in row['highlights'] for row in filtered['rows'] if row[metric] == best)
+
+
+class TestStudentsApi:
+    """Test /api/students and the /students first window"""
+
+    def test_api_window(self, client, sample_db):
+        """Verify the API returns the same window as the database method"""
+        data = client.get('/api/students?sort=fundraising&dir=desc&offset=2&limit=2').get_json()
+        expected = sample_db.get_students_page(sort_by='fundraising', descending=True, offset=2, limit=2)
+        assert [row['student_name'] for row in data['rows']] == \
+               [row['student_name'] for row in expected['rows']]
+        assert data['offset'] == 2 and data['limit'] == 2
+
+    def test_api_rejects_bad_paging(self, client):
+        """Verify non-integer offset/limit is a 400"""
+        assert client.get('/api/students?offset=abc').status_code == 400
+
+    def test_api_revalidates(self, client):
+        """Verify the API answers 304 for a matching ETag"""
+        first = client.get('/api/students?search=a')
+        second = client.get('/api/students?search=a', headers={'If-None-Match': first.headers['ETag']})
+        assert second.status_code == 304
+
+    def test_pager_only_for_large_groups(self, client, monkeypatch):
+        """Verify /students renders one window and shows the pager only when needed"""
+        monkeypatch.setattr(app_module, '_tab_context_cache', app_module.OrderedDict())
+        html = client.get('/students').data.decode()
+        assert 'id="studentsPager" class="d-none' in html
+        assert 'complete: true' in html
+
+        monkeypatch.setattr(app_module, 'STUDENTS_PAGE_SIZE', 2)
+        app_module._tab_context_cache.clear()
+        html = client.get('/students').data.decode()
+        assert 'id="studentsPager" class="d-flex' in html
+        assert 'complete: false' in html
+        assert html.count('data-student-name="student') == 2
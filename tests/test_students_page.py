@@ -7,6 +7,7 @@ from the sample database and maintains data integrity across changes.
 
 import pytest
 import re
+import shutil
 from app import app
 from database import ReadathonDB
 
@@ -685,6 +686,65 @@ class TestStudentsHighlighting:
         assert 'winning-value-grade' in html or 'winning-value-school' in html
 
 
+class TestStudentsMasterAggregate:
+    """Tests for the cached per-date master aggregate behind the Students page."""
+
+    def test_master_reused_across_filters(self, sample_db):
+        """Grade/team filters are derived from the same cached master result."""
+        master = sample_db.get_students_master('all')
+        sample_db.get_students_data('all', '2', 'team2')
+        sample_db.get_students_filtered_winners('all', '1', 'all')
+
+        assert sample_db.get_students_master('all') is master
+        assert len(master['students']) == 7
+
+    def test_filtered_rows_are_subset_of_master(self, sample_db):
+        """Filtered student rows match the corresponding master rows."""
+        master = sample_db.get_students_master('all')
+        grade_2 = sample_db.get_students_data('all', '2', 'all')
+
+        assert grade_2 == [s for s in master['students'] if s['grade_level'] == '2']
+
+    def test_banner_totals_match_student_rows(self, sample_db):
+        """Banner sums equal the sums of the displayed student rows."""
+        for date_filter in ['all'] + sample_db.get_all_dates():
+            students = sample_db.get_students_data(date_filter, 'all', 'team2')
+            banner = sample_db.get_students_banner(date_filter, 'all', 'team2')
+
+            assert banner['total_students'] == len(students)
+            assert banner['total_fundraising'] == sum(s['fundraising'] for s in students)
+            assert banner['total_minutes'] == sum(s['minutes_capped'] for s in students)
+            assert banner['total_sponsors'] == sum(s['sponsors'] for s in students)
+
+    def test_winners_match_student_rows(self, sample_db):
+        """Gold and silver winners are the maxima of the displayed values."""
+        for date_filter in ['all'] + sample_db.get_all_dates():
+            students = sample_db.get_students_data(date_filter)
+            school_winners = sample_db.get_students_school_winners(date_filter)
+            grade_winners = sample_db.get_students_grade_winners(date_filter)
+
+            for metric in ReadathonDB.STUDENT_WINNER_METRICS:
+                assert school_winners[metric] == max(s[metric] for s in students)
+                grade_1 = [s[metric] for s in students if s['grade_level'] == '1']
+                assert grade_winners['1'][metric] == max(grade_1)
+
+    def test_master_invalidated_after_data_change(self, tmp_path):
+        """Writing to the database invalidates the cached master result."""
+        db_copy = tmp_path / 'readathon_copy.db'
+        shutil.copy('db/readathon_sample.db', db_copy)
+        db = ReadathonDB(str(db_copy))
+
+        before = db.get_students_banner('all')
+        conn = db.get_connection()
+        conn.execute("UPDATE Reader_Cumulative SET donation_amount = donation_amount + 100 "
+                     "WHERE student_name = 'student11'")
+        conn.commit()
+        after = db.get_students_banner('all')
+        db.close()
+
+        assert after['total_fundraising'] == before['total_fundraising'] + 100
+
+
 class TestStudentsFilterStickiness:
     """Tests for filter persistence using sessionStorage."""
 
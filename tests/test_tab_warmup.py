@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test Dashboard Context Cache & Warmup
+
+Covers the per-filter template context cache behind the School, Teams,
+Grade Level and Students tabs, the post-upload warmup that fills it, and
+the warmup status on /api/warmup and the Admin page.
+
+Created: 2026-10-19
+"""
+
+import time
+import pytest
+import app as app_module
+
+
+def count_builds(monkeypatch):
+    """Wrap every context builder so calls can be counted."""
+    calls = []
+    for tab, builder in list(app_module.TAB_CONTEXT_BUILDERS.items()):
+        def counting(db, *filters, _tab=tab, _builder=builder):
+            calls.append((_tab, filters))
+            return _builder(db, *filters)
+        monkeypatch.setitem(app_module.TAB_CONTEXT_BUILDERS, tab, counting)
+    return calls
+
+
+class TestTabContextCache:
+    """Test get_tab_context"""
+
+    def test_reused_until_data_changes(self, scratch_db, monkeypatch):
+        """Verify a context is built once per data stamp"""
+        calls = count_builds(monkeypatch)
+        first = app_module.get_tab_context(scratch_db, 'school', 'all')
+        assert app_module.get_tab_context(scratch_db, 'school', 'all') is first
+        assert len(calls) == 1
+
+        conn = scratch_db.get_connection()
+        conn.execute("UPDATE Daily_Logs SET minutes_read = minutes_read + 1 "
+                     "WHERE rowid = (SELECT MIN(rowid) FROM Daily_Logs)")
+        conn.commit()
+        app_module.get_tab_context(scratch_db, 'school', 'all')
+        assert len(calls) == 2
+
+    def test_cached_page_matches_fresh_build(self, client, scratch_db):
+        """Verify a page served from the cache renders the same as a cold build"""
+        log_date = scratch_db.get_all_dates()[0]
+        url = f'/students?date={log_date}&grade=K'
+        cold = client.get(url).data
+        assert client.get(url).data == cold
+
+
+class TestTabWarmup:
+    """Test the background warmup"""
+
+    def test_warmup_covers_every_combination(self, scratch_db, monkeypatch):
+        """Verify the warmup builds every combination so later requests build nothing"""
+        combinations = app_module.get_tab_filter_combinations(scratch_db)
+        dates = len(scratch_db.get_all_dates()) + 1
+        assert sum(1 for tab, _ in combinations if tab == 'school') == dates
+        assert combinations[0] == ('school', ('all',))
+
+        app_module.warm_tab_contexts(scratch_db)
+        status = app_module.get_tab_warmup_status(scratch_db)
+        assert status['total'] == len(combinations)
+        assert status['built'] + status['failed'] == status['total']
+
+        calls = count_builds(monkeypatch)
+        for tab, filters in combinations:
+            if tab in ('school', 'teams', 'students'):
+                app_module.get_tab_context(scratch_db, tab, *filters)
+        assert calls == []
+
+    def test_grade_level_builds_print_nothing(self, scratch_db, capsys):
+        """Verify the Grade Level contexts the warmup builds write nothing to stdout"""
+        for tab, filters in app_module.get_tab_filter_combinations(scratch_db):
+            if tab == 'classes':
+                app_module.TAB_CONTEXT_BUILDERS[tab](scratch_db, *filters)
+        assert capsys.readouterr().out == ''
+
+    def test_upload_notification_schedules_warmup(self, scratch_db):
+        """Verify the post-upload hook runs the warmup in the background"""
+        thread = app_module.schedule_tab_warmup(scratch_db)
+        thread.join(timeout=60)
+        assert app_module.get_tab_warmup_status(scratch_db)['state'].startswith('done')
+
+    def test_upload_results_stay_valid_after_snapshot_refresh(self, scratch_db, monkeypatch):
+        """Verify the bundle and warmed contexts built after an upload match the final file"""
+        app_module.notify_data_changed(scratch_db)
+        deadline = time.time() + 120
+        while any(key[1] == scratch_db.db_path for key in list(app_module._background_jobs_rerun)):
+            assert time.time() < deadline, "post-upload jobs did not finish"
+            time.sleep(0.05)
+
+        assert scratch_db.get_comparison_snapshot('all') is not None
+        assert app_module.load_slide_bundle(scratch_db) is not None
+        calls = count_builds(monkeypatch)
+        for tab, filters in app_module.get_tab_filter_combinations(scratch_db):
+            if tab in ('school', 'teams', 'students'):
+                app_module.get_tab_context(scratch_db, tab, *filters)
+        assert calls == []
+
+    def test_status_api_and_admin_page(self, client):
+        """Verify /api/warmup starts a warmup and the Admin page shows its status"""
+        assert client.get('/api/warmup').get_json()['state'] in ('never', 'done', 'done_with_errors')
+        assert 'state' in client.post('/api/warmup').get_json()
+        assert b'Dashboard Cache Warmup' in client.get('/admin').data